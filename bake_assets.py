@@ -0,0 +1,38 @@
+import sys
+import os
+
+# 烘焙时不需要显示窗口
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 资源路径相对于项目根目录
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+os.chdir(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, "src"))
+
+import pygame
+import asset_pack
+from ui import text_atlas
+
+# 烘焙步骤，每个模块提供bake_main()；资源包最后打包，包含前面步骤的产物
+BAKE_STEPS = [
+    text_atlas,
+    asset_pack,
+]
+
+def bake_assets():
+    """执行所有烘焙步骤"""
+    pygame.init()
+    # 烘焙时始终读取原始资源文件，不使用已有的资源包
+    asset_pack.set_default_pack(None)
+    all_passed = True
+    for step in BAKE_STEPS:
+        print(f"\n=== {step.__name__} ===")
+        if not step.bake_main():
+            print(f"烘焙未完成: {step.__name__}")
+            all_passed = False
+    return all_passed
+
+if __name__ == '__main__':
+    success = bake_assets()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,65 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# 使用无窗口的音频驱动
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "src"))
+
+import pygame
+from audio_cache import AudioCache
+
+SFX_DIR = os.path.join(ROOT_DIR, "assets", "audio", "sfx")
+
+def _load_all(cache: AudioCache, paths) -> float:
+    """加载所有音效，返回耗时（毫秒）"""
+    start = time.perf_counter()
+    for path in paths:
+        cache.load_sound(path)
+    return (time.perf_counter() - start) * 1000
+
+def run(repeat: int = 3) -> dict:
+    """比较冷启动（解码并写缓存）和热启动（内存映射读取缓存）的音效加载耗时"""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    paths = [os.path.join(SFX_DIR, file) for file in sorted(os.listdir(SFX_DIR)) if file.endswith(".mp3")]
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache = AudioCache(cache_dir)
+        cold = []
+        warm = []
+        for _ in range(repeat):
+            cache.clear()
+            cold.append(_load_all(cache, paths))
+            warm.append(_load_all(cache, paths))
+        return {
+            'sounds': len(paths),
+            'cache_bytes': sum(os.path.getsize(os.path.join(cache_dir, f)) for f in os.listdir(cache_dir)),
+            'cold_ms': min(cold),
+            'warm_ms': min(warm),
+            'hits': cache.hits,
+            'misses': cache.misses
+        }
+    finally:
+        shutil.rmtree(cache_dir)
+
+def main():
+    try:
+        result = run()
+    except pygame.error as e:
+        print(f"无法初始化音频，跳过音频缓存基准测试: {e}")
+        return True
+    print("音频缓存基准测试:")
+    print(f"- 音效: {result['sounds']}个, 缓存 {result['cache_bytes'] / 1024:.1f}KB")
+    print(f"- 冷启动(解码): {result['cold_ms']:.2f}ms")
+    print(f"- 热启动(缓存): {result['warm_ms']:.2f}ms")
+    # 热启动应跳过所有解码，且明显快于冷启动
+    return result['misses'] == result['hits'] and result['warm_ms'] < result['cold_ms'] / 2
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
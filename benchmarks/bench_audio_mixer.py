@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+
+# 使用无窗口的音频驱动
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from audio_mixer import SOUND_POLICIES, ChannelManager
+
+NAMES = list(SOUND_POLICIES)
+
+def make_sounds() -> dict:
+    """每个音效一段0.5秒的静音（只关心调度开销，不关心内容）"""
+    frequency, size, channels = pygame.mixer.get_init()
+    length = int(frequency * 0.5) * abs(size) // 8 * channels
+    return {name: pygame.mixer.Sound(buffer=bytes(length)) for name in NAMES}
+
+def run_managed(sounds: dict, requests: int, frames: int) -> dict:
+    """通过ChannelManager：请求在帧内合并，按策略节流和限制声部"""
+    now = [0]
+    manager = ChannelManager(clock=lambda: now[0])
+    elapsed = 0.0
+    flush_time = 0.0
+    for frame in range(frames):
+        now[0] = frame * 16
+        start = time.perf_counter()
+        for i in range(requests):
+            manager.request(NAMES[i % len(NAMES)])
+        flush_start = time.perf_counter()
+        manager.flush(sounds)
+        end = time.perf_counter()
+        elapsed += end - start
+        flush_time += end - flush_start
+    manager.stop_all()
+    return {'frame_ms': elapsed * 1000 / frames, 'flush_ms': flush_time * 1000 / frames,
+            'plays_per_frame': manager.stats['played'] / frames}
+
+def run_direct(sounds: dict, requests: int, frames: int) -> dict:
+    """直接播放：每个请求都抢一个通道播放"""
+    pygame.mixer.set_num_channels(16)
+    plays = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        for i in range(requests):
+            channel = pygame.mixer.find_channel(True)
+            if channel is not None:
+                channel.play(sounds[NAMES[i % len(NAMES)]])
+                plays += 1
+    elapsed = time.perf_counter() - start
+    pygame.mixer.stop()
+    return {'frame_ms': elapsed * 1000 / frames, 'plays_per_frame': plays / frames}
+
+def run(loads=(6, 60, 600), frames: int = 120) -> dict:
+    """比较每帧不同数量的播放请求下，通道管理和直接播放的每帧耗时"""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    sounds = make_sounds()
+    return {requests: {'managed': run_managed(sounds, requests, frames),
+                       'direct': run_direct(sounds, requests, frames)}
+            for requests in loads}
+
+def main():
+    try:
+        results = run()
+    except pygame.error as e:
+        print(f"无法初始化音频，跳过混音通道基准测试: {e}")
+        return True
+    print("混音通道基准测试（每帧请求数 -> 每帧耗时 / 实际播放次数）:")
+    for requests, result in results.items():
+        managed, direct = result['managed'], result['direct']
+        print(f"- {requests:4d}次请求: 通道管理 {managed['frame_ms']:6.3f}ms（flush {managed['flush_ms']:6.3f}ms）"
+              f" / {managed['plays_per_frame']:5.2f}次  "
+              f"直接播放 {direct['frame_ms']:6.3f}ms / {direct['plays_per_frame']:6.1f}次")
+    low, high = results[min(results)], results[max(results)]
+    # 请求增加100倍时实际播放次数和flush耗时不随之增加（合并和节流），总耗时低于直接播放
+    return (high['managed']['plays_per_frame'] <= low['managed']['plays_per_frame']
+            and high['managed']['flush_ms'] < low['managed']['flush_ms'] * 3 + 0.02
+            and high['managed']['frame_ms'] < high['direct']['frame_ms'])
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
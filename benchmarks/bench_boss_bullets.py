@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from entities.bullet_patterns import BossBulletPool, SpiralPattern, RingPattern
+
+def run(live_bullets: int = 4000, frames: int = 300) -> dict:
+    """维持指定数量的Boss子弹，统计每帧更新和渲染耗时"""
+    pygame.init()
+    screen = pygame.Surface((1280, 720))
+    pool = BossBulletPool(capacity=live_bullets + 256)
+    # 慢速子弹，保证大部分子弹长时间停留在屏幕内
+    spiral = SpiralPattern(speed=1.5, arms=8, step=0.05)
+    ring = RingPattern(speed=1.0, interval=1, count=64)
+    origin = (640, 360)
+    
+    # 预热到目标子弹数量
+    frame = 0
+    while pool.count < live_bullets:
+        ring.update(pool, frame, origin, None, 10)
+        pool.update()
+        frame += 1
+    
+    update_total = 0.0
+    render_total = 0.0
+    emitted = 0
+    for _ in range(frames):
+        start = time.perf_counter()
+        if pool.count < live_bullets:
+            emitted += spiral.update(pool, frame, origin, None, 10)
+        pool.update()
+        pool.collide_circle(100, 100, 20)
+        update_total += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        screen.fill((30, 30, 30))
+        pool.render(screen)
+        render_total += time.perf_counter() - start
+        frame += 1
+    
+    pygame.quit()
+    return {
+        'live_bullets': pool.count,
+        'emitted': emitted,
+        'update_ms': update_total / frames * 1000,
+        'render_ms': render_total / frames * 1000
+    }
+
+def main():
+    result = run()
+    frame_ms = result['update_ms'] + result['render_ms']
+    print("Boss弹幕基准测试:")
+    print(f"- 存活子弹: {result['live_bullets']}")
+    print(f"- 更新耗时: {result['update_ms']:.2f}ms/帧")
+    print(f"- 渲染耗时: {result['render_ms']:.2f}ms/帧")
+    print(f"- 合计: {frame_ms:.2f}ms/帧 (60FPS预算 16.67ms)")
+    return frame_ms <= 1000.0 / 60
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from frame_pacer import FramePacer, PacingMode
+
+def busy_work(seconds: float):
+    """模拟一帧的更新和渲染耗时"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def stats(intervals: list, period: float) -> dict:
+    """帧间隔统计；中位误差不受偶发的系统调度延迟影响"""
+    mean = sum(intervals) / len(intervals)
+    variance = sum((interval - mean) ** 2 for interval in intervals) / len(intervals)
+    errors = sorted(abs(interval - period) for interval in intervals)
+    return {
+        'mean_ms': mean * 1000,
+        'jitter_ms': variance ** 0.5 * 1000,
+        'median_error_ms': errors[len(errors) // 2] * 1000,
+        'max_ms': max(intervals) * 1000
+    }
+
+def run_clock(fps: int, frames: int, work: float) -> dict:
+    """原来的做法：pygame.time.Clock.tick"""
+    pygame.init()
+    clock = pygame.time.Clock()
+    clock.tick(fps)
+    intervals = []
+    last = time.perf_counter()
+    for _ in range(frames):
+        busy_work(work)
+        clock.tick(fps)
+        now = time.perf_counter()
+        intervals.append(now - last)
+        last = now
+    pygame.quit()
+    return stats(intervals, 1.0 / fps)
+
+def run_pacer(fps: int, frames: int, work: float, mode: PacingMode) -> dict:
+    pacer = FramePacer(fps, mode, history=frames)
+    pacer.wait()
+    for _ in range(frames):
+        busy_work(work)
+        pacer.wait()
+    return stats(list(pacer.intervals), 1.0 / fps)
+
+def run(fps: int = 60, frames: int = 120, work: float = 0.004) -> dict:
+    """对比不同帧率控制方式的帧间隔和抖动"""
+    return {
+        'clock.tick': run_clock(fps, frames, work),
+        'precise': run_pacer(fps, frames, work, PacingMode.PRECISE),
+        'uncapped': run_pacer(fps, frames, work, PacingMode.UNCAPPED)
+    }
+
+def main():
+    fps = 60
+    results = run(fps)
+    period_ms = 1000.0 / fps
+    print(f"帧节奏基准测试（目标 {period_ms:.2f}ms/帧，模拟工作 4ms）:")
+    for name, result in results.items():
+        print(f"- {name:<10}: 平均 {result['mean_ms']:6.2f}ms  抖动 {result['jitter_ms']:5.2f}ms  "
+              f"中位误差 {result['median_error_ms']:5.2f}ms  最长 {result['max_ms']:6.2f}ms")
+    precise = results['precise']
+    return abs(precise['mean_ms'] - period_ms) < 1.0 and precise['median_error_ms'] < 0.5
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,96 @@
+import gc
+import os
+import sys
+import time
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from gc_controller import GCController
+
+class FakeBullet:
+    """模拟子弹：每帧大量创建和丢弃，部分带循环引用（例如引用发射者的回调）"""
+    def __init__(self, i: int):
+        self.pos = [float(i), float(i)]
+        self.velocity = (1.0, 2.0)
+        self.owner = None
+
+def build_world(size: int) -> list:
+    """长期存活的对象（资源、关卡数据、场景），自动回收的老年代回收要遍历它们"""
+    return [{'id': i, 'tags': [i, i + 1], 'name': f"entity_{i}"} for i in range(size)]
+
+def simulate_frame(live: list, churn: int):
+    """更新一帧：生成新子弹、丢弃旧子弹，并创建一些临时容器"""
+    for i in range(churn):
+        bullet = FakeBullet(i)
+        if i % 10 == 0:
+            bullet.owner = bullet
+        live.append(bullet)
+    del live[:churn]
+    rects = [(b.pos[0], b.pos[1], 4, 4) for b in live[:500]]
+    return len(rects)
+
+def run_frames(controlled: bool, frames: int = 240, churn: int = 2000, world_size: int = 300000,
+               period: float = 1 / 60) -> dict:
+    gc.collect()
+    world = build_world(world_size)
+    live = [FakeBullet(i) for i in range(churn)]
+    in_work = [False]
+    pauses = []
+    start = [0.0]
+    
+    def on_gc(phase, info):
+        if phase == "start":
+            start[0] = time.perf_counter()
+        elif in_work[0]:
+            pauses.append((time.perf_counter() - start[0]) * 1000)
+    
+    controller = GCController()
+    if controlled:
+        controller.freeze()
+        controller.start()
+    gc.callbacks.append(on_gc)
+    work_times = []
+    try:
+        for _ in range(frames):
+            frame_start = time.perf_counter()
+            in_work[0] = True
+            simulate_frame(live, churn)
+            in_work[0] = False
+            work = time.perf_counter() - frame_start
+            work_times.append(work * 1000)
+            if controlled:
+                controller.collect_in_slack(max(0.0, period - work))
+    finally:
+        gc.callbacks.remove(on_gc)
+        controller.stop()
+        gc.unfreeze()
+    del world, live
+    gc.collect()
+    work_times.sort()
+    return {
+        'in_frame_collections': len(pauses),
+        'in_frame_gc_ms': sum(pauses),
+        'max_gc_pause_ms': max(pauses) if pauses else 0.0,
+        'p99_work_ms': work_times[int(len(work_times) * 0.99)],
+        'max_work_ms': work_times[-1],
+        'slack_collections': sum(controller.collections)
+    }
+
+def run() -> dict:
+    """对比自动回收和帧空闲时间调度的回收对帧内停顿的影响"""
+    return {'auto': run_frames(False), 'controlled': run_frames(True)}
+
+def main():
+    results = run()
+    print("垃圾回收停顿基准测试（240帧，每帧2000个子弹对象的创建和丢弃，30万个长期对象）:")
+    for name, result in results.items():
+        print(f"- {name:<10}: 帧内回收 {result['in_frame_collections']:4d}次 / {result['in_frame_gc_ms']:7.2f}ms  "
+              f"最长停顿 {result['max_gc_pause_ms']:6.2f}ms  "
+              f"工作 p99 {result['p99_work_ms']:6.2f}ms / 最长 {result['max_work_ms']:6.2f}ms  "
+              f"空闲时回收 {result['slack_collections']}次")
+    auto, controlled = results['auto'], results['controlled']
+    return controlled['in_frame_collections'] == 0 and controlled['max_work_ms'] < auto['max_work_ms']
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+import time
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from sampling_profiler import SamplingProfiler
+
+def update_entities(entities: list):
+    """模拟一帧的实体更新：纯Python的属性读写和少量函数调用"""
+    for entity in entities:
+        entity[0] += entity[2]
+        entity[1] += entity[3]
+        if not 0 <= entity[0] <= 1280:
+            entity[2] = -entity[2]
+        if not 0 <= entity[1] <= 720:
+            entity[3] = -entity[3]
+
+def workload(frames: int = 1000, count: int = 2000) -> float:
+    entities = [[float(i % 1280), float(i % 720), 1.5, -0.5] for i in range(count)]
+    start = time.perf_counter()
+    for _ in range(frames):
+        update_entities(entities)
+    return time.perf_counter() - start
+
+def run(hz: float = 200.0, repeat: int = 5) -> dict:
+    """对比开启采样前后同一工作量的耗时（交替运行，减少机器负载变化的影响）"""
+    profiler = SamplingProfiler(hz=hz)
+    baselines = []
+    profiled = []
+    for _ in range(repeat):
+        baselines.append(workload())
+        profiler.start(threading.get_ident())
+        profiled.append(workload())
+        profiler.stop(save=False)
+    baseline = min(baselines)
+    profiled_time = min(profiled)
+    return {
+        'baseline_ms': baseline * 1000,
+        'profiled_ms': profiled_time * 1000,
+        'overhead_percent': (profiled_time / baseline - 1) * 100,
+        'samples': profiler.samples,
+        'hot': profiler.compute_hot(3)
+    }
+
+def main():
+    results = run()
+    print(f"采样分析器开销（200Hz）: 基准 {results['baseline_ms']:.1f}ms, 采样中 {results['profiled_ms']:.1f}ms, "
+          f"开销 {results['overhead_percent']:+.1f}%, 最后一轮 {results['samples']}次采样")
+    for entry in results['hot']:
+        print(f"  {entry['self_percent']:5.1f}% {entry['function']}")
+    return results['overhead_percent'] < 10.0
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,99 @@
+import os
+import random
+import sys
+import time
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from quality_governor import quality
+from scenes.game_scene import GameScene
+from entities.soldier import Soldier
+from entities.enemy import Enemy
+from entities.boss_enemy import BossEnemy
+
+def build_scene(enemies: int) -> GameScene:
+    """创建压力场景：带血条的敌人、护盾阶段的Boss和冷却中的玩家"""
+    scene = GameScene(1280, 720)
+    scene.set_player_class(Soldier)
+    scene.initialize()
+    scene.player.use_skill()
+    scene.max_enemies = enemies
+    
+    boss = BossEnemy(600, 200, scene.player)
+    boss.current_phase = 'shield'
+    boss.phases['shield'].start()
+    scene.add_enemy(boss)
+    return scene
+
+def fill_scene(scene: GameScene, bullets: int, seed: int = 0):
+    """按当前档位的上限补充敌人和Boss子弹（子弹静止，保证数量不变）"""
+    rng = random.Random(seed)
+    del scene.enemies[1:]
+    for _ in range(scene.get_enemy_cap()):
+        scene.add_enemy(Enemy(rng.uniform(0, 1240), rng.uniform(0, 680), scene.player))
+    
+    scene.boss_bullets.clear()
+    for _ in range(bullets):
+        scene.boss_bullets.spawn(rng.uniform(0, 1280), rng.uniform(0, 720), 0.0, 0.0, 10)
+
+def run(bullets: int = 4000, enemies: int = 40, frames: int = 120) -> list:
+    """逐个档位测量一帧的渲染和弹幕更新耗时"""
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    scene = build_scene(enemies)
+    scene.prepare()
+    
+    results = []
+    try:
+        for level, tier in enumerate(quality.tiers):
+            quality.set_level(level, lock=True)
+            scene.apply_quality()
+            fill_scene(scene, bullets)
+            
+            update_total = 0.0
+            render_total = 0.0
+            for _ in range(frames):
+                start = time.perf_counter()
+                scene.boss_bullets.update()
+                scene.boss_bullets.collide_circle(-100, -100, 20)
+                update_total += time.perf_counter() - start
+                
+                start = time.perf_counter()
+                scene.render(screen)
+                render_total += time.perf_counter() - start
+            
+            results.append({
+                'tier': tier.name,
+                'enemies': len(scene.enemies) - 1,
+                'bullets': scene.boss_bullets.count,
+                'update_ms': update_total / frames * 1000,
+                'render_ms': render_total / frames * 1000
+            })
+    finally:
+        quality.set_level(0)
+        quality.unlock()
+        pygame.quit()
+    return results
+
+def main():
+    results = run()
+    print("画质档位基准测试:")
+    print(f"  {'档位':<8} {'敌人':>4} {'子弹':>5} {'更新':>8} {'渲染':>8} {'合计':>8}")
+    for result in results:
+        total = result['update_ms'] + result['render_ms']
+        print(f"  {result['tier']:<10} {result['enemies']:>4} {result['bullets']:>6} "
+              f"{result['update_ms']:>7.2f}ms {result['render_ms']:>7.2f}ms {total:>7.2f}ms")
+    
+    # 每降一档耗时不应增加（允许少量测量误差），最低档必须明显低于最高档
+    totals = [result['update_ms'] + result['render_ms'] for result in results]
+    monotonic = all(lower <= higher * 1.05 + 0.1 for higher, lower in zip(totals, totals[1:]))
+    return monotonic and totals[-1] < totals[0] * 0.8
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
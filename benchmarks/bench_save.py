@@ -0,0 +1,75 @@
+import json
+import os
+import random
+import sys
+import time
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import save_format
+
+def make_large_save(runs: int = 2000, replay_bytes: int = 4096, seed: int = 0) -> dict:
+    """生成包含大量局内统计和回放的存档"""
+    rng = random.Random(seed)
+    data = save_format.new_save()
+    data['score'] = rng.randint(0, 10 ** 7)
+    data['fragments'] = rng.randint(0, 10 ** 5)
+    data['stars'] = rng.randint(0, 10 ** 3)
+    data['play_time'] = rng.random() * 10 ** 6
+    data['unlocked_upgrades'] = [f"upgrade_{i}" for i in range(64)]
+    for i in range(runs):
+        data['runs'].append({
+            'score': rng.randint(0, 50000),
+            'kills': rng.randint(0, 500),
+            'level': rng.randint(1, 30),
+            'duration': rng.random() * 900,
+            'boss_defeated': rng.random() < 0.3,
+            'weapon': rng.choice(['basic', 'shotgun', 'sniper', 'laser'])
+        })
+    for i in range(20):
+        # 回放是按帧记录的输入，重复度较高
+        data['replays'].append(bytes(rng.choice((0, 0, 0, 1, 2, 4)) for _ in range(replay_bytes)))
+    return data
+
+def _time(func, repeat: int) -> float:
+    """返回多次执行的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def run(repeat: int = 5) -> dict:
+    """比较旧版JSON与二进制存档的体积和读写耗时"""
+    data = make_large_save()
+    # 旧格式不支持bytes，回放按整数列表保存
+    json_data = dict(data, replays=[list(r) for r in data['replays']])
+    
+    json_text = json.dumps(json_data, ensure_ascii=False, indent=4)
+    binary = save_format.dumps(data, compress=False)
+    compressed = save_format.dumps(data)
+    return {
+        'json_size': len(json_text.encode('utf-8')),
+        'binary_size': len(binary),
+        'compressed_size': len(compressed),
+        'json_save_ms': _time(lambda: json.dumps(json_data, ensure_ascii=False, indent=4), repeat),
+        'json_load_ms': _time(lambda: json.loads(json_text), repeat),
+        'binary_save_ms': _time(lambda: save_format.dumps(data, compress=False), repeat),
+        'binary_load_ms': _time(lambda: save_format.loads(binary), repeat),
+        'compressed_save_ms': _time(lambda: save_format.dumps(data), repeat),
+        'compressed_load_ms': _time(lambda: save_format.loads(compressed), repeat)
+    }
+
+def main():
+    result = run()
+    print("存档格式基准测试:")
+    for name in ('json', 'binary', 'compressed'):
+        print(f"- {name}: {result[name + '_size'] / 1024:.1f}KB, "
+              f"保存 {result[name + '_save_ms']:.2f}ms, 加载 {result[name + '_load_ms']:.2f}ms")
+    # 压缩后的存档应明显小于JSON，且读写都在一帧预算之内
+    return (result['compressed_size'] < result['json_size'] / 4 and
+            result['compressed_save_ms'] < 1000.0 / 60 * 4 and
+            result['compressed_load_ms'] < 1000.0 / 60 * 4)
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
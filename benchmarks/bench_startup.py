@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+
+# 添加src目录到Python路径
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "src"))
+
+from startup_trace import REPORT_PREFIX, TRACE_ENV
+
+# 首帧时间预算（毫秒），无窗口驱动下测量
+FIRST_FRAME_BUDGET_MS = 3000
+# 首帧之前不应该创建的场景
+LAZY_SCENES = ("scene:shop", "scene:game")
+
+def run(repeat: int = 3) -> dict:
+    """在子进程中启动游戏，首帧显示后退出，返回最快一次的启动追踪结果"""
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env[TRACE_ENV] = "exit"
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, os.path.join("src", "main.py")], cwd=ROOT_DIR, env=env,
+                                capture_output=True, text=True, encoding='utf-8', timeout=60)
+        lines = [line for line in result.stdout.splitlines() if line.startswith(REPORT_PREFIX)]
+        if result.returncode != 0 or not lines:
+            raise RuntimeError(f"启动失败 (返回码 {result.returncode}):\n{result.stdout[-2000:]}{result.stderr[-2000:]}")
+        summary = json.loads(lines[-1][len(REPORT_PREFIX):])
+        if best is None or summary['marks']['first_frame'] < best['marks']['first_frame']:
+            best = summary
+    return best
+
+def main():
+    try:
+        summary = run()
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        print(f"启动基准测试失败: {e}")
+        return False
+    first_frame = summary['marks']['first_frame']
+    print("启动时间基准测试:")
+    print(f"- 首帧时间: {first_frame:.1f}ms (预算 {FIRST_FRAME_BUDGET_MS}ms)")
+    for category, value in sorted(summary['categories'].items()):
+        print(f"- {category} 合计: {value:.1f}ms")
+    for record in summary['top'][:5]:
+        print(f"  {record['self_ms']:8.2f}ms  [{record['category']}] {record['name']}")
+    eager = [name for name in LAZY_SCENES if name in summary['constructed']]
+    if eager:
+        print(f"首帧之前创建了场景: {', '.join(eager)}")
+    return first_frame < FIRST_FRAME_BUDGET_MS and not eager
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,35 @@
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# 导入所有基准测试
+from benchmarks import (bench_boss_bullets, bench_save, bench_audio_mixer, bench_audio_cache, bench_startup,
+                        bench_quality, bench_frame_pacing, bench_gc_pauses, bench_profiler)
+
+BENCHMARKS = [
+    bench_boss_bullets,
+    bench_save,
+    bench_audio_mixer,
+    bench_audio_cache,
+    bench_startup,
+    bench_quality,
+    bench_frame_pacing,
+    bench_gc_pauses,
+    bench_profiler,
+]
+
+def run_benchmarks():
+    """运行所有基准测试"""
+    all_passed = True
+    for bench in BENCHMARKS:
+        print(f"\n=== {bench.__name__} ===")
+        if not bench.main():
+            print(f"基准测试未达标: {bench.__name__}")
+            all_passed = False
+    return all_passed
+
+if __name__ == '__main__':
+    success = run_benchmarks()
+    sys.exit(0 if success else 1)
@@ -7,6 +7,31 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # 导入所有测试
 from tests.test_scenes import TestScenes
+from tests.test_bullet_patterns import TestBulletPatterns
+from tests.test_collision import TestCollision
+from tests.test_event_bus import TestEventBus
+from tests.test_audio_mixer import TestAudioMixer
+from tests.test_save_format import TestSaveFormat
+from tests.test_overlay import TestOverlay
+from tests.test_scene_manager import TestSceneManager
+from tests.test_input_manager import TestInputManager
+from tests.test_hit_test import TestHitTest
+from tests.test_widgets import TestWidgets
+from tests.test_layout import TestLayout
+from tests.test_shop import TestShop
+from tests.test_text_atlas import TestTextAtlas
+from tests.test_audio_cache import TestAudioCache
+from tests.test_asset_pack import TestAssetPack
+from tests.test_startup_trace import TestStartupTrace
+from tests.test_sprite_atlas import TestSpriteAtlas
+from tests.test_quality_governor import TestQualityGovernor
+from tests.test_frame_pacer import TestFramePacer
+from tests.test_perf_stats import TestPerfStats
+from tests.test_memory_telemetry import TestMemoryTelemetry
+from tests.test_gc_controller import TestGCController
+from tests.test_flight_recorder import TestFlightRecorder
+from tests.test_stall_watchdog import TestStallWatchdog
+from tests.test_sampling_profiler import TestSamplingProfiler
 
 def run_tests():
     """运行所有测试"""
@@ -18,6 +43,31 @@ def run_tests():
     
     # 添加测试类
     suite.addTests(loader.loadTestsFromTestCase(TestScenes))
+    suite.addTests(loader.loadTestsFromTestCase(TestBulletPatterns))
+    suite.addTests(loader.loadTestsFromTestCase(TestCollision))
+    suite.addTests(loader.loadTestsFromTestCase(TestEventBus))
+    suite.addTests(loader.loadTestsFromTestCase(TestAudioMixer))
+    suite.addTests(loader.loadTestsFromTestCase(TestSaveFormat))
+    suite.addTests(loader.loadTestsFromTestCase(TestOverlay))
+    suite.addTests(loader.loadTestsFromTestCase(TestSceneManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestInputManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestHitTest))
+    suite.addTests(loader.loadTestsFromTestCase(TestWidgets))
+    suite.addTests(loader.loadTestsFromTestCase(TestLayout))
+    suite.addTests(loader.loadTestsFromTestCase(TestShop))
+    suite.addTests(loader.loadTestsFromTestCase(TestTextAtlas))
+    suite.addTests(loader.loadTestsFromTestCase(TestAudioCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestAssetPack))
+    suite.addTests(loader.loadTestsFromTestCase(TestStartupTrace))
+    suite.addTests(loader.loadTestsFromTestCase(TestSpriteAtlas))
+    suite.addTests(loader.loadTestsFromTestCase(TestQualityGovernor))
+    suite.addTests(loader.loadTestsFromTestCase(TestFramePacer))
+    suite.addTests(loader.loadTestsFromTestCase(TestPerfStats))
+    suite.addTests(loader.loadTestsFromTestCase(TestMemoryTelemetry))
+    suite.addTests(loader.loadTestsFromTestCase(TestGCController))
+    suite.addTests(loader.loadTestsFromTestCase(TestFlightRecorder))
+    suite.addTests(loader.loadTestsFromTestCase(TestStallWatchdog))
+    suite.addTests(loader.loadTestsFromTestCase(TestSamplingProfiler))
     
     # 创建测试运行器
     runner = unittest.TextTestRunner(verbosity=2)
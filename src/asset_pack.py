@@ -0,0 +1,230 @@
+import io
+import json
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, List, Optional
+
+# 资源包：文件头 + 索引JSON + 按ALIGNMENT对齐的资源数据
+# 索引：资源名称 -> [偏移, 大小, 原始文件的修改时间（纳秒）]
+ASSET_ROOT = "assets"
+PACK_FILE = os.path.join(ASSET_ROOT, "assets.pak")
+MAGIC = b'GFPK'
+VERSION = 2
+HEADER = struct.Struct('<4sHI')  # magic, version, 索引长度
+ALIGNMENT = 16
+
+# 打包的资源类型
+PACKED_EXTENSIONS = ('.mp3', '.ogg', '.wav', '.ttc', '.ttf', '.otf', '.png', '.json', '.bin')
+
+def asset_name(path: str, root: str = ASSET_ROOT) -> str:
+    """把资源路径（assets/...）转换为资源包中的名称"""
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+def collect_assets(root: str = ASSET_ROOT) -> List[str]:
+    """收集需要打包的资源文件（按名称排序）"""
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            if name.endswith(PACKED_EXTENSIONS) and os.path.abspath(path) != os.path.abspath(PACK_FILE):
+                files.append(path)
+    return sorted(files, key=lambda path: asset_name(path, root))
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def pack(files: List[str], path: str = PACK_FILE, root: str = ASSET_ROOT) -> int:
+    """把资源文件打包，返回数据部分的字节数"""
+    # 索引中的偏移相对于数据区起点（索引之后按ALIGNMENT对齐）
+    index: Dict[str, List[int]] = {}
+    offset = 0
+    for file in files:
+        stat = os.stat(file)
+        size = stat.st_size
+        index[asset_name(file, root)] = [offset, size, stat.st_mtime_ns]
+        offset = _align(offset + size)
+    index_data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    data_start = _align(HEADER.size + len(index_data))
+
+    temp_file = path + ".tmp"
+    with open(temp_file, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, VERSION, len(index_data)))
+        out.write(index_data)
+        for file in files:
+            out.write(b'\0' * (data_start + index[asset_name(file, root)][0] - out.tell()))
+            with open(file, 'rb') as f:
+                out.write(f.read())
+    os.replace(temp_file, path)
+    return offset
+
+class AssetStream(io.RawIOBase):
+    """资源包中单个资源的只读流，直接读取内存映射，不复制整个资源"""
+    def __init__(self, view: memoryview):
+        super().__init__()
+        self.view = view
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), len(self.view) - self.position))
+        buffer[:count] = self.view[self.position:self.position + count]
+        self.position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+class AssetPack:
+    """内存映射的资源包，整个包只打开一次文件
+    
+    资源包是构建产物，原始文件修改后（大小或修改时间与索引不同）对应的条目过期，
+    读取时改为读取原始文件；原始文件不存在时（只发布资源包）使用资源包中的数据。
+    """
+    def __init__(self, path: str, root: str = ASSET_ROOT):
+        self.path = path
+        self.root = root
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_len = HEADER.unpack_from(self.data)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"资源包格式不匹配: {path}")
+            self.index: Dict[str, List[int]] = json.loads(
+                bytes(self.data[HEADER.size:HEADER.size + index_len]).decode('utf-8'))
+            self.data_start = _align(HEADER.size + index_len)
+        except Exception:
+            self.close()
+            raise
+        self.view = memoryview(self.data)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def fresh(self, name: str) -> bool:
+        """资源包中的条目是否与原始文件一致"""
+        _, size, mtime = self.index[name]
+        try:
+            stat = os.stat(os.path.join(self.root, *name.split('/')))
+        except OSError:
+            return True
+        return stat.st_size == size and stat.st_mtime_ns == mtime
+
+    def names(self, prefix: str = '') -> List[str]:
+        """列出指定前缀下的资源名称"""
+        return [name for name in self.index if name.startswith(prefix)]
+
+    def get(self, name: str) -> memoryview:
+        """获取资源数据（内存映射的切片，不复制）"""
+        offset, size, _ = self.index[name]
+        start = self.data_start + offset
+        return self.view[start:start + size]
+
+    def open(self, name: str) -> AssetStream:
+        """以只读流的形式打开资源"""
+        return AssetStream(self.get(name))
+
+    def close(self):
+        """关闭资源包（之前返回的数据切片随之失效）"""
+        try:
+            if getattr(self, 'view', None) is not None:
+                self.view.release()
+            if getattr(self, 'data', None) is not None:
+                self.data.close()
+        except BufferError:
+            # 仍有资源流在使用映射，交给垃圾回收处理
+            pass
+        self.view = None
+        self.data = None
+        self.file.close()
+
+    @classmethod
+    def load(cls, path: str = PACK_FILE, root: str = ASSET_ROOT) -> Optional['AssetPack']:
+        """打开资源包，不存在或损坏时返回None"""
+        if not os.path.exists(path):
+            return None
+        try:
+            asset_pack = cls(path, root)
+            print(f"加载资源包: {path} ({len(asset_pack.index)}个资源)")
+            return asset_pack
+        except (OSError, ValueError, struct.error) as e:
+            print(f"加载资源包失败 {path}: {e}")
+            return None
+
+# 默认资源包（首次使用时打开），不存在时直接读取资源文件
+_default_pack: Optional[AssetPack] = None
+_default_pack_loaded = False
+
+def default_pack() -> Optional[AssetPack]:
+    """获取默认资源包"""
+    global _default_pack, _default_pack_loaded
+    if not _default_pack_loaded:
+        _default_pack = AssetPack.load()
+        _default_pack_loaded = True
+    return _default_pack
+
+def set_default_pack(asset_pack: Optional[AssetPack]):
+    """替换默认资源包（None表示直接读取资源文件）"""
+    global _default_pack, _default_pack_loaded
+    _default_pack = asset_pack
+    _default_pack_loaded = True
+
+def _packed_name(path: str) -> Optional[str]:
+    """资源在默认资源包中的名称，不在资源包中或条目已过期时返回None"""
+    asset_pack = default_pack()
+    if asset_pack is None:
+        return None
+    name = asset_name(path)
+    if name in asset_pack and asset_pack.fresh(name):
+        return name
+    return None
+
+def asset_exists(path: str) -> bool:
+    """检查资源是否存在（资源包或文件）"""
+    return _packed_name(path) is not None or os.path.exists(path)
+
+def asset_size(path: str) -> Optional[int]:
+    """获取资源大小，不存在时返回None"""
+    name = _packed_name(path)
+    if name is not None:
+        return default_pack().index[name][1]
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+def open_asset(path: str) -> BinaryIO:
+    """打开资源，资源包中存在且未过期时返回内存映射的流，否则打开文件"""
+    name = _packed_name(path)
+    if name is not None:
+        return default_pack().open(name)
+    return open(path, 'rb')
+
+def list_assets(directory: str, extension: str) -> List[str]:
+    """列出目录中指定扩展名的资源路径（资源包和目录中的文件合并）"""
+    files = set()
+    asset_pack = default_pack()
+    if asset_pack is not None:
+        prefix = asset_name(directory) + '/'
+        files.update(name[len(prefix):] for name in asset_pack.names(prefix)
+                     if name.endswith(extension) and '/' not in name[len(prefix):])
+    if os.path.isdir(directory):
+        files.update(file for file in os.listdir(directory) if file.endswith(extension))
+    return [os.path.join(directory, file) for file in sorted(files)]
+
+def bake_main() -> bool:
+    """把assets目录打包成资源包（由bake_assets.py调用）"""
+    files = collect_assets()
+    total = pack(files)
+    print(f"已打包资源: {len(files)}个文件, {total / 1024:.1f}KB -> {PACK_FILE}")
+    return True
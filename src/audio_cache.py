@@ -0,0 +1,97 @@
+import hashlib
+import mmap
+import os
+import pygame
+from typing import Optional
+from asset_pack import open_asset
+
+# 解码后音频的缓存目录
+CACHE_DIR = os.path.join("cache", "audio")
+# 缓存文件名为 名称.键.pcm，键取哈希的前KEY_LENGTH位
+KEY_LENGTH = 16
+SUFFIX_LENGTH = KEY_LENGTH + len("..pcm")
+
+class AudioCache:
+    """解码后音频（PCM）的磁盘缓存
+    
+    缓存文件名包含源文件内容哈希和混音器参数，源文件修改或混音器参数变化后
+    自动使用新的缓存文件并删除同名音效的旧缓存。命中时通过内存映射读取PCM，
+    不再解码MP3。
+    """
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _file_hash(path: str) -> str:
+        """计算源文件内容的哈希"""
+        digest = hashlib.sha1()
+        with open_asset(path) as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def cache_path(self, path: str) -> Optional[str]:
+        """获取源文件对应的缓存文件路径，混音器未初始化时返回None"""
+        mixer = pygame.mixer.get_init()
+        if not mixer:
+            return None
+        frequency, size, channels = mixer
+        digest = hashlib.sha1(f"{self._file_hash(path)}|{frequency}|{size}|{channels}".encode()).hexdigest()
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{name}.{digest[:KEY_LENGTH]}.pcm")
+    
+    def _remove_stale(self, cache_file: str):
+        """删除同一音效的旧缓存文件"""
+        name = os.path.basename(cache_file)[:-SUFFIX_LENGTH]
+        for file in os.listdir(self.cache_dir):
+            stale = os.path.join(self.cache_dir, file)
+            if (file.endswith('.pcm') and stale != cache_file and
+                    file[:-SUFFIX_LENGTH] == name):
+                os.remove(stale)
+    
+    def load_sound(self, path: str) -> pygame.mixer.Sound:
+        """加载音效，优先从缓存中读取解码后的PCM"""
+        try:
+            cache_file = self.cache_path(path)
+        except OSError as e:
+            print(f"计算音频缓存键失败 {path}: {e}")
+            cache_file = None
+        if cache_file is None:
+            with open_asset(path) as f:
+                return pygame.mixer.Sound(f)
+        
+        if os.path.exists(cache_file) and os.path.getsize(cache_file) > 0:
+            try:
+                with open(cache_file, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        sound = pygame.mixer.Sound(buffer=data)
+                self.hits += 1
+                return sound
+            except (OSError, ValueError, pygame.error) as e:
+                print(f"读取音频缓存失败 {cache_file}: {e}")
+        
+        # 未命中：解码源文件并写入缓存
+        self.misses += 1
+        with open_asset(path) as f:
+            sound = pygame.mixer.Sound(f)
+        try:
+            if not os.path.exists(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            temp_file = cache_file + ".tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(sound.get_raw())
+            os.replace(temp_file, cache_file)
+            self._remove_stale(cache_file)
+        except OSError as e:
+            print(f"写入音频缓存失败 {cache_file}: {e}")
+        return sound
+    
+    def clear(self):
+        """删除所有缓存文件"""
+        if not os.path.exists(self.cache_dir):
+            return
+        for file in os.listdir(self.cache_dir):
+            if file.endswith('.pcm'):
+                os.remove(os.path.join(self.cache_dir, file))
@@ -0,0 +1,180 @@
+import pygame
+from typing import Callable, Dict, List, Optional
+
+class SoundPolicy:
+    """单个音效的播放策略"""
+    def __init__(self, max_voices: int = 2, priority: int = 1, cooldown: int = 0):
+        self.max_voices = max_voices  # 同时播放的最大声部数
+        self.priority = priority      # 优先级，数值越大越重要
+        self.cooldown = cooldown      # 两次播放的最小间隔（毫秒）
+
+# 默认音效策略，未列出的音效使用DEFAULT_POLICY
+DEFAULT_POLICY = SoundPolicy()
+SOUND_POLICIES: Dict[str, SoundPolicy] = {
+    'shoot': SoundPolicy(max_voices=3, priority=1, cooldown=50),
+    'hit': SoundPolicy(max_voices=4, priority=2, cooldown=40),
+    'collect': SoundPolicy(max_voices=2, priority=3, cooldown=60),
+    'levelup': SoundPolicy(max_voices=1, priority=5),
+    'boss_skill': SoundPolicy(max_voices=2, priority=8, cooldown=100),
+    'boss_appear': SoundPolicy(max_voices=1, priority=10)
+}
+
+class ChannelManager:
+    """混音通道管理器
+    
+    播放请求先在本帧内合并，每帧调用一次flush统一播放。播放时按音效
+    策略做冷却节流和声部数限制，通道不足时抢占优先级不高于新音效的最旧声部。
+    """
+    def __init__(self, num_channels: int = 16, policies: Optional[Dict[str, SoundPolicy]] = None,
+                 channels: Optional[List] = None, clock: Callable[[], int] = pygame.time.get_ticks):
+        self.policies = policies if policies is not None else SOUND_POLICIES
+        self.clock = clock  # 毫秒时钟
+        self.num_channels = 0
+        self.channels: List[pygame.mixer.Channel] = []
+        self.voice_names: List[Optional[str]] = []
+        self.voice_priorities: List[int] = []
+        self.voice_start_times: List[int] = []
+        
+        # 本帧的播放请求（音效名 -> 请求次数）
+        self.pending: Dict[str, int] = {}
+        self.last_play_times: Dict[str, int] = {}
+        
+        # 统计信息
+        self.stats = {
+            'requested': 0,
+            'played': 0,
+            'merged': 0,     # 同一帧内合并掉的重复请求
+            'throttled': 0,  # 冷却中被丢弃
+            'stolen': 0,     # 抢占其他声部
+            'dropped': 0     # 没有可用通道被丢弃
+        }
+        
+        if channels is not None:
+            self._use_channels(channels)
+        else:
+            self._allocate_channels(num_channels)
+    
+    def _allocate_channels(self, num_channels: int):
+        """分配混音通道"""
+        if not pygame.mixer.get_init():
+            return
+        pygame.mixer.set_num_channels(num_channels)
+        self._use_channels([pygame.mixer.Channel(i) for i in range(num_channels)])
+    
+    def _use_channels(self, channels: List):
+        """使用给定的通道（需要提供play/get_busy/stop）"""
+        num_channels = len(channels)
+        self.num_channels = num_channels
+        self.channels = list(channels)
+        self.voice_names = [None] * num_channels
+        self.voice_priorities = [0] * num_channels
+        self.voice_start_times = [0] * num_channels
+    
+    def get_policy(self, name: str) -> SoundPolicy:
+        """获取音效的播放策略"""
+        return self.policies.get(name, DEFAULT_POLICY)
+    
+    def request(self, name: str):
+        """请求播放音效（在flush时统一处理）"""
+        self.stats['requested'] += 1
+        if name in self.pending:
+            self.pending[name] += 1
+            self.stats['merged'] += 1
+        else:
+            self.pending[name] = 1
+    
+    def flush(self, sounds: Dict[str, pygame.mixer.Sound]):
+        """处理本帧所有播放请求，高优先级音效先分配通道"""
+        if not self.pending:
+            return
+        if not self.channels:
+            self.pending.clear()
+            return
+        
+        now = self.clock()
+        names = sorted(self.pending, key=lambda n: self.get_policy(n).priority, reverse=True)
+        self.pending.clear()
+        
+        for name in names:
+            sound = sounds.get(name)
+            if sound is None:
+                continue
+            policy = self.get_policy(name)
+            
+            # 冷却节流
+            last_time = self.last_play_times.get(name)
+            if last_time is not None and now - last_time < policy.cooldown:
+                self.stats['throttled'] += 1
+                continue
+            
+            channel_index = self._find_channel(name, policy)
+            if channel_index is None:
+                self.stats['dropped'] += 1
+                continue
+            
+            try:
+                self.channels[channel_index].play(sound)
+            except pygame.error as e:
+                print(f"无法播放音效 {name}: {e}")
+                continue
+            
+            self.voice_names[channel_index] = name
+            self.voice_priorities[channel_index] = policy.priority
+            self.voice_start_times[channel_index] = now
+            self.last_play_times[name] = now
+            self.stats['played'] += 1
+    
+    def _find_channel(self, name: str, policy: SoundPolicy) -> Optional[int]:
+        """为音效选择通道，必要时抢占已有声部"""
+        free_index = None
+        oldest_same = None
+        same_count = 0
+        steal_index = None
+        
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                self.voice_names[i] = None
+                if free_index is None:
+                    free_index = i
+                continue
+            
+            start_time = self.voice_start_times[i]
+            if self.voice_names[i] == name:
+                same_count += 1
+                if oldest_same is None or start_time < self.voice_start_times[oldest_same]:
+                    oldest_same = i
+            elif self.voice_priorities[i] <= policy.priority:
+                # 优先抢占优先级最低的声部，同优先级时抢占最旧的
+                if (steal_index is None or
+                        self.voice_priorities[i] < self.voice_priorities[steal_index] or
+                        (self.voice_priorities[i] == self.voice_priorities[steal_index] and
+                         start_time < self.voice_start_times[steal_index])):
+                    steal_index = i
+        
+        # 声部数已满时复用同名音效最旧的声部
+        if same_count >= policy.max_voices:
+            self.stats['stolen'] += 1
+            return oldest_same
+        
+        if free_index is not None:
+            return free_index
+        
+        if steal_index is not None:
+            self.stats['stolen'] += 1
+            return steal_index
+        return None
+    
+    def active_voices(self, name: Optional[str] = None) -> int:
+        """获取正在播放的声部数量"""
+        count = 0
+        for i, channel in enumerate(self.channels):
+            if channel.get_busy() and (name is None or self.voice_names[i] == name):
+                count += 1
+        return count
+    
+    def stop_all(self):
+        """停止所有声部"""
+        for i, channel in enumerate(self.channels):
+            channel.stop()
+            self.voice_names[i] = None
+        self.pending.clear()
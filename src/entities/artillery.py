@@ -1,9 +1,15 @@
 from .player import Player
+from .sprite_atlas import ENTITY_ROTATIONS, circle_size, circle_sprite, sprite_atlas
+from memory_telemetry import memory_telemetry
 import pygame
 import math
 from typing import List, Optional
 
+sprite_atlas.register("artillery_shell", circle_size(5), circle_sprite((255, 50, 50), 5))
+
 class Bullet:
+    sprite_name = "artillery_shell"
+    
     def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, damage: float):
         self.x = x
         self.y = y
@@ -18,12 +24,33 @@ class Bullet:
         """更新子弹位置"""
         self.x += self.dx * self.speed
         self.y += self.dy * self.speed
+
+def draw_artillery_sprite(image: pygame.Surface):
+    """炮兵精灵"""
+    width, height = image.get_size()
+    
+    # 绘制一个红色正方形
+    center = (width // 2, height // 2)
+    size = min(width, height) - 4
+    rect = pygame.Rect(
+        center[0] - size // 2,
+        center[1] - size // 2,
+        size,
+        size
+    )
+    
+    pygame.draw.rect(image, (200, 50, 50), rect)
+    pygame.draw.rect(image, (255, 100, 100), rect, 2)
     
-    def render(self, screen: pygame.Surface):
-        """渲染子弹"""
-        pygame.draw.circle(screen, (255, 50, 50), (int(self.x), int(self.y)), self.radius)
+    # 绘制一个小圆表示炮口
+    muzzle_pos = (center[0] + size // 2 - 2, center[1])
+    pygame.draw.circle(image, (255, 150, 150), muzzle_pos, 4)
+
+sprite_atlas.register("artillery", (40, 40), draw_artillery_sprite, ENTITY_ROTATIONS)
 
 class Artillery(Player):
+    sprite_name = "artillery"
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y)
         
@@ -43,32 +70,6 @@ class Artillery(Player):
         self.skill_duration = 0.5
         self.skill_damage_bonus = 2.0  # 技能期间伤害翻倍
         self.skill_end_time: Optional[int] = None
-        
-        # 创建炮兵图像
-        self._create_artillery_image()
-    
-    def _create_artillery_image(self):
-        """创建炮兵的几何图形图像"""
-        image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # 绘制一个红色正方形
-        center = (self.width // 2, self.height // 2)
-        size = min(self.width, self.height) - 4
-        rect = pygame.Rect(
-            center[0] - size // 2,
-            center[1] - size // 2,
-            size,
-            size
-        )
-        
-        pygame.draw.rect(image, (200, 50, 50), rect)
-        pygame.draw.rect(image, (255, 100, 100), rect, 2)
-        
-        # 绘制一个小圆表示炮口
-        muzzle_pos = (center[0] + size // 2 - 2, center[1])
-        pygame.draw.circle(image, (255, 150, 150), muzzle_pos, 4)
-        
-        self.set_image(image)
     
     def update(self):
         """更新炮兵状态"""
@@ -125,14 +126,6 @@ class Artillery(Player):
         self.add_attribute_bonus("damage_bonus", -self.skill_damage_bonus)
         self.skill_end_time = None
     
-    def render(self, screen: pygame.Surface):
-        """渲染炮兵和子弹"""
-        super().render(screen)
-        
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
-    
     def level_up(self):
         """升级效果"""
         super().level_up()
@@ -141,4 +134,7 @@ class Artillery(Player):
         self.max_health += 6
         self.health = self.max_health
         self.damage += 4
-        self.attack_speed += 0.05 
\ No newline at end of file
+        self.attack_speed += 0.05 
+
+# 炮弹是本模块的独立类（不是entities.bullet.Bullet），需要单独登记
+memory_telemetry.watch("bullets", Bullet)
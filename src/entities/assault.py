@@ -1,10 +1,36 @@
 from .player import Player
+from .sprite_atlas import ENTITY_ROTATIONS, sprite_atlas
 from .bullet import PlayerBullet
 import pygame
 import math
 from typing import List, Optional
 
+def draw_assault_sprite(image: pygame.Surface):
+    """突击手精灵"""
+    width, height = image.get_size()
+    
+    # 绘制一个橙色三角形
+    center = (width // 2, height // 2)
+    radius = min(width, height) // 2 - 2
+    points = []
+    for i in range(3):
+        angle = math.pi * 2 / 3 * i - math.pi / 2
+        x = center[0] + radius * math.cos(angle)
+        y = center[1] + radius * math.sin(angle)
+        points.append((x, y))
+    
+    pygame.draw.polygon(image, (255, 165, 0), points)
+    pygame.draw.polygon(image, (255, 200, 0), points, 2)
+    
+    # 绘制一个小圆表示炮口
+    muzzle_pos = (center[0], center[1] - radius + 4)
+    pygame.draw.circle(image, (255, 220, 0), muzzle_pos, 3)
+
+sprite_atlas.register("assault", (40, 40), draw_assault_sprite, ENTITY_ROTATIONS)
+
 class Assault(Player):
+    sprite_name = "assault"
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y)
         
@@ -24,40 +50,6 @@ class Assault(Player):
         self.skill_duration = 1.0
         self.skill_speed_bonus = 2.0  # 技能期间速度翻倍
         self.skill_end_time: Optional[int] = None
-        
-        # 创建突击手图像
-        self._create_assault_image()
-    
-    def _create_assault_image(self):
-        """创建突击手的几何图形图像"""
-        try:
-            # 创建一个带有透明度的表面
-            image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            
-            # 绘制一个橙色三角形
-            center = (self.width // 2, self.height // 2)
-            radius = min(self.width, self.height) // 2 - 2
-            points = []
-            for i in range(3):
-                angle = math.pi * 2 / 3 * i - math.pi / 2
-                x = center[0] + radius * math.cos(angle)
-                y = center[1] + radius * math.sin(angle)
-                points.append((x, y))
-            
-            pygame.draw.polygon(image, (255, 165, 0), points)
-            pygame.draw.polygon(image, (255, 200, 0), points, 2)
-            
-            # 绘制一个小圆表示炮口
-            muzzle_pos = (center[0], center[1] - radius + 4)
-            pygame.draw.circle(image, (255, 220, 0), muzzle_pos, 3)
-            
-            self.set_image(image)
-            print(f"为突击手 {self.__class__.__name__} 创建图像")
-        
-        except Exception as e:
-            print(f"创建突击手图像时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
     
     def update(self):
         """更新突击手状态"""
@@ -115,15 +107,6 @@ class Assault(Player):
         self.add_attribute_bonus("speed_bonus", -self.skill_speed_bonus)
         self.skill_end_time = None
     
-    def render(self, screen: pygame.Surface):
-        """渲染突击手和子弹"""
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
-        
-        # 渲染突击手
-        super().render(screen)
-    
     def level_up(self):
         """升级效果"""
         super().level_up()
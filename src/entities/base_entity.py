@@ -1,8 +1,28 @@
 import pygame
-from typing import Tuple, Optional
+from typing import Tuple
 import math
+from .sprite_atlas import ENTITY_ROTATIONS, SpriteBatch, sprite_atlas
+
+def draw_default_sprite(image: pygame.Surface):
+    """默认精灵：三角形"""
+    width, height = image.get_size()
+    points = [
+        (width * 0.2, height * 0.8),  # 左下
+        (width * 0.8, height * 0.8),  # 右下
+        (width * 0.5, height * 0.2)   # 顶部
+    ]
+    pygame.draw.polygon(image, (255, 255, 255), points)
+    pygame.draw.polygon(image, (200, 200, 200), points, 2)  # 边框
+
+sprite_atlas.register("entity", (40, 40), draw_default_sprite, ENTITY_ROTATIONS)
 
 class BaseEntity:
+    # 碰撞形状：'aabb' 或 'circle'
+    collision_shape = 'aabb'
+    # 图集中的精灵名称和渲染图层
+    sprite_name = "entity"
+    sprite_layer = 'enemies'
+    
     def __init__(self, x: float, y: float, width: int, height: int):
         self.x = x
         self.y = y
@@ -11,8 +31,6 @@ class BaseEntity:
         self.velocity_x = 0
         self.velocity_y = 0
         self.rotation = 0  # 角度，0表示朝右
-        self.original_image: Optional[pygame.Surface] = None
-        self.image: Optional[pygame.Surface] = None
         self.rect = pygame.Rect(
             x - width // 2,
             y - height // 2,
@@ -20,32 +38,6 @@ class BaseEntity:
             height
         )
         self.color = (255, 255, 255)  # 默认颜色为白色
-        
-        # 创建默认图像
-        self._create_default_image()
-    
-    def _create_default_image(self):
-        """创建默认图像"""
-        try:
-            # 创建一个带有透明度的表面
-            image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            
-            # 绘制一个三角形作为默认图像
-            points = [
-                (self.width * 0.2, self.height * 0.8),  # 左下
-                (self.width * 0.8, self.height * 0.8),  # 右下
-                (self.width * 0.5, self.height * 0.2)   # 顶部
-            ]
-            pygame.draw.polygon(image, self.color, points)
-            pygame.draw.polygon(image, (200, 200, 200), points, 2)  # 边框
-            
-            self.set_image(image)
-            print(f"为实体 {self.__class__.__name__} 创建默认图像")
-        
-        except Exception as e:
-            print(f"创建默认图像时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
     
     def move(self, dx: float, dy: float):
         """移动实体"""
@@ -61,41 +53,9 @@ class BaseEntity:
         self.rect.centerx = int(x)
         self.rect.centery = int(y)
     
-    def set_image(self, image: pygame.Surface):
-        """设置实体图像"""
-        try:
-            self.original_image = image
-            self.image = image
-            # 更新图像大小以匹配实体大小
-            if self.original_image:
-                self.original_image = pygame.transform.scale(
-                    self.original_image, 
-                    (self.width, self.height)
-                )
-                self.image = self.original_image
-                print(f"实体 {self.__class__.__name__} 图像已设置和缩放")
-        except Exception as e:
-            print(f"设置图像时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
-    
     def set_rotation(self, angle: float):
-        """设置实体旋转角度"""
-        try:
-            self.rotation = angle
-            if self.original_image:
-                # 保存当前中心点
-                center = self.rect.center
-                # 旋转图像
-                self.image = pygame.transform.rotate(self.original_image, -angle)
-                # 获取新的矩形
-                self.rect = self.image.get_rect()
-                # 保持中心点不变
-                self.rect.center = center
-        except Exception as e:
-            print(f"设置旋转角度时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
+        """设置实体旋转角度（渲染时使用图集中最接近的预旋转帧）"""
+        self.rotation = angle
     
     def get_position(self) -> Tuple[float, float]:
         """获取实体位置"""
@@ -114,26 +74,21 @@ class BaseEntity:
         """更新实体状态"""
         self.move(self.velocity_x, self.velocity_y)
     
+    def queue_sprites(self, batch: SpriteBatch):
+        """把实体（以及子弹等附属物）的精灵加入批量渲染"""
+        batch.add(self.sprite_layer, self.sprite_name, self.rect.centerx, self.rect.centery, self.rotation)
+    
+    def render_overlay(self, screen: pygame.Surface):
+        """绘制精灵之上的动态内容（血条、冷却指示等）"""
+        pass
+    
     def render(self, screen: pygame.Surface):
-        """渲染实体"""
+        """单独渲染实体（场景中由SpriteBatch统一批量渲染）"""
         try:
-            if self.image:
-                screen.blit(self.image, self.rect)
-            else:
-                # 如果没有图像，绘制一个矩形作为占位符
-                pygame.draw.rect(screen, self.color, self.rect)
-                # 绘制一个箭头表示朝向
-                center_x, center_y = self.get_center()
-                direction_x, direction_y = self.get_direction()
-                end_x = center_x + direction_x * (self.width / 2)
-                end_y = center_y + direction_y * (self.height / 2)
-                pygame.draw.line(
-                    screen,
-                    (255, 0, 0),
-                    (center_x, center_y),
-                    (end_x, end_y),
-                    2
-                )
+            batch = SpriteBatch()
+            self.queue_sprites(batch)
+            batch.flush(screen, batch.layers.keys())
+            self.render_overlay(screen)
         except Exception as e:
             print(f"渲染实体时发生错误: {e}")
             import traceback
@@ -1,10 +1,43 @@
 import pygame
 import math
 import random
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from .enemy import Enemy
 from .character import Character
 from .geometric_enemies import TriangleEnemy, CircleEnemy, SquareEnemy
+from .bullet_patterns import BossBulletPool, BulletPattern, compile_pattern
+from .sprite_atlas import SpriteBatch, sprite_atlas
+from event_bus import CombatEvent
+from quality_governor import quality
+
+def draw_boss_sprite(image: pygame.Surface):
+    """Boss精灵：红色十二角星"""
+    width, height = image.get_size()
+    points = []
+    num_points = 12
+    inner_radius = width * 0.3
+    outer_radius = width * 0.5
+    
+    for i in range(num_points * 2):
+        angle = math.pi * i / num_points
+        radius = outer_radius if i % 2 == 0 else inner_radius
+        points.append((
+            width / 2 + radius * math.cos(angle),
+            height / 2 + radius * math.sin(angle)
+        ))
+    
+    pygame.draw.polygon(image, (255, 0, 0), points)
+
+sprite_atlas.register("boss", (60, 60), draw_boss_sprite)
+
+# Boss弹幕模式描述，speed为None时使用Boss的子弹速度，interval单位为帧
+BOSS_PATTERN_SPECS: Dict[str, Dict] = {
+    'spiral': {'type': 'spiral', 'arms': 3, 'step': 0.2, 'interval': 1},
+    'rain': {'type': 'rain', 'lanes': 32, 'interval': 10},
+    'targeted': {'type': 'aimed_fan', 'count': 1, 'interval': 5},
+    'fan': {'type': 'aimed_fan', 'count': 5, 'spread': 15, 'interval': 20},
+    'ring': {'type': 'ring', 'count': 24, 'interval': 45}
+}
 
 class BossPhase:
     """Boss战斗阶段基类"""
@@ -33,14 +66,25 @@ class BossPhase:
         self.is_active = False
 
 class AttackPhase(BossPhase):
-    """攻击阶段：发射多种类型的子弹"""
+    """攻击阶段：按数据描述的弹幕模式批量发射子弹"""
     def __init__(self, boss: 'BossEnemy'):
         super().__init__(boss)
-        self.attack_patterns = ['spiral', 'rain', 'targeted']
+        self.patterns: Dict[str, BulletPattern] = {
+            name: compile_pattern(spec, boss.bullet_speed, boss.arena_width)
+            for name, spec in BOSS_PATTERN_SPECS.items()
+        }
+        self.attack_patterns = list(self.patterns.keys())
         self.current_pattern = 'spiral'
         self.pattern_timer = 0
         self.pattern_interval = 5000  # 每5秒切换一次攻击模式
-        self.spiral_angle = 0
+        self.frame = 0
+    
+    def start(self):
+        """开始攻击阶段"""
+        super().start()
+        self.frame = 0
+        for pattern in self.patterns.values():
+            pattern.reset()
     
     def update(self):
         """更新攻击阶段"""
@@ -56,33 +100,15 @@ class AttackPhase(BossPhase):
             self.pattern_timer = current_time
         
         # 执行攻击
-        if self.current_pattern == 'spiral':
-            self._spiral_attack()
-        elif self.current_pattern == 'rain':
-            self._rain_attack()
-        else:
-            self._targeted_attack()
-    
-    def _spiral_attack(self):
-        """螺旋形攻击"""
-        for i in range(3):
-            angle = self.spiral_angle + i * (2 * math.pi / 3)
-            dx = math.cos(angle)
-            dy = math.sin(angle)
-            self.boss.shoot(dx, dy)
-        self.spiral_angle += 0.2
-    
-    def _rain_attack(self):
-        """从天而降的攻击"""
-        if random.random() < 0.1:  # 10%概率发射
-            x = random.uniform(0, 800)  # 假设屏幕宽度为800
-            self.boss.shoot(0, 1, start_x=x, start_y=0)
-    
-    def _targeted_attack(self):
-        """追踪玩家的攻击"""
-        if self.boss.target and random.random() < 0.2:  # 20%概率发射
-            direction = self.boss.get_direction_to_target()
-            self.boss.shoot(direction[0], direction[1])
+        target = self.boss.target.get_center() if self.boss.target else None
+        self.patterns[self.current_pattern].update(
+            self.boss.bullet_pool,
+            self.frame,
+            self.boss.get_center(),
+            target,
+            self.boss.get_damage()
+        )
+        self.frame += 1
 
 class SummonPhase(BossPhase):
     """召唤阶段：召唤小怪并增强它们"""
@@ -101,7 +127,7 @@ class SummonPhase(BossPhase):
         
         current_time = pygame.time.get_ticks()
         if (current_time - self.summon_timer >= self.summon_interval and 
-            len(self.boss.minions) < self.max_minions):
+            len(self.boss.minions) < quality.tier.spawn_cap(self.max_minions)):
             self._summon_minion()
             self.summon_timer = current_time
     
@@ -155,7 +181,12 @@ class ShieldPhase(BossPhase):
 
 class BossEnemy(Enemy):
     """Boss敌人，具有多个战斗阶段和复杂的攻击模式"""
-    def __init__(self, x: float, y: float, target: Optional[Character] = None):
+    sprite_name = "boss"
+    has_health_bar = False  # 使用更宽的Boss血条
+    
+    def __init__(self, x: float, y: float, target: Optional[Character] = None,
+                 bullet_pool: Optional[BossBulletPool] = None,
+                 arena_size: Tuple[int, int] = (1280, 720)):
         super().__init__(x, y, target)
         
         # Boss属性
@@ -171,9 +202,17 @@ class BossEnemy(Enemy):
         
         # 战斗相关
         self.is_vulnerable = True
-        self.bullets: List['BossBullet'] = []
         self.minions: List[Enemy] = []
         self.bullet_speed = 6.0
+        self.arena_width, self.arena_height = arena_size
+        
+        # 子弹池（可由场景提供共享池）
+        self.owns_bullet_pool = bullet_pool is None
+        if bullet_pool is None:
+            bullet_pool = BossBulletPool(bounds=(-50, -50,
+                                                 self.arena_width + 50,
+                                                 self.arena_height + 50))
+        self.bullet_pool = bullet_pool
         
         # 阶段系统
         self.phases = {
@@ -203,11 +242,9 @@ class BossEnemy(Enemy):
         else:
             self._switch_phase()
         
-        # 更新子弹
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if not bullet.is_active:
-                self.bullets.remove(bullet)
+        # 更新子弹（共享池由场景统一更新）
+        if self.owns_bullet_pool:
+            self.bullet_pool.update()
         
         # 更新小怪
         for minion in self.minions[:]:
@@ -215,6 +252,11 @@ class BossEnemy(Enemy):
             if not minion.is_alive:
                 self.minions.remove(minion)
     
+    def set_bullet_pool(self, pool: BossBulletPool):
+        """使用场景提供的共享子弹池"""
+        self.bullet_pool = pool
+        self.owns_bullet_pool = False
+    
     def _switch_phase(self):
         """切换到新的战斗阶段"""
         available_phases = [p for p in self.phases.keys() 
@@ -232,66 +274,59 @@ class BossEnemy(Enemy):
             reflected = self.phases['shield'].take_damage(amount)
             if reflected > 0 and self.target:
                 self.target.take_damage(reflected)
+                if self.event_queue:
+                    self.event_queue.push(CombatEvent.HIT, self.target, self, reflected)
             return
         
         super().take_damage(amount)
     
     def shoot(self, dx: float, dy: float, start_x: Optional[float] = None, 
              start_y: Optional[float] = None):
-        """发射子弹"""
+        """发射单发子弹"""
         if start_x is None or start_y is None:
             start_x, start_y = self.get_center()
         
-        bullet = BossBullet(
+        self.bullet_pool.spawn(
             start_x,
             start_y,
-            dx,
-            dy,
-            self.bullet_speed,
+            dx * self.bullet_speed,
+            dy * self.bullet_speed,
             self.get_damage()
         )
-        self.bullets.append(bullet)
     
-    def render(self, screen: pygame.Surface):
-        """渲染Boss、子弹和小怪"""
-        # 渲染小怪
+    def queue_sprites(self, batch: SpriteBatch):
+        """加入小怪、子弹和Boss本体的精灵"""
         for minion in self.minions:
-            minion.render(screen)
-        
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
+            minion.queue_sprites(batch)
         
-        # 渲染Boss本体（十字星形状）
-        center_x, center_y = self.get_center()
+        # 共享子弹池由场景统一渲染
+        if self.owns_bullet_pool:
+            self.bullet_pool.queue_sprites(batch)
         
-        # 绘制主体
-        points = []
-        num_points = 12
-        inner_radius = self.width * 0.3
-        outer_radius = self.width * 0.5
-        
-        for i in range(num_points * 2):
-            angle = math.pi * i / num_points
-            radius = outer_radius if i % 2 == 0 else inner_radius
-            points.append((
-                center_x + radius * math.cos(angle),
-                center_y + radius * math.sin(angle)
-            ))
+        super().queue_sprites(batch)
+    
+    def render_overlay(self, screen: pygame.Surface):
+        """绘制小怪的血条、护盾效果和Boss血条"""
+        for minion in self.minions:
+            minion.render_overlay(screen)
         
-        pygame.draw.polygon(screen, self.color, points)
+        center_x, center_y = self.rect.center
         
         # 如果在护盾阶段，绘制护盾效果
         if self.current_phase == 'shield' and not self.is_vulnerable:
             shield = self.phases['shield']
             shield_radius = self.width * 0.7
-            shield_surface = pygame.Surface((shield_radius * 2, shield_radius * 2), 
-                                         pygame.SRCALPHA)
-            alpha = int(255 * (shield.shield_health / shield.max_shield_health))
-            pygame.draw.circle(shield_surface, (100, 200, 255, alpha),
-                             (shield_radius, shield_radius), shield_radius)
-            screen.blit(shield_surface, 
-                       (center_x - shield_radius, center_y - shield_radius))
+            if quality.tier.shield_effect:
+                shield_surface = pygame.Surface((shield_radius * 2, shield_radius * 2), 
+                                             pygame.SRCALPHA)
+                alpha = int(255 * (shield.shield_health / shield.max_shield_health))
+                pygame.draw.circle(shield_surface, (100, 200, 255, alpha),
+                                 (shield_radius, shield_radius), shield_radius)
+                screen.blit(shield_surface, 
+                           (center_x - shield_radius, center_y - shield_radius))
+            else:
+                # 低画质：只绘制护盾轮廓，不创建半透明表面
+                pygame.draw.circle(screen, (100, 200, 255), (center_x, center_y), shield_radius, 2)
         
         # 绘制血条
         health_width = int(self.width * 1.5)
@@ -307,39 +342,3 @@ class BossEnemy(Enemy):
         current_health_width = int(health_width * (self.health / self.max_health))
         pygame.draw.rect(screen, (255, 0, 0),
                         pygame.Rect(health_x, health_y, current_health_width, health_height))
-
-class BossBullet:
-    def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, damage: float):
-        self.x = x
-        self.y = y
-        self.dx = dx
-        self.dy = dy
-        self.speed = speed
-        self.damage = damage
-        self.size = 6
-        self.is_active = True
-        self.rotation = 0
-        self.rotation_speed = 10
-    
-    def update(self):
-        """更新子弹位置和旋转"""
-        self.x += self.dx * self.speed
-        self.y += self.dy * self.speed
-        self.rotation += self.rotation_speed
-    
-    def render(self, screen: pygame.Surface):
-        """渲染子弹（旋转的十字）"""
-        center = (int(self.x), int(self.y))
-        
-        # 计算旋转后的四个端点
-        points = []
-        for i in range(4):
-            angle = math.radians(self.rotation + i * 90)
-            points.append((
-                self.x + self.size * math.cos(angle),
-                self.y + self.size * math.sin(angle)
-            ))
-        
-        # 绘制两条交叉的线
-        pygame.draw.line(screen, (255, 0, 0), points[0], points[2], 3)
-        pygame.draw.line(screen, (255, 0, 0), points[1], points[3], 3) 
\ No newline at end of file
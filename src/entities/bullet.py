@@ -1,9 +1,42 @@
 import pygame
 import math
 from typing import Optional, Tuple
+from .sprite_atlas import circle_size, circle_sprite, diamond_sprite, fill_sprite, sprite_atlas
+from memory_telemetry import memory_telemetry
+
+def draw_boss_cross(image: pygame.Surface):
+    """Boss子弹：十字（旋转由图集预生成）"""
+    width, height = image.get_size()
+    center = width / 2
+    size = 6
+    points = []
+    for i in range(4):
+        angle = math.radians(i * 90)
+        points.append((
+            center + size * math.cos(angle),
+            center + size * math.sin(angle)
+        ))
+    
+    # 绘制两条交叉的线
+    pygame.draw.line(image, (255, 0, 0), points[0], points[2], 2)
+    pygame.draw.line(image, (255, 0, 0), points[1], points[3], 2)
+
+# 子弹精灵（名称与子弹类型对应）
+sprite_atlas.register("bullet", circle_size(4), circle_sprite((255, 255, 255), 4))
+sprite_atlas.register("bullet_soldier", circle_size(3), circle_sprite((255, 255, 0), 3))
+sprite_atlas.register("bullet_assault", (5, 5), diamond_sprite((255, 165, 0)))
+sprite_atlas.register("bullet_artillery", circle_size(5), circle_sprite((255, 50, 50), 5, (255, 200, 200)))
+sprite_atlas.register("bullet_tracking", (4, 4), fill_sprite((200, 255, 200)))
+sprite_atlas.register("bullet_spread", circle_size(3), circle_sprite((200, 200, 255), 3))
+sprite_atlas.register("bullet_boss", (16, 16), draw_boss_cross, rotations=9, period=90.0)
+# 低画质时使用的简化子弹
+sprite_atlas.register_simple("bullet_artillery", circle_size(3), circle_sprite((255, 50, 50), 3))
+sprite_atlas.register_simple("bullet_boss", (5, 5), fill_sprite((255, 0, 0)))
 
 class Bullet:
     """子弹基类"""
+    sprite_name = "bullet"
+    
     def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, damage: float):
         self.x = x
         self.y = y
@@ -15,21 +48,16 @@ class Bullet:
         self.is_active = True
         self.color = (255, 255, 255)  # 默认白色
     
+    @property
+    def radius(self) -> float:
+        """碰撞半径"""
+        return self.size
+    
     def update(self):
         """更新子弹位置"""
         self.x += self.dx * self.speed
         self.y += self.dy * self.speed
     
-    def render(self, screen: pygame.Surface):
-        """渲染子弹"""
-        try:
-            # 默认渲染一个圆形
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-        except Exception as e:
-            print(f"渲染子弹时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
-
 class PlayerBullet(Bullet):
     """玩家子弹"""
     def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, damage: float, 
@@ -38,6 +66,8 @@ class PlayerBullet(Bullet):
         self.bullet_type = bullet_type
         
         # 根据子弹类型设置属性
+        if bullet_type in ("soldier", "assault", "artillery"):
+            self.sprite_name = f"bullet_{bullet_type}"
         if bullet_type == "soldier":
             self.color = (255, 255, 0)  # 黄色
             self.size = 3
@@ -48,30 +78,6 @@ class PlayerBullet(Bullet):
             self.color = (255, 50, 50)  # 红色
             self.size = 5
     
-    def render(self, screen: pygame.Surface):
-        """渲染玩家子弹"""
-        try:
-            if self.bullet_type == "artillery":
-                # 炮兵子弹是一个大圆
-                pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-                pygame.draw.circle(screen, (255, 200, 200), (int(self.x), int(self.y)), self.size - 1)
-            elif self.bullet_type == "assault":
-                # 突击手子弹是一个小菱形
-                points = [
-                    (self.x, self.y - self.size),  # 上
-                    (self.x + self.size, self.y),  # 右
-                    (self.x, self.y + self.size),  # 下
-                    (self.x - self.size, self.y)   # 左
-                ]
-                pygame.draw.polygon(screen, self.color, points)
-            else:
-                # 士兵子弹是一个小圆
-                super().render(screen)
-        except Exception as e:
-            print(f"渲染玩家子弹时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
-
 class EnemyBullet(Bullet):
     """敌人子弹"""
     def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, damage: float,
@@ -83,6 +89,8 @@ class EnemyBullet(Bullet):
         self.rotation = 0      # 旋转角度
         
         # 根据子弹类型设置属性
+        if bullet_type in ("tracking", "spread", "boss"):
+            self.sprite_name = f"bullet_{bullet_type}"
         if bullet_type == "tracking":
             self.color = (200, 255, 200)  # 追踪子弹是绿色
             self.size = 4
@@ -124,42 +132,5 @@ class EnemyBullet(Bullet):
         
         # 更新位置
         super().update()
-    
-    def render(self, screen: pygame.Surface):
-        """渲染敌人子弹"""
-        try:
-            if self.bullet_type == "tracking":
-                # 追踪子弹是一个方块
-                rect = pygame.Rect(self.x - self.size/2, self.y - self.size/2, 
-                                self.size, self.size)
-                pygame.draw.rect(screen, self.color, rect)
-            
-            elif self.bullet_type == "spread":
-                # 散射子弹是一个圆形
-                super().render(screen)
-            
-            elif self.bullet_type == "boss":
-                # Boss子弹是一个旋转的十字
-                center = (int(self.x), int(self.y))
-                
-                # 计算旋转后的四个端点
-                points = []
-                for i in range(4):
-                    angle = math.radians(self.rotation + i * 90)
-                    points.append((
-                        self.x + self.size * math.cos(angle),
-                        self.y + self.size * math.sin(angle)
-                    ))
-                
-                # 绘制两条交叉的线
-                pygame.draw.line(screen, self.color, points[0], points[2], 2)
-                pygame.draw.line(screen, self.color, points[1], points[3], 2)
-            
-            else:
-                # 默认子弹是一个小圆
-                super().render(screen)
-        
-        except Exception as e:
-            print(f"渲染敌人子弹时发生错误: {e}")
-            import traceback
-            traceback.print_exc() 
\ No newline at end of file
+
+memory_telemetry.watch("bullets", Bullet)
@@ -0,0 +1,314 @@
+import pygame
+import math
+import random
+from typing import Dict, Any, List, Optional, Tuple
+from .sprite_atlas import SpriteBatch, fill_sprite, sprite_atlas
+from memory_telemetry import memory_telemetry
+
+# Boss弹幕外观
+BOSS_BULLET_SIZE = 6
+BOSS_BULLET_COLOR = (255, 0, 0)
+BOSS_BULLET_ROTATION_SPEED = 10  # 度/帧
+
+def draw_boss_bullet(image: pygame.Surface):
+    """Boss弹幕精灵：十字（十字以90度为周期，旋转帧由图集预生成）"""
+    extent = image.get_width() / 2
+    points = []
+    for i in range(4):
+        rad = math.radians(i * 90)
+        points.append((
+            extent + BOSS_BULLET_SIZE * math.cos(rad),
+            extent + BOSS_BULLET_SIZE * math.sin(rad)
+        ))
+    pygame.draw.line(image, BOSS_BULLET_COLOR, points[0], points[2], 3)
+    pygame.draw.line(image, BOSS_BULLET_COLOR, points[1], points[3], 3)
+
+sprite_atlas.register("boss_bullet", ((BOSS_BULLET_SIZE + 2) * 2, (BOSS_BULLET_SIZE + 2) * 2), draw_boss_bullet,
+                      rotations=90 // BOSS_BULLET_ROTATION_SPEED, period=90.0)
+sprite_atlas.register_simple("boss_bullet", (5, 5), fill_sprite(BOSS_BULLET_COLOR))
+
+class BossBulletPool:
+    """Boss子弹池，使用结构数组（SoA）批量存储和更新子弹"""
+    def __init__(self, capacity: int = 4096,
+                 bounds: Tuple[float, float, float, float] = (-50, -50, 1330, 770)):
+        self.capacity = capacity
+        self.limit = capacity  # 同时存在的子弹上限（画质调节可以降低，不超过容量）
+        self.bounds = bounds  # (min_x, min_y, max_x, max_y)，超出即回收
+        self.count = 0
+        self.dropped = 0  # 池满时丢弃的子弹数量
+        
+        # 预分配的子弹数据
+        self.xs: List[float] = [0.0] * capacity
+        self.ys: List[float] = [0.0] * capacity
+        self.vxs: List[float] = [0.0] * capacity
+        self.vys: List[float] = [0.0] * capacity
+        self.damages: List[float] = [0.0] * capacity
+        
+        # 子弹外观（精灵在图集中）
+        self.size = BOSS_BULLET_SIZE
+        self.rotation_speed = BOSS_BULLET_ROTATION_SPEED
+        self.frame = 0
+    
+    def set_bounds(self, min_x: float, min_y: float, max_x: float, max_y: float):
+        """设置回收边界"""
+        self.bounds = (min_x, min_y, max_x, max_y)
+    
+    def set_limit(self, limit: int):
+        """设置同时存在的子弹上限（已存在的子弹不受影响）"""
+        self.limit = max(0, min(limit, self.capacity))
+    
+    def spawn(self, x: float, y: float, vx: float, vy: float, damage: float) -> bool:
+        """生成单个子弹，池满时返回False"""
+        n = self.count
+        if n >= self.limit:
+            self.dropped += 1
+            return False
+        self.xs[n] = x
+        self.ys[n] = y
+        self.vxs[n] = vx
+        self.vys[n] = vy
+        self.damages[n] = damage
+        self.count = n + 1
+        return True
+    
+    def emit_table(self, x: float, y: float, vx_table: List[float], vy_table: List[float],
+                   start: int, length: int, damage: float) -> int:
+        """从同一发射点批量发射速度表中的一段子弹，返回实际发射数量"""
+        n = self.count
+        available = max(0, min(length, self.limit - n))
+        if available < length:
+            self.dropped += length - available
+        
+        xs, ys, vxs, vys, damages = self.xs, self.ys, self.vxs, self.vys, self.damages
+        for i in range(start, start + available):
+            xs[n] = x
+            ys[n] = y
+            vxs[n] = vx_table[i]
+            vys[n] = vy_table[i]
+            damages[n] = damage
+            n += 1
+        self.count = n
+        return available
+    
+    def emit_columns(self, x_table: List[float], start: int, length: int, y: float,
+                     vx: float, vy: float, damage: float) -> int:
+        """从位置表中的多个发射点以相同速度批量发射子弹"""
+        n = self.count
+        available = max(0, min(length, self.limit - n))
+        if available < length:
+            self.dropped += length - available
+        
+        xs, ys, vxs, vys, damages = self.xs, self.ys, self.vxs, self.vys, self.damages
+        table_size = len(x_table)
+        for i in range(start, start + available):
+            xs[n] = x_table[i % table_size]
+            ys[n] = y
+            vxs[n] = vx
+            vys[n] = vy
+            damages[n] = damage
+            n += 1
+        self.count = n
+        return available
+    
+    def update(self):
+        """批量移动子弹并回收越界子弹（交换删除，保持数据紧凑）"""
+        xs, ys, vxs, vys, damages = self.xs, self.ys, self.vxs, self.vys, self.damages
+        min_x, min_y, max_x, max_y = self.bounds
+        n = self.count
+        i = 0
+        while i < n:
+            x = xs[i] + vxs[i]
+            y = ys[i] + vys[i]
+            if x < min_x or x > max_x or y < min_y or y > max_y:
+                n -= 1
+                xs[i] = xs[n]
+                ys[i] = ys[n]
+                vxs[i] = vxs[n]
+                vys[i] = vys[n]
+                damages[i] = damages[n]
+                continue
+            xs[i] = x
+            ys[i] = y
+            i += 1
+        self.count = n
+        self.frame += 1
+    
+    def collide_circle(self, cx: float, cy: float, radius: float) -> float:
+        """检测与圆形的碰撞，移除命中的子弹并返回总伤害"""
+        xs, ys, vxs, vys, damages = self.xs, self.ys, self.vxs, self.vys, self.damages
+        reach = radius + self.size
+        reach_sq = reach * reach
+        total_damage = 0.0
+        n = self.count
+        i = 0
+        while i < n:
+            dx = xs[i] - cx
+            dy = ys[i] - cy
+            if dx * dx + dy * dy <= reach_sq:
+                total_damage += damages[i]
+                n -= 1
+                xs[i] = xs[n]
+                ys[i] = ys[n]
+                vxs[i] = vxs[n]
+                vys[i] = vys[n]
+                damages[i] = damages[n]
+                continue
+            i += 1
+        self.count = n
+        return total_damage
+    
+    def clear(self):
+        """清空所有子弹"""
+        self.count = 0
+    
+    def queue_sprites(self, batch: SpriteBatch):
+        """加入所有子弹的精灵（所有子弹共享同一旋转帧）"""
+        batch.add_many('enemy_bullets', "boss_bullet", self.xs, self.ys, self.count,
+                       self.frame * self.rotation_speed)
+    
+    def render(self, screen: pygame.Surface):
+        """批量渲染子弹"""
+        if self.count == 0:
+            return
+        page, area = sprite_atlas.frame("boss_bullet", self.frame * self.rotation_speed)
+        offset_x = area.width >> 1
+        offset_y = area.height >> 1
+        xs, ys = self.xs, self.ys
+        screen.blits([(page, (xs[i] - offset_x, ys[i] - offset_y), area) for i in range(self.count)], False)
+
+# 池中的子弹不是独立对象，按池中的数量计入子弹统计
+memory_telemetry.watch("bullets", BossBulletPool, size=lambda pool: pool.count)
+
+class BulletPattern:
+    """弹幕模式基类，构造时预计算发射表，运行时只做查表和批量写入"""
+    def __init__(self, speed: float, interval: int):
+        self.speed = speed
+        self.interval = max(1, int(interval))  # 每隔多少帧发射一次
+        self.cursor = 0  # 发射表游标
+    
+    def reset(self):
+        """重置发射表游标"""
+        self.cursor = 0
+    
+    def update(self, pool: BossBulletPool, frame: int, origin: Tuple[float, float],
+               target: Optional[Tuple[float, float]], damage: float) -> int:
+        """按帧间隔发射，返回本帧发射的子弹数"""
+        if frame % self.interval != 0:
+            return 0
+        return self.emit(pool, origin, target, damage)
+    
+    def emit(self, pool: BossBulletPool, origin: Tuple[float, float],
+             target: Optional[Tuple[float, float]], damage: float) -> int:
+        """发射一轮子弹"""
+        raise NotImplementedError
+
+class SpiralPattern(BulletPattern):
+    """螺旋弹幕：多条旋臂，每轮整体旋转固定角度"""
+    def __init__(self, speed: float, interval: int = 1, arms: int = 3, step: float = 0.2):
+        super().__init__(speed, interval)
+        self.arms = arms
+        # 一个完整旋转周期内的发射轮数
+        self.steps = max(1, int(round(2 * math.pi / step)))
+        self.vx_table: List[float] = []
+        self.vy_table: List[float] = []
+        for k in range(self.steps):
+            for i in range(arms):
+                angle = k * step + i * (2 * math.pi / arms)
+                self.vx_table.append(math.cos(angle) * speed)
+                self.vy_table.append(math.sin(angle) * speed)
+    
+    def emit(self, pool, origin, target, damage):
+        start = (self.cursor % self.steps) * self.arms
+        self.cursor += 1
+        return pool.emit_table(origin[0], origin[1], self.vx_table, self.vy_table,
+                               start, self.arms, damage)
+
+class RingPattern(BulletPattern):
+    """环形弹幕：一次发射一整圈，相邻两轮错开半个间隔"""
+    def __init__(self, speed: float, interval: int = 45, count: int = 24):
+        super().__init__(speed, interval)
+        self.count = count
+        self.vx_table: List[float] = []
+        self.vy_table: List[float] = []
+        for offset in (0.0, 0.5):
+            for i in range(count):
+                angle = (i + offset) * (2 * math.pi / count)
+                self.vx_table.append(math.cos(angle) * speed)
+                self.vy_table.append(math.sin(angle) * speed)
+    
+    def emit(self, pool, origin, target, damage):
+        start = (self.cursor % 2) * self.count
+        self.cursor += 1
+        return pool.emit_table(origin[0], origin[1], self.vx_table, self.vy_table,
+                               start, self.count, damage)
+
+class RainPattern(BulletPattern):
+    """弹雨：从场地顶部的预洗牌落点表中依次落下"""
+    def __init__(self, speed: float, interval: int = 10, arena_width: int = 1280,
+                 lanes: int = 32, per_emit: int = 1, seed: int = 0):
+        super().__init__(speed, interval)
+        self.per_emit = per_emit
+        lane_width = arena_width / lanes
+        self.x_table = [lane_width * (i + 0.5) for i in range(lanes)]
+        random.Random(seed).shuffle(self.x_table)
+    
+    def emit(self, pool, origin, target, damage):
+        start = self.cursor
+        self.cursor = (self.cursor + self.per_emit) % len(self.x_table)
+        return pool.emit_columns(self.x_table, start, self.per_emit, 0.0,
+                                 0.0, self.speed, damage)
+
+class AimedFanPattern(BulletPattern):
+    """瞄准扇形弹幕：预计算相对偏转角，发射时旋转到玩家方向"""
+    def __init__(self, speed: float, interval: int = 5, count: int = 1, spread: float = 0.0):
+        super().__init__(speed, interval)
+        self.count = count
+        # 每发子弹相对瞄准方向的旋转（cos, sin），已乘以速度
+        self.cos_table: List[float] = []
+        self.sin_table: List[float] = []
+        for i in range(count):
+            angle = math.radians(spread * (i - (count - 1) / 2))
+            self.cos_table.append(math.cos(angle) * speed)
+            self.sin_table.append(math.sin(angle) * speed)
+        self._vx: List[float] = [0.0] * count
+        self._vy: List[float] = [0.0] * count
+    
+    def emit(self, pool, origin, target, damage):
+        if target is None:
+            return 0
+        dx = target[0] - origin[0]
+        dy = target[1] - origin[1]
+        length = math.sqrt(dx * dx + dy * dy)
+        if length == 0:
+            return 0
+        ux = dx / length
+        uy = dy / length
+        
+        vx, vy = self._vx, self._vy
+        for i in range(self.count):
+            c = self.cos_table[i]
+            s = self.sin_table[i]
+            vx[i] = ux * c - uy * s
+            vy[i] = ux * s + uy * c
+        return pool.emit_table(origin[0], origin[1], vx, vy, 0, self.count, damage)
+
+# 模式类型注册表
+PATTERN_TYPES = {
+    'spiral': SpiralPattern,
+    'ring': RingPattern,
+    'rain': RainPattern,
+    'aimed_fan': AimedFanPattern
+}
+
+def compile_pattern(spec: Dict[str, Any], default_speed: float,
+                    arena_width: int = 1280) -> BulletPattern:
+    """根据数据描述编译弹幕模式"""
+    params = dict(spec)
+    pattern_type = params.pop('type')
+    if pattern_type not in PATTERN_TYPES:
+        raise ValueError(f"未知的弹幕类型: {pattern_type}")
+    if params.get('speed') is None:
+        params['speed'] = default_speed
+    if pattern_type == 'rain':
+        params.setdefault('arena_width', arena_width)
+    return PATTERN_TYPES[pattern_type](**params)
@@ -1,8 +1,12 @@
 from typing import Dict, Optional
 import pygame
 from .base_entity import BaseEntity
+from event_bus import EventQueue
 
 class Character(BaseEntity):
+    # 战斗事件队列，由所在场景设置
+    event_queue: Optional[EventQueue] = None
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y, 40, 40)  # 默认大小40x40
         
@@ -5,9 +5,47 @@ from typing import List, Optional, Type
 from .enemy import Enemy
 from .geometric_enemies import TriangleEnemy, CircleEnemy, SquareEnemy
 from .character import Character
+from .sprite_atlas import SpriteBatch, diamond_sprite, sprite_atlas
+from quality_governor import quality
+from memory_telemetry import memory_telemetry
+
+def draw_summoner_sprite(image: pygame.Surface):
+    """召唤师精灵：金色八角星"""
+    width, height = image.get_size()
+    points = []
+    for i in range(8):
+        angle = math.pi / 4 * i
+        radius = width / 2
+        if i % 2 == 0:
+            radius *= 0.6
+        points.append((
+            width / 2 + radius * math.cos(angle),
+            height / 2 + radius * math.sin(angle)
+        ))
+    pygame.draw.polygon(image, (255, 215, 0), points)
+
+def draw_powered_sprite(image: pygame.Surface):
+    """强化精英精灵：紫色五边形"""
+    width, height = image.get_size()
+    points = []
+    for i in range(5):
+        angle = math.pi * 2 / 5 * i - math.pi / 2
+        radius = width / 2
+        points.append((
+            width / 2 + radius * math.cos(angle),
+            height / 2 + radius * math.sin(angle)
+        ))
+    pygame.draw.polygon(image, (148, 0, 211), points)
+
+sprite_atlas.register("summoner_elite", (40, 40), draw_summoner_sprite)
+sprite_atlas.register("powered_elite", (40, 40), draw_powered_sprite)
+sprite_atlas.register("powered_bullet", (11, 11), diamond_sprite((148, 0, 211)))
 
 class SummonerElite(Enemy):
     """召唤师精英敌人，可以召唤基础几何敌人"""
+    sprite_name = "summoner_elite"
+    has_health_bar = False
+    
     def __init__(self, x: float, y: float, target: Optional[Character] = None):
         super().__init__(x, y, target)
         
@@ -46,7 +84,7 @@ class SummonerElite(Enemy):
         # 尝试召唤
         current_time = pygame.time.get_ticks()
         if (current_time - self.last_summon_time >= self.summon_interval and 
-            len(self.minions) < self.max_minions):
+            len(self.minions) < quality.tier.spawn_cap(self.max_minions)):
             self.summon()
             self.last_summon_time = current_time
     
@@ -72,28 +110,22 @@ class SummonerElite(Enemy):
         minion.damage *= 0.7
         self.minions.append(minion)
     
-    def render(self, screen: pygame.Surface):
-        """渲染召唤师和召唤物"""
-        # 渲染召唤物
+    def queue_sprites(self, batch: SpriteBatch):
+        """加入召唤物和召唤师的精灵"""
         for minion in self.minions:
-            minion.render(screen)
-        
-        # 渲染召唤师（八角星形状）
-        center_x, center_y = self.get_center()
-        points = []
-        for i in range(8):
-            angle = math.pi / 4 * i
-            radius = self.width / 2
-            if i % 2 == 0:
-                radius *= 0.6
-            points.append((
-                center_x + radius * math.cos(angle),
-                center_y + radius * math.sin(angle)
-            ))
-        pygame.draw.polygon(screen, self.color, points)
+            minion.queue_sprites(batch)
+        super().queue_sprites(batch)
+    
+    def render_overlay(self, screen: pygame.Surface):
+        """绘制召唤物的血条等"""
+        for minion in self.minions:
+            minion.render_overlay(screen)
 
 class PoweredElite(Enemy):
     """强化精英敌人，具有多种强化属性和特殊攻击模式"""
+    sprite_name = "powered_elite"
+    has_health_bar = False
+    
     def __init__(self, x: float, y: float, target: Optional[Character] = None):
         super().__init__(x, y, target)
         
@@ -221,26 +253,9 @@ class PoweredElite(Enemy):
             )
             self.bullets.append(bullet)
     
-    def render(self, screen: pygame.Surface):
-        """渲染强化精英和子弹"""
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
-        
-        # 渲染本体（五角星形状）
-        center_x, center_y = self.get_center()
-        points = []
-        for i in range(5):
-            angle = math.pi * 2 / 5 * i - math.pi / 2
-            radius = self.width / 2
-            points.append((
-                center_x + radius * math.cos(angle),
-                center_y + radius * math.sin(angle)
-            ))
-        pygame.draw.polygon(screen, self.color, points)
-        
-        # 渲染护盾条
-        if self.shield > 0:
+    def render_overlay(self, screen: pygame.Surface):
+        """渲染护盾条（低画质时不绘制）"""
+        if self.shield > 0 and quality.tier.health_bars:
             shield_width = int(self.width * (self.shield / self.max_shield))
             shield_rect = pygame.Rect(
                 self.x,
@@ -251,6 +266,8 @@ class PoweredElite(Enemy):
             pygame.draw.rect(screen, (0, 191, 255), shield_rect)
 
 class PoweredBullet:
+    sprite_name = "powered_bullet"
+    
     def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, damage: float):
         self.x = x
         self.y = y
@@ -265,13 +282,5 @@ class PoweredBullet:
         """更新子弹位置"""
         self.x += self.dx * self.speed
         self.y += self.dy * self.speed
-    
-    def render(self, screen: pygame.Surface):
-        """渲染子弹（菱形）"""
-        points = [
-            (self.x, self.y - self.size),  # 上
-            (self.x + self.size, self.y),  # 右
-            (self.x, self.y + self.size),  # 下
-            (self.x - self.size, self.y)   # 左
-        ]
-        pygame.draw.polygon(screen, (148, 0, 211), points) 
\ No newline at end of file
+
+memory_telemetry.watch("bullets", PoweredBullet)
@@ -3,8 +3,40 @@ import pygame
 import math
 import random
 from .character import Character
+from .sprite_atlas import ENTITY_ROTATIONS, SpriteBatch, sprite_atlas
+from event_bus import CombatEvent
+from quality_governor import quality
+from memory_telemetry import memory_telemetry
+
+def draw_enemy_sprite(image: pygame.Surface):
+    """敌人精灵：红色五边形，小圆表示眼睛"""
+    width, height = image.get_size()
+    center_x = width / 2
+    center_y = height / 2
+    radius = min(width, height) / 2 - 2
+    points = []
+    
+    for i in range(5):
+        angle = math.pi * 2 / 5 * i - math.pi / 2
+        x = center_x + radius * math.cos(angle)
+        y = center_y + radius * math.sin(angle)
+        points.append((x, y))
+    
+    # 绘制填充的五边形
+    pygame.draw.polygon(image, (255, 0, 0), points)
+    # 绘制边框
+    pygame.draw.polygon(image, (255, 255, 255), points, 2)
+    
+    # 绘制一个小圆表示"眼睛"
+    eye_pos = (center_x, center_y - radius // 2)
+    pygame.draw.circle(image, (255, 255, 0), eye_pos, 3)
+
+sprite_atlas.register("enemy", (40, 40), draw_enemy_sprite, ENTITY_ROTATIONS)
 
 class Enemy(Character):
+    sprite_name = "enemy"
+    has_health_bar = True  # 是否在精灵上方绘制血条
+    
     def __init__(self, x: float, y: float, target: Optional[Character] = None):
         super().__init__(x, y)
         
@@ -13,6 +45,7 @@ class Enemy(Character):
         self.detection_range = 400  # 检测范围
         self.attack_range = 200     # 攻击范围
         self.score_value = 10       # 击杀得分
+        self.experience_reward = (10, 20)  # 击杀经验范围
         
         # 掉落概率
         self.fragment_drop_chance = 0.3  # 30%概率掉落碎片
@@ -29,47 +62,10 @@ class Enemy(Character):
         # 子弹列表
         self.bullets = []
         
-        # 创建敌人图像
         self.color = (255, 0, 0)  # 敌人是红色
-        self._create_enemy_image()
         
         print(f"敌人初始化完成: {self.__class__.__name__}")
     
-    def _create_enemy_image(self):
-        """创建敌人图像"""
-        try:
-            # 创建一个带有透明度的表面
-            image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            
-            # 绘制一个五边形作为敌人图像
-            center_x = self.width / 2
-            center_y = self.height / 2
-            radius = min(self.width, self.height) / 2 - 2
-            points = []
-            
-            for i in range(5):
-                angle = math.pi * 2 / 5 * i - math.pi / 2
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                points.append((x, y))
-            
-            # 绘制填充的五边形
-            pygame.draw.polygon(image, self.color, points)
-            # 绘制边框
-            pygame.draw.polygon(image, (255, 255, 255), points, 2)
-            
-            # 绘制一个小圆表示"眼睛"
-            eye_pos = (center_x, center_y - radius // 2)
-            pygame.draw.circle(image, (255, 255, 0), eye_pos, 3)
-            
-            self.set_image(image)
-            print(f"为敌人 {self.__class__.__name__} 创建图像")
-        
-        except Exception as e:
-            print(f"创建敌人图像时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
-    
     def update(self):
         """更新敌人状态"""
         super().update()
@@ -169,16 +165,15 @@ class Enemy(Character):
         if self.can_attack():
             self.attack()
     
-    def render(self, screen: pygame.Surface):
-        """渲染敌人和子弹"""
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
-        
-        # 渲染敌人
-        super().render(screen)
-        
-        # 绘制血条
+    def queue_sprites(self, batch: SpriteBatch):
+        """加入子弹和敌人的精灵"""
+        batch.add_bullets('enemy_bullets', self.bullets)
+        super().queue_sprites(batch)
+    
+    def render_overlay(self, screen: pygame.Surface):
+        """绘制血条（低画质时不绘制）"""
+        if not self.has_health_bar or not quality.tier.health_bars:
+            return
         health_width = self.width
         health_height = 4
         health_x = self.x
@@ -194,22 +189,10 @@ class Enemy(Character):
                         pygame.Rect(health_x, health_y, current_health_width, health_height))
     
     def die(self):
-        """敌人死亡"""
+        """敌人死亡，击杀奖励由订阅KILL事件的场景统一结算"""
         super().die()
         
-        if not self.target:
-            return
-        
-        # 增加玩家得分
-        if hasattr(self.target, 'add_score'):
-            self.target.add_score(self.score_value)
-        
-        # 随机掉落碎片
-        if random.random() < self.fragment_drop_chance:
-            if hasattr(self.target, 'add_fragments'):
-                self.target.add_fragments(self.fragment_drop_amount)
-        
-        # 随机掉落星星
-        if random.random() < self.star_drop_chance:
-            if hasattr(self.target, 'add_stars'):
-                self.target.add_stars(self.star_drop_amount) 
\ No newline at end of file
+        if self.event_queue:
+            self.event_queue.push(CombatEvent.KILL, self, self.target, self.score_value)
+
+memory_telemetry.watch("enemies", Enemy)
@@ -3,8 +3,22 @@ import math
 from typing import List, Optional, Tuple
 from .enemy import Enemy
 from .character import Character
+from .sprite_atlas import circle_size, circle_sprite, fill_sprite, sprite_atlas, triangle_sprite
+from memory_telemetry import memory_telemetry
+
+# 几何敌人不随朝向旋转
+sprite_atlas.register("triangle_enemy", (40, 40), triangle_sprite((255, 100, 100)))
+sprite_atlas.register("circle_enemy", circle_size(20), circle_sprite((100, 100, 255), 20))
+sprite_atlas.register("square_enemy", (40, 40), fill_sprite((100, 255, 100)))
+sprite_atlas.register("triangle_bullet", (13, 13), triangle_sprite((255, 200, 200)))
+sprite_atlas.register("circle_bullet", circle_size(4), circle_sprite((200, 200, 255), 4))
+sprite_atlas.register("square_bullet", (5, 5), fill_sprite((200, 255, 200)))
+sprite_atlas.register_simple("triangle_bullet", (5, 5), fill_sprite((255, 200, 200)))
 
 class TriangleEnemy(Enemy):
+    sprite_name = "triangle_enemy"
+    has_health_bar = False
+    
     def __init__(self, x: float, y: float, target: Optional[Character] = None):
         super().__init__(x, y, target)
         
@@ -48,23 +62,12 @@ class TriangleEnemy(Enemy):
             bullet.update()
             if not bullet.is_active:
                 self.bullets.remove(bullet)
-    
-    def render(self, screen: pygame.Surface):
-        """渲染三角形敌人和子弹"""
-        # 渲染三角形
-        center_x, center_y = self.get_center()
-        points = [
-            (center_x, center_y - self.height/2),  # 顶点
-            (center_x - self.width/2, center_y + self.height/2),  # 左下
-            (center_x + self.width/2, center_y + self.height/2)   # 右下
-        ]
-        pygame.draw.polygon(screen, self.color, points)
-        
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
 
 class CircleEnemy(Enemy):
+    collision_shape = 'circle'
+    sprite_name = "circle_enemy"
+    has_health_bar = False
+    
     def __init__(self, x: float, y: float, target: Optional[Character] = None):
         super().__init__(x, y, target)
         
@@ -119,19 +122,11 @@ class CircleEnemy(Enemy):
             bullet.update()
             if not bullet.is_active:
                 self.bullets.remove(bullet)
-    
-    def render(self, screen: pygame.Surface):
-        """渲染圆形敌人和子弹"""
-        # 渲染圆形
-        pygame.draw.circle(screen, self.color, 
-                         (int(self.x + self.width/2), int(self.y + self.height/2)), 
-                         int(self.width/2))
-        
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
 
 class SquareEnemy(Enemy):
+    sprite_name = "square_enemy"
+    has_health_bar = False
+    
     def __init__(self, x: float, y: float, target: Optional[Character] = None):
         super().__init__(x, y, target)
         
@@ -180,18 +175,11 @@ class SquareEnemy(Enemy):
             bullet.update()
             if not bullet.is_active:
                 self.bullets.remove(bullet)
-    
-    def render(self, screen: pygame.Surface):
-        """渲染方块敌人和子弹"""
-        # 渲染方块
-        pygame.draw.rect(screen, self.color, self.rect)
-        
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
 
 # 子弹类
 class TriangleBullet:
+    sprite_name = "triangle_bullet"
+    
     def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, damage: float):
         self.x = x
         self.y = y
@@ -206,17 +194,10 @@ class TriangleBullet:
         """更新子弹位置"""
         self.x += self.dx * self.speed
         self.y += self.dy * self.speed
-    
-    def render(self, screen: pygame.Surface):
-        """渲染三角形子弹"""
-        points = [
-            (self.x, self.y - self.size),
-            (self.x - self.size, self.y + self.size),
-            (self.x + self.size, self.y + self.size)
-        ]
-        pygame.draw.polygon(screen, (255, 200, 200), points)
 
 class CircleBullet:
+    sprite_name = "circle_bullet"
+    
     def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, damage: float):
         self.x = x
         self.y = y
@@ -231,14 +212,10 @@ class CircleBullet:
         """更新子弹位置"""
         self.x += self.dx * self.speed
         self.y += self.dy * self.speed
-    
-    def render(self, screen: pygame.Surface):
-        """渲染圆形子弹"""
-        pygame.draw.circle(screen, (200, 200, 255), 
-                         (int(self.x), int(self.y)), 
-                         self.radius)
 
 class SquareBullet:
+    sprite_name = "square_bullet"
+    
     def __init__(self, x: float, y: float, dx: float, dy: float, speed: float, 
                  damage: float, turn_speed: float, target: Optional[Character]):
         self.x = x
@@ -279,9 +256,6 @@ class SquareBullet:
         # 更新位置
         self.x += self.dx * self.speed
         self.y += self.dy * self.speed
-    
-    def render(self, screen: pygame.Surface):
-        """渲染方形子弹"""
-        rect = pygame.Rect(self.x - self.size/2, self.y - self.size/2, 
-                         self.size, self.size)
-        pygame.draw.rect(screen, (200, 255, 200), rect) 
\ No newline at end of file
+
+for bullet_class in (TriangleBullet, CircleBullet, SquareBullet):
+    memory_telemetry.watch("bullets", bullet_class)
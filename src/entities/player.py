@@ -1,9 +1,42 @@
 import pygame
 from typing import Optional, Tuple
 from .character import Character
+from .sprite_atlas import ENTITY_ROTATIONS, SpriteBatch, sprite_atlas
+from event_bus import CombatEvent
+from input_manager import Action, InputSnapshot
+from quality_governor import quality
 import math
 
+def draw_player_sprite(image: pygame.Surface):
+    """玩家精灵：白色六边形，小圆表示朝向"""
+    width, height = image.get_size()
+    center_x = width / 2
+    center_y = height / 2
+    radius = min(width, height) / 2 - 2
+    points = []
+    
+    for i in range(6):
+        angle = math.pi / 3 * i
+        x = center_x + radius * math.cos(angle)
+        y = center_y + radius * math.sin(angle)
+        points.append((x, y))
+    
+    # 绘制填充的六边形
+    pygame.draw.polygon(image, (255, 255, 255), points)
+    # 绘制边框
+    pygame.draw.polygon(image, (255, 255, 255), points, 2)
+    
+    # 绘制一个小圆表示朝向
+    front_x = center_x + radius * 0.8
+    front_y = center_y
+    pygame.draw.circle(image, (255, 255, 255), (int(front_x), int(front_y)), 3)
+
+sprite_atlas.register("player", (40, 40), draw_player_sprite, ENTITY_ROTATIONS)
+
 class Player(Character):
+    sprite_name = "player"
+    sprite_layer = 'player'
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y)
         
@@ -25,65 +58,8 @@ class Player(Character):
         # 子弹列表
         self.bullets = []
         
-        # 移动控制
-        self.move_keys = {
-            pygame.K_w: (0, -1),
-            pygame.K_s: (0, 1),
-            pygame.K_a: (-1, 0),
-            pygame.K_d: (1, 0)
-        }
-        
-        # 创建玩家图像
-        self._create_player_image()
-        
         print(f"玩家初始化完成: {self.__class__.__name__}")
     
-    def _create_player_image(self):
-        """创建玩家图像"""
-        try:
-            # 创建一个带有透明度的表面
-            image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            
-            # 根据玩家类型设置颜色
-            if self.__class__.__name__ == "Soldier":
-                self.color = (0, 255, 0)  # 士兵是绿色
-            elif self.__class__.__name__ == "Assault":
-                self.color = (255, 165, 0)  # 突击手是橙色
-            elif self.__class__.__name__ == "Artillery":
-                self.color = (0, 0, 255)  # 炮兵是蓝色
-            else:
-                self.color = (255, 255, 255)  # 默认是白色
-            
-            # 绘制一个六边形作为玩家图像
-            center_x = self.width / 2
-            center_y = self.height / 2
-            radius = min(self.width, self.height) / 2 - 2
-            points = []
-            
-            for i in range(6):
-                angle = math.pi / 3 * i
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                points.append((x, y))
-            
-            # 绘制填充的六边形
-            pygame.draw.polygon(image, self.color, points)
-            # 绘制边框
-            pygame.draw.polygon(image, (255, 255, 255), points, 2)
-            
-            # 绘制一个小圆表示朝向
-            front_x = center_x + radius * 0.8
-            front_y = center_y
-            pygame.draw.circle(image, (255, 255, 255), (int(front_x), int(front_y)), 3)
-            
-            self.set_image(image)
-            print(f"为玩家 {self.__class__.__name__} 创建图像")
-        
-        except Exception as e:
-            print(f"创建玩家图像时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
-    
     def update(self):
         """更新玩家状态"""
         super().update()
@@ -100,34 +76,25 @@ class Player(Character):
             self.is_skill_ready = True
             print(f"玩家 {self.__class__.__name__} 技能冷却完成")
     
-    def handle_input(self, keys, mouse_pos: Tuple[int, int], mouse_buttons: Tuple[int, ...]):
-        """处理输入"""
-        # 处理移动
-        dx = dy = 0
-        for key, (move_x, move_y) in self.move_keys.items():
-            if keys[key]:
-                dx += move_x
-                dy += move_y
-        
-        # 标准化移动向量
+    def handle_input(self, snapshot: InputSnapshot):
+        """处理输入（每个模拟帧调用一次）"""
+        # 处理移动（方向已标准化）
+        dx, dy = snapshot.move
         if dx != 0 or dy != 0:
-            length = math.sqrt(dx * dx + dy * dy)
-            dx /= length
-            dy /= length
-            self.move(dx * self.get_speed(), dy * self.get_speed())
-            print(f"玩家 {self.__class__.__name__} 移动: ({dx:.2f}, {dy:.2f})")
+            speed = self.get_speed()
+            self.move(dx * speed, dy * speed)
         
         # 处理旋转（朝向鼠标）
         center_x, center_y = self.get_center()
-        mouse_x, mouse_y = mouse_pos
+        mouse_x, mouse_y = snapshot.mouse_pos
         angle = math.degrees(math.atan2(mouse_y - center_y, mouse_x - center_x))
         self.set_rotation(angle)
         
         # 处理攻击
-        if mouse_buttons[0]:  # 左键射击
+        if snapshot.is_held(Action.FIRE):
             self.attack()
         
-        if mouse_buttons[2] and self.is_skill_ready:  # 右键技能
+        if snapshot.is_held(Action.SKILL) and self.is_skill_ready:
             self.use_skill()
             print(f"玩家 {self.__class__.__name__} 使用技能")
     
@@ -154,6 +121,8 @@ class Player(Character):
         self.level += 1
         self.experience_to_next_level = int(self.experience_to_next_level * 1.2)
         print(f"玩家 {self.__class__.__name__} 升级到 {self.level} 级")
+        if self.event_queue:
+            self.event_queue.push(CombatEvent.LEVEL_UP, self, None, self.level)
         # 具体升级效果由子类实现
     
     def add_score(self, amount: int):
@@ -165,11 +134,15 @@ class Player(Character):
         """增加碎片"""
         self.fragments += amount
         print(f"玩家 {self.__class__.__name__} 获得碎片: {amount}")
+        if self.event_queue:
+            self.event_queue.push(CombatEvent.PICKUP, self, 'fragments', amount)
     
     def add_stars(self, amount: int):
         """增加星星"""
         self.stars += amount
         print(f"玩家 {self.__class__.__name__} 获得星星: {amount}")
+        if self.event_queue:
+            self.event_queue.push(CombatEvent.PICKUP, self, 'stars', amount)
     
     def get_skill_cooldown_percentage(self) -> float:
         """获取技能冷却进度（0-1）"""
@@ -179,17 +152,14 @@ class Player(Character):
         elapsed = (current_time - self.last_skill_time) / 1000
         return min(elapsed / self.skill_cooldown, 1.0)
     
-    def render(self, screen: pygame.Surface):
-        """渲染玩家和子弹"""
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
-        
-        # 渲染玩家
-        super().render(screen)
-        
-        # 如果技能冷却中，绘制冷却指示器
-        if not self.is_skill_ready:
+    def queue_sprites(self, batch: SpriteBatch):
+        """加入子弹和玩家的精灵"""
+        batch.add_bullets('player_bullets', self.bullets)
+        super().queue_sprites(batch)
+    
+    def render_overlay(self, screen: pygame.Surface):
+        """如果技能冷却中，绘制冷却指示器（最低画质时不绘制）"""
+        if not self.is_skill_ready and quality.tier.cooldown_arc:
             cooldown_percentage = self.get_skill_cooldown_percentage()
             radius = min(self.width, self.height) / 2
             center_x, center_y = self.get_center()
@@ -203,4 +173,4 @@ class Player(Character):
                            radius * 2, radius * 2),
                           math.radians(start_angle), 
                           math.radians(end_angle), 
-                          2) 
\ No newline at end of file
+                          2)
@@ -1,10 +1,37 @@
 from .player import Player
+from .sprite_atlas import ENTITY_ROTATIONS, sprite_atlas
 from .bullet import PlayerBullet
 import pygame
 import math
 from typing import List, Optional
 
+def draw_sniper_sprite(image: pygame.Surface):
+    """狙击手精灵"""
+    width, height = image.get_size()
+    
+    # 绘制一个红色菱形
+    center = (width // 2, height // 2)
+    radius = min(width, height) // 2 - 2
+    points = []
+    for i in range(4):
+        angle = math.pi * 2 / 4 * i - math.pi / 4
+        x = center[0] + radius * math.cos(angle)
+        y = center[1] + radius * math.sin(angle)
+        points.append((x, y))
+    
+    pygame.draw.polygon(image, (220, 20, 60), points)
+    pygame.draw.polygon(image, (255, 0, 0), points, 2)
+    
+    # 绘制一个小圆表示瞄准镜
+    scope_pos = (center[0], center[1] - radius + 6)
+    pygame.draw.circle(image, (200, 0, 0), scope_pos, 4)
+    pygame.draw.circle(image, (255, 0, 0), scope_pos, 4, 1)
+
+sprite_atlas.register("sniper", (40, 40), draw_sniper_sprite, ENTITY_ROTATIONS)
+
 class Sniper(Player):
+    sprite_name = "sniper"
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y)
         
@@ -24,41 +51,6 @@ class Sniper(Player):
         self.skill_duration = 3.0
         self.skill_damage_bonus = 2.0  # 技能期间伤害翻倍
         self.skill_end_time: Optional[int] = None
-        
-        # 创建狙击手图像
-        self._create_sniper_image()
-    
-    def _create_sniper_image(self):
-        """创建狙击手的几何图形图像"""
-        try:
-            # 创建一个带有透明度的表面
-            image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            
-            # 绘制一个红色菱形
-            center = (self.width // 2, self.height // 2)
-            radius = min(self.width, self.height) // 2 - 2
-            points = []
-            for i in range(4):
-                angle = math.pi * 2 / 4 * i - math.pi / 4
-                x = center[0] + radius * math.cos(angle)
-                y = center[1] + radius * math.sin(angle)
-                points.append((x, y))
-            
-            pygame.draw.polygon(image, (220, 20, 60), points)
-            pygame.draw.polygon(image, (255, 0, 0), points, 2)
-            
-            # 绘制一个小圆表示瞄准镜
-            scope_pos = (center[0], center[1] - radius + 6)
-            pygame.draw.circle(image, (200, 0, 0), scope_pos, 4)
-            pygame.draw.circle(image, (255, 0, 0), scope_pos, 4, 1)
-            
-            self.set_image(image)
-            print(f"为狙击手 {self.__class__.__name__} 创建图像")
-        
-        except Exception as e:
-            print(f"创建狙击手图像时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
     
     def update(self):
         """更新狙击手状态"""
@@ -116,15 +108,6 @@ class Sniper(Player):
         self.add_attribute_bonus("damage_bonus", -self.skill_damage_bonus)
         self.skill_end_time = None
     
-    def render(self, screen: pygame.Surface):
-        """渲染狙击手和子弹"""
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
-        
-        # 渲染狙击手
-        super().render(screen)
-    
     def level_up(self):
         """升级效果"""
         super().level_up()
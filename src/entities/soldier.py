@@ -1,10 +1,36 @@
 from .player import Player
+from .sprite_atlas import ENTITY_ROTATIONS, sprite_atlas
 from .bullet import PlayerBullet
 import pygame
 import math
 from typing import List, Optional
 
+def draw_soldier_sprite(image: pygame.Surface):
+    """士兵精灵"""
+    width, height = image.get_size()
+    
+    # 绘制一个绿色六边形
+    center = (width // 2, height // 2)
+    radius = min(width, height) // 2 - 2
+    points = []
+    for i in range(6):
+        angle = math.pi / 3 * i
+        x = center[0] + radius * math.cos(angle)
+        y = center[1] + radius * math.sin(angle)
+        points.append((x, y))
+    
+    pygame.draw.polygon(image, (0, 255, 0), points)
+    pygame.draw.polygon(image, (100, 255, 100), points, 2)
+    
+    # 绘制一个小圆表示炮口
+    muzzle_pos = (center[0] + radius - 4, center[1])
+    pygame.draw.circle(image, (200, 255, 200), muzzle_pos, 3)
+
+sprite_atlas.register("soldier", (40, 40), draw_soldier_sprite, ENTITY_ROTATIONS)
+
 class Soldier(Player):
+    sprite_name = "soldier"
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y)
         
@@ -24,40 +50,6 @@ class Soldier(Player):
         self.skill_duration = 3.0
         self.skill_attack_speed_bonus = 1.0  # 技能期间攻击速度翻倍
         self.skill_end_time: Optional[int] = None
-        
-        # 创建士兵图像
-        self._create_soldier_image()
-    
-    def _create_soldier_image(self):
-        """创建士兵的几何图形图像"""
-        try:
-            # 创建一个带有透明度的表面
-            image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            
-            # 绘制一个绿色六边形
-            center = (self.width // 2, self.height // 2)
-            radius = min(self.width, self.height) // 2 - 2
-            points = []
-            for i in range(6):
-                angle = math.pi / 3 * i
-                x = center[0] + radius * math.cos(angle)
-                y = center[1] + radius * math.sin(angle)
-                points.append((x, y))
-            
-            pygame.draw.polygon(image, (0, 255, 0), points)
-            pygame.draw.polygon(image, (100, 255, 100), points, 2)
-            
-            # 绘制一个小圆表示炮口
-            muzzle_pos = (center[0] + radius - 4, center[1])
-            pygame.draw.circle(image, (200, 255, 200), muzzle_pos, 3)
-            
-            self.set_image(image)
-            print(f"为士兵 {self.__class__.__name__} 创建图像")
-        
-        except Exception as e:
-            print(f"创建士兵图像时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
     
     def update(self):
         """更新士兵状态"""
@@ -115,15 +107,6 @@ class Soldier(Player):
         self.add_attribute_bonus("attack_speed_bonus", -self.skill_attack_speed_bonus)
         self.skill_end_time = None
     
-    def render(self, screen: pygame.Surface):
-        """渲染士兵和子弹"""
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
-        
-        # 渲染士兵
-        super().render(screen)
-    
     def level_up(self):
         """升级效果"""
         super().level_up()
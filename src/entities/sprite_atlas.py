@@ -0,0 +1,249 @@
+import pygame
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 图集页大小和精灵间距
+PAGE_SIZE = 1024
+PADDING = 1
+# 角色精灵的预旋转帧数（每5度一帧）
+ENTITY_ROTATIONS = 72
+
+# 渲染图层（按绘制顺序）
+LAYERS = ('enemies', 'enemy_bullets', 'player_bullets', 'player')
+
+# (图集页, 精灵在页中的区域)
+SpriteFrame = Tuple[pygame.Surface, pygame.Rect]
+
+class SpriteRecipe:
+    """精灵的绘制方式：在指定大小的透明表面上绘制朝右（0度）的精灵"""
+    def __init__(self, name: str, size: Tuple[int, int], draw: Callable[[pygame.Surface], None],
+                 rotations: int = 1, period: float = 360.0):
+        self.name = name
+        self.size = size
+        self.draw = draw
+        self.rotations = max(1, rotations)
+        self.period = period  # 旋转对称周期（例如十字为90度）
+
+def circle_sprite(color: Tuple[int, int, int], radius: int,
+                  inner_color: Optional[Tuple[int, int, int]] = None) -> Callable[[pygame.Surface], None]:
+    """圆形精灵的绘制函数（表面大小为radius * 2 + 1），可选内圈颜色"""
+    def draw(image: pygame.Surface):
+        center = (radius, radius)
+        pygame.draw.circle(image, color, center, radius)
+        if inner_color is not None:
+            pygame.draw.circle(image, inner_color, center, radius - 1)
+    return draw
+
+def circle_size(radius: int) -> Tuple[int, int]:
+    """圆形精灵的表面大小"""
+    return radius * 2 + 1, radius * 2 + 1
+
+def diamond_sprite(color: Tuple[int, int, int]) -> Callable[[pygame.Surface], None]:
+    """菱形精灵的绘制函数（顶点在表面各边中点）"""
+    def draw(image: pygame.Surface):
+        width, height = image.get_size()
+        half_w = width // 2
+        half_h = height // 2
+        points = [
+            (half_w, 0),           # 上
+            (half_w * 2, half_h),  # 右
+            (half_w, half_h * 2),  # 下
+            (0, half_h)            # 左
+        ]
+        pygame.draw.polygon(image, color, points)
+    return draw
+
+def triangle_sprite(color: Tuple[int, int, int]) -> Callable[[pygame.Surface], None]:
+    """三角形（顶点朝上）精灵的绘制函数"""
+    def draw(image: pygame.Surface):
+        width, height = image.get_size()
+        points = [
+            (width / 2, 0),              # 顶点
+            (0, height - 1),             # 左下
+            (width - 1, height - 1)      # 右下
+        ]
+        pygame.draw.polygon(image, color, points)
+    return draw
+
+def fill_sprite(color: Tuple[int, int, int]) -> Callable[[pygame.Surface], None]:
+    """实心方块精灵的绘制函数"""
+    def draw(image: pygame.Surface):
+        image.fill(color)
+    return draw
+
+class SpriteAtlas:
+    """程序生成精灵的图集
+    
+    精灵及其预旋转帧在第一次使用时统一绘制并按行打包进少量大表面，
+    渲染时按名称和角度查表得到(图集页, 区域)，不再为每个实体保存和旋转单独的表面。
+    """
+    def __init__(self, page_size: int = PAGE_SIZE):
+        self.page_size = page_size
+        self.recipes: Dict[str, SpriteRecipe] = {}
+        self.frames: Dict[str, List[SpriteFrame]] = {}
+        self.simple_names: Dict[str, str] = {}  # 精灵名 -> 低画质时使用的简化精灵名
+        self.pages: List[pygame.Surface] = []
+        self.unconverted: List[int] = []  # 尚未转换为显示格式的页（在后台线程生成）
+        self._cursor = [0, 0, 0]  # 当前页的x, y, 行高
+        self._lock = threading.Lock()  # 场景可能在后台线程预先生成图集
+    
+    def register(self, name: str, size: Tuple[int, int], draw: Callable[[pygame.Surface], None],
+                 rotations: int = 1, period: float = 360.0):
+        """注册精灵（只记录绘制方式，图集在使用时统一生成）"""
+        if name in self.recipes:
+            print(f"警告：精灵 {name} 已注册，忽略重复注册")
+            return
+        self.recipes[name] = SpriteRecipe(name, size, draw, rotations, period)
+    
+    def register_simple(self, name: str, size: Tuple[int, int], draw: Callable[[pygame.Surface], None]):
+        """注册精灵的简化版本（不旋转、更小的形状），低画质时代替原精灵绘制"""
+        simple_name = name + ":simple"
+        self.register(simple_name, size, draw)
+        self.simple_names[name] = simple_name
+    
+    def build(self) -> int:
+        """绘制并打包所有尚未生成的精灵，返回新生成的帧数
+        
+        可以在后台线程调用：此时新页保持普通的SRCALPHA表面，由主线程调用convert_pages转换为显示格式。
+        """
+        with self._lock:
+            count = 0
+            for recipe in self.recipes.values():
+                if recipe.name in self.frames:
+                    continue
+                base = pygame.Surface(recipe.size, pygame.SRCALPHA)
+                recipe.draw(base)
+                frames = []
+                step = recipe.period / recipe.rotations
+                for i in range(recipe.rotations):
+                    # 实体角度0表示朝右，角度增大为顺时针（屏幕坐标）
+                    surface = base if i == 0 else pygame.transform.rotozoom(base, -i * step, 1)
+                    frames.append(self._place(surface))
+                self.frames[recipe.name] = frames
+                count += len(frames)
+            return count
+    
+    def convert_pages(self) -> int:
+        """在主线程中把后台生成的页转换为显示格式，返回转换的页数"""
+        if not self.unconverted or pygame.display.get_surface() is None:
+            return 0
+        with self._lock:
+            replaced = {}
+            for index in self.unconverted:
+                page = self.pages[index]
+                converted = page.convert_alpha()
+                self.pages[index] = converted
+                replaced[id(page)] = converted
+            for name, frames in self.frames.items():
+                self.frames[name] = [(replaced.get(id(page), page), area) for page, area in frames]
+            count = len(self.unconverted)
+            self.unconverted = []
+            return count
+    
+    def _new_page(self, width: int, height: int) -> pygame.Surface:
+        page = pygame.Surface((width, height), pygame.SRCALPHA)
+        if threading.current_thread() is not threading.main_thread():
+            # 后台线程不能访问显示设备，留给主线程转换
+            self.unconverted.append(len(self.pages))
+        elif pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        return page
+    
+    def _place(self, surface: pygame.Surface) -> SpriteFrame:
+        """按行把精灵放入当前页，放不下时新建一页"""
+        width, height = surface.get_size()
+        size = self.page_size
+        if width > size or height > size:
+            # 超过页大小的精灵单独占一页
+            page = self._new_page(width, height)
+            area = pygame.Rect(0, 0, width, height)
+        else:
+            x, y, row_height = self._cursor
+            if not self.pages or self.pages[-1].get_size() != (size, size):
+                page = self._new_page(size, size)
+                x = y = row_height = 0
+            else:
+                page = self.pages[-1]
+            if x + width > size:
+                x = 0
+                y += row_height + PADDING
+                row_height = 0
+            if y + height > size:
+                page = self._new_page(size, size)
+                x = y = row_height = 0
+            area = pygame.Rect(x, y, width, height)
+            self._cursor = [x + width + PADDING, y, max(row_height, height)]
+        # 直接复制像素（包括Alpha），不与透明背景混合
+        page.blit(surface, area.topleft, special_flags=pygame.BLEND_RGBA_MAX)
+        return page, area
+    
+    def frame(self, name: str, angle: float = 0.0) -> SpriteFrame:
+        """获取最接近指定角度（度）的精灵帧"""
+        frames = self.frames.get(name)
+        if frames is None:
+            self.build()
+            frames = self.frames[name]
+        if len(frames) == 1:
+            return frames[0]
+        recipe = self.recipes[name]
+        index = int(round(angle % recipe.period * len(frames) / recipe.period))
+        return frames[index % len(frames)]
+
+class SpriteBatch:
+    """按图层收集(图集页, 位置, 区域)，每个图层用一次Surface.blits绘制
+    
+    detail为False时子弹（add_bullets/add_many）改用图集中注册的简化精灵。
+    """
+    def __init__(self, atlas: Optional[SpriteAtlas] = None):
+        self.atlas = atlas if atlas is not None else sprite_atlas
+        self.layers: Dict[str, List[tuple]] = {}
+        self.detail = True
+    
+    def add(self, layer: str, name: str, x: float, y: float, angle: float = 0.0):
+        """添加一个以(x, y)为中心的精灵"""
+        page, area = self.atlas.frame(name, angle)
+        self.layers.setdefault(layer, []).append(
+            (page, (x - (area.width >> 1), y - (area.height >> 1)), area))
+    
+    def add_many(self, layer: str, name: str, xs: Sequence[float], ys: Sequence[float],
+                 count: int, angle: float = 0.0):
+        """添加多个相同帧的精灵（例如子弹池）"""
+        if not self.detail and name in self.atlas.simple_names:
+            name = self.atlas.simple_names[name]
+        page, area = self.atlas.frame(name, angle)
+        half_w = area.width >> 1
+        half_h = area.height >> 1
+        self.layers.setdefault(layer, []).extend(
+            [(page, (xs[i] - half_w, ys[i] - half_h), area) for i in range(count)])
+    
+    def add_bullets(self, layer: str, bullets: Iterable):
+        """添加子弹（子弹类提供sprite_name，旋转的子弹提供rotation）"""
+        simple_names = None if self.detail else self.atlas.simple_names
+        for bullet in bullets:
+            if bullet.is_active:
+                name = bullet.sprite_name
+                if simple_names and name in simple_names:
+                    self.add(layer, simple_names[name], bullet.x, bullet.y)
+                else:
+                    self.add(layer, name, bullet.x, bullet.y, getattr(bullet, 'rotation', 0))
+    
+    def flush(self, screen: pygame.Surface, layers: Iterable[str] = LAYERS) -> int:
+        """按顺序绘制并清空指定图层，返回绘制的精灵数量"""
+        count = 0
+        for layer in layers:
+            blits = self.layers.get(layer)
+            if blits:
+                screen.blits(blits, False)
+                count += len(blits)
+                blits.clear()
+        return count
+    
+    def clear(self):
+        """清空所有图层"""
+        for blits in self.layers.values():
+            blits.clear()
+
+# 全局精灵图集（各实体模块导入时注册自己的精灵）
+sprite_atlas = SpriteAtlas()
@@ -1,10 +1,37 @@
 from .player import Player
+from .sprite_atlas import ENTITY_ROTATIONS, sprite_atlas
 from .bullet import PlayerBullet
 import pygame
 import math
 from typing import List, Optional
 
+def draw_tank_sprite(image: pygame.Surface):
+    """坦克精灵"""
+    width, height = image.get_size()
+    
+    # 绘制一个蓝色正方形
+    center = (width // 2, height // 2)
+    radius = min(width, height) // 2 - 2
+    points = []
+    for i in range(4):
+        angle = math.pi * 2 / 4 * i
+        x = center[0] + radius * math.cos(angle)
+        y = center[1] + radius * math.sin(angle)
+        points.append((x, y))
+    
+    pygame.draw.polygon(image, (30, 144, 255), points)
+    pygame.draw.polygon(image, (0, 191, 255), points, 2)
+    
+    # 绘制一个小圆表示炮塔
+    turret_pos = (center[0], center[1] - radius + 8)
+    pygame.draw.circle(image, (135, 206, 250), turret_pos, 5)
+    pygame.draw.circle(image, (0, 191, 255), turret_pos, 5, 1)
+
+sprite_atlas.register("tank", (40, 40), draw_tank_sprite, ENTITY_ROTATIONS)
+
 class Tank(Player):
+    sprite_name = "tank"
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y)
         
@@ -24,41 +51,6 @@ class Tank(Player):
         self.skill_duration = 4.0
         self.skill_defense_bonus = 0.5  # 技能期间减伤50%
         self.skill_end_time: Optional[int] = None
-        
-        # 创建坦克图像
-        self._create_tank_image()
-    
-    def _create_tank_image(self):
-        """创建坦克的几何图形图像"""
-        try:
-            # 创建一个带有透明度的表面
-            image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            
-            # 绘制一个蓝色正方形
-            center = (self.width // 2, self.height // 2)
-            radius = min(self.width, self.height) // 2 - 2
-            points = []
-            for i in range(4):
-                angle = math.pi * 2 / 4 * i
-                x = center[0] + radius * math.cos(angle)
-                y = center[1] + radius * math.sin(angle)
-                points.append((x, y))
-            
-            pygame.draw.polygon(image, (30, 144, 255), points)
-            pygame.draw.polygon(image, (0, 191, 255), points, 2)
-            
-            # 绘制一个小圆表示炮塔
-            turret_pos = (center[0], center[1] - radius + 8)
-            pygame.draw.circle(image, (135, 206, 250), turret_pos, 5)
-            pygame.draw.circle(image, (0, 191, 255), turret_pos, 5, 1)
-            
-            self.set_image(image)
-            print(f"为坦克 {self.__class__.__name__} 创建图像")
-        
-        except Exception as e:
-            print(f"创建坦克图像时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
     
     def update(self):
         """更新坦克状态"""
@@ -116,15 +108,6 @@ class Tank(Player):
         self.add_attribute_bonus("defense_bonus", -self.skill_defense_bonus)
         self.skill_end_time = None
     
-    def render(self, screen: pygame.Surface):
-        """渲染坦克和子弹"""
-        # 渲染子弹
-        for bullet in self.bullets:
-            bullet.render(screen)
-        
-        # 渲染坦克
-        super().render(screen)
-    
     def level_up(self):
         """升级效果"""
         super().level_up()
@@ -0,0 +1,113 @@
+from enum import IntEnum
+from typing import Any, Callable, List
+
+class CombatEvent(IntEnum):
+    """战斗事件类型"""
+    HIT = 0       # 命中：source=受击者, target=攻击来源, value=伤害
+    KILL = 1      # 击杀：source=被击杀的敌人, target=击杀者, value=得分
+    LEVEL_UP = 2  # 升级：source=玩家, value=新等级
+    PICKUP = 3    # 拾取：source=玩家, target=资源类型('fragments'/'stars'), value=数量
+
+# 队列满时可以丢弃的事件（只影响受击表现和统计）；击杀、拾取和升级关系到得分和奖励，队列满时扩容
+DROPPABLE_EVENTS = frozenset((CombatEvent.HIT,))
+
+# 事件处理函数签名：handler(source, target, value)
+EventHandler = Callable[[Any, Any, float], None]
+
+class EventQueue:
+    """战斗事件队列
+    
+    事件以并行数组的形式存放在预分配的槽位中，push时不创建事件对象；
+    每帧调用一次drain，按入队顺序分发给订阅者。处理函数在分发过程中
+    推入的新事件会在同一次drain中继续处理。
+    """
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.types: List[int] = [0] * capacity
+        self.sources: List[Any] = [None] * capacity
+        self.targets: List[Any] = [None] * capacity
+        self.values: List[float] = [0] * capacity
+        self.count = 0
+        self.dropped = 0  # 队列满时丢弃的事件数量（只有DROPPABLE_EVENTS会被丢弃）
+        
+        event_type_count = len(CombatEvent)
+        self.subscribers: List[List[EventHandler]] = [[] for _ in range(event_type_count)]
+        
+        # 统计信息
+        self.totals: List[int] = [0] * event_type_count
+        self.frame_counts: List[int] = [0] * event_type_count
+    
+    def subscribe(self, event_type: CombatEvent, handler: EventHandler):
+        """订阅事件"""
+        handlers = self.subscribers[event_type]
+        if handler not in handlers:
+            handlers.append(handler)
+    
+    def unsubscribe(self, event_type: CombatEvent, handler: EventHandler):
+        """取消订阅事件"""
+        handlers = self.subscribers[event_type]
+        if handler in handlers:
+            handlers.remove(handler)
+    
+    def push(self, event_type: CombatEvent, source: Any = None, target: Any = None,
+             value: float = 0):
+        """推入事件，队列满时丢弃可丢弃的事件并计数，其余事件扩容后入队"""
+        n = self.count
+        if n >= self.capacity:
+            if event_type in DROPPABLE_EVENTS:
+                self.dropped += 1
+                return
+            self._grow()
+        self.types[n] = event_type
+        self.sources[n] = source
+        self.targets[n] = target
+        self.values[n] = value
+        self.count = n + 1
+    
+    def _grow(self):
+        """容量翻倍（原地扩展数组，drain中持有的数组引用仍然有效）"""
+        extra = self.capacity
+        self.types.extend([0] * extra)
+        self.sources.extend([None] * extra)
+        self.targets.extend([None] * extra)
+        self.values.extend([0] * extra)
+        self.capacity += extra
+        print(f"战斗事件队列扩容: {self.capacity}")
+    
+    def drain(self) -> int:
+        """分发并清空所有事件，返回本次处理的事件数量"""
+        frame_counts = self.frame_counts
+        for i in range(len(frame_counts)):
+            frame_counts[i] = 0
+        
+        types, sources, targets, values = self.types, self.sources, self.targets, self.values
+        subscribers = self.subscribers
+        i = 0
+        while i < self.count:
+            event_type = types[i]
+            frame_counts[event_type] += 1
+            for handler in subscribers[event_type]:
+                try:
+                    handler(sources[i], targets[i], values[i])
+                except Exception as e:
+                    print(f"处理事件 {CombatEvent(event_type).name} 时发生错误: {e}")
+                    import traceback
+                    traceback.print_exc()
+            i += 1
+        
+        # 释放对实体的引用
+        for j in range(i):
+            sources[j] = None
+            targets[j] = None
+        self.count = 0
+        
+        for event_type in range(len(frame_counts)):
+            self.totals[event_type] += frame_counts[event_type]
+        return i
+    
+    def clear(self):
+        """丢弃所有未处理的事件"""
+        for j in range(self.count):
+            self.sources[j] = None
+            self.targets[j] = None
+        self.count = 0
@@ -0,0 +1,166 @@
+import atexit
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 每帧记录的字段（按顺序保存为元组，写入文件时再转换为字典）
+FRAME_FIELDS = ('frame', 'time', 'scene', 'frame_ms', 'work_ms', 'update_ms', 'render_ms',
+                'gc_ms', 'gc_collections', 'alloc_blocks', 'quality', 'counts', 'events')
+
+def format_stack(frame) -> List[str]:
+    """把栈帧格式化为"文件:行号 函数"的列表（最内层在最后）"""
+    return [f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+            for entry in traceback.extract_stack(frame)]
+
+def sample_threads() -> Dict[str, List[str]]:
+    """所有线程当前的Python调用栈"""
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    return {names.get(ident, str(ident)): format_stack(frame)
+            for ident, frame in sys._current_frames().items()}
+
+class FlightRecorder:
+    """飞行记录器：环形缓冲区一直保存最近若干帧的分阶段耗时、实体数量、生成事件和垃圾回收情况，
+    某一帧超过阈值时，再记录after帧之后把前后的帧和调用栈采样写入文件，供离线分析
+    
+    支持setitimer的平台在每帧开始时设置一次性定时器，帧耗时超过阈值时在信号处理中
+    采样主线程的调用栈（即卡顿发生时正在执行的代码）；不支持时在检测到卡顿时采样所有线程。
+    """
+    def __init__(self, capacity: int = 300, threshold_ms: float = 50.0, after: int = 30,
+                 cooldown: float = 10.0, max_dumps: int = 20, directory: str = os.path.join("logs", "hitches"),
+                 clock: Callable[[], float] = time.perf_counter):
+        self.capacity = capacity
+        self.threshold_ms = threshold_ms
+        self.after = after          # 卡顿之后再记录的帧数
+        self.cooldown = cooldown    # 两次写入之间的最短间隔（秒）
+        self.max_dumps = max_dumps  # 每次运行最多写入的文件数
+        self.directory = directory
+        self.clock = clock
+        
+        self.frames: List[Optional[Tuple]] = [None] * capacity
+        self.index = 0
+        self.frame_count = 0
+        self.start_time = clock()
+        self.frame_start = self.start_time
+        self.counts: Dict[str, int] = {}          # 本帧的实体数量，由场景每帧设置
+        self.events: List[Tuple[float, str, str]] = []  # 本帧的事件：(帧内毫秒, 类型, 说明)
+        
+        self.dumps: List[str] = []
+        self.last_dump = float('-inf')
+        self._pending: Optional[Dict] = None  # 等待记录后续帧的卡顿
+        self._stack: Optional[List[str]] = None  # 本帧定时器采样到的主线程调用栈
+        self._expected = False  # 本帧预期较长（例如加载），不算作卡顿
+        self._timer = False
+    
+    def install(self):
+        """在主线程中调用：开启帧内调用栈采样（平台不支持时忽略）"""
+        if not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+            return
+        try:
+            signal.signal(signal.SIGALRM, self._on_alarm)
+            self._timer = True
+            self._arm()
+            # 无论从哪条路径退出都要取消定时器，否则解释器关闭后到期的SIGALRM会直接结束进程
+            atexit.register(self.uninstall)
+        except (ValueError, OSError) as e:
+            print(f"无法开启卡顿调用栈采样: {e}")
+    
+    def uninstall(self):
+        if self._timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, signal.SIG_DFL)
+            self._timer = False
+    
+    def _arm(self):
+        signal.setitimer(signal.ITIMER_REAL, self.threshold_ms / 1000)
+    
+    def _on_alarm(self, signum, frame):
+        if self._stack is None:
+            self._stack = format_stack(frame)
+    
+    def set_counts(self, **counts: int):
+        """设置本帧的实体数量（例如enemies、bullets）"""
+        self.counts.update(counts)
+    
+    def mark(self, kind: str, detail: str = ""):
+        """记录本帧发生的事件（例如生成敌人、切换场景）"""
+        self.events.append((round((self.clock() - self.frame_start) * 1000, 2), kind, detail))
+    
+    def expect_long_frame(self, reason: str):
+        """标记本帧预期较长（例如预加载），记录事件但不当作卡顿"""
+        self.mark("expected", reason)
+        self._expected = True
+    
+    def record(self, scene: Optional[str], frame_ms: float, work_ms: float, update_ms: float,
+               render_ms: float, gc_ms: float = 0.0, gc_collections: int = 0, alloc_blocks: int = 0,
+               quality: str = "") -> Optional[str]:
+        """帧结束时调用，记录本帧并检查卡顿，写入文件时返回文件路径"""
+        now = self.clock()
+        self.frames[self.index] = (self.frame_count, round((now - self.start_time) * 1000, 2), scene,
+                                   frame_ms, work_ms, update_ms, render_ms, gc_ms, gc_collections,
+                                   alloc_blocks, quality, self.counts, self.events)
+        self.index = (self.index + 1) % self.capacity
+        self.frame_count += 1
+        self.counts = {}
+        self.events = []
+        stack, self._stack = self._stack, None
+        expected, self._expected = self._expected, False
+        
+        path = None
+        if self._pending is not None:
+            self._pending['remaining'] -= 1
+            if self._pending['remaining'] <= 0:
+                path = self.dump()
+        elif (frame_ms >= self.threshold_ms and not expected and len(self.dumps) < self.max_dumps
+              and now - self.last_dump >= self.cooldown):
+            self._pending = {
+                'frame': self.frame_count - 1,
+                'frame_ms': frame_ms,
+                'scene': scene,
+                'remaining': self.after,
+                # 定时器采样的是卡顿期间的主线程栈；没有采样到时退而取所有线程的当前栈
+                'stack': stack,
+                'threads': None if stack else sample_threads()
+            }
+            print(f"检测到卡顿: 第{self.frame_count - 1}帧 {frame_ms:.1f}ms（场景 {scene}）")
+        
+        self.frame_start = self.clock()
+        if self._timer:
+            self._arm()
+        return path
+    
+    def window(self) -> List[Dict]:
+        """按时间顺序返回缓冲区中的所有帧"""
+        frames = self.frames[self.index:] + self.frames[:self.index]
+        return [dict(zip(FRAME_FIELDS, frame)) for frame in frames if frame is not None]
+    
+    def dump(self) -> Optional[str]:
+        """把当前窗口和卡顿信息写入JSON文件"""
+        hitch, self._pending = self._pending, None
+        self.last_dump = self.clock()
+        if hitch is None:
+            hitch = {'frame': self.frame_count - 1, 'frame_ms': 0.0, 'scene': None,
+                     'stack': None, 'threads': sample_threads()}
+        hitch.pop('remaining', None)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory,
+                                f"hitch_{time.strftime('%Y%m%d_%H%M%S')}_{hitch['frame']}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'hitch': hitch, 'threshold_ms': self.threshold_ms,
+                           'fields': FRAME_FIELDS, 'frames': self.window()},
+                          f, ensure_ascii=False)
+            self.dumps.append(path)
+            print(f"卡顿记录已保存: {path}")
+            return path
+        except Exception as e:
+            print(f"保存卡顿记录时发生错误: {e}")
+            traceback.print_exc()
+            return None
+
+# 全局飞行记录器
+flight_recorder = FlightRecorder()
@@ -0,0 +1,115 @@
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Optional
+
+class PacingMode(Enum):
+    """帧率控制方式"""
+    PRECISE = "precise"    # 粗粒度sleep + 短时间自旋，精确对齐帧截止时间
+    VSYNC = "vsync"        # 由垂直同步（flip阻塞）控制帧率，不额外等待
+    UNCAPPED = "uncapped"  # 不限帧率（用于基准测试）
+
+class FramePacer:
+    """帧节奏控制：统一的帧计时和帧率限制
+    
+    截止时间按固定周期递增而不是从本帧结束时重新计算，单帧的误差不会累积；
+    落后超过一帧时重新对齐，不会为了追赶而连续跑多帧。
+    sleep只睡到截止时间前spin_ms，剩下的时间自旋等待，避免sleep粒度带来的抖动。
+    等待之前调用idle（例如垃圾回收），参数为本帧剩余的空闲秒数（不限帧率等模式下为0）。
+    """
+    def __init__(self, fps: int = 60, mode: PacingMode = PacingMode.PRECISE,
+                 spin_ms: float = 1.5, history: int = 240,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.mode = mode
+        self.spin = spin_ms / 1000
+        self.clock = clock
+        self.sleep = sleep
+        self.intervals: Deque[float] = deque(maxlen=history)  # 最近的帧间隔（秒）
+        self.missed = 0        # 错过截止时间超过半帧的次数
+        self.vsync_check = 30  # 垂直同步模式下检查前多少帧是否真的被限帧
+        self.frame_count = 0
+        self.idle: Optional[Callable[[float], object]] = None  # 空闲回调
+        self.set_fps(fps)
+        
+        now = clock()
+        self.frame_start = now  # 本帧开始时间
+        self.deadline = now + self.period
+        self.frame_ms = 0.0     # 上一帧的完整耗时（毫秒，包含等待）
+        self.work_ms = 0.0      # 上一帧的工作耗时（毫秒，不含等待）
+    
+    def set_fps(self, fps: int):
+        """设置目标帧率（0表示不限帧率）"""
+        self.fps = fps
+        self.period = 1.0 / fps if fps > 0 else 0.0
+    
+    def set_mode(self, mode: PacingMode):
+        """切换帧率控制方式，重新对齐截止时间"""
+        self.mode = mode
+        self.deadline = self.clock() + self.period
+        print(f"帧率控制方式: {mode.value}")
+    
+    def elapsed_ms(self) -> float:
+        """本帧开始到现在的耗时（毫秒）"""
+        return (self.clock() - self.frame_start) * 1000
+    
+    def wait(self) -> float:
+        """等待到本帧的截止时间并开始下一帧，返回本帧的完整耗时（秒）"""
+        clock = self.clock
+        now = clock()
+        self.work_ms = (now - self.frame_start) * 1000
+        precise = self.mode == PacingMode.PRECISE and self.period > 0
+        
+        if self.idle is not None:
+            self.idle(max(0.0, self.deadline - now - self.spin) if precise else 0.0)
+            now = clock()
+        
+        if precise:
+            deadline = self.deadline
+            remaining = deadline - now
+            if remaining > self.spin:
+                self.sleep(remaining - self.spin)
+            while clock() < deadline:
+                pass
+            now = clock()
+            if now - deadline > self.period * 0.5:
+                self.missed += 1
+            # 落后超过一帧时从现在重新对齐，否则沿固定周期推进
+            if now - deadline > self.period:
+                self.deadline = now + self.period
+            else:
+                self.deadline = deadline + self.period
+        
+        interval = now - self.frame_start
+        self.frame_start = now
+        self.frame_ms = interval * 1000
+        self.intervals.append(interval)
+        self.frame_count += 1
+        
+        if self.mode == PacingMode.VSYNC and self.frame_count == self.vsync_check:
+            self._check_vsync()
+        return interval
+    
+    def _check_vsync(self):
+        """垂直同步没有生效（例如驱动不支持）时改用精确等待"""
+        recent = sorted(list(self.intervals)[-self.vsync_check:])
+        if recent[len(recent) // 2] < self.period * 0.5:
+            print("警告：垂直同步未生效，改用精确帧率控制")
+            self.set_mode(PacingMode.PRECISE)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """最近若干帧的帧间隔统计（毫秒）：平均值、抖动（标准差）、最大值和实际帧率"""
+        count = len(self.intervals)
+        if count == 0:
+            return {'frames': 0, 'mean_ms': 0.0, 'jitter_ms': 0.0, 'max_ms': 0.0,
+                    'fps': 0.0, 'missed': self.missed}
+        mean = sum(self.intervals) / count
+        variance = sum((interval - mean) ** 2 for interval in self.intervals) / count
+        return {
+            'frames': count,
+            'mean_ms': mean * 1000,
+            'jitter_ms': variance ** 0.5 * 1000,
+            'max_ms': max(self.intervals) * 1000,
+            'fps': 1.0 / mean if mean > 0 else 0.0,
+            'missed': self.missed
+        }
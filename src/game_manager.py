@@ -1,7 +1,18 @@
 import pygame
-import time
+import os
 from typing import Optional, Dict, Any
 from enum import Enum, auto
+from quality_governor import quality
+from frame_pacer import FramePacer, PacingMode
+from perf_stats import PerfLogEmitter, PerfStats, format_gc, format_memory, format_metrics
+from memory_telemetry import memory_telemetry
+from gc_controller import gc_controller
+from flight_recorder import flight_recorder
+from stall_watchdog import watchdog
+from sampling_profiler import profiler
+
+# 帧率控制方式（precise/vsync/uncapped），未设置时由vsync设置决定
+PACING_ENV = "GF_FRAME_PACING"
 
 class GameState(Enum):
     """游戏状态枚举"""
@@ -36,18 +47,38 @@ class GameManager:
         self.total_play_time = 0
         self.frame_count = 0
         
-        # 性能监控
-        self.fps_stats = []
-        self.last_fps_update = time.time()
-        self.current_fps = 0.0
+        # 性能监控：整体和按场景的滚动统计，每5秒输出一次日志
+        self.perf = PerfStats()
+        self.perf_log = PerfLogEmitter(self.get_performance_stats, interval=5.0)
+        
+        # 内存遥测：RSS和每帧分配量一直采样，对象数量只在显示性能信息或开启追踪时统计
+        self.memory = memory_telemetry
+        
+        # 画质调节：游戏中根据帧耗时自动升降画质档位
+        self.quality = quality
+        self.quality.set_target_fps(self.fps)
         
-        # 游戏时钟
-        self.clock = pygame.time.Clock()
+        # 游戏时钟（主循环和游戏管理器共用同一个帧节奏控制）
+        self.pacer = FramePacer(self.fps, self._pacing_mode())
         self.last_update_time = pygame.time.get_ticks()
         
+        # 垃圾回收：主循环开始后关闭自动回收，在每帧等待之前的空闲时间回收
+        self.gc_control = gc_controller
+        self.pacer.idle = self.gc_control.collect_in_slack
+        
+        # 飞行记录器：一直记录最近的帧，出现卡顿时把前后的帧写入文件
+        self.recorder = flight_recorder
+        
+        # 卡死检测：主循环每帧发送心跳，长时间没有心跳时把主线程调用栈写入日志
+        self.watchdog = watchdog
+        
+        # 采样分析器（F8开关），热点函数显示在调试信息中
+        self.profiler = profiler
+        
         # 调试信息
         self.debug_info: Dict[str, Any] = {
             'frame_time': 0.0,
+            'work_time': 0.0,
             'update_time': 0.0,
             'render_time': 0.0,
             'entity_count': 0,
@@ -58,14 +89,13 @@ class GameManager:
             'show_entity_bounds': False,
             'show_performance': False
         }
+        self._debug_font: Optional[pygame.font.Font] = None
         
         print(f"游戏管理器初始化完成 - 分辨率: {self.screen_width}x{self.screen_height}, 目标FPS: {self.fps}")
     
     def update(self):
         """更新游戏状态"""
         try:
-            start_time = time.time()
-            
             # 更新游戏时间
             current_time = pygame.time.get_ticks()
             delta_time = current_time - self.last_update_time
@@ -74,60 +104,102 @@ class GameManager:
             if self.state != GameState.PAUSED:
                 self.total_play_time += delta_time
             
-            # 更新FPS统计
             self.frame_count += 1
-            if time.time() - self.last_fps_update >= 1.0:
-                self.current_fps = self.frame_count
-                self.fps_stats.append(self.current_fps)
-                if len(self.fps_stats) > 60:  # 保留最近60秒的FPS记录
-                    self.fps_stats.pop(0)
-                self.frame_count = 0
-                self.last_fps_update = time.time()
-            
-            # 更新调试信息
-            self.debug_info['update_time'] = time.time() - start_time
-            self.debug_info['frame_time'] = self.clock.get_time()
-            
-            if self.debug_info['frame_time'] > 1000.0 / self.fps:
-                print(f"警告：帧时间过长 ({self.debug_info['frame_time']:.1f}ms)")
         
         except Exception as e:
             print(f"游戏状态更新错误: {e}")
             import traceback
             traceback.print_exc()
     
+    def _pacing_mode(self) -> PacingMode:
+        """确定帧率控制方式"""
+        value = os.environ.get(PACING_ENV, "")
+        if value:
+            try:
+                return PacingMode(value)
+            except ValueError:
+                print(f"警告：未知的帧率控制方式 {value}")
+        return PacingMode.VSYNC if self.vsync else PacingMode.PRECISE
+    
+    def create_display(self) -> pygame.Surface:
+        """创建可调整大小的窗口，请求垂直同步失败时改用精确帧率控制"""
+        size = (self.screen_width, self.screen_height)
+        flags = pygame.HWSURFACE | pygame.DOUBLEBUF | pygame.RESIZABLE
+        if self.pacer.mode == PacingMode.VSYNC:
+            try:
+                # pygame只在SCALED或OPENGL窗口上支持垂直同步
+                return pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"无法开启垂直同步: {e}")
+                self.pacer.set_mode(PacingMode.PRECISE)
+        return pygame.display.set_mode(size, flags)
+    
+    def handle_resize(self) -> bool:
+        """窗口大小变化（VIDEORESIZE）后读取新的画面大小，画面大小确实变化时返回True
+        
+        SCALED窗口（垂直同步）由SDL缩放，逻辑大小不变，不需要调整布局。
+        """
+        surface = pygame.display.get_surface()
+        if surface is None:
+            return False
+        width, height = surface.get_size()
+        if width == self.screen_width and height == self.screen_height:
+            return False
+        self.screen_width = width
+        self.screen_height = height
+        self.recorder.mark("resize", f"{width}x{height}")
+        print(f"窗口大小变化: {width}x{height}")
+        return True
+    
     def render_debug_info(self, screen: pygame.Surface):
         """渲染调试信息"""
         if not self.debug_info['show_debug']:
             return
         
         try:
-            font = pygame.font.SysFont(None, 24)
+            # SysFont每次都要查找字体文件，只创建一次
+            if self._debug_font is None:
+                self._debug_font = pygame.font.SysFont(None, 24)
+            font = self._debug_font
             y = 10
             line_height = 20
             
+            # 每帧只做常数时间的快照查询（不含按场景的统计）
+            snapshot = self.perf.snapshot(include_scenes=False)
+            
             # 显示FPS
             if self.debug_info['show_fps']:
-                fps_text = f"FPS: {self.current_fps:.1f}"
+                fps_text = f"FPS: {snapshot['fps']:.1f}"
                 text_surface = font.render(fps_text, True, (255, 255, 255))
                 screen.blit(text_surface, (10, y))
                 y += line_height
             
             # 显示性能信息
             if self.debug_info['show_performance']:
-                perf_texts = [
-                    f"帧时间: {self.debug_info['frame_time']:.1f}ms",
-                    f"更新时间: {self.debug_info['update_time']:.1f}ms",
-                    f"渲染时间: {self.debug_info['render_time']:.1f}ms",
-                    f"实体数量: {self.debug_info['entity_count']}",
-                    f"内存使用: {self.debug_info['memory_usage'] / 1024 / 1024:.1f}MB"
-                ]
+                perf_texts = format_metrics(snapshot['metrics']) + [
+                    f"帧抖动: {self.pacer.get_stats()['jitter_ms']:.2f}ms ({self.pacer.mode.value})",
+                    f"画质: {self.quality.tier.name}",
+                    format_gc(self.gc_control.get_stats()),
+                    f"实体数量: {self.debug_info['entity_count']}"
+                ] + format_memory(self.memory.snapshot())
                 
                 for text in perf_texts:
                     text_surface = font.render(text, True, (255, 255, 255))
                     screen.blit(text_surface, (10, y))
                     y += line_height
             
+            # 显示采样分析器的热点函数（开启中或刚关闭时）
+            if self.profiler.running or self.profiler.hot:
+                profiler_texts = [f"采样分析: {self.profiler.samples}次采样"
+                                  f"{' (采样中)' if self.profiler.running else ''}"]
+                for entry in self.profiler.hot:
+                    profiler_texts.append(f"  {entry['self_percent']:5.1f}% {entry['function']}")
+                
+                for text in profiler_texts:
+                    text_surface = font.render(text, True, (255, 255, 0))
+                    screen.blit(text_surface, (10, y))
+                    y += line_height
+            
             # 显示游戏状态
             state_text = f"游戏状态: {self.state.name}"
             text_surface = font.render(state_text, True, (255, 255, 255))
@@ -166,6 +238,13 @@ class GameManager:
         """切换性能信息显示"""
         self.debug_info['show_performance'] = not self.debug_info['show_performance']
         print(f"性能信息显示: {'开启' if self.debug_info['show_performance'] else '关闭'}")
+        self.memory.census_enabled = self.debug_info['show_performance'] or self.memory.tracing
+    
+    def toggle_profiler(self):
+        """开关采样分析器，关闭时把折叠栈写入文件"""
+        self.profiler.toggle()
+        if self.profiler.running and not self.debug_info['show_debug']:
+            self.toggle_debug_info()
     
     def toggle_collision_display(self):
         """切换碰撞显示"""
@@ -177,12 +256,35 @@ class GameManager:
         self.debug_info['show_entity_bounds'] = not self.debug_info['show_entity_bounds']
         print(f"实体边界显示: {'开启' if self.debug_info['show_entity_bounds'] else '关闭'}")
     
+    def end_frame(self, scene: Optional[str] = None):
+        """帧结束（帧率限制的等待之后）：记录性能和内存统计，游戏进行中用工作耗时调节画质"""
+        self.watchdog.heartbeat()
+        pacer = self.pacer
+        info = self.debug_info
+        info['frame_time'] = pacer.frame_ms
+        info['work_time'] = pacer.work_ms
+        self.perf.record_frame(pacer.frame_ms, pacer.work_ms, info['update_time'], info['render_time'], scene)
+        self.memory.update()
+        info['memory_usage'] = self.memory.rss_bytes
+        info['entity_count'] = sum(self.recorder.counts.values())
+        gc_ms, gc_collections = self.gc_control.take_frame()
+        self.recorder.record(scene, pacer.frame_ms, pacer.work_ms, info['update_time'], info['render_time'],
+                             gc_ms, gc_collections, int(self.memory.block_deltas.last), self.quality.tier.name)
+        if self.state == GameState.PLAYING:
+            self.quality.record_frame(pacer.work_ms)
+        self.perf_log.update()
+    
     def change_state(self, new_state: GameState):
         """切换游戏状态"""
         if new_state != self.state:
             print(f"游戏状态从 {self.state.name} 切换到 {new_state.name}")
             self.previous_state = self.state
             self.state = new_state
+            self.recorder.mark("state", new_state.name)
+            # 切换状态前后的帧耗时不具有可比性
+            self.quality.reset()
+            # 切换状态时通常有大量对象被丢弃，在下一帧的空闲时间完整回收一次
+            self.gc_control.request_full()
     
     def pause(self):
         """暂停游戏"""
@@ -203,7 +305,13 @@ class GameManager:
         print(f"- 收集碎片: {self.total_fragments}")
         print(f"- 收集星星: {self.total_stars}")
         print(f"- 游戏时间: {self.get_play_time_str()}")
-        print(f"- 平均FPS: {sum(self.fps_stats) / len(self.fps_stats):.1f}" if self.fps_stats else "- 平均FPS: N/A")
+        print(f"- 平均FPS: {self.perf.average_fps:.1f}" if len(self.perf.fps_history) else "- 平均FPS: N/A")
+        gc_stats = self.gc_control.get_stats()
+        print(f"- 垃圾回收: {sum(gc_stats['collections'])}次, 最长停顿 {gc_stats['pause']['max']:.1f}ms")
+        self.gc_control.stop()
+        self.recorder.uninstall()
+        self.watchdog.stop()
+        self.profiler.stop()
         self.running = False
     
     def add_score(self, score: int):
@@ -253,10 +361,22 @@ class GameManager:
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """获取性能统计信息"""
+        pacing = self.pacer.get_stats()
+        snapshot = self.perf.snapshot()
         return {
-            'fps': self.current_fps,
+            'fps': snapshot['fps'],
             'frame_time': self.debug_info['frame_time'],
             'update_time': self.debug_info['update_time'],
             'render_time': self.debug_info['render_time'],
-            'average_fps': sum(self.fps_stats) / len(self.fps_stats) if self.fps_stats else 0
+            'quality': self.quality.tier.name,
+            'pacing': self.pacer.mode.value,
+            'jitter_ms': pacing['jitter_ms'],
+            'max_frame_ms': pacing['max_ms'],
+            'missed_frames': pacing['missed'],
+            'average_fps': snapshot['average_fps'],
+            'metrics': snapshot['metrics'],
+            'scenes': snapshot['scenes'],
+            'memory': self.memory.snapshot(),
+            'gc': self.gc_control.get_stats(),
+            'watchdog': self.watchdog.get_stats()
         } 
\ No newline at end of file
@@ -0,0 +1,145 @@
+import gc
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from perf_stats import MetricStats
+
+class GCController:
+    """垃圾回收控制：关闭自动回收，改为在帧末尾的空闲时间按代手动回收
+    
+    自动回收可能在更新或渲染的任意位置触发，表现为随机的长帧。控制器接管后：
+    - 启动完成时gc.freeze()，启动期间创建的长期对象不再参与之后的回收；
+    - 每帧由帧节奏控制在等待之前调用collect_in_slack，年轻代超过阈值且空闲时间
+      够用时回收，回收耗时按代估计；
+    - 老年代回收耗时较长，空闲时间不够时最多推迟max_defer帧；
+    - 年轻代对象数超过emergency时不论空闲时间立即回收，避免内存无限增长。
+    """
+    def __init__(self, thresholds: Tuple[int, int, int] = (1000, 10, 10), emergency: int = 20000,
+                 max_defer: int = 600, clock: Callable[[], float] = time.perf_counter,
+                 get_count: Callable[[], Tuple[int, int, int]] = gc.get_count,
+                 collect: Callable[[int], int] = gc.collect):
+        self.thresholds = thresholds
+        self.emergency = emergency
+        self.max_defer = max_defer
+        self.clock = clock
+        self.get_count = get_count
+        self.collect = collect
+        self.enabled = False
+        self._saved_thresholds: Optional[Tuple[int, int, int]] = None
+        
+        # 各代回收耗时的估计（毫秒，指数平均），老年代初始按较大的值估计
+        self.estimates: List[float] = [0.2, 0.5, 5.0]
+        self.pauses = MetricStats(window=120, min_samples=5)  # 每次回收的停顿（毫秒）
+        self.collections = [0, 0, 0]  # 各代回收次数
+        self.unscheduled = 0          # 控制器之外触发的回收（自动回收或其他代码直接调用）
+        self.deferred = 0             # 老年代回收已推迟的帧数
+        self.full_requested = False
+        self.frozen = 0  # 冻结的对象数（gc.get_freeze_count要遍历整个永久代，只在冻结时读取一次）
+        self.last_pause_ms = 0.0
+        self.frame_pause_ms = 0.0   # 本帧的回收停顿合计（毫秒）
+        self.frame_collections = 0  # 本帧的回收次数
+        self._scheduled = False
+        self._start_time = 0.0
+    
+    def start(self):
+        """接管垃圾回收：关闭自动回收并开始记录回收停顿"""
+        if self.enabled:
+            return
+        self._saved_thresholds = gc.get_threshold()
+        gc.set_threshold(*self.thresholds)
+        gc.disable()
+        gc.callbacks.append(self._on_gc)
+        self.enabled = True
+        print(f"垃圾回收由帧空闲时间调度 - 阈值: {self.thresholds}")
+    
+    def stop(self):
+        """恢复自动回收"""
+        if not self.enabled:
+            return
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._saved_thresholds is not None:
+            gc.set_threshold(*self._saved_thresholds)
+        gc.enable()
+        self.enabled = False
+    
+    def freeze(self):
+        """回收一次后冻结当前所有对象（启动和预加载完成时调用）"""
+        start = self.clock()
+        self._run(2)
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        print(f"冻结启动对象: {self.frozen}个, 耗时 {(self.clock() - start) * 1000:.1f}ms")
+    
+    def request_full(self):
+        """请求在下一个空闲时间做一次完整回收（例如切换场景后有大量垃圾）"""
+        self.full_requested = True
+    
+    def _on_gc(self, phase: str, info: Dict):
+        if phase == "start":
+            self._start_time = self.clock()
+            return
+        pause = (self.clock() - self._start_time) * 1000
+        generation = info['generation']
+        self.last_pause_ms = pause
+        self.frame_pause_ms += pause
+        self.frame_collections += 1
+        self.pauses.add(pause)
+        self.collections[generation] += 1
+        self.estimates[generation] = self.estimates[generation] * 0.7 + pause * 0.3
+        if not self._scheduled:
+            self.unscheduled += 1
+    
+    def _run(self, generation: int):
+        self._scheduled = True
+        try:
+            self.collect(generation)
+        finally:
+            self._scheduled = False
+    
+    def collect_in_slack(self, slack: float) -> Optional[int]:
+        """帧末尾调用，slack为距离帧截止时间的空闲秒数，返回回收的代（没有回收时返回None）"""
+        if not self.enabled:
+            return None
+        slack_ms = slack * 1000
+        young, middle, old = self.get_count()
+        threshold0, threshold1, threshold2 = self.thresholds
+        
+        # 老年代：请求完整回收、空闲时间够用或推迟太久时回收
+        if self.full_requested or old >= threshold2:
+            if (self.full_requested or slack_ms >= self.estimates[2] * 1.2
+                    or self.deferred >= self.max_defer):
+                self.full_requested = False
+                self.deferred = 0
+                self._run(2)
+                return 2
+            self.deferred += 1
+        
+        if young < threshold0:
+            return None
+        generation = 1 if middle >= threshold1 else 0
+        if slack_ms >= self.estimates[generation] * 1.2 or young >= self.emergency:
+            self._run(generation)
+            return generation
+        return None
+    
+    def take_frame(self) -> Tuple[float, int]:
+        """返回本帧的回收停顿合计和次数，并开始统计下一帧"""
+        result = (self.frame_pause_ms, self.frame_collections)
+        self.frame_pause_ms = 0.0
+        self.frame_collections = 0
+        return result
+    
+    def get_stats(self) -> Dict:
+        """回收统计：各代次数、停顿分布（毫秒）、非调度回收次数和冻结对象数"""
+        return {
+            'collections': list(self.collections),
+            'pause': self.pauses.snapshot(),
+            'last_pause_ms': self.last_pause_ms,
+            'unscheduled': self.unscheduled,
+            'deferred': self.deferred,
+            'frozen': self.frozen,
+            'enabled': self.enabled
+        }
+
+# 全局垃圾回收控制
+gc_controller = GCController()
@@ -0,0 +1,168 @@
+import pygame
+import math
+from enum import Enum, auto
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+class Action(Enum):
+    """输入动作"""
+    MOVE_UP = auto()
+    MOVE_DOWN = auto()
+    MOVE_LEFT = auto()
+    MOVE_RIGHT = auto()
+    FIRE = auto()
+    SKILL = auto()
+    PAUSE = auto()
+
+# 默认按键映射
+DEFAULT_KEY_BINDINGS: Dict[int, Action] = {
+    pygame.K_w: Action.MOVE_UP,
+    pygame.K_s: Action.MOVE_DOWN,
+    pygame.K_a: Action.MOVE_LEFT,
+    pygame.K_d: Action.MOVE_RIGHT,
+    pygame.K_UP: Action.MOVE_UP,
+    pygame.K_DOWN: Action.MOVE_DOWN,
+    pygame.K_LEFT: Action.MOVE_LEFT,
+    pygame.K_RIGHT: Action.MOVE_RIGHT,
+    pygame.K_ESCAPE: Action.PAUSE
+}
+
+# 默认鼠标按键映射（pygame.mouse.get_pressed的下标）
+DEFAULT_MOUSE_BINDINGS: Dict[int, Action] = {
+    0: Action.FIRE,   # 左键射击
+    2: Action.SKILL   # 右键技能
+}
+
+# 游戏需要处理的事件类型，其余事件在SDL层直接丢弃
+ALLOWED_EVENTS = [
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL,
+    pygame.VIDEORESIZE,
+    pygame.VIDEOEXPOSE,
+    pygame.ACTIVEEVENT,
+    pygame.WINDOWFOCUSLOST,
+    pygame.WINDOWFOCUSGAINED,
+    pygame.USEREVENT
+]
+
+class InputSnapshot(NamedTuple):
+    """一个模拟帧的输入状态（不可变）"""
+    tick: int                               # 采样序号
+    held: FrozenSet[Action]                 # 本帧按住的动作
+    pressed: FrozenSet[Action]              # 本帧新触发的动作
+    move: Tuple[float, float]               # 标准化后的移动方向
+    mouse_pos: Tuple[int, int]
+    mouse_buttons: Tuple[bool, ...]
+    
+    def is_held(self, action: Action) -> bool:
+        """动作是否处于按住状态"""
+        return action in self.held
+    
+    def was_pressed(self, action: Action) -> bool:
+        """动作是否在本帧被触发"""
+        return action in self.pressed
+
+# 没有任何输入时的快照
+EMPTY_SNAPSHOT = InputSnapshot(0, frozenset(), frozenset(), (0.0, 0.0), (0, 0), (False, False, False))
+
+class InputManager:
+    """输入管理器
+    
+    每帧调用一次poll获取过滤和合并后的事件，再调用一次sample把键盘和鼠标状态
+    采样为不可变的InputSnapshot，游戏逻辑只读取快照，不再逐事件查询设备状态。
+    """
+    def __init__(self, key_bindings: Optional[Dict[int, Action]] = None,
+                 mouse_bindings: Optional[Dict[int, Action]] = None):
+        self.key_bindings = dict(key_bindings if key_bindings is not None else DEFAULT_KEY_BINDINGS)
+        self.mouse_bindings = dict(mouse_bindings if mouse_bindings is not None else DEFAULT_MOUSE_BINDINGS)
+        self.snapshot = EMPTY_SNAPSHOT
+        
+        # 两次采样之间按下过的动作（按下又松开的快速点击也不会丢失）
+        self.pending_presses = set()
+        
+        # 统计信息
+        self.stats = {
+            'events': 0,
+            'coalesced': 0  # 被合并掉的鼠标移动事件
+        }
+    
+    def install(self, allowed: Sequence[int] = ALLOWED_EVENTS):
+        """只允许指定类型的事件进入事件队列"""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(allowed))
+    
+    def bind_key(self, key: int, action: Action):
+        """绑定按键到动作"""
+        self.key_bindings[key] = action
+    
+    def poll(self) -> List[pygame.event.Event]:
+        """取出本帧的所有事件，连续的鼠标移动事件合并为一个"""
+        events = pygame.event.get()
+        self.stats['events'] += len(events)
+        
+        result = []
+        motion_index = -1
+        rel_x = rel_y = 0
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                rel_x += event.rel[0]
+                rel_y += event.rel[1]
+                if motion_index >= 0:
+                    # 保留最后一次位置，累加位移
+                    self.stats['coalesced'] += 1
+                    result[motion_index] = pygame.event.Event(
+                        pygame.MOUSEMOTION, pos=event.pos, rel=(rel_x, rel_y), buttons=event.buttons)
+                    continue
+                motion_index = len(result)
+            elif event.type == pygame.KEYDOWN:
+                action = self.key_bindings.get(event.key)
+                if action is not None:
+                    self.pending_presses.add(action)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                action = self.mouse_bindings.get(event.button - 1)
+                if action is not None:
+                    self.pending_presses.add(action)
+            result.append(event)
+        return result
+    
+    def sample(self) -> InputSnapshot:
+        """采样当前键盘和鼠标状态，每个模拟帧调用一次"""
+        return self.build_snapshot(pygame.key.get_pressed(), pygame.mouse.get_pos(),
+                                   pygame.mouse.get_pressed())
+    
+    def build_snapshot(self, keys, mouse_pos: Tuple[int, int],
+                       mouse_buttons: Tuple[bool, ...]) -> InputSnapshot:
+        """根据设备状态生成输入快照"""
+        held = set()
+        for key, action in self.key_bindings.items():
+            if keys[key]:
+                held.add(action)
+        for button, action in self.mouse_bindings.items():
+            if button < len(mouse_buttons) and mouse_buttons[button]:
+                held.add(action)
+        
+        pressed = frozenset((held - self.snapshot.held) | self.pending_presses)
+        self.pending_presses.clear()
+        
+        # 计算标准化的移动方向
+        dx = (Action.MOVE_RIGHT in held) - (Action.MOVE_LEFT in held)
+        dy = (Action.MOVE_DOWN in held) - (Action.MOVE_UP in held)
+        if dx != 0 and dy != 0:
+            length = math.sqrt(dx * dx + dy * dy)
+            move = (dx / length, dy / length)
+        else:
+            move = (float(dx), float(dy))
+        
+        self.snapshot = InputSnapshot(
+            self.snapshot.tick + 1,
+            frozenset(held),
+            pressed,
+            move,
+            tuple(mouse_pos),
+            tuple(bool(b) for b in mouse_buttons)
+        )
+        return self.snapshot
@@ -1,3 +1,11 @@
+import startup_trace
+from startup_trace import tracer
+# 启动追踪（GF_TRACE_STARTUP=1）需要在导入其他模块之前开启
+startup_trace.install_from_env()
+# 内存分配追踪（GF_MEMORY_TRACE=栈帧数）同样要尽早开启，才能记录到导入时的分配
+import memory_telemetry
+memory_telemetry.install_from_env()
+
 import pygame
 import sys
 import traceback
@@ -7,15 +15,20 @@ from resource_manager import ResourceManager
 from scene_manager import SceneManager
 from save_manager import SaveManager
 from ui.main_menu import MainMenu
-from ui.character_select import CharacterSelect
-from ui.shop import Shop
-from scenes.game_scene import GameScene
+from event_bus import CombatEvent
+from input_manager import InputManager
+import stall_watchdog
+import sampling_profiler
+from ui.ui_element import UIElement
+from ui.text_atlas import TextAtlas
+# 商店和游戏场景（以及实体模块）在第一次使用时才导入，见create_scenes
 
 def initialize_game():
     """初始化游戏"""
     try:
         # 初始化Pygame
-        pygame.init()
+        with tracer.span("pygame.init"):
+            pygame.init()
         if not pygame.display.get_init():
             print("错误：无法初始化显示模块")
             return None, None, None, None, None
@@ -40,10 +53,8 @@ def initialize_game():
         
         try:
             # 创建窗口化屏幕
-            screen = pygame.display.set_mode(
-                (game_manager.screen_width, game_manager.screen_height),
-                pygame.HWSURFACE | pygame.DOUBLEBUF  # 移除全屏标志
-            )
+            with tracer.span("display.set_mode"):
+                screen = game_manager.create_display()
             pygame.display.set_caption("几何战斗")
             print("显示窗口创建成功")
             
@@ -58,8 +69,13 @@ def initialize_game():
             print(f"错误：无法创建显示窗口: {e}")
             return None, None, None, None, None
         
+        # 加载预烘焙的静态文字图集，未烘焙的文本在运行时渲染
+        with tracer.span("TextAtlas.load"):
+            UIElement.text_atlas = TextAtlas.load()
+        
         # 创建资源管理器
-        resource_manager = ResourceManager()
+        with tracer.span("ResourceManager"):
+            resource_manager = ResourceManager()
         print("资源管理器创建成功")
         
         # 创建场景管理器
@@ -67,7 +83,8 @@ def initialize_game():
         print("场景管理器创建成功")
         
         # 创建存档管理器
-        save_manager = SaveManager()
+        with tracer.span("SaveManager"):
+            save_manager = SaveManager()
         print("存档管理器创建成功")
         
         return game_manager, screen, resource_manager, scene_manager, save_manager
@@ -76,29 +93,75 @@ def initialize_game():
         traceback.print_exc()
         return None, None, None, None, None
 
+def bind_combat_events(game_scene, game_manager, resource_manager):
+    """订阅战斗事件：音效和全局统计（用于存档）"""
+    events = game_scene.events
+    
+    # 音效
+    events.subscribe(CombatEvent.HIT, lambda source, target, value: resource_manager.play_sound("hit"))
+    events.subscribe(CombatEvent.LEVEL_UP, lambda source, target, value: resource_manager.play_sound("levelup"))
+    events.subscribe(CombatEvent.PICKUP, lambda source, target, value: resource_manager.play_sound("collect"))
+    
+    # 全局统计
+    def on_kill(enemy, killer, score):
+        game_manager.add_score(int(score))
+    
+    def on_pickup(player, currency, amount):
+        if currency == 'fragments':
+            game_manager.add_fragments(int(amount))
+        elif currency == 'stars':
+            game_manager.add_stars(int(amount))
+    
+    events.subscribe(CombatEvent.KILL, on_kill)
+    events.subscribe(CombatEvent.PICKUP, on_pickup)
+
 def create_scenes(game_manager, scene_manager, resource_manager):
-    """创建并注册场景"""
+    """创建并注册场景
+    
+    首帧只需要主菜单，商店和游戏场景注册为工厂，第一次切换或预初始化时才导入模块并创建。
+    """
     try:
-        # 创建场景
-        main_menu = MainMenu(game_manager.screen_width, game_manager.screen_height)
-        shop = Shop(game_manager.screen_width, game_manager.screen_height)
-        game_scene = GameScene(game_manager.screen_width, game_manager.screen_height)
-        print("所有场景创建成功")
+        # 创建主菜单
+        with tracer.span("scene:main_menu"):
+            main_menu = MainMenu(game_manager.screen_width, game_manager.screen_height)
+        scene_manager.register_scene("main_menu", main_menu)
+        
+        def back_to_menu():
+            game_manager.change_state(GameState.MAIN_MENU)
+            scene_manager.switch_scene("main_menu")
+            # 切换回主菜单音乐
+            resource_manager.play_music("menu_bgm", loop=True)
+            print("返回主菜单")
+        
+        def create_shop():
+            from ui.shop import Shop
+            shop = Shop(game_manager.screen_width, game_manager.screen_height)
+            shop.back_button.callback = back_to_menu
+            print("商店场景创建成功")
+            return shop
+        
+        def create_game_scene():
+            from scenes.game_scene import GameScene
+            game_scene = GameScene(game_manager.screen_width, game_manager.screen_height)
+            bind_combat_events(game_scene, game_manager, resource_manager)
+            print("游戏场景创建成功")
+            return game_scene
         
         # 注册场景
-        scene_manager.register_scene("main_menu", main_menu)
-        scene_manager.register_scene("shop", shop)
-        scene_manager.register_scene("game", game_scene)
+        scene_manager.register_scene_factory("shop", create_shop)
+        scene_manager.register_scene_factory("game", create_game_scene)
         print("场景注册完成")
         
         # 设置主菜单回调
         def start_game():
             # 直接使用士兵作为默认角色
             from entities.soldier import Soldier
+            game_scene = scene_manager.get_scene("game")
+            if game_scene is None:
+                return
             game_scene.set_player_class(Soldier)
-            game_scene.initialize()
             game_manager.change_state(GameState.PLAYING)
-            scene_manager.switch_scene("game")
+            scene_manager.switch_scene("game", reinitialize=True)
             resource_manager.play_music("battle_bgm", loop=True)
             print("开始游戏，使用士兵角色")
         
@@ -117,23 +180,20 @@ def create_scenes(game_manager, scene_manager, resource_manager):
         main_menu.set_callback("quit", quit_game)
         print("主菜单回调设置完成")
         
-        # 设置商店回调
-        def back_to_menu():
-            game_manager.change_state(GameState.MAIN_MENU)
-            scene_manager.switch_scene("main_menu")
-            # 切换回主菜单音乐
-            resource_manager.play_music("menu_bgm", loop=True)
-            print("返回主菜单")
-        
-        shop.back_button.callback = back_to_menu
-        print("商店回调设置完成")
-        
         return True
     except Exception as e:
         print(f"创建场景时发生错误: {e}")
         traceback.print_exc()
         return False
 
+def preload_game_scene(scene_manager):
+    """创建游戏场景并在后台预初始化（默认士兵角色），开始游戏时无需等待"""
+    from entities.soldier import Soldier
+    game_scene = scene_manager.get_scene("game")
+    if game_scene is not None:
+        game_scene.set_player_class(Soldier)
+        scene_manager.preload_scene("game")
+
 def main():
     """游戏主函数"""
     # 初始化游戏
@@ -152,20 +212,31 @@ def main():
     scene_manager.switch_scene("main_menu")
     resource_manager.play_music("menu_bgm", loop=True)
     
+    # 输入管理：过滤不需要的事件类型
+    input_manager = InputManager()
+    input_manager.install()
+    
     print("游戏初始化完成，开始主循环")
     
-    # 游戏主循环
-    clock = pygame.time.Clock()
-    last_performance_check = time.time()
-    performance_check_interval = 5.0  # 每5秒检查一次性能
+    # 游戏主循环（帧计时和帧率限制由游戏管理器的帧节奏控制统一负责）
+    # 性能统计在每帧结束时记录，由游戏管理器定期输出日志
+    pacer = game_manager.pacer
+    first_frame = True  # 首帧显示之后再创建并预初始化游戏场景
+    
+    # 垃圾回收改由帧空闲时间调度，不在更新和渲染中途触发
+    game_manager.gc_control.start()
+    # 飞行记录器在主线程设置卡顿时的调用栈采样
+    game_manager.recorder.install()
+    # 卡死检测线程在主循环开始时启动，之前的初始化阶段不受阈值限制
+    stall_watchdog.install_from_env()
+    game_manager.watchdog.start()
+    sampling_profiler.install_from_env()
     
     try:
         while game_manager.running:
             try:
-                loop_start_time = time.time()
-                
                 # 处理事件
-                for event in pygame.event.get():
+                for event in input_manager.poll():
                     if event.type == pygame.QUIT:
                         game_manager.change_state(GameState.QUITTING)
                         game_manager.quit()
@@ -181,18 +252,28 @@ def main():
                             game_manager.toggle_collision_display()
                         elif event.key == pygame.K_F7:
                             game_manager.toggle_entity_bounds_display()
+                        elif event.key == pygame.K_F8:
+                            game_manager.toggle_profiler()
                         else:
                             scene_manager.handle_event(event)
+                    elif event.type == pygame.VIDEORESIZE:
+                        # 窗口大小变化：画面表面由pygame重新创建，通知所有场景调整布局
+                        if game_manager.handle_resize():
+                            screen = pygame.display.get_surface()
+                            scene_manager.resize(game_manager.screen_width, game_manager.screen_height)
                     else:
                         scene_manager.handle_event(event)
                 
                 # 更新游戏状态
+                update_start_time = time.perf_counter()
                 game_manager.update()
-                scene_manager.update()
+                scene_manager.update(input_manager.sample())
+                resource_manager.update()
+                game_manager.debug_info['update_time'] = (time.perf_counter() - update_start_time) * 1000
                 
                 # 渲染画面
                 try:
-                    render_start_time = time.time()
+                    render_start_time = time.perf_counter()
                     
                     screen.fill((30, 30, 30))  # 背景色
                     scene_manager.render(screen)
@@ -203,7 +284,18 @@ def main():
                     pygame.display.flip()
                     
                     # 更新渲染时间
-                    game_manager.debug_info['render_time'] = (time.time() - render_start_time) * 1000
+                    game_manager.debug_info['render_time'] = (time.perf_counter() - render_start_time) * 1000
+                    
+                    if first_frame:
+                        first_frame = False
+                        if tracer.first_frame():
+                            # 只测量启动时间（GF_TRACE_STARTUP=exit）
+                            pygame.quit()
+                            return
+                        game_manager.recorder.expect_long_frame("preload")
+                        preload_game_scene(scene_manager)
+                        # 启动和预加载创建的对象基本一直存活，冻结后不再参与回收
+                        game_manager.gc_control.freeze()
                 
                 except pygame.error as e:
                     print(f"渲染错误: {e}")
@@ -211,23 +303,10 @@ def main():
                     continue
                 
                 # 控制帧率
-                clock.tick(game_manager.fps)
-                
-                # 更新性能统计
-                frame_time = time.time() - loop_start_time
-                game_manager.debug_info['frame_time'] = frame_time * 1000  # 转换为毫秒
+                pacer.wait()
                 
-                # 定期检查性能
-                current_time = time.time()
-                if current_time - last_performance_check >= performance_check_interval:
-                    stats = game_manager.get_performance_stats()
-                    print("\n性能统计:")
-                    print(f"当前FPS: {stats['fps']:.1f}")
-                    print(f"平均FPS: {stats['average_fps']:.1f}")
-                    print(f"帧时间: {stats['frame_time']:.1f}ms")
-                    print(f"更新时间: {stats['update_time']:.1f}ms")
-                    print(f"渲染时间: {stats['render_time']:.1f}ms\n")
-                    last_performance_check = current_time
+                # 记录本帧的性能统计（工作耗时用于调节画质）
+                game_manager.end_frame(scene_manager.current_scene_name)
             
             except Exception as e:
                 print(f"主循环中发生错误: {e}")
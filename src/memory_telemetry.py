@@ -0,0 +1,240 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import pygame
+from typing import Callable, Dict, List, Optional, Tuple
+from perf_stats import RingBuffer
+
+# 内存追踪开关：设置为tracemalloc保存的栈帧数（例如1或10）时开启分配追踪和对象统计
+MEMORY_ENV = "GF_MEMORY_TRACE"
+
+# 类型标志：实例由垃圾回收器跟踪（纯Python类都有，部分C扩展类型没有，例如pygame.Surface）
+_TPFLAGS_HAVE_GC = 1 << 14
+
+try:
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+def read_rss() -> Optional[int]:
+    """当前进程的常驻内存（字节），无法获取时返回None"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # 没有/proc时只能拿到峰值（macOS单位为字节，其他系统为KB）
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+class BudgetedSampler:
+    """按间隔执行开销较大的采样，按实际耗时拉长间隔，使平均开销不超过预算比例"""
+    def __init__(self, interval: float, budget: float):
+        self.base_interval = interval
+        self.interval = interval
+        self.budget = budget  # 采样耗时占总时间的比例上限
+        self.next_time = 0.0
+        self.last_cost = 0.0
+        self.total_cost = 0.0
+        self.runs = 0
+    
+    def due(self, now: float) -> bool:
+        return now >= self.next_time
+    
+    def record(self, start: float, end: float):
+        """记录一次采样的耗时并安排下一次采样"""
+        self.last_cost = end - start
+        self.total_cost += self.last_cost
+        self.runs += 1
+        self.interval = max(self.base_interval, self.last_cost / self.budget)
+        self.next_time = end + self.interval
+
+class MemoryTelemetry:
+    """内存遥测：进程RSS、每帧分配的内存块变化、关注类型的存活对象数量和tracemalloc分配排行
+    
+    每帧只读取分配块计数（常数时间），RSS、对象统计和分配排行按各自的间隔采样，
+    开销大的采样根据耗时自动降低频率。
+    """
+    def __init__(self, rss_interval: float = 1.0, census_interval: float = 5.0,
+                 top_interval: float = 30.0, budget: float = 0.002, window: int = 300,
+                 clock: Callable[[], float] = time.perf_counter,
+                 get_blocks: Callable[[], int] = sys.getallocatedblocks):
+        self.clock = clock
+        self.get_blocks = get_blocks
+        self.start_time = clock()
+        self.watched: Dict[str, List[type]] = {}
+        self.sizes: Dict[type, Callable[[object], int]] = {}  # 类型 -> 一个实例代表的对象数量
+        self._categories: Dict[type, Tuple[Optional[str], Optional[Callable]]] = {}  # 类型 -> (分类, 数量函数)（缓存）
+        
+        self.rss_bytes = 0
+        self.peak_rss = 0
+        self.blocks = get_blocks()
+        self.block_deltas = RingBuffer(window)   # 每帧新增的内存块数量
+        self.traced = 0
+        self.traced_deltas = RingBuffer(window)  # 每帧新增的追踪内存（字节，需要开启tracemalloc）
+        self.counts: Dict[str, int] = {}
+        self.top: List[Dict] = []
+        self.census_enabled = False
+        
+        self.rss_sampler = BudgetedSampler(rss_interval, budget)
+        self.census_sampler = BudgetedSampler(census_interval, budget)
+        self.top_sampler = BudgetedSampler(top_interval, budget)
+    
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+    
+    def watch(self, name: str, cls: type, size: Optional[Callable[[object], int]] = None):
+        """统计某个类型（包括子类）的存活对象数量，多个类型可以归入同一分类
+        
+        size用于容器类型（例如对象池），返回一个实例中包含的对象数量，不提供时每个实例计为1。
+        """
+        self.watched.setdefault(name, []).append(cls)
+        if size is not None:
+            self.sizes[cls] = size
+        self.counts.setdefault(name, 0)
+        self._categories.clear()
+    
+    def start_tracing(self, frames: int = 1):
+        """开启tracemalloc分配追踪（会明显拖慢分配，只用于排查）"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            print(f"开启内存分配追踪（{frames}层栈帧）")
+        self.traced = tracemalloc.get_traced_memory()[0]
+        self.top_sampler.next_time = 0.0
+    
+    def stop_tracing(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            print("关闭内存分配追踪")
+        self.traced = 0
+        self.traced_deltas.clear()
+        self.top = []
+    
+    def update(self):
+        """每帧调用一次"""
+        blocks = self.get_blocks()
+        self.block_deltas.append(blocks - self.blocks)
+        self.blocks = blocks
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            traced = tracemalloc.get_traced_memory()[0]
+            self.traced_deltas.append(traced - self.traced)
+            self.traced = traced
+        
+        now = self.clock()
+        if self.rss_sampler.due(now):
+            self._sample(self.rss_sampler, self.sample_rss)
+        if self.census_enabled and self.census_sampler.due(now):
+            self._sample(self.census_sampler, self.census)
+        if tracing and self.top_sampler.due(now):
+            self._sample(self.top_sampler, self.sample_top)
+    
+    def _sample(self, sampler: BudgetedSampler, sample: Callable[[], object]):
+        start = self.clock()
+        sample()
+        sampler.record(start, self.clock())
+    
+    def sample_rss(self) -> int:
+        rss = read_rss()
+        if rss is not None:
+            self.rss_bytes = rss
+            self.peak_rss = max(self.peak_rss, rss)
+        return self.rss_bytes
+    
+    def _category(self, cls: type) -> Tuple[Optional[str], Optional[Callable]]:
+        for name, classes in self.watched.items():
+            for watched in classes:
+                if issubclass(cls, watched):
+                    return name, self.sizes.get(watched)
+        return None, None
+    
+    def census(self) -> Dict[str, int]:
+        """遍历垃圾回收器跟踪的对象统计关注类型的数量
+        
+        不被垃圾回收器跟踪的类型（例如pygame.Surface）通过引用它们的对象找到，
+        只被C扩展内部持有的对象不会计入。
+        """
+        counts = {name: 0 for name in self.watched}
+        categories = self._categories
+        scan_referents = any(not cls.__flags__ & _TPFLAGS_HAVE_GC
+                             for classes in self.watched.values() for cls in classes)
+        seen = set()
+        objects = gc.get_objects()
+        try:
+            for obj in objects:
+                cls = type(obj)
+                if cls in categories:
+                    category, size = categories[cls]
+                else:
+                    category, size = categories[cls] = self._category(cls)
+                if category is not None:
+                    counts[category] += 1 if size is None else size(obj)
+                if not scan_referents:
+                    continue
+                for ref in gc.get_referents(obj):
+                    ref_cls = type(ref)
+                    if ref_cls.__flags__ & _TPFLAGS_HAVE_GC:
+                        continue
+                    if ref_cls not in categories:
+                        categories[ref_cls] = self._category(ref_cls)
+                    category = categories[ref_cls][0]
+                    if category is not None and id(ref) not in seen:
+                        seen.add(id(ref))
+                        counts[category] += 1
+        finally:
+            del objects
+        self.counts = counts
+        return counts
+    
+    def sample_top(self, limit: int = 10) -> List[Dict]:
+        """tracemalloc分配排行（按代码行汇总）"""
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        self.top = [
+            {
+                'location': f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                'size': stat.size,
+                'count': stat.count
+            }
+            for stat in snapshot.statistics('lineno')[:limit]
+        ]
+        return self.top
+    
+    def snapshot(self) -> Dict:
+        """内存快照（只返回已采样的数据，不触发采样）"""
+        elapsed = self.clock() - self.start_time
+        overhead = sum(sampler.total_cost for sampler in
+                       (self.rss_sampler, self.census_sampler, self.top_sampler))
+        return {
+            'rss': self.rss_bytes,
+            'peak_rss': self.peak_rss,
+            'blocks': self.blocks,
+            'blocks_per_frame': self.block_deltas.mean,
+            'traced': self.traced,
+            'traced_per_frame': self.traced_deltas.mean,
+            'counts': dict(self.counts) if self.census_sampler.runs else {},
+            'top': list(self.top),
+            'overhead': overhead / elapsed if elapsed > 0 else 0.0
+        }
+
+# 全局内存遥测（实体模块导入时登记需要统计数量的类型）
+memory_telemetry = MemoryTelemetry()
+memory_telemetry.watch("surfaces", pygame.Surface)
+
+def install_from_env():
+    """根据环境变量开启内存分配追踪和对象统计"""
+    value = os.environ.get(MEMORY_ENV, "")
+    if value:
+        memory_telemetry.start_tracing(int(value) if value.isdigit() else 1)
+        memory_telemetry.census_enabled = True
@@ -0,0 +1,304 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 统计的帧耗时指标（毫秒）：完整帧、工作（不含帧率等待）、更新、渲染
+METRICS = ('frame', 'work', 'update', 'render')
+METRIC_LABELS = {'frame': '帧时间', 'work': '工作时间', 'update': '更新时间', 'render': '渲染时间'}
+# 流式估计的百分位
+PERCENTILES = (0.5, 0.95, 0.99)
+
+class RingBuffer:
+    """固定大小的环形缓冲区，保存最近的数值并维护总和（O(1)求平均）"""
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.data: List[float] = [0.0] * capacity
+        self.index = 0  # 下一个写入位置
+        self.count = 0
+        self.total = 0.0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def append(self, value: float):
+        """写入数值，满了之后覆盖最旧的数值"""
+        if self.count == self.capacity:
+            self.total -= self.data[self.index]
+        else:
+            self.count += 1
+        self.data[self.index] = value
+        self.total += value
+        self.index += 1
+        if self.index == self.capacity:
+            self.index = 0
+            # 每绕一圈重新求和一次，消除浮点累加误差
+            self.total = sum(self.data[:self.count])
+    
+    @property
+    def last(self) -> float:
+        """最近写入的数值"""
+        return self.data[self.index - 1] if self.count else 0.0
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def values(self) -> List[float]:
+        """按写入顺序返回所有数值"""
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return self.data[self.index:] + self.data[:self.index]
+    
+    def clear(self):
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+class P2Quantile:
+    """P²算法：用5个标记点流式估计百分位，不保存样本（Jain & Chlamtac, 1985）"""
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self.heights = [0.0] * 5                         # 标记点的高度（估计值）
+        self.positions = [0, 1, 2, 3, 4]                 # 标记点的实际位置
+        self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]  # 标记点的期望位置
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+    
+    def add(self, x: float):
+        heights = self.heights
+        if self.count < 5:
+            heights[self.count] = x
+            self.count += 1
+            if self.count == 5:
+                heights.sort()
+            return
+        self.count += 1
+        
+        # 找到x所在的区间并更新最小/最大值
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+        
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        desired = self.desired
+        for i in range(5):
+            desired[i] += self.increments[i]
+        
+        # 调整中间三个标记点，使其接近期望位置
+        for i in range(1, 4):
+            offset = desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1) or
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                d = 1 if offset > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + d * (heights[i + d] - heights[i]) / (positions[i + d] - positions[i])
+                heights[i] = height
+                positions[i] += d
+    
+    def _parabolic(self, i: int, d: int) -> float:
+        q = self.heights
+        n = self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+    
+    @property
+    def value(self) -> float:
+        """当前的百分位估计"""
+        if self.count >= 5:
+            return self.heights[2]
+        if self.count == 0:
+            return 0.0
+        samples = sorted(self.heights[:self.count])
+        return samples[int(round(self.p * (self.count - 1)))]
+    
+    @property
+    def maximum(self) -> float:
+        if self.count >= 5:
+            return self.heights[4]
+        return max(self.heights[:self.count]) if self.count else 0.0
+
+class MetricStats:
+    """单个指标的滚动统计：环形缓冲区保存最近的数值，百分位按窗口流式估计
+    
+    百分位估计器每window个样本重新开始，新窗口样本不足时沿用上一个窗口的结果，
+    这样百分位反映的是最近一段时间而不是整局游戏。
+    """
+    def __init__(self, window: int = 600, percentiles: Tuple[float, ...] = PERCENTILES,
+                 min_samples: int = 30):
+        self.history = RingBuffer(window)
+        self.window = window
+        self.percentiles = percentiles
+        self.min_samples = min(min_samples, window)
+        self.count = 0
+        self._estimators = [P2Quantile(p) for p in percentiles]
+        self._window_count = 0
+        self._previous: Optional[Tuple[List[float], float]] = None  # 上一个窗口的(百分位, 最大值)
+    
+    def add(self, value: float):
+        self.history.append(value)
+        self.count += 1
+        for estimator in self._estimators:
+            estimator.add(value)
+        self._window_count += 1
+        if self._window_count >= self.window:
+            self._previous = self._current()
+            self._estimators = [P2Quantile(p) for p in self.percentiles]
+            self._window_count = 0
+    
+    def _current(self) -> Tuple[List[float], float]:
+        return [estimator.value for estimator in self._estimators], self._estimators[0].maximum
+    
+    def snapshot(self) -> Dict[str, float]:
+        """最近值、平均值、各百分位和最大值"""
+        if self._previous is not None and self._window_count < self.min_samples:
+            values, maximum = self._previous
+        else:
+            values, maximum = self._current()
+        result = {'last': self.history.last, 'mean': self.history.mean, 'max': maximum}
+        for p, value in zip(self.percentiles, values):
+            result[f"p{int(round(p * 100))}"] = value
+        return result
+
+class PerfStats:
+    """帧耗时统计：整体和按场景的滚动统计，以及每秒的FPS记录"""
+    def __init__(self, window: int = 600, scene_window: int = 300, fps_seconds: int = 60):
+        self.window = window
+        self.scene_window = scene_window
+        self.metrics: Dict[str, MetricStats] = {name: MetricStats(window) for name in METRICS}
+        self.scenes: Dict[str, Dict[str, MetricStats]] = {}
+        self.fps_history = RingBuffer(fps_seconds)  # 每秒的平均FPS
+        self.frames = 0
+        self._second_ms = 0.0
+        self._second_frames = 0
+    
+    def record_frame(self, frame_ms: float, work_ms: float, update_ms: float, render_ms: float,
+                     scene: Optional[str] = None):
+        """记录一帧的各项耗时（毫秒）"""
+        values = (frame_ms, work_ms, update_ms, render_ms)
+        metrics = self.metrics
+        for name, value in zip(METRICS, values):
+            metrics[name].add(value)
+        if scene is not None:
+            scene_metrics = self.scenes.get(scene)
+            if scene_metrics is None:
+                scene_metrics = {name: MetricStats(self.scene_window) for name in METRICS}
+                self.scenes[scene] = scene_metrics
+            for name, value in zip(METRICS, values):
+                scene_metrics[name].add(value)
+        
+        # 按累计的帧耗时划分秒，不需要额外读取时钟
+        self.frames += 1
+        self._second_ms += frame_ms
+        self._second_frames += 1
+        if self._second_ms >= 1000.0:
+            self.fps_history.append(self._second_frames * 1000.0 / self._second_ms)
+            self._second_ms = 0.0
+            self._second_frames = 0
+    
+    @property
+    def fps(self) -> float:
+        """最近窗口内的平均FPS"""
+        mean = self.metrics['frame'].history.mean
+        return 1000.0 / mean if mean > 0 else 0.0
+    
+    @property
+    def average_fps(self) -> float:
+        """最近若干秒的平均FPS"""
+        return self.fps_history.mean
+    
+    def snapshot(self, include_scenes: bool = True) -> Dict:
+        """性能快照（只做常数时间的查询，可以每帧调用）"""
+        result = {
+            'frames': self.frames,
+            'fps': self.fps,
+            'average_fps': self.average_fps,
+            'metrics': {name: stats.snapshot() for name, stats in self.metrics.items()}
+        }
+        if include_scenes:
+            result['scenes'] = {
+                scene: {name: stats.snapshot() for name, stats in metrics.items()}
+                for scene, metrics in self.scenes.items()
+            }
+        return result
+
+class PerfLogEmitter:
+    """定期把性能快照打印到日志"""
+    def __init__(self, source: Callable[[], Dict], interval: float = 5.0,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.source = source
+        self.interval = interval
+        self.clock = clock
+        self.last_emit = clock()
+    
+    def update(self) -> bool:
+        """每帧调用，到达间隔时打印一次，返回是否打印"""
+        now = self.clock()
+        if now - self.last_emit < self.interval:
+            return False
+        self.last_emit = now
+        self.emit(self.source())
+        return True
+    
+    def emit(self, stats: Dict):
+        print("\n性能统计:")
+        print(f"当前FPS: {stats['fps']:.1f}")
+        print(f"平均FPS: {stats['average_fps']:.1f}")
+        for line in format_metrics(stats['metrics']):
+            print(line)
+        for scene, metrics in stats.get('scenes', {}).items():
+            frame = metrics['frame']
+            print(f"场景 {scene}: 帧 {frame['mean']:.1f}ms (p95 {frame['p95']:.1f}ms), "
+                  f"更新 {metrics['update']['mean']:.1f}ms, 渲染 {metrics['render']['mean']:.1f}ms")
+        if 'jitter_ms' in stats:
+            print(f"帧抖动: {stats['jitter_ms']:.2f}ms (超时 {stats['missed_frames']}帧, {stats['pacing']})")
+        if 'quality' in stats:
+            print(f"画质档位: {stats['quality']}")
+        if 'gc' in stats:
+            print(format_gc(stats['gc']))
+        if stats.get('watchdog', {}).get('stalls'):
+            watchdog = stats['watchdog']
+            print(f"主循环卡住: {watchdog['stalls']}次, 最长 {watchdog['longest_stall_s']:.2f}秒")
+        if 'memory' in stats:
+            for line in format_memory(stats['memory']):
+                print(line)
+            for entry in stats['memory']['top'][:5]:
+                print(f"  {entry['location']}: {entry['size'] / 1024:.1f}KB ({entry['count']}块)")
+        print()
+
+def format_metrics(metrics: Dict[str, Dict[str, float]]) -> List[str]:
+    """把各指标的快照格式化为文本行（调试信息和日志共用）"""
+    lines = []
+    for name in METRICS:
+        stats = metrics[name]
+        lines.append(f"{METRIC_LABELS[name]}: {stats['mean']:.1f}ms "
+                     f"(p50 {stats['p50']:.1f} / p95 {stats['p95']:.1f} / p99 {stats['p99']:.1f} / "
+                     f"最大 {stats['max']:.1f})")
+    return lines
+
+def format_memory(memory: Dict) -> List[str]:
+    """把内存快照格式化为文本行（调试信息和日志共用）"""
+    mb = 1024 * 1024
+    lines = [f"内存使用: {memory['rss'] / mb:.1f}MB (峰值 {memory['peak_rss'] / mb:.1f}MB), "
+             f"分配块 {memory['blocks']} ({memory['blocks_per_frame']:+.1f}/帧)"]
+    if memory['counts']:
+        lines.append("存活对象: " + ", ".join(f"{name} {count}" for name, count in memory['counts'].items()))
+    if memory['traced']:
+        lines.append(f"追踪内存: {memory['traced'] / mb:.1f}MB ({memory['traced_per_frame'] / 1024:+.1f}KB/帧)")
+    return lines
+
+def format_gc(stats: Dict) -> str:
+    """垃圾回收统计的文本（调试信息和日志共用）"""
+    pause = stats['pause']
+    young, middle, old = stats['collections']
+    return (f"垃圾回收: {young}/{middle}/{old}次, 停顿 p95 {pause['p95']:.2f}ms / 最大 {pause['max']:.2f}ms, "
+            f"帧内 {stats['unscheduled']}次")
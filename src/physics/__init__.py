@@ -0,0 +1,3 @@
+"""
+物理与碰撞包
+"""
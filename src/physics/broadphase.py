@@ -0,0 +1,65 @@
+from typing import Dict, List, Tuple
+
+class SpatialHashGrid:
+    """均匀网格空间哈希，用于快速筛选可能碰撞的候选对"""
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.item_count = 0
+    
+    def clear(self):
+        """清空网格（每帧重建）"""
+        self.cells.clear()
+        self.item_count = 0
+    
+    def insert(self, index: int, min_x: float, min_y: float, max_x: float, max_y: float):
+        """按包围盒把对象索引插入覆盖到的所有格子"""
+        size = self.cell_size
+        cells = self.cells
+        for cx in range(int(min_x // size), int(max_x // size) + 1):
+            for cy in range(int(min_y // size), int(max_y // size) + 1):
+                key = (cx, cy)
+                bucket = cells.get(key)
+                if bucket is None:
+                    cells[key] = [index]
+                else:
+                    bucket.append(index)
+        self.item_count += 1
+    
+    def query(self, min_x: float, min_y: float, max_x: float, max_y: float,
+              out: List[int]) -> List[int]:
+        """查询与包围盒重叠的格子中的对象索引（去重后追加到out）"""
+        size = self.cell_size
+        cells = self.cells
+        seen = set()
+        for cx in range(int(min_x // size), int(max_x // size) + 1):
+            for cy in range(int(min_y // size), int(max_y // size) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                for index in bucket:
+                    if index not in seen:
+                        seen.add(index)
+                        out.append(index)
+        return out
+
+def collect_swept_pairs(grid: SpatialHashGrid, x0s: List[float], y0s: List[float],
+                        x1s: List[float], y1s: List[float], radii: List[float],
+                        count: int) -> Tuple[List[int], List[int]]:
+    """用每个运动圆的扫掠包围盒查询网格，返回候选对（运动体索引, 目标索引）"""
+    pair_a: List[int] = []
+    pair_b: List[int] = []
+    if grid.item_count == 0:
+        return pair_a, pair_b
+    
+    candidates: List[int] = []
+    for i in range(count):
+        r = radii[i]
+        x0, y0, x1, y1 = x0s[i], y0s[i], x1s[i], y1s[i]
+        candidates.clear()
+        grid.query(min(x0, x1) - r, min(y0, y1) - r,
+                   max(x0, x1) + r, max(y0, y1) + r, candidates)
+        for j in candidates:
+            pair_a.append(i)
+            pair_b.append(j)
+    return pair_a, pair_b
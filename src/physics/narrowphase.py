@@ -0,0 +1,242 @@
+import math
+from typing import Dict, List, Tuple
+
+# 形状类型
+SHAPE_CIRCLE = 0
+SHAPE_AABB = 1
+
+# 没有碰撞时返回的碰撞时间
+NO_HIT = -1.0
+
+_EPSILON = 1e-9
+
+def circle_circle(ax: float, ay: float, ar: float, bx: float, by: float, br: float) -> bool:
+    """圆与圆的重叠测试"""
+    dx = bx - ax
+    dy = by - ay
+    reach = ar + br
+    return dx * dx + dy * dy <= reach * reach
+
+def circle_aabb(cx: float, cy: float, r: float,
+                min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+    """圆与轴对齐矩形的重叠测试（取矩形上离圆心最近的点）"""
+    nearest_x = min_x if cx < min_x else (max_x if cx > max_x else cx)
+    nearest_y = min_y if cy < min_y else (max_y if cy > max_y else cy)
+    dx = cx - nearest_x
+    dy = cy - nearest_y
+    return dx * dx + dy * dy <= r * r
+
+def aabb_aabb(a_min_x: float, a_min_y: float, a_max_x: float, a_max_y: float,
+              b_min_x: float, b_min_y: float, b_max_x: float, b_max_y: float) -> bool:
+    """轴对齐矩形之间的重叠测试"""
+    return (a_min_x <= b_max_x and b_min_x <= a_max_x and
+            a_min_y <= b_max_y and b_min_y <= a_max_y)
+
+def _ray_circle(x0: float, y0: float, dx: float, dy: float,
+                cx: float, cy: float, r: float) -> float:
+    """射线 p(t) = p0 + t*d 与圆的首次相交时间，t在[0, 1]内有效"""
+    mx = x0 - cx
+    my = y0 - cy
+    c = mx * mx + my * my - r * r
+    if c <= 0:
+        return 0.0  # 起点已在圆内
+    a = dx * dx + dy * dy
+    if a < _EPSILON:
+        return NO_HIT
+    b = mx * dx + my * dy
+    if b > 0:
+        return NO_HIT  # 远离圆心运动
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return NO_HIT
+    t = (-b - math.sqrt(discriminant)) / a
+    return t if t <= 1.0 else NO_HIT
+
+def swept_circle_circle(x0: float, y0: float, x1: float, y1: float, r: float,
+                        bx: float, by: float, br: float) -> float:
+    """运动圆（从p0到p1）与静止圆的首次接触时间，未碰撞返回NO_HIT"""
+    return _ray_circle(x0, y0, x1 - x0, y1 - y0, bx, by, r + br)
+
+def swept_circle_aabb(x0: float, y0: float, x1: float, y1: float, r: float,
+                      min_x: float, min_y: float, max_x: float, max_y: float) -> float:
+    """运动圆与静止矩形的首次接触时间，未碰撞返回NO_HIT
+    
+    等价于射线与按半径外扩的圆角矩形求交：先与外扩矩形做slab测试，
+    若进入点落在角区域，再与对应角上的圆求交。
+    """
+    if circle_aabb(x0, y0, r, min_x, min_y, max_x, max_y):
+        return 0.0
+    
+    dx = x1 - x0
+    dy = y1 - y0
+    t_enter = 0.0
+    t_exit = 1.0
+    
+    # X轴slab
+    if abs(dx) < _EPSILON:
+        if x0 < min_x - r or x0 > max_x + r:
+            return NO_HIT
+    else:
+        inv = 1.0 / dx
+        t1 = (min_x - r - x0) * inv
+        t2 = (max_x + r - x0) * inv
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_enter = max(t_enter, t1)
+        t_exit = min(t_exit, t2)
+        if t_enter > t_exit:
+            return NO_HIT
+    
+    # Y轴slab
+    if abs(dy) < _EPSILON:
+        if y0 < min_y - r or y0 > max_y + r:
+            return NO_HIT
+    else:
+        inv = 1.0 / dy
+        t1 = (min_y - r - y0) * inv
+        t2 = (max_y + r - y0) * inv
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_enter = max(t_enter, t1)
+        t_exit = min(t_exit, t2)
+        if t_enter > t_exit:
+            return NO_HIT
+    
+    # 检查进入点是否位于角区域
+    px = x0 + dx * t_enter
+    py = y0 + dy * t_enter
+    if px < min_x:
+        corner_x = min_x
+    elif px > max_x:
+        corner_x = max_x
+    else:
+        return t_enter
+    if py < min_y:
+        corner_y = min_y
+    elif py > max_y:
+        corner_y = max_y
+    else:
+        return t_enter
+    
+    return _ray_circle(x0, y0, dx, dy, corner_x, corner_y, r)
+
+def shape_of(entity) -> int:
+    """获取实体的碰撞形状类型"""
+    return SHAPE_CIRCLE if getattr(entity, 'collision_shape', 'aabb') == 'circle' else SHAPE_AABB
+
+def bullet_radius(bullet) -> float:
+    """获取子弹的碰撞半径（部分子弹类只定义了size）"""
+    radius = getattr(bullet, 'radius', None)
+    if radius is None:
+        radius = getattr(bullet, 'size', 4)
+    return radius
+
+class ShapeBatch:
+    """静止碰撞目标的结构数组，以实体中心和半宽高描述"""
+    def __init__(self):
+        self.xs: List[float] = []
+        self.ys: List[float] = []
+        self.half_ws: List[float] = []
+        self.half_hs: List[float] = []
+        self.kinds: List[int] = []
+        self.count = 0
+    
+    def clear(self):
+        """清空所有目标"""
+        self.xs.clear()
+        self.ys.clear()
+        self.half_ws.clear()
+        self.half_hs.clear()
+        self.kinds.clear()
+        self.count = 0
+    
+    def add(self, x: float, y: float, half_w: float, half_h: float, kind: int) -> int:
+        """添加目标，圆形目标使用half_w作为半径"""
+        self.xs.append(x)
+        self.ys.append(y)
+        self.half_ws.append(half_w)
+        self.half_hs.append(half_h)
+        self.kinds.append(kind)
+        self.count += 1
+        return self.count - 1
+    
+    def add_entity(self, entity) -> int:
+        """按实体的位置、尺寸和碰撞形状添加目标"""
+        kind = shape_of(entity)
+        if kind == SHAPE_CIRCLE:
+            radius = min(entity.width, entity.height) / 2
+            return self.add(entity.x, entity.y, radius, radius, kind)
+        return self.add(entity.x, entity.y, entity.width / 2, entity.height / 2, kind)
+    
+    def bounds(self, index: int) -> Tuple[float, float, float, float]:
+        """获取目标的包围盒"""
+        x, y = self.xs[index], self.ys[index]
+        hw, hh = self.half_ws[index], self.half_hs[index]
+        return x - hw, y - hh, x + hw, y + hh
+
+class SweptCircleBatch:
+    """本帧运动圆（子弹）的结构数组，记录起点、终点和半径"""
+    def __init__(self):
+        self.x0s: List[float] = []
+        self.y0s: List[float] = []
+        self.x1s: List[float] = []
+        self.y1s: List[float] = []
+        self.radii: List[float] = []
+        self.count = 0
+    
+    def clear(self):
+        """清空所有运动圆"""
+        self.x0s.clear()
+        self.y0s.clear()
+        self.x1s.clear()
+        self.y1s.clear()
+        self.radii.clear()
+        self.count = 0
+    
+    def add(self, x0: float, y0: float, x1: float, y1: float, radius: float) -> int:
+        """添加一个运动圆"""
+        self.x0s.append(x0)
+        self.y0s.append(y0)
+        self.x1s.append(x1)
+        self.y1s.append(y1)
+        self.radii.append(radius)
+        self.count += 1
+        return self.count - 1
+    
+    def add_bullet(self, bullet) -> int:
+        """根据子弹本帧的位移添加运动圆（子弹已在本帧更新过位置）"""
+        x1, y1 = bullet.x, bullet.y
+        x0 = x1 - bullet.dx * bullet.speed
+        y0 = y1 - bullet.dy * bullet.speed
+        return self.add(x0, y0, x1, y1, bullet_radius(bullet))
+
+def sweep_pairs(movers: SweptCircleBatch, shapes: ShapeBatch,
+                pair_a: List[int], pair_b: List[int]) -> List[float]:
+    """对候选对批量执行扫掠测试，返回每一对的碰撞时间（NO_HIT表示未碰撞）"""
+    x0s, y0s, x1s, y1s, radii = movers.x0s, movers.y0s, movers.x1s, movers.y1s, movers.radii
+    xs, ys, half_ws, half_hs, kinds = shapes.xs, shapes.ys, shapes.half_ws, shapes.half_hs, shapes.kinds
+    tois: List[float] = [NO_HIT] * len(pair_a)
+    for k in range(len(pair_a)):
+        i = pair_a[k]
+        j = pair_b[k]
+        if kinds[j] == SHAPE_CIRCLE:
+            tois[k] = _ray_circle(x0s[i], y0s[i], x1s[i] - x0s[i], y1s[i] - y0s[i],
+                                  xs[j], ys[j], radii[i] + half_ws[j])
+        else:
+            x, y, hw, hh = xs[j], ys[j], half_ws[j], half_hs[j]
+            tois[k] = swept_circle_aabb(x0s[i], y0s[i], x1s[i], y1s[i], radii[i],
+                                        x - hw, y - hh, x + hw, y + hh)
+    return tois
+
+def first_hits(pair_a: List[int], pair_b: List[int], tois: List[float]) -> Dict[int, Tuple[int, float]]:
+    """为每个运动体选出最早碰到的目标，返回 {运动体索引: (目标索引, 碰撞时间)}"""
+    hits: Dict[int, Tuple[int, float]] = {}
+    for k in range(len(tois)):
+        t = tois[k]
+        if t < 0:
+            continue
+        i = pair_a[k]
+        best = hits.get(i)
+        if best is None or t < best[1]:
+            hits[i] = (pair_b[k], t)
+    return hits
@@ -0,0 +1,120 @@
+from collections import deque
+from typing import Deque, List, Optional
+
+class QualityTier:
+    """画质档位：可降级效果的开关和数量上限"""
+    def __init__(self, name: str, health_bars: bool = True, shield_effect: bool = True,
+                 cooldown_arc: bool = True, bullet_detail: bool = True,
+                 bullet_limit: int = 4096, spawn_scale: float = 1.0):
+        self.name = name
+        self.health_bars = health_bars        # 敌人血条和护盾条
+        self.shield_effect = shield_effect    # Boss护盾的半透明表面（关闭时只画轮廓）
+        self.cooldown_arc = cooldown_arc      # 玩家技能冷却环
+        self.bullet_detail = bullet_detail    # 子弹使用完整形状和旋转帧（关闭时使用简化精灵）
+        self.bullet_limit = bullet_limit      # Boss弹幕同时存在的子弹上限
+        self.spawn_scale = spawn_scale        # 敌人数量上限的缩放比例
+    
+    def spawn_cap(self, cap: int) -> int:
+        """按当前档位缩放敌人（或召唤物）数量上限，至少为1"""
+        return max(1, int(cap * self.spawn_scale))
+
+# 画质档位（从高到低）
+QUALITY_TIERS: List[QualityTier] = [
+    QualityTier("high"),
+    QualityTier("medium", shield_effect=False, bullet_limit=3072),
+    QualityTier("low", health_bars=False, shield_effect=False, bullet_detail=False,
+                bullet_limit=2048, spawn_scale=0.8),
+    QualityTier("minimal", health_bars=False, shield_effect=False, cooldown_arc=False,
+                bullet_detail=False, bullet_limit=1024, spawn_scale=0.5),
+]
+
+class QualityGovernor:
+    """根据帧耗时自动调整画质档位
+    
+    记录每帧的工作耗时（不含帧率限制的等待），取最近一段窗口的中位数，
+    偶发的卡顿不会触发降级。中位数超过预算的downgrade_ratio时降一档；
+    持续upgrade_delay帧低于预算的upgrade_ratio才升一档。两个阈值之间留有空隙，
+    升档后很快又降档时加倍下一次的升档等待，避免在两档之间来回切换。
+    """
+    def __init__(self, target_fps: int = 60, tiers: Optional[List[QualityTier]] = None,
+                 window: int = 30, downgrade_ratio: float = 0.9, upgrade_ratio: float = 0.6,
+                 upgrade_delay: int = 120, max_upgrade_delay: int = 1920):
+        self.tiers = tiers if tiers is not None else QUALITY_TIERS
+        self.level = 0
+        self.locked = False
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.base_upgrade_delay = upgrade_delay
+        self.upgrade_delay = upgrade_delay
+        self.max_upgrade_delay = max_upgrade_delay
+        self.calm_frames = 0          # 连续低于升档阈值的帧数
+        self.frames_since_upgrade = -1  # 距离上次升档的帧数（-1表示还没有升过档）
+        self.changes = 0
+        self.set_target_fps(target_fps)
+    
+    @property
+    def tier(self) -> QualityTier:
+        """当前画质档位"""
+        return self.tiers[self.level]
+    
+    def set_target_fps(self, fps: int):
+        """设置目标帧率（帧耗时预算随之变化）"""
+        self.budget_ms = 1000.0 / fps
+    
+    def set_level(self, level: int, lock: bool = False):
+        """手动设置画质档位，lock为True时不再自动调整"""
+        self.locked = lock
+        self._change(max(0, min(level, len(self.tiers) - 1)))
+    
+    def unlock(self):
+        """恢复自动调整"""
+        self.locked = False
+        self.reset()
+    
+    def reset(self):
+        """清空帧耗时记录（例如切换场景或暂停恢复后）"""
+        self.samples.clear()
+        self.calm_frames = 0
+    
+    def record_frame(self, work_ms: float) -> bool:
+        """记录一帧的工作耗时（毫秒），档位变化时返回True"""
+        samples = self.samples
+        samples.append(work_ms)
+        if self.frames_since_upgrade >= 0:
+            self.frames_since_upgrade += 1
+        if self.locked or len(samples) < samples.maxlen:
+            return False
+        
+        median = sorted(samples)[len(samples) // 2]
+        if median > self.budget_ms * self.downgrade_ratio:
+            self.calm_frames = 0
+            if self.level + 1 < len(self.tiers):
+                if 0 <= self.frames_since_upgrade <= samples.maxlen * 4:
+                    # 刚升档就撑不住：下一次升档等待更久
+                    self.upgrade_delay = min(self.upgrade_delay * 2, self.max_upgrade_delay)
+                self._change(self.level + 1)
+                return True
+        elif median < self.budget_ms * self.upgrade_ratio and self.level > 0:
+            self.calm_frames += 1
+            if self.calm_frames >= self.upgrade_delay:
+                self._change(self.level - 1)
+                self.frames_since_upgrade = 0
+                return True
+        else:
+            self.calm_frames = 0
+            if self.frames_since_upgrade > self.max_upgrade_delay:
+                # 升档后长时间稳定，恢复默认的升档等待
+                self.upgrade_delay = self.base_upgrade_delay
+        return False
+    
+    def _change(self, level: int):
+        if level != self.level:
+            old_name = self.tier.name
+            self.level = level
+            self.changes += 1
+            print(f"画质档位从 {old_name} 调整为 {self.tier.name}")
+        self.reset()
+
+# 全局画质调节器
+quality = QualityGovernor()
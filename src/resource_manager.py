@@ -1,6 +1,9 @@
 import pygame
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 import os
+from audio_mixer import ChannelManager
+from audio_cache import AudioCache
+from asset_pack import asset_exists, list_assets, open_asset
 
 class ResourceManager:
     """资源管理器，负责加载和管理游戏资源"""
@@ -13,6 +16,7 @@ class ResourceManager:
         
         # 当前播放的音乐
         self.current_music: Optional[str] = None
+        self._music_stream = None
         
         # 音量设置
         self.music_volume = 0.5
@@ -27,6 +31,13 @@ class ResourceManager:
         except pygame.error as e:
             print(f"音频系统初始化失败: {e}")
         
+        # 混音通道管理
+        self.channel_manager = ChannelManager()
+        self._missing_sounds: Set[str] = set()
+        
+        # 解码后音效的磁盘缓存，避免每次启动都解码MP3
+        self.audio_cache = AudioCache()
+        
         # 加载音频资源
         self._load_audio_resources()
         
@@ -38,34 +49,36 @@ class ResourceManager:
         print("开始加载音频资源")
         
         # 加载背景音乐
+        # 资源列表优先取自资源包的索引，没有资源包时扫描目录
         bgm_dir = "assets/audio/bgm"
-        if os.path.exists(bgm_dir):
+        bgm_files = list_assets(bgm_dir, ".mp3")
+        if bgm_files:
             print(f"扫描背景音乐目录: {bgm_dir}")
-            for file in os.listdir(bgm_dir):
-                if file.endswith(".mp3"):
-                    name = os.path.splitext(file)[0]
-                    self.music[name] = os.path.join(bgm_dir, file)
-                    print(f"找到背景音乐: {name}")
+            for path in bgm_files:
+                name = os.path.splitext(os.path.basename(path))[0]
+                self.music[name] = path
+                print(f"找到背景音乐: {name}")
         else:
             print(f"警告：背景音乐目录不存在: {bgm_dir}")
         
         # 加载音效
         sfx_dir = "assets/audio/sfx"
-        if os.path.exists(sfx_dir):
+        sfx_files = list_assets(sfx_dir, ".mp3")
+        if sfx_files:
             print(f"扫描音效目录: {sfx_dir}")
-            for file in os.listdir(sfx_dir):
-                if file.endswith(".mp3"):
-                    name = os.path.splitext(file)[0]
-                    try:
-                        self.sounds[name] = pygame.mixer.Sound(os.path.join(sfx_dir, file))
-                        self.sounds[name].set_volume(self.sound_volume)
-                        print(f"加载音效: {name}")
-                    except pygame.error as e:
-                        print(f"加载音效失败 {name}: {e}")
+            for path in sfx_files:
+                name = os.path.splitext(os.path.basename(path))[0]
+                try:
+                    self.sounds[name] = self.audio_cache.load_sound(path)
+                    self.sounds[name].set_volume(self.sound_volume)
+                    print(f"加载音效: {name}")
+                except (pygame.error, OSError) as e:
+                    print(f"加载音效失败 {name}: {e}")
         else:
             print(f"警告：音效目录不存在: {sfx_dir}")
         
-        print(f"音频资源加载完成 - 背景音乐: {len(self.music)}个, 音效: {len(self.sounds)}个")
+        print(f"音频资源加载完成 - 背景音乐: {len(self.music)}个, 音效: {len(self.sounds)}个 "
+              f"(缓存命中 {self.audio_cache.hits}, 解码 {self.audio_cache.misses})")
     
     def _load_font_resources(self):
         """加载字体资源"""
@@ -74,7 +87,7 @@ class ResourceManager:
         # 字体文件路径
         font_path = "assets/fonts/SourceHanSans-Regular.ttc"
         
-        if not os.path.exists(font_path):
+        if not asset_exists(font_path):
             print(f"警告：字体文件不存在: {font_path}")
             print("将使用系统默认字体")
             return
@@ -86,7 +99,7 @@ class ResourceManager:
             
             for size in sizes:
                 try:
-                    self.fonts['source_han_sans'][size] = pygame.font.Font(font_path, size)
+                    self.fonts['source_han_sans'][size] = pygame.font.Font(open_asset(font_path), size)
                     print(f"加载字体 source_han_sans 大小 {size}")
                 except pygame.error as e:
                     print(f"加载字体失败 source_han_sans 大小 {size}: {e}")
@@ -108,8 +121,8 @@ class ResourceManager:
             print(f"加载新字号 {size} 的字体 {font_name}")
             try:
                 font_path = "assets/fonts/SourceHanSans-Regular.ttc"
-                if os.path.exists(font_path):
-                    self.fonts[font_name][size] = pygame.font.Font(font_path, size)
+                if asset_exists(font_path):
+                    self.fonts[font_name][size] = pygame.font.Font(open_asset(font_path), size)
                 else:
                     self.fonts[font_name][size] = pygame.font.SysFont(None, size)
             except pygame.error as e:
@@ -123,9 +136,10 @@ class ResourceManager:
         if path not in self.images:
             print(f"加载图片: {path}")
             try:
-                self.images[path] = pygame.image.load(path).convert_alpha()
+                with open_asset(path) as f:
+                    self.images[path] = pygame.image.load(f, path).convert_alpha()
                 print(f"图片加载成功: {path}")
-            except pygame.error as e:
+            except (pygame.error, OSError) as e:
                 print(f"无法加载图片 {path}: {e}")
                 print("创建默认紫色方块作为替代")
                 # 创建一个默认的紫色方块作为替代
@@ -139,12 +153,18 @@ class ResourceManager:
         if name in self.music and name != self.current_music:
             print(f"播放背景音乐: {name} {'(循环)' if loop else ''}")
             try:
-                pygame.mixer.music.load(self.music[name])
+                # 音乐播放期间持续从流中读取，保留流的引用
+                path = self.music[name]
+                stream = open_asset(path)
+                pygame.mixer.music.load(stream, os.path.splitext(path)[1][1:])
+                if self._music_stream is not None:
+                    self._music_stream.close()
+                self._music_stream = stream
                 pygame.mixer.music.set_volume(self.music_volume)
                 pygame.mixer.music.play(-1 if loop else 0)
                 self.current_music = name
                 print(f"背景音乐 {name} 开始播放")
-            except pygame.error as e:
+            except (pygame.error, OSError) as e:
                 print(f"无法播放音乐 {name}: {e}")
         elif name not in self.music:
             print(f"错误：未找到背景音乐 {name}")
@@ -158,17 +178,18 @@ class ResourceManager:
             self.current_music = None
     
     def play_sound(self, name: str):
-        """播放音效"""
+        """请求播放音效，实际播放在每帧的update中统一处理"""
         if name in self.sounds:
-            print(f"播放音效: {name}")
-            try:
-                self.sounds[name].play()
-            except pygame.error as e:
-                print(f"无法播放音效 {name}: {e}")
-        else:
+            self.channel_manager.request(name)
+        elif name not in self._missing_sounds:
+            self._missing_sounds.add(name)
             print(f"错误：未找到音效 {name}")
             print(f"当前可用的音效: {', '.join(self.sounds.keys())}")
     
+    def update(self):
+        """每帧调用一次，批量处理本帧的音效请求"""
+        self.channel_manager.flush(self.sounds)
+    
     def set_music_volume(self, volume: float):
         """设置背景音乐音量"""
         old_volume = self.music_volume
@@ -188,6 +209,7 @@ class ResourceManager:
         """清理资源缓存"""
         print("清理资源缓存")
         print(f"清理前 - 图片: {len(self.images)}个, 音效: {len(self.sounds)}个, 背景音乐: {len(self.music)}个")
+        self.channel_manager.stop_all()
         self.images.clear()
         self.sounds.clear()
         self.music.clear()
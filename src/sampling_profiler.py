@@ -0,0 +1,205 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 采样频率（每秒采样次数，覆盖默认值）
+PROFILE_ENV = "GF_PROFILE_HZ"
+
+# 主线程空闲等待所在的函数（文件名, 函数名），热点统计时不计入
+IDLE_FUNCTIONS = {("frame_pacer.py", "wait")}
+
+class SamplingProfiler:
+    """采样分析器：后台线程按固定频率读取主线程的调用栈，按调用栈聚合采样次数
+    
+    不需要像cProfile那样给每次函数调用插桩，运行中随时开关；结果可以导出为
+    折叠栈格式（每行"外层;...;内层 次数"），直接交给flamegraph.pl或speedscope生成火焰图。
+    热点函数（按自身采样数排序）由采样线程定期计算，调试信息每帧只读取结果。
+    采样线程需要拿到GIL才能运行，主线程一直忙碌时实际频率受切换间隔（默认5ms）限制。
+    """
+    def __init__(self, hz: float = 200.0, max_depth: int = 64, refresh: float = 0.5, top: int = 8,
+                 directory: str = os.path.join("logs", "profiles"),
+                 clock: Callable[[], float] = time.perf_counter):
+        self.hz = hz
+        self.max_depth = max_depth
+        self.refresh = refresh  # 热点统计的刷新间隔（秒）
+        self.top_count = top
+        self.directory = directory
+        self.clock = clock
+        
+        self.stacks: Dict[Tuple, int] = {}       # 调用栈（代码对象元组，外层在前） -> 采样次数
+        self.self_counts: Dict[object, int] = {}  # 代码对象 -> 位于栈顶的采样次数
+        self.total_counts: Dict[object, int] = {}  # 代码对象 -> 出现在栈中的采样次数
+        self.samples = 0
+        self.idle_samples = 0
+        self.hot: List[Dict] = []  # 最近一次计算的热点函数
+        self._labels: Dict[object, str] = {}
+        self._idle_codes: Dict[object, bool] = {}
+        self._target: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started = 0.0
+        self.duration = 0.0  # 已采样的时长（秒）
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+    
+    def start(self, thread_ident: Optional[int] = None):
+        """开始采样（默认采样调用者所在的线程），之前的结果会被清空"""
+        if self.running:
+            return
+        self.clear()
+        self.set_target(thread_ident)
+        self._stop.clear()
+        self._started = self.clock()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+        print(f"采样分析器已开启 - 频率: {self.hz:.0f}Hz")
+    
+    def set_target(self, thread_ident: Optional[int] = None):
+        """设置被采样的线程（默认为调用者所在的线程）"""
+        self._target = thread_ident if thread_ident is not None else threading.get_ident()
+    
+    def stop(self, save: bool = True) -> Optional[str]:
+        """停止采样，把折叠栈写入文件并返回路径（save为False时只停止）"""
+        if not self.running:
+            return None
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self.duration = self.clock() - self._started
+        self.hot = self.compute_hot()
+        if not save:
+            return None
+        print(f"采样分析器已关闭 - {self.samples}次采样, {self.duration:.1f}秒")
+        for entry in self.hot:
+            print(f"  {entry['self_percent']:5.1f}% (累计 {entry['total_percent']:5.1f}%) {entry['function']}")
+        return self.write_folded()
+    
+    def toggle(self) -> Optional[str]:
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+    
+    def clear(self):
+        self.stacks = {}
+        self.self_counts = {}
+        self.total_counts = {}
+        self.samples = 0
+        self.idle_samples = 0
+        self.hot = []
+        self.duration = 0.0
+    
+    def _run(self):
+        interval = 1.0 / self.hz
+        next_refresh = self.clock() + self.refresh
+        try:
+            while not self._stop.wait(interval):
+                self.sample()
+                now = self.clock()
+                if now >= next_refresh:
+                    self.hot = self.compute_hot()
+                    next_refresh = now + self.refresh
+        except Exception as e:
+            print(f"采样分析器发生错误: {e}")
+            traceback.print_exc()
+    
+    def sample(self) -> bool:
+        """采样一次目标线程的调用栈，目标线程不存在时返回False"""
+        frame = sys._current_frames().get(self._target)
+        if frame is None:
+            return False
+        codes = []
+        depth = 0
+        while frame is not None and depth < self.max_depth:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+            depth += 1
+        del frame
+        codes.reverse()
+        stack = tuple(codes)
+        
+        self.samples += 1
+        leaf = stack[-1]
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.self_counts[leaf] = self.self_counts.get(leaf, 0) + 1
+        if self._is_idle(leaf):
+            # 空闲采样只保留在折叠栈中，不计入累计占比
+            self.idle_samples += 1
+            return True
+        total_counts = self.total_counts
+        for code in set(stack):
+            total_counts[code] = total_counts.get(code, 0) + 1
+        return True
+    
+    def label(self, code) -> str:
+        """代码对象的显示名称：文件名:限定函数名"""
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, 'co_qualname', code.co_name)
+            label = f"{os.path.basename(code.co_filename)}:{name}"
+            self._labels[code] = label
+        return label
+    
+    def _is_idle(self, code) -> bool:
+        idle = self._idle_codes.get(code)
+        if idle is None:
+            idle = (os.path.basename(code.co_filename), code.co_name) in IDLE_FUNCTIONS
+            self._idle_codes[code] = idle
+        return idle
+    
+    def compute_hot(self, count: Optional[int] = None) -> List[Dict]:
+        """按自身采样数排序的热点函数，百分比相对于非空闲的采样数"""
+        busy = self.samples - self.idle_samples
+        if busy <= 0:
+            return []
+        entries = [(samples, code) for code, samples in list(self.self_counts.items())
+                   if not self._is_idle(code)]
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        return [
+            {
+                'function': self.label(code),
+                'line': code.co_firstlineno,
+                'self': samples,
+                'self_percent': samples * 100.0 / busy,
+                'total_percent': self.total_counts.get(code, 0) * 100.0 / busy
+            }
+            for samples, code in entries[:count or self.top_count]
+        ]
+    
+    def folded(self) -> List[str]:
+        """折叠栈格式的文本行（外层在前，以分号分隔）"""
+        return [";".join(self.label(code) for code in stack) + f" {samples}"
+                for stack, samples in sorted(self.stacks.items(), key=lambda item: -item[1])]
+    
+    def write_folded(self, path: Optional[str] = None) -> Optional[str]:
+        if not self.stacks:
+            return None
+        try:
+            if path is None:
+                os.makedirs(self.directory, exist_ok=True)
+                path = os.path.join(self.directory, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.folded")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(self.folded()) + "\n")
+            print(f"采样结果已保存（折叠栈格式）: {path}")
+            return path
+        except Exception as e:
+            print(f"保存采样结果时发生错误: {e}")
+            traceback.print_exc()
+            return None
+
+# 全局采样分析器（F8开关）
+profiler = SamplingProfiler()
+
+def install_from_env():
+    """根据环境变量设置采样频率"""
+    value = os.environ.get(PROFILE_ENV, "")
+    if value:
+        try:
+            profiler.hz = max(1.0, float(value))
+        except ValueError:
+            print(f"无效的采样频率: {value}")
@@ -0,0 +1,191 @@
+import struct
+import zlib
+from typing import Any, Callable, Dict, Tuple
+
+# 存档文件头：魔数、结构版本、标志位、原始数据长度、存储数据CRC32
+MAGIC = b'GFSV'
+HEADER = struct.Struct('<4sHBII')
+FLAG_COMPRESSED = 0x01
+
+# 当前存档结构版本
+SCHEMA_VERSION = 2
+
+# 数据类型标记
+_TAG_NONE = 0x00
+_TAG_FALSE = 0x01
+_TAG_TRUE = 0x02
+_TAG_INT = 0x03
+_TAG_FLOAT = 0x04
+_TAG_STR = 0x05
+_TAG_BYTES = 0x06
+_TAG_LIST = 0x07
+_TAG_DICT = 0x08
+
+_FLOAT = struct.Struct('<d')
+
+class SaveFormatError(Exception):
+    """存档格式错误"""
+    pass
+
+def _write_varint(out: bytearray, value: int):
+    """写入无符号变长整数"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """读取无符号变长整数，返回 (值, 新偏移)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+def _encode(value: Any, out: bytearray):
+    """按类型标记编码单个值"""
+    if value is None:
+        out.append(_TAG_NONE)
+    elif value is True:
+        out.append(_TAG_TRUE)
+    elif value is False:
+        out.append(_TAG_FALSE)
+    elif isinstance(value, int):
+        out.append(_TAG_INT)
+        # zigzag编码，使小的负数也占用较少字节
+        _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+    elif isinstance(value, float):
+        out.append(_TAG_FLOAT)
+        out += _FLOAT.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        out.append(_TAG_STR)
+        _write_varint(out, len(encoded))
+        out += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_TAG_BYTES)
+        _write_varint(out, len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out.append(_TAG_LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out.append(_TAG_DICT)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    else:
+        raise SaveFormatError(f"无法编码的数据类型: {type(value).__name__}")
+
+def _decode(data: bytes, offset: int) -> Tuple[Any, int]:
+    """解码单个值，返回 (值, 新偏移)"""
+    tag = data[offset]
+    offset += 1
+    if tag == _TAG_INT:
+        raw, offset = _read_varint(data, offset)
+        return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), offset
+    if tag == _TAG_FLOAT:
+        return _FLOAT.unpack_from(data, offset)[0], offset + 8
+    if tag == _TAG_STR:
+        length, offset = _read_varint(data, offset)
+        return data[offset:offset + length].decode('utf-8'), offset + length
+    if tag == _TAG_DICT:
+        count, offset = _read_varint(data, offset)
+        result = {}
+        for _ in range(count):
+            key, offset = _decode(data, offset)
+            result[key], offset = _decode(data, offset)
+        return result, offset
+    if tag == _TAG_LIST:
+        count, offset = _read_varint(data, offset)
+        items = []
+        for _ in range(count):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == _TAG_NONE:
+        return None, offset
+    if tag == _TAG_TRUE:
+        return True, offset
+    if tag == _TAG_FALSE:
+        return False, offset
+    if tag == _TAG_BYTES:
+        length, offset = _read_varint(data, offset)
+        return bytes(data[offset:offset + length]), offset + length
+    raise SaveFormatError(f"未知的数据类型标记: {tag:#x}")
+
+def dumps(data: Dict[str, Any], version: int = SCHEMA_VERSION, compress: bool = True) -> bytes:
+    """把存档数据编码为二进制"""
+    payload = bytearray()
+    _encode(data, payload)
+    raw_length = len(payload)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, 6)
+        flags |= FLAG_COMPRESSED
+    header = HEADER.pack(MAGIC, version, flags, raw_length, zlib.crc32(payload))
+    return header + bytes(payload)
+
+def loads(blob: bytes) -> Tuple[int, Dict[str, Any]]:
+    """解码二进制存档，返回 (结构版本, 存档数据)"""
+    if len(blob) < HEADER.size:
+        raise SaveFormatError("存档文件过短")
+    magic, version, flags, raw_length, checksum = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise SaveFormatError("不是有效的存档文件")
+    
+    payload = memoryview(blob)[HEADER.size:]
+    if zlib.crc32(payload) != checksum:
+        raise SaveFormatError("存档校验失败，文件可能已损坏")
+    payload = zlib.decompress(payload) if flags & FLAG_COMPRESSED else bytes(payload)
+    if len(payload) != raw_length:
+        raise SaveFormatError("存档数据长度不匹配")
+    
+    data, _ = _decode(payload, 0)
+    if not isinstance(data, dict):
+        raise SaveFormatError("存档根节点必须是字典")
+    return version, data
+
+def _migrate_v1_to_v2(data: Dict[str, Any]) -> Dict[str, Any]:
+    """v1（旧版JSON，只有累计数据）-> v2：增加局内统计、已解锁升级和回放"""
+    data.setdefault('runs', [])
+    data.setdefault('unlocked_upgrades', [])
+    data.setdefault('replays', [])
+    return data
+
+def new_save() -> Dict[str, Any]:
+    """创建当前结构版本的空存档"""
+    return {
+        'score': 0,
+        'fragments': 0,
+        'stars': 0,
+        'play_time': 0,
+        'runs': [],
+        'unlocked_upgrades': [],
+        'replays': []
+    }
+
+# 存档迁移表：旧版本 -> 升级到下一版本的函数
+MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    1: _migrate_v1_to_v2
+}
+
+def migrate(data: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """把存档数据逐级迁移到当前结构版本"""
+    if version > SCHEMA_VERSION:
+        raise SaveFormatError(f"存档版本 {version} 高于当前支持的版本 {SCHEMA_VERSION}")
+    if not isinstance(data, dict):
+        raise SaveFormatError(f"存档根节点应为字典，实际为 {type(data).__name__}")
+    while version < SCHEMA_VERSION:
+        if version not in MIGRATIONS:
+            raise SaveFormatError(f"缺少从版本 {version} 升级的迁移")
+        data = MIGRATIONS[version](data)
+        version += 1
+    return data
@@ -1,14 +1,22 @@
 import json
 import os
+import time
 from typing import Dict, Any, Optional
+import save_format
+from save_format import SaveFormatError
 
 class SaveManager:
     """存档管理器，负责处理游戏存档的保存和加载"""
     
-    def __init__(self):
+    def __init__(self, compress: bool = True):
         # 存档目录
         self.save_dir = "save"
-        self.save_file = os.path.join(self.save_dir, "game_save.json")
+        self.save_file = os.path.join(self.save_dir, "game_save.dat")
+        # 旧版JSON存档（结构版本1），加载后在下次保存时转换为二进制格式
+        self.legacy_save_file = os.path.join(self.save_dir, "game_save.json")
+        # 调试用的JSON导出文件
+        self.export_file = os.path.join(self.save_dir, "game_save.export.json")
+        self.compress = compress
         
         # 确保存档目录存在
         if not os.path.exists(self.save_dir):
@@ -19,18 +27,30 @@ class SaveManager:
     
     def save_exists(self) -> bool:
         """检查是否存在存档"""
-        return os.path.exists(self.save_file)
+        return os.path.exists(self.save_file) or os.path.exists(self.legacy_save_file)
     
     def save_game(self, data: Dict[str, Any]) -> bool:
-        """保存游戏数据"""
+        """保存游戏数据，未提供的字段保留原存档中的值"""
         try:
             # 确保存档目录存在
             if not os.path.exists(self.save_dir):
                 os.makedirs(self.save_dir)
             
-            # 保存数据
-            with open(self.save_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            # 与现有存档合并，保留局内统计、已解锁升级和回放
+            base = self.current_save if self.current_save is not None else self.load_game()
+            if base is None and os.path.exists(self.save_file):
+                # 存档存在但无法读取（损坏或版本过新），先备份再写入，避免覆盖丢失
+                self.backup_save()
+            merged = dict(base or save_format.new_save())
+            merged.update(data)
+            data = merged
+            blob = save_format.dumps(data, compress=self.compress)
+            
+            # 先写临时文件再替换，避免写入中断导致存档损坏
+            temp_file = self.save_file + ".tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(blob)
+            os.replace(temp_file, self.save_file)
             
             self.current_save = data
             return True
@@ -41,30 +61,60 @@ class SaveManager:
     def load_game(self) -> Optional[Dict[str, Any]]:
         """加载游戏数据"""
         try:
-            if not os.path.exists(self.save_file):
+            if os.path.exists(self.save_file):
+                with open(self.save_file, 'rb') as f:
+                    version, data = save_format.loads(f.read())
+            elif os.path.exists(self.legacy_save_file):
+                with open(self.legacy_save_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                version = 1
+            else:
                 return None
             
-            with open(self.save_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
+            data = save_format.migrate(data, version)
             self.current_save = data
             return data
-        except Exception as e:
+        except (SaveFormatError, OSError, ValueError) as e:
             print(f"加载游戏失败: {e}")
             return None
     
+    def backup_save(self) -> Optional[str]:
+        """把当前存档文件改名备份，返回备份路径"""
+        backup_file = f"{self.save_file}.{time.strftime('%Y%m%d_%H%M%S')}.bak"
+        os.replace(self.save_file, backup_file)
+        print(f"无法读取的存档已备份到: {backup_file}")
+        return backup_file
+    
+    def export_json(self, path: Optional[str] = None) -> bool:
+        """把当前存档导出为可读的JSON（用于调试）"""
+        try:
+            data = self.current_save if self.current_save is not None else self.load_game()
+            if data is None:
+                return False
+            
+            with open(path or self.export_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': save_format.SCHEMA_VERSION, 'data': data},
+                          f, ensure_ascii=False, indent=4)
+            return True
+        except Exception as e:
+            print(f"导出存档失败: {e}")
+            return False
+    
     def delete_save(self) -> bool:
         """删除存档"""
         try:
-            if os.path.exists(self.save_file):
-                os.remove(self.save_file)
+            deleted = False
+            for path in (self.save_file, self.legacy_save_file):
+                if os.path.exists(path):
+                    os.remove(path)
+                    deleted = True
+            if deleted:
                 self.current_save = None
-                return True
-            return False
+            return deleted
         except Exception as e:
             print(f"删除存档失败: {e}")
             return False
     
     def get_current_save(self) -> Optional[Dict[str, Any]]:
         """获取当前存档数据"""
-        return self.current_save 
\ No newline at end of file
+        return self.current_save
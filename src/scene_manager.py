@@ -1,17 +1,55 @@
 import pygame
-from typing import Dict, Optional, List
+import threading
+from enum import Enum, auto
+from typing import Callable, Dict, Optional, List
 import traceback
+from ui.overlay import compositor
+from input_manager import InputSnapshot
+from startup_trace import tracer
+
+class SceneState(Enum):
+    """场景生命周期状态"""
+    CREATED = auto()     # 已创建，尚未初始化（或已清理）
+    PREPARING = auto()   # 正在后台线程中预初始化
+    PREPARED = auto()    # 预初始化完成，等待initialize
+    ACTIVE = auto()      # 当前正在运行
+    SUSPENDED = auto()   # 被挂起并保留在场景栈中，恢复时不重新初始化
 
 class Scene:
-    """场景基类"""
+    """场景基类
+    
+    生命周期：prepare（可选，可在后台线程执行）-> initialize -> [suspend -> resume]* -> cleanup
+    """
+    state = SceneState.CREATED
+    
+    def prepare(self):
+        """预初始化场景（在后台线程执行，不能访问显示设备和事件队列）"""
+        pass
+    
     def initialize(self):
         """初始化场景"""
         pass
     
+    def suspend(self):
+        """挂起场景（切换到其他场景时保留状态）"""
+        pass
+    
+    def resume(self):
+        """从挂起状态恢复场景"""
+        pass
+    
+    def resize(self, width: int, height: int):
+        """屏幕大小变化时调整布局"""
+        pass
+    
     def handle_event(self, event: pygame.event.Event):
         """处理事件"""
         pass
     
+    def handle_input(self, snapshot: InputSnapshot):
+        """处理本帧的输入快照（每个模拟帧调用一次，在update之前）"""
+        pass
+    
     def update(self):
         """更新场景"""
         pass
@@ -28,6 +66,7 @@ class SceneManager:
     """场景管理器，负责管理和切换场景"""
     def __init__(self):
         self.scenes: Dict[str, Scene] = {}
+        self.scene_factories: Dict[str, Callable[[], Scene]] = {}  # 尚未创建的场景
         self.current_scene: Optional[Scene] = None
         self.current_scene_name: Optional[str] = None
         self.scene_stack: List[str] = []  # 场景栈，用于场景回退
@@ -36,6 +75,8 @@ class SceneManager:
         self.transition_start_time = 0
         self.transition_from = None
         self.transition_to = None
+        self.compositor = compositor  # 切换动画复用预分配的遮罩
+        self.preload_threads: Dict[str, threading.Thread] = {}  # 后台预初始化线程
         print("场景管理器初始化完成")
     
     def register_scene(self, name: str, scene: Scene):
@@ -43,35 +84,115 @@ class SceneManager:
         try:
             if name in self.scenes:
                 print(f"警告：场景 {name} 已存在，将被覆盖")
+            self.scene_factories.pop(name, None)
             self.scenes[name] = scene
             print(f"注册场景: {name} ({scene.__class__.__name__})")
         except Exception as e:
             print(f"注册场景 {name} 失败: {e}")
             traceback.print_exc()
     
-    def switch_scene(self, name: str, push_to_stack: bool = True):
-        """切换场景"""
+    def register_scene_factory(self, name: str, factory: Callable[[], Scene]):
+        """注册场景工厂，场景在第一次切换或预初始化时才创建"""
+        if self.has_scene(name):
+            print(f"警告：场景 {name} 已存在，将被覆盖")
+            self.scenes.pop(name, None)
+        self.scene_factories[name] = factory
+        print(f"注册场景工厂: {name}")
+    
+    def has_scene(self, name: str) -> bool:
+        """场景是否已注册（包括尚未创建的场景）"""
+        return name in self.scenes or name in self.scene_factories
+    
+    def get_scene(self, name: str) -> Optional[Scene]:
+        """获取场景，尚未创建时调用工厂创建"""
+        scene = self.scenes.get(name)
+        if scene is None and name in self.scene_factories:
+            factory = self.scene_factories[name]
+            try:
+                with tracer.span(f"scene:{name}"):
+                    scene = factory()
+            except Exception as e:
+                print(f"创建场景 {name} 时发生错误: {e}")
+                traceback.print_exc()
+                return None
+            self.register_scene(name, scene)
+        return scene
+    
+    def preload_scene(self, name: str) -> bool:
+        """在后台线程中预初始化场景，切换时只需执行轻量的initialize"""
+        scene = self.get_scene(name)
+        if scene is None:
+            print(f"错误：场景 {name} 不存在")
+            return False
+        if scene.state != SceneState.CREATED:
+            return False
+        
+        def run():
+            try:
+                scene.prepare()
+                scene.state = SceneState.PREPARED
+            except Exception as e:
+                print(f"预初始化场景 {name} 时发生错误: {e}")
+                traceback.print_exc()
+                scene.state = SceneState.CREATED
+        
+        scene.state = SceneState.PREPARING
+        thread = threading.Thread(target=run, name=f"preload-{name}", daemon=True)
+        self.preload_threads[name] = thread
+        thread.start()
+        return True
+    
+    def wait_for_preload(self, name: str):
+        """等待场景的后台预初始化完成"""
+        thread = self.preload_threads.pop(name, None)
+        if thread is not None:
+            thread.join()
+    
+    def _cleanup_scene(self, name: str):
+        """清理场景并重置为未初始化状态"""
+        scene = self.scenes[name]
+        try:
+            scene.cleanup()
+        except Exception as e:
+            print(f"清理场景 {name} 时发生错误: {e}")
+            traceback.print_exc()
+        scene.state = SceneState.CREATED
+    
+    def switch_scene(self, name: str, push_to_stack: bool = True, reinitialize: bool = False):
+        """切换场景
+        
+        push_to_stack为True时当前场景被挂起并保留在场景栈中，否则被清理。
+        目标场景处于挂起状态时直接恢复，reinitialize为True时强制重新初始化。
+        """
         try:
             print(f"切换场景到: {name}")
-            if name not in self.scenes:
+            if not self.has_scene(name):
                 print(f"错误：场景 {name} 不存在")
-                print(f"当前已注册的场景: {', '.join(self.scenes.keys())}")
+                print(f"当前已注册的场景: {', '.join(list(self.scenes) + list(self.scene_factories))}")
+                return
+            if self.get_scene(name) is None:
                 return
             
-            # 清理当前场景
-            if self.current_scene:
-                try:
-                    self.current_scene.cleanup()
-                except Exception as e:
-                    print(f"清理场景 {self.current_scene_name} 时发生错误: {e}")
-                    traceback.print_exc()
+            # 挂起或清理当前场景
+            old_scene = self.current_scene_name
+            if self.current_scene and old_scene != name:
+                if push_to_stack:
+                    try:
+                        self.current_scene.suspend()
+                        self.current_scene.state = SceneState.SUSPENDED
+                    except Exception as e:
+                        print(f"挂起场景 {old_scene} 时发生错误: {e}")
+                        traceback.print_exc()
+                        self._cleanup_scene(old_scene)
+                    self.scene_stack.append(old_scene)
+                else:
+                    self._cleanup_scene(old_scene)
             
-            # 保存当前场景到栈中
-            if push_to_stack and self.current_scene_name:
-                self.scene_stack.append(self.current_scene_name)
+            # 目标场景已在栈中时从栈中取出，避免同一场景重复入栈
+            if name in self.scene_stack:
+                self.scene_stack.remove(name)
             
             # 切换场景
-            old_scene = self.current_scene_name
             self.current_scene = self.scenes[name]
             self.current_scene_name = name
             
@@ -83,11 +204,21 @@ class SceneManager:
             
             print(f"从 {old_scene if old_scene else '无'} 切换到 {name}")
             
-            # 初始化新场景
+            scene = self.current_scene
+            if reinitialize and scene.state in (SceneState.SUSPENDED, SceneState.ACTIVE):
+                self._cleanup_scene(name)
+            
             try:
-                print(f"初始化新场景: {name}")
-                self.current_scene.initialize()
-                print(f"场景 {name} 初始化完成")
+                if scene.state == SceneState.SUSPENDED:
+                    # 恢复挂起的场景
+                    scene.resume()
+                    print(f"场景 {name} 已恢复")
+                elif scene.state != SceneState.ACTIVE:
+                    # 初始化新场景（预初始化尚未完成时等待）
+                    self.wait_for_preload(name)
+                    scene.initialize()
+                    print(f"场景 {name} 初始化完成")
+                scene.state = SceneState.ACTIVE
             except Exception as e:
                 print(f"初始化场景 {name} 时发生错误: {e}")
                 traceback.print_exc()
@@ -104,31 +235,37 @@ class SceneManager:
         else:
             print("警告：场景栈为空，无法返回上一个场景")
     
+    def resize(self, width: int, height: int):
+        """通知所有已创建的场景屏幕大小已变化"""
+        for name, scene in self.scenes.items():
+            try:
+                scene.resize(width, height)
+            except Exception as e:
+                print(f"调整场景 {name} 大小时发生错误: {e}")
+                traceback.print_exc()
+    
     def handle_event(self, event: pygame.event.Event):
         """处理事件"""
         if not self.current_scene:
             return
         
         try:
-            # 记录事件信息
-            if event.type == pygame.KEYDOWN:
-                print(f"场景 {self.current_scene_name} 处理按键事件: {pygame.key.name(event.key)}")
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                print(f"场景 {self.current_scene_name} 处理鼠标按下事件: {event.pos}")
-            
-            # 处理事件
             self.current_scene.handle_event(event)
         
         except Exception as e:
             print(f"处理事件时发生错误: {e}")
             traceback.print_exc()
     
-    def update(self):
+    def update(self, snapshot: Optional[InputSnapshot] = None):
         """更新当前场景"""
         if not self.current_scene:
             return
         
         try:
+            # 处理输入快照
+            if snapshot is not None:
+                self.current_scene.handle_input(snapshot)
+            
             # 更新场景
             self.current_scene.update()
             
@@ -154,11 +291,7 @@ class SceneManager:
             # 渲染场景切换动画
             if self.is_transitioning:
                 progress = (pygame.time.get_ticks() - self.transition_start_time) / self.transition_time
-                alpha = int(255 * (1 - progress))
-                overlay = pygame.Surface((screen.get_width(), screen.get_height()))
-                overlay.fill((0, 0, 0))
-                overlay.set_alpha(alpha)
-                screen.blit(overlay, (0, 0))
+                self.compositor.fade(screen, progress)
         
         except Exception as e:
             print(f"渲染场景时发生错误: {e}")
@@ -172,4 +305,4 @@ class SceneManager:
                 screen.blit(error_text, (screen.get_width() // 2 - error_text.get_width() // 2,
                                        screen.get_height() // 2 - error_text.get_height() // 2))
             except:
-                pass  # 如果连错误信息都无法渲染，就放弃 
\ No newline at end of file
+                pass  # 如果连错误信息都无法渲染，就放弃
@@ -4,8 +4,20 @@ from scene_manager import Scene
 from entities.player import Player
 from entities.enemy import Enemy
 from entities.geometric_enemies import TriangleEnemy, CircleEnemy, SquareEnemy
+from entities.bullet_patterns import BossBulletPool
+from entities.sprite_atlas import SpriteBatch, sprite_atlas
+from physics.broadphase import SpatialHashGrid, collect_swept_pairs
+from physics.narrowphase import (ShapeBatch, SweptCircleBatch, SHAPE_CIRCLE, aabb_aabb,
+                                 bullet_radius, circle_aabb, first_hits, sweep_pairs,
+                                 swept_circle_aabb)
 from ui.hud import HUD
-from ui.ui_element import Label
+from ui.ui_element import Label, UIElement
+from ui.layout import Anchor, update_layout
+from ui.overlay import compositor
+from event_bus import CombatEvent, EventQueue
+from input_manager import Action, InputSnapshot
+from quality_governor import quality
+from flight_recorder import flight_recorder
 import random
 import math
 
@@ -22,15 +34,33 @@ class GameScene(Scene):
         # 玩家相关
         self.player_class = None
         self.player = None
+        self.prepared_player = None  # 后台预初始化创建的玩家
+        self.suspend_time = 0
         
         # 敌人列表
         self.enemies = []
         self.enemy_spawn_timer = 0
         self.enemy_spawn_interval = 2000  # 每2秒生成一个敌人
-        self.max_enemies = 10
+        self.max_enemies = 10  # 最高画质下的敌人数量上限
+        
+        # Boss共享子弹池
+        self.boss_bullets = BossBulletPool(bounds=(-50, -50, screen_width + 50, screen_height + 50))
+        
+        # 实体和子弹的精灵按图层批量绘制（每帧复用）
+        self.sprite_batch = SpriteBatch()
+        
+        # 碰撞检测（每帧复用的缓冲区）
+        self.collision_grid = SpatialHashGrid(cell_size=64)
+        self.collision_targets = ShapeBatch()
+        self.collision_movers = SweptCircleBatch()
+        
+        # 战斗事件队列（每帧在update末尾统一分发）
+        self.events = EventQueue()
+        self.events.subscribe(CombatEvent.KILL, self._on_enemy_killed)
         
         # 创建HUD
         self.hud = HUD(screen_width, screen_height)
+        self.hud.bind_events(self.events)
         
         # 创建暂停和游戏结束提示
         self.pause_label = Label(
@@ -56,22 +86,76 @@ class GameScene(Scene):
             bold=True
         )
         
+        # 游戏结束时的结算信息（只在数值变化时重新渲染文本）
+        self.final_score_label = Label(
+            screen_width // 2 - 75,
+            screen_height // 2 + 50,
+            "得分: 0",
+            48,
+            bold=True
+        )
+        
+        self.final_fragment_label = Label(
+            screen_width // 2 - 75,
+            screen_height // 2 + 100,
+            "获得碎片: 0",
+            32
+        )
+        
+        self.final_star_label = Label(
+            screen_width // 2 - 75,
+            screen_height // 2 + 130,
+            "获得星星: 0",
+            32
+        )
+        
+        # 提示文本相对屏幕中心定位，屏幕大小变化时只需重新布局
+        self.overlay_root = UIElement(0, 0, screen_width, screen_height)
+        for label in (self.pause_label, self.pause_tip, self.game_over_label,
+                      self.final_score_label, self.final_fragment_label, self.final_star_label):
+            label.set_anchor(Anchor((0.5, 0.5), (label.x - screen_width // 2, label.y - screen_height // 2),
+                                    pivot=(0.0, 0.0)))
+            self.overlay_root.add_child(label)
+        
+        # 暂停和游戏结束的背景遮罩
+        self.compositor = compositor
+        self.overlay_alpha = 128
+        
         print("游戏场景初始化完成，屏幕大小:", screen_width, "x", screen_height)
     
     def set_player_class(self, player_class: Type[Player]):
         """设置玩家类型"""
+        if player_class is not self.player_class:
+            # 预初始化的玩家类型不同，作废
+            self.prepared_player = None
         self.player_class = player_class
         print(f"设置玩家类型: {player_class.__name__}")
     
+    def _create_player(self) -> Player:
+        """创建位于屏幕中央的玩家"""
+        return self.player_class(
+            self.screen_width // 2,
+            self.screen_height // 2
+        )
+    
+    def prepare(self):
+        """在后台预先创建玩家并生成精灵图集（图集页在initialize中转换为显示格式）"""
+        if self.player_class:
+            self.prepared_player = self._create_player()
+        sprite_atlas.build()
+    
     def initialize(self):
         """初始化场景"""
         try:
+            sprite_atlas.convert_pages()
             if self.player_class:
-                # 创建玩家
-                self.player = self.player_class(
-                    self.screen_width // 2,
-                    self.screen_height // 2
-                )
+                # 创建玩家（优先使用预初始化的玩家）
+                player = self.prepared_player
+                self.prepared_player = None
+                if player is None or type(player) is not self.player_class:
+                    player = self._create_player()
+                self.player = player
+                self.player.event_queue = self.events
                 # 设置HUD的玩家引用
                 self.hud.set_player(self.player)
                 print(f"玩家 {self.player.__class__.__name__} 已创建")
@@ -80,6 +164,8 @@ class GameScene(Scene):
                 self.paused = False
                 self.game_over = False
                 self.enemies.clear()
+                self.boss_bullets.clear()
+                self.events.clear()
                 self.enemy_spawn_timer = pygame.time.get_ticks()
                 
                 print("游戏场景初始化完成")
@@ -90,22 +176,31 @@ class GameScene(Scene):
             import traceback
             traceback.print_exc()
     
-    def handle_event(self, event: pygame.event.Event):
-        """处理事件"""
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                self.paused = not self.paused
-                print(f"游戏{'暂停' if self.paused else '继续'}")
+    def resize(self, width: int, height: int):
+        """屏幕大小变化时调整边界和界面布局"""
+        self.screen_width = width
+        self.screen_height = height
+        self.boss_bullets.set_bounds(-50, -50, width + 50, height + 50)
+        self.hud.resize(width, height)
+        self.overlay_root.set_size(width, height)
+    
+    def suspend(self):
+        """挂起场景，保留玩家和敌人状态"""
+        self.suspend_time = pygame.time.get_ticks()
+    
+    def resume(self):
+        """恢复场景，挂起期间不计入敌人生成计时"""
+        self.enemy_spawn_timer += pygame.time.get_ticks() - self.suspend_time
+    
+    def handle_input(self, snapshot: InputSnapshot):
+        """处理本帧的输入快照"""
+        if snapshot.was_pressed(Action.PAUSE):
+            self.paused = not self.paused
+            print(f"游戏{'暂停' if self.paused else '继续'}")
+            return
         
-        if not self.paused and not self.game_over:
-            if self.player:
-                # 获取键盘状态
-                keys = pygame.key.get_pressed()
-                # 获取鼠标位置和按钮状态
-                mouse_pos = pygame.mouse.get_pos()
-                mouse_buttons = pygame.mouse.get_pressed()
-                # 处理玩家输入
-                self.player.handle_input(keys, mouse_pos, mouse_buttons)
+        if not self.paused and not self.game_over and self.player:
+            self.player.handle_input(snapshot)
     
     def _spawn_enemy(self):
         """生成敌人"""
@@ -131,7 +226,7 @@ class GameScene(Scene):
             
             # 创建敌人并设置目标
             enemy = enemy_class(x, y, self.player)
-            self.enemies.append(enemy)
+            self.add_enemy(enemy)
             print(f"生成敌人 {enemy_class.__name__} 在位置 ({x}, {y})")
         
         except Exception as e:
@@ -139,90 +234,138 @@ class GameScene(Scene):
             import traceback
             traceback.print_exc()
     
+    def get_enemy_cap(self) -> int:
+        """当前画质档位下的敌人数量上限"""
+        return quality.tier.spawn_cap(self.max_enemies)
+    
+    def apply_quality(self):
+        """应用当前画质档位的子弹细节和弹幕上限"""
+        tier = quality.tier
+        self.sprite_batch.detail = tier.bullet_detail
+        self.boss_bullets.set_limit(tier.bullet_limit)
+    
+    def add_enemy(self, enemy: Enemy):
+        """加入敌人，Boss改用场景共享的子弹池"""
+        if hasattr(enemy, 'set_bullet_pool'):
+            enemy.set_bullet_pool(self.boss_bullets)
+        enemy.event_queue = self.events
+        self.enemies.append(enemy)
+        flight_recorder.mark("spawn", type(enemy).__name__)
+    
+    def count_bullets(self) -> int:
+        """场景中的子弹总数（玩家、敌人和Boss弹幕）"""
+        count = len(self.player.bullets) if self.player else 0
+        for enemy in self.enemies:
+            count += len(enemy.bullets)
+        return count + self.boss_bullets.count
+    
+    def _on_enemy_killed(self, enemy: Enemy, killer, score: float):
+        """结算击杀奖励（得分、掉落和经验）"""
+        if not self.player or killer is not self.player:
+            return
+        
+        self.player.add_score(score)
+        if random.random() < enemy.fragment_drop_chance:
+            self.player.add_fragments(enemy.fragment_drop_amount)
+        if random.random() < enemy.star_drop_chance:
+            self.player.add_stars(enemy.star_drop_amount)
+        self.player.add_experience(random.randint(*enemy.experience_reward))
+    
     def _check_collisions(self):
-        """检查碰撞"""
+        """检查碰撞（网格粗筛 + 扫掠细测，避免高速子弹穿透）"""
         try:
             if not self.player or not self.player.is_alive:
                 return
             
+            # 构建本帧的敌人碰撞目标和空间网格
+            alive_enemies = [enemy for enemy in self.enemies if enemy.is_alive]
+            targets = self.collision_targets
+            targets.clear()
+            self.collision_grid.clear()
+            for enemy in alive_enemies:
+                index = targets.add_entity(enemy)
+                self.collision_grid.insert(index, *targets.bounds(index))
+            
             # 检查玩家子弹与敌人的碰撞
-            for bullet in self.player.bullets[:]:
-                bullet_rect = pygame.Rect(
-                    bullet.x - bullet.radius,
-                    bullet.y - bullet.radius,
-                    bullet.radius * 2,
-                    bullet.radius * 2
-                )
+            bullets = [bullet for bullet in self.player.bullets if bullet.is_active]
+            movers = self.collision_movers
+            movers.clear()
+            for bullet in bullets:
+                movers.add_bullet(bullet)
+            
+            pair_a, pair_b = collect_swept_pairs(
+                self.collision_grid, movers.x0s, movers.y0s,
+                movers.x1s, movers.y1s, movers.radii, movers.count
+            )
+            hits = first_hits(pair_a, pair_b, sweep_pairs(movers, targets, pair_a, pair_b))
+            
+            for bullet_index, (enemy_index, _) in hits.items():
+                bullet = bullets[bullet_index]
+                enemy = alive_enemies[enemy_index]
+                if not enemy.is_alive:
+                    continue
                 
-                for enemy in self.enemies[:]:
-                    if not enemy.is_alive:
-                        continue
-                    
-                    enemy_rect = pygame.Rect(
-                        enemy.x - enemy.width // 2,
-                        enemy.y - enemy.height // 2,
-                        enemy.width,
-                        enemy.height
-                    )
-                    
-                    if bullet_rect.colliderect(enemy_rect):
-                        # 子弹击中敌人
-                        enemy.take_damage(bullet.damage)
-                        bullet.is_active = False
-                        print(f"玩家子弹击中敌人，造成 {bullet.damage} 点伤害")
-                        
-                        # 如果敌人死亡，给予玩家奖励
-                        if not enemy.is_alive:
-                            self.player.score += 100
-                            self.player.fragments += random.randint(1, 3)
-                            self.player.experience += random.randint(10, 20)
-                            print(f"击杀敌人，获得分数和资源")
-                            
-                            # 检查是否升级
-                            if self.player.experience >= self.player.experience_to_next_level:
-                                self.player.level_up()
-                                print(f"玩家升级！当前等级: {self.player.level}")
+                # 子弹击中敌人（击杀奖励通过KILL事件结算）
+                enemy.take_damage(bullet.damage)
+                bullet.is_active = False
+                self.events.push(CombatEvent.HIT, enemy, self.player, bullet.damage)
             
             # 检查敌人子弹与玩家的碰撞
-            player_rect = pygame.Rect(
-                self.player.x - self.player.width // 2,
-                self.player.y - self.player.height // 2,
-                self.player.width,
-                self.player.height
-            )
+            half_w = self.player.width / 2
+            half_h = self.player.height / 2
+            player_min_x = self.player.x - half_w
+            player_min_y = self.player.y - half_h
+            player_max_x = self.player.x + half_w
+            player_max_y = self.player.y + half_h
             
             for enemy in self.enemies:
-                for bullet in enemy.bullets[:]:
-                    bullet_rect = pygame.Rect(
-                        bullet.x - bullet.size,
-                        bullet.y - bullet.size,
-                        bullet.size * 2,
-                        bullet.size * 2
+                for bullet in enemy.bullets:
+                    if not bullet.is_active:
+                        continue
+                    x1, y1 = bullet.x, bullet.y
+                    toi = swept_circle_aabb(
+                        x1 - bullet.dx * bullet.speed, y1 - bullet.dy * bullet.speed,
+                        x1, y1, bullet_radius(bullet),
+                        player_min_x, player_min_y, player_max_x, player_max_y
                     )
-                    
-                    if bullet_rect.colliderect(player_rect):
+                    if toi >= 0:
                         # 敌人子弹击中玩家
                         self.player.take_damage(bullet.damage)
                         bullet.is_active = False
-                        print(f"敌人子弹击中玩家，造成 {bullet.damage} 点伤害")
+                        self.events.push(CombatEvent.HIT, self.player, enemy, bullet.damage)
+            
+            # 检查Boss弹幕与玩家的碰撞
+            if self.boss_bullets.count:
+                boss_damage = self.boss_bullets.collide_circle(
+                    self.player.x, self.player.y,
+                    min(self.player.width, self.player.height) / 2
+                )
+                if boss_damage > 0:
+                    self.player.take_damage(boss_damage)
+                    self.events.push(CombatEvent.HIT, self.player, None, boss_damage)
             
             # 检查玩家与敌人的直接碰撞
-            for enemy in self.enemies:
+            for index, enemy in enumerate(alive_enemies):
                 if not enemy.is_alive:
                     continue
                 
-                enemy_rect = pygame.Rect(
-                    enemy.x - enemy.width // 2,
-                    enemy.y - enemy.height // 2,
-                    enemy.width,
-                    enemy.height
-                )
+                if targets.kinds[index] == SHAPE_CIRCLE:
+                    touching = circle_aabb(
+                        targets.xs[index], targets.ys[index], targets.half_ws[index],
+                        player_min_x, player_min_y, player_max_x, player_max_y
+                    )
+                else:
+                    touching = aabb_aabb(
+                        player_min_x, player_min_y, player_max_x, player_max_y,
+                        *targets.bounds(index)
+                    )
                 
-                if player_rect.colliderect(enemy_rect):
+                if touching:
                     # 玩家与敌人碰撞
                     self.player.take_damage(enemy.get_damage())
                     enemy.take_damage(self.player.get_damage())
-                    print(f"玩家与敌人碰撞，双方受到伤害")
+                    self.events.push(CombatEvent.HIT, self.player, enemy, enemy.get_damage())
+                    self.events.push(CombatEvent.HIT, enemy, self.player, self.player.get_damage())
         
         except Exception as e:
             print(f"检查碰撞时发生错误: {e}")
@@ -264,10 +407,13 @@ class GameScene(Scene):
     
     def update(self):
         """更新场景"""
+        flight_recorder.set_counts(enemies=len(self.enemies), bullets=self.count_bullets())
         if self.paused or self.game_over:
             return
         
         try:
+            self.apply_quality()
+            
             # 更新玩家
             if self.player:
                 self.player.update()
@@ -279,7 +425,7 @@ class GameScene(Scene):
             
             # 生成敌人
             current_time = pygame.time.get_ticks()
-            if (len(self.enemies) < self.max_enemies and 
+            if (len(self.enemies) < self.get_enemy_cap() and 
                 current_time - self.enemy_spawn_timer >= self.enemy_spawn_interval):
                 self._spawn_enemy()
                 self.enemy_spawn_timer = current_time
@@ -291,14 +437,20 @@ class GameScene(Scene):
                     self.enemies.remove(enemy)
                     print(f"敌人被消灭，剩余敌人数量: {len(self.enemies)}")
             
-            # 更新HUD
-            self.hud.update()
+            # 更新Boss弹幕
+            self.boss_bullets.update()
             
             # 检查碰撞
             self._check_collisions()
             
             # 检查屏幕边界
             self._check_screen_bounds()
+            
+            # 分发本帧的战斗事件
+            self.events.drain()
+            
+            # 更新HUD
+            self.hud.update()
         
         except Exception as e:
             print(f"更新游戏场景时发生错误: {e}")
@@ -311,23 +463,29 @@ class GameScene(Scene):
             # 清空屏幕
             screen.fill((30, 30, 30))  # 使用深灰色背景
             
-            # 渲染敌人
+            # 敌人、子弹和玩家的精灵按图层各用一次blits绘制
+            batch = self.sprite_batch
+            for enemy in self.enemies:
+                enemy.queue_sprites(batch)
+            self.boss_bullets.queue_sprites(batch)
+            batch.flush(screen, ('enemies', 'enemy_bullets'))
             for enemy in self.enemies:
-                enemy.render(screen)
+                enemy.render_overlay(screen)
             
-            # 渲染玩家
             if self.player:
-                self.player.render(screen)
+                self.player.queue_sprites(batch)
+                batch.flush(screen, ('player_bullets', 'player'))
+                self.player.render_overlay(screen)
             
             # 渲染HUD
             self.hud.render(screen)
             
             # 渲染暂停或游戏结束提示
+            update_layout(self.overlay_root)
             if self.paused:
-                self.pause_label.render(screen)
-                self.pause_tip.render(screen)
+                self._render_pause_screen(screen)
             elif self.game_over:
-                self.game_over_label.render(screen)
+                self._render_game_over_screen(screen)
         
         except Exception as e:
             print(f"渲染游戏场景时发生错误: {e}")
@@ -347,11 +505,8 @@ class GameScene(Scene):
     def _render_pause_screen(self, screen: pygame.Surface):
         """渲染暂停界面"""
         try:
-            # 创建半透明遮罩
-            overlay = pygame.Surface((self.screen_width, self.screen_height))
-            overlay.fill((0, 0, 0))
-            overlay.set_alpha(128)
-            screen.blit(overlay, (0, 0))
+            # 绘制半透明遮罩
+            self.compositor.draw(screen, self.overlay_alpha)
             
             # 渲染暂停文本和提示
             self.pause_label.render(screen)
@@ -365,42 +520,20 @@ class GameScene(Scene):
     def _render_game_over_screen(self, screen: pygame.Surface):
         """渲染游戏结束界面"""
         try:
-            # 创建半透明遮罩
-            overlay = pygame.Surface((self.screen_width, self.screen_height))
-            overlay.fill((0, 0, 0))
-            overlay.set_alpha(128)
-            screen.blit(overlay, (0, 0))
+            # 绘制半透明遮罩
+            self.compositor.draw(screen, self.overlay_alpha)
             
             # 渲染游戏结束文本
             self.game_over_label.render(screen)
             
             if self.player:
-                # 渲染得分
-                score_label = Label(
-                    self.screen_width // 2 - 75,
-                    self.screen_height // 2 + 50,
-                    f"得分: {self.player.score}",
-                    48,
-                    bold=True
-                )
-                score_label.render(screen)
-                
-                # 渲染资源获取情况
-                fragment_label = Label(
-                    self.screen_width // 2 - 75,
-                    self.screen_height // 2 + 100,
-                    f"获得碎片: {self.player.fragments}",
-                    32
-                )
-                fragment_label.render(screen)
-                
-                star_label = Label(
-                    self.screen_width // 2 - 75,
-                    self.screen_height // 2 + 130,
-                    f"获得星星: {self.player.stars}",
-                    32
-                )
-                star_label.render(screen)
+                # 渲染得分和资源获取情况
+                self.final_score_label.set_text(f"得分: {self.player.score}")
+                self.final_fragment_label.set_text(f"获得碎片: {self.player.fragments}")
+                self.final_star_label.set_text(f"获得星星: {self.player.stars}")
+                self.final_score_label.render(screen)
+                self.final_fragment_label.render(screen)
+                self.final_star_label.render(screen)
         
         except Exception as e:
             print(f"渲染游戏结束界面时发生错误: {e}")
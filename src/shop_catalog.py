@@ -0,0 +1,123 @@
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from asset_pack import open_asset
+
+# 商店物品数据文件
+CATALOG_FILE = os.path.join("assets", "data", "shop_items.json")
+
+# 物品效果函数签名：effect(player)
+ItemEffect = Callable[[Any], None]
+
+def _heal_effect(fraction: float) -> ItemEffect:
+    """按最大生命值的比例恢复生命"""
+    def effect(player):
+        player.health = min(player.health + player.max_health * fraction, player.max_health)
+    return effect
+
+def _add_effect(stat: str, amount: float) -> ItemEffect:
+    """属性增加固定值"""
+    def effect(player):
+        setattr(player, stat, getattr(player, stat) + amount)
+    return effect
+
+def _bonus_effect(attribute: str, amount: float) -> ItemEffect:
+    """增加角色的属性加成（见Character.attributes）"""
+    def effect(player):
+        player.add_attribute_bonus(attribute, amount)
+    return effect
+
+def _scale_effect(stat: str, factor: float) -> ItemEffect:
+    """属性按倍率提升"""
+    def effect(player):
+        setattr(player, stat, getattr(player, stat) * factor)
+    return effect
+
+# 效果类型注册表
+EFFECT_TYPES = {
+    'heal': _heal_effect,
+    'add': _add_effect,
+    'bonus': _bonus_effect,
+    'scale': _scale_effect
+}
+
+def compile_effect(spec: Dict[str, Any]) -> ItemEffect:
+    """根据数据描述编译物品效果"""
+    params = dict(spec)
+    effect_type = params.pop('type')
+    if effect_type not in EFFECT_TYPES:
+        raise ValueError(f"未知的物品效果类型: {effect_type}")
+    return EFFECT_TYPES[effect_type](**params)
+
+class ShopItem:
+    """商店物品"""
+    def __init__(self, name: str, description: str, price: int,
+                 currency: str, effect: ItemEffect,
+                 item_id: Optional[str] = None, shop: str = 'temp'):
+        self.item_id = item_id if item_id is not None else name
+        self.shop = shop  # 'temp' 或 'perm'
+        self.name = name
+        self.description = description
+        self.price = price
+        self.currency = currency  # 'fragments' 或 'stars'
+        self.effect = effect
+    
+    def affordable(self, fragments: int, stars: int) -> bool:
+        """检查货币是否足够购买"""
+        balance = stars if self.currency == 'stars' else fragments
+        return balance >= self.price
+
+class ShopCatalog:
+    """商店物品目录，按id索引并按商店类型分组（保持数据文件中的顺序）"""
+    def __init__(self, items: Iterable[ShopItem] = ()):
+        self.items: Dict[str, ShopItem] = {}
+        self.shops: Dict[str, List[ShopItem]] = {'temp': [], 'perm': []}
+        for item in items:
+            self.add(item)
+    
+    def add(self, item: ShopItem):
+        """添加物品，id重复时报错"""
+        if item.item_id in self.items:
+            raise ValueError(f"重复的商店物品id: {item.item_id}")
+        self.items[item.item_id] = item
+        self.shops.setdefault(item.shop, []).append(item)
+    
+    def get(self, item_id: str) -> Optional[ShopItem]:
+        """按id获取物品"""
+        return self.items.get(item_id)
+    
+    def items_for(self, shop: str) -> List[ShopItem]:
+        """获取某个商店的全部物品"""
+        return self.shops.get(shop, [])
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'ShopCatalog':
+        """从数据描述创建目录"""
+        catalog = cls()
+        for entry in data.get('items', []):
+            catalog.add(ShopItem(
+                entry['name'],
+                entry.get('description', ''),
+                int(entry['price']),
+                entry.get('currency', 'fragments'),
+                compile_effect(entry['effect']),
+                item_id=entry['id'],
+                shop=entry.get('shop', 'temp')
+            ))
+        return catalog
+    
+    @classmethod
+    def load(cls, path: str = CATALOG_FILE) -> 'ShopCatalog':
+        """从数据文件加载目录，加载失败时返回空目录"""
+        try:
+            with open_asset(path) as f:
+                data = json.loads(f.read().decode('utf-8'))
+            catalog = cls.from_data(data)
+            print(f"加载商店物品: {len(catalog)}个")
+            return catalog
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"加载商店物品失败 {path}: {e}")
+            return cls()
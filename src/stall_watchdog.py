@@ -0,0 +1,152 @@
+import faulthandler
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Callable, Dict, IO, Optional
+
+# 主循环卡住多少秒后输出调用栈（覆盖默认阈值）
+WATCHDOG_ENV = "GF_WATCHDOG_SECS"
+
+class StallWatchdog:
+    """主循环卡死检测：主循环每帧发送心跳，后台线程发现心跳停止超过threshold秒时，
+    把主线程的调用栈写入日志并计数；持续卡住时每隔repeat秒再写一次
+    
+    后台线程需要拿到GIL才能运行，主线程在C代码中长时间持有GIL时它也会停住，
+    因此另外用faulthandler的C线程兜底：后台线程超过hard_timeout秒没有运行时，
+    由faulthandler直接输出所有线程的调用栈。
+    """
+    def __init__(self, threshold: float = 2.0, poll: float = 0.1, repeat: float = 5.0,
+                 hard_timeout: float = 10.0, log_path: str = os.path.join("logs", "stalls.log"),
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.poll = poll
+        self.repeat = repeat
+        self.hard_timeout = hard_timeout
+        self.log_path = log_path
+        self.clock = clock
+        
+        self.last_beat = clock()
+        self.beats = 0
+        self.stalls = 0              # 卡住的次数
+        self.longest_stall = 0.0     # 最长一次卡住的时长（秒）
+        self.stalled = False
+        self._stall_beat = 0.0       # 卡住时最后一次心跳的时间
+        self._next_dump = 0.0
+        self._main_ident = threading.main_thread().ident
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._log: Optional[IO] = None
+        self._rearm_at = 0.0
+    
+    def start(self):
+        """开始监视（在主线程中调用，主线程即被监视的线程）"""
+        if self._thread is not None:
+            return
+        self._main_ident = threading.get_ident()
+        self.last_beat = self.clock()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        print(f"主循环卡死检测已开启 - 阈值: {self.threshold:.1f}秒")
+    
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._log is not None:
+            faulthandler.cancel_dump_traceback_later()
+            self._log.close()
+            self._log = None
+    
+    def heartbeat(self):
+        """主循环每帧调用一次"""
+        self.last_beat = self.clock()
+        self.beats += 1
+    
+    def _open_log(self) -> IO:
+        if self._log is None:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._log = open(self.log_path, 'a', encoding='utf-8')
+        return self._log
+    
+    def _run(self):
+        try:
+            while not self._stop.wait(self.poll):
+                now = self.clock()
+                if now >= self._rearm_at:
+                    # 后台线程正常运行时不断推迟faulthandler的输出，只有后台线程也停住时才会触发
+                    faulthandler.dump_traceback_later(self.hard_timeout, file=self._open_log())
+                    self._rearm_at = now + self.hard_timeout / 2
+                self.check(now)
+        except Exception as e:
+            print(f"卡死检测线程发生错误: {e}")
+            traceback.print_exc()
+    
+    def check(self, now: Optional[float] = None) -> bool:
+        """检查心跳，返回主循环当前是否卡住"""
+        if now is None:
+            now = self.clock()
+        last_beat = self.last_beat
+        elapsed = now - last_beat
+        
+        if self.stalled and last_beat > self._stall_beat:
+            # 心跳恢复
+            duration = last_beat - self._stall_beat
+            self.longest_stall = max(self.longest_stall, duration)
+            self.stalled = False
+            self._write(f"主循环恢复，卡住了 {duration:.2f}秒\n")
+            return False
+        
+        if elapsed < self.threshold:
+            return self.stalled
+        if not self.stalled:
+            self.stalled = True
+            self.stalls += 1
+            self._stall_beat = last_beat
+            self._next_dump = now
+        if now >= self._next_dump:
+            self._next_dump = now + self.repeat
+            self.longest_stall = max(self.longest_stall, elapsed)
+            self.dump(elapsed)
+        return True
+    
+    def dump(self, elapsed: float):
+        """把主线程的调用栈写入日志"""
+        frame = sys._current_frames().get(self._main_ident)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "  （主线程已结束）\n"
+        del frame
+        self._write(f"主循环已 {elapsed:.2f}秒 没有心跳（第{self.stalls}次卡住），主线程调用栈:\n{stack}")
+    
+    def _write(self, text: str):
+        header = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] "
+        print(header + text, end="")
+        try:
+            log = self._open_log()
+            log.write(header + text)
+            log.flush()
+        except OSError as e:
+            print(f"写入卡死日志时发生错误: {e}")
+    
+    def get_stats(self) -> Dict:
+        return {
+            'stalls': self.stalls,
+            'longest_stall_s': self.longest_stall,
+            'stalled': self.stalled
+        }
+
+# 全局卡死检测
+watchdog = StallWatchdog()
+
+def install_from_env():
+    """根据环境变量调整卡死阈值（秒）"""
+    value = os.environ.get(WATCHDOG_ENV, "")
+    if value:
+        try:
+            watchdog.threshold = float(value)
+        except ValueError:
+            print(f"无效的卡死阈值: {value}")
@@ -0,0 +1,156 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ExtensionFileLoader
+from typing import Dict, List, Optional
+
+# 启动追踪开关：1 表示首帧后打印报告，exit 表示打印报告后直接退出（用于基准测试）
+TRACE_ENV = "GF_TRACE_STARTUP"
+# 机器可读报告的行前缀
+REPORT_PREFIX = "STARTUP_TRACE "
+
+class _TimedLoader(Loader):
+    """包装模块加载器，记录模块执行（导入）耗时"""
+    def __init__(self, loader: Loader, tracer: 'StartupTracer', name: str):
+        self.loader = loader
+        self.tracer = tracer
+        self.name = name
+    
+    def create_module(self, spec):
+        # 扩展模块在create_module中完成初始化
+        if not isinstance(self.loader, ExtensionFileLoader):
+            return self.loader.create_module(spec)
+        with self.tracer.span(self.name, 'import'):
+            return self.loader.create_module(spec)
+    
+    def exec_module(self, module):
+        with self.tracer.span(self.name, 'import'):
+            self.loader.exec_module(module)
+    
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+class _ImportTracer(MetaPathFinder):
+    """放在sys.meta_path最前面，给其他查找器找到的模块套上计时加载器"""
+    def __init__(self, tracer: 'StartupTracer'):
+        self.tracer = tracer
+    
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and not isinstance(spec.loader, _TimedLoader):
+                spec.loader = _TimedLoader(spec.loader, self.tracer, fullname)
+            return spec
+        return None
+
+class StartupTracer:
+    """启动追踪：记录模块导入和对象构造的耗时（只记录主线程）
+    
+    记录按嵌套关系统计自身耗时（不含嵌套的子记录），首帧渲染后汇总报告。
+    """
+    def __init__(self):
+        self.enabled = False
+        self.exit_after_report = False
+        self.start_time = time.perf_counter()
+        self.records: List[Dict] = []
+        self.marks: Dict[str, float] = {}
+        self._stack: List[list] = []  # [名称, 类别, 开始时间, 子记录耗时]
+        self._finder: Optional[_ImportTracer] = None
+    
+    def install(self, exit_after_report: bool = False):
+        """开始追踪（安装导入钩子）"""
+        self.enabled = True
+        self.exit_after_report = exit_after_report
+        if self._finder is None:
+            self._finder = _ImportTracer(self)
+            sys.meta_path.insert(0, self._finder)
+    
+    def uninstall(self):
+        """停止追踪（移除导入钩子）"""
+        self.enabled = False
+        if self._finder is not None:
+            if self._finder in sys.meta_path:
+                sys.meta_path.remove(self._finder)
+            self._finder = None
+    
+    @contextmanager
+    def span(self, name: str, category: str = 'construct'):
+        """记录一段代码的耗时"""
+        if not self.enabled or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        frame = [name, category, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            duration = time.perf_counter() - frame[2]
+            if self._stack:
+                self._stack[-1][3] += duration
+            self.records.append({
+                'name': name,
+                'category': category,
+                'start_ms': (frame[2] - self.start_time) * 1000,
+                'total_ms': duration * 1000,
+                'self_ms': (duration - frame[3]) * 1000,
+                'depth': len(self._stack)
+            })
+    
+    def mark(self, name: str):
+        """记录从开始追踪到现在的时间点"""
+        if self.enabled:
+            self.marks[name] = (time.perf_counter() - self.start_time) * 1000
+    
+    def summary(self, top: int = 15) -> Dict:
+        """汇总追踪结果"""
+        categories: Dict[str, float] = {}
+        for record in self.records:
+            categories[record['category']] = categories.get(record['category'], 0.0) + record['self_ms']
+        slowest = sorted(self.records, key=lambda record: record['self_ms'], reverse=True)[:top]
+        return {
+            'marks': dict(self.marks),
+            'categories': categories,
+            'top': [{key: record[key] for key in ('name', 'category', 'self_ms', 'total_ms')}
+                    for record in slowest],
+            'constructed': [record['name'] for record in self.records if record['category'] == 'construct']
+        }
+    
+    def report(self, top: int = 15):
+        """打印追踪报告（以及一行机器可读的JSON）"""
+        summary = self.summary(top)
+        print("\n启动追踪:")
+        for name, value in summary['marks'].items():
+            print(f"- {name}: {value:.1f}ms")
+        for category, value in sorted(summary['categories'].items()):
+            print(f"- {category} 合计: {value:.1f}ms")
+        print(f"最慢的{len(summary['top'])}项（自身耗时）:")
+        for record in summary['top']:
+            print(f"  {record['self_ms']:8.2f}ms  {record['total_ms']:8.2f}ms  [{record['category']}] {record['name']}")
+        print(REPORT_PREFIX + json.dumps(summary, ensure_ascii=False))
+    
+    def first_frame(self) -> bool:
+        """首帧渲染完成：打印报告并停止追踪，返回是否应该直接退出"""
+        if not self.enabled:
+            return False
+        self.mark('first_frame')
+        self.uninstall()
+        self.report()
+        return self.exit_after_report
+
+# 全局追踪器
+tracer = StartupTracer()
+
+def install_from_env():
+    """根据环境变量开启启动追踪"""
+    value = os.environ.get(TRACE_ENV, "")
+    if value:
+        tracer.install(exit_after_report=value == "exit")
@@ -1,6 +1,8 @@
 import pygame
 from typing import Dict, Callable, Optional, Type
 from ui.ui_element import UIElement, Button, Label, Panel
+from ui.hit_index import PointerDispatcher
+from ui.layout import Anchor, Stack, update_layout
 from entities.player import Player
 from entities.soldier import Soldier
 from entities.assault import Assault
@@ -24,6 +26,7 @@ class CharacterCard(Panel):
         }
         name = character_names.get(character_class.__name__, character_class.__name__)
         name_label = Label(x + 10, y + 10, name, 32, bold=True)
+        name_label.set_anchor(Anchor(offset=(10, 10)))
         self.add_child(name_label)
         
         # 角色属性
@@ -41,6 +44,7 @@ class CharacterCard(Panel):
         
         for i, stat in enumerate(stats):
             stat_label = Label(stats_x, stats_y + i * line_height, stat)
+            stat_label.set_anchor(Anchor(offset=(10, 50 + i * line_height)))
             self.add_child(stat_label)
         
         # 选择按钮
@@ -52,11 +56,12 @@ class CharacterCard(Panel):
             "选择",
             lambda: None  # 将在外部设置回调
         )
+        self.select_button.set_anchor(Anchor((0.5, 1.0), (0, -40), pivot=(0.5, 0.0)))
         self.add_child(self.select_button)
     
     def set_selected(self, selected: bool):
         """设置是否被选中"""
-        self.color = (100, 100, 100, 200) if selected else (50, 50, 50, 200)
+        self.set_color((100, 100, 100, 200) if selected else (50, 50, 50, 200))
 
 class CharacterSelect(Scene, UIElement):
     def __init__(self, screen_width: int, screen_height: int):
@@ -64,6 +69,7 @@ class CharacterSelect(Scene, UIElement):
         
         # 创建标题
         title_label = Label(screen_width // 2 - 100, 50, "选择角色", 48, bold=True)
+        title_label.set_anchor(Anchor((0.5, 0.0), (0, 50)))
         self.add_child(title_label)
         
         # 角色卡片
@@ -73,6 +79,12 @@ class CharacterSelect(Scene, UIElement):
         total_width = (card_width + spacing) * 3 - spacing
         start_x = screen_width // 2 - total_width // 2
         
+        # 角色卡片横向排列，整体水平居中
+        self.card_row = UIElement(start_x, 150, total_width, card_height)
+        self.card_row.set_arrangement(Stack('horizontal', spacing=spacing))
+        self.card_row.set_anchor(Anchor((0.5, 0.0), (0, 150)))
+        self.add_child(self.card_row)
+        
         self.character_cards: Dict[str, CharacterCard] = {}
         self.selected_character: Optional[Type[Player]] = None
         
@@ -88,13 +100,19 @@ class CharacterSelect(Scene, UIElement):
             )
             self.character_cards[char_class.__name__] = card
             card.select_button.callback = lambda c=char_class: self.select_character(c)
-            self.add_child(card)
+            self.card_row.add_child(card)
         
         # 创建确认和返回按钮
         button_width = 150
         button_height = 40
         button_y = screen_height - 100
         
+        # 确认和返回按钮横向排列，位于底部
+        self.button_row = UIElement(screen_width // 2 - button_width - 20, button_y, button_width * 2 + 40, button_height)
+        self.button_row.set_arrangement(Stack('horizontal', spacing=40))
+        self.button_row.set_anchor(Anchor((0.5, 1.0), (0, -100), pivot=(0.5, 0.0)))
+        self.add_child(self.button_row)
+        
         # 确认按钮
         self.confirm_button = Button(
             screen_width // 2 - button_width - 20,
@@ -104,7 +122,7 @@ class CharacterSelect(Scene, UIElement):
             "确认",
             self.confirm_selection
         )
-        self.add_child(self.confirm_button)
+        self.button_row.add_child(self.confirm_button)
         
         # 返回按钮
         self.back_button = Button(
@@ -115,16 +133,23 @@ class CharacterSelect(Scene, UIElement):
             "返回",
             lambda: None  # 将在外部设置回调
         )
-        self.add_child(self.back_button)
+        self.button_row.add_child(self.back_button)
         
         # 回调函数
         self.on_confirm: Optional[Callable[[Type[Player]], None]] = None
         self.on_back: Optional[Callable[[], None]] = None
+        
+        # 指针事件分发（点击检测索引）
+        self.dispatcher = PointerDispatcher(self)
     
     def initialize(self):
         """初始化场景"""
         pass
     
+    def resize(self, width: int, height: int):
+        """屏幕大小变化时调整布局"""
+        self.set_size(width, height)
+    
     def select_character(self, character_class: Type[Player]):
         """选择角色"""
         self.selected_character = character_class
@@ -138,6 +163,10 @@ class CharacterSelect(Scene, UIElement):
         if self.selected_character and self.on_confirm:
             self.on_confirm(self.selected_character)
     
+    def handle_event(self, event: pygame.event.Event):
+        """处理事件"""
+        self.dispatcher.handle_event(event)
+    
     def set_callbacks(self, on_confirm: Callable[[Type[Player]], None], 
                      on_back: Callable[[], None]):
         """设置回调函数"""
@@ -147,7 +176,7 @@ class CharacterSelect(Scene, UIElement):
     
     def update(self):
         """更新角色选择界面"""
-        super().update()
+        UIElement.update(self)
         
         # 禁用确认按钮，直到选择了角色
         self.confirm_button.enabled = self.selected_character is not None
@@ -158,4 +187,5 @@ class CharacterSelect(Scene, UIElement):
         screen.fill((30, 30, 30))
         
         # 渲染UI元素
-        super().render(screen) 
\ No newline at end of file
+        update_layout(self)
+        UIElement.render(self, screen) 
\ No newline at end of file
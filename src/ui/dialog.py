@@ -1,30 +1,35 @@
 import pygame
 from typing import Callable, Optional
 from ui.ui_element import UIElement, Button, Label, Panel
+from ui.overlay import compositor
+from ui.layout import Anchor
 
 class Dialog(UIElement):
-    """对话框组件"""
+    """对话框组件（模态，显示时屏蔽下层元素的指针事件）"""
+    modal = True
+    
     def __init__(self, x: int, y: int, width: int, height: int,
                  title: str, message: str,
                  on_confirm: Optional[Callable[[], None]] = None,
                  on_cancel: Optional[Callable[[], None]] = None):
         super().__init__(x, y, width, height)
         
-        # 创建背景遮罩
-        self.overlay = pygame.Surface((pygame.display.get_surface().get_size()))
-        self.overlay.fill((0, 0, 0))
-        self.overlay.set_alpha(128)
+        # 背景遮罩透明度（遮罩由合成器按屏幕大小共享）
+        self.overlay_alpha = 128
         
         # 创建对话框面板
         self.panel = Panel(x, y, width, height)
+        self.panel.set_anchor(Anchor(stretch=(0, 0)))
         self.add_child(self.panel)
         
         # 标题
         title_label = Label(x + 10, y + 10, title, 32, bold=True)
+        title_label.set_anchor(Anchor(offset=(10, 10)))
         self.panel.add_child(title_label)
         
         # 消息
         message_label = Label(x + 10, y + 60, message, 24)
+        message_label.set_anchor(Anchor(offset=(10, 60)))
         self.panel.add_child(message_label)
         
         # 按钮
@@ -41,6 +46,7 @@ class Dialog(UIElement):
             "确认",
             self._on_confirm if on_confirm else lambda: None
         )
+        self.confirm_button.set_anchor(Anchor((0.5, 1.0), (-10, -60), pivot=(1.0, 0.0)))
         self.panel.add_child(self.confirm_button)
         
         # 取消按钮
@@ -52,11 +58,15 @@ class Dialog(UIElement):
             "取消",
             self._on_cancel if on_cancel else lambda: None
         )
+        self.cancel_button.set_anchor(Anchor((0.5, 1.0), (10, -60), pivot=(0.0, 0.0)))
         self.panel.add_child(self.cancel_button)
         
         # 回调函数
         self.on_confirm = on_confirm
         self.on_cancel = on_cancel
+        
+        # 默认隐藏，调用show显示
+        self.visible = False
     
     def _on_confirm(self):
         """确认回调"""
@@ -84,7 +94,7 @@ class Dialog(UIElement):
             return
         
         # 绘制背景遮罩
-        screen.blit(self.overlay, (0, 0))
+        compositor.draw(screen, self.overlay_alpha)
         
         # 渲染对话框
         super().render(screen) 
\ No newline at end of file
@@ -0,0 +1,124 @@
+import pygame
+from typing import Dict, List, Optional, Tuple
+from ui.ui_element import UIElement
+
+class HitTestIndex:
+    """UI点击检测索引
+    
+    把可交互元素按渲染顺序（越靠后越在上层）展开成列表，并按网格分桶，
+    查询时只检查指针所在格子中的元素。只有布局版本号变化时才重建。
+    """
+    def __init__(self, root: UIElement, cell_size: int = 64):
+        self.root = root
+        self.cell_size = cell_size
+        self.elements: List[UIElement] = []
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.version = -1
+        self.rebuilds = 0
+    
+    def _collect(self, element: UIElement):
+        """按渲染顺序收集可见的可交互元素"""
+        if not element.visible:
+            return
+        if element.modal:
+            # 模态元素之下的元素不再接收指针事件
+            self.elements.clear()
+        if element.interactive:
+            self.elements.append(element)
+        for child in element.children:
+            self._collect(child)
+    
+    def rebuild(self):
+        """重建索引"""
+        self.elements.clear()
+        self.cells.clear()
+        self._collect(self.root)
+        
+        size = self.cell_size
+        for z, element in enumerate(self.elements):
+            rect = element.rect
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    self.cells.setdefault((cx, cy), []).append(z)
+        
+        self.version = UIElement.layout_version
+        self.rebuilds += 1
+    
+    def ensure(self) -> bool:
+        """布局变化时重建索引，返回是否发生了重建"""
+        if self.version != UIElement.layout_version:
+            self.rebuild()
+            return True
+        return False
+    
+    def hit(self, x: int, y: int) -> Optional[UIElement]:
+        """返回指针位置最上层的可用元素"""
+        self.ensure()
+        bucket = self.cells.get((x // self.cell_size, y // self.cell_size))
+        if not bucket:
+            return None
+        for z in reversed(bucket):
+            element = self.elements[z]
+            if element.enabled and element.rect.collidepoint(x, y):
+                return element
+        return None
+
+class PointerDispatcher:
+    """指针事件分发器
+    
+    鼠标移动只更新进入和离开的元素的悬停状态，按下和松开事件只发送给
+    指针下的元素（以及之前被按下的元素）。
+    """
+    def __init__(self, root: UIElement, cell_size: int = 64):
+        self.index = HitTestIndex(root, cell_size)
+        self.hovered: Optional[UIElement] = None
+        self.pressed: Optional[UIElement] = None
+    
+    def _update_hover(self, pos: Tuple[int, int]) -> Optional[UIElement]:
+        """更新悬停元素，返回当前指针下的元素"""
+        if self.index.ensure() and self.hovered is not None and self.hovered not in self.index.elements:
+            # 悬停元素已被隐藏或移除
+            self.hovered.set_hovered(False)
+            self.hovered = None
+        
+        target = self.index.hit(*pos)
+        if target is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.set_hovered(False)
+            if target is not None:
+                target.set_hovered(True)
+            self.hovered = target
+        return target
+    
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """分发指针事件，返回是否有元素处理了该事件"""
+        if event.type == pygame.MOUSEMOTION:
+            return self._update_hover(event.pos) is not None
+        
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            target = self._update_hover(event.pos)
+            if target is None:
+                return False
+            self.pressed = target
+            return target.handle_event(event)
+        
+        if event.type == pygame.MOUSEBUTTONUP:
+            target = self._update_hover(event.pos)
+            pressed = self.pressed
+            self.pressed = None
+            handled = False
+            if pressed is not None and pressed is not target:
+                # 在其他位置松开，只重置被按下元素的状态
+                pressed.handle_event(event)
+            if target is not None:
+                handled = target.handle_event(event)
+            return handled
+        
+        return False
+    
+    def reset(self):
+        """清除悬停和按下状态"""
+        if self.hovered is not None:
+            self.hovered.set_hovered(False)
+        self.hovered = None
+        self.pressed = None
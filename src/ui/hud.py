@@ -1,8 +1,10 @@
 import pygame
 from typing import Optional
 from ui.ui_element import UIElement, Label, ProgressBar, Panel
+from ui.layout import Anchor, update_layout
 from entities.player import Player
 from scene_manager import Scene
+from event_bus import CombatEvent, EventQueue
 
 class HUD(Scene, UIElement):
     def __init__(self, screen_width: int, screen_height: int):
@@ -10,12 +12,13 @@ class HUD(Scene, UIElement):
         
         # 创建状态面板
         panel_width = 300
-        panel_height = 150
+        panel_height = 170
         self.status_panel = Panel(
             20, 20,
             panel_width, panel_height,
             color=(50, 50, 50, 200)
         )
+        self.status_panel.set_anchor(Anchor(offset=(20, 20)))
         self.add_child(self.status_panel)
         
         # 创建角色信息标签
@@ -25,17 +28,22 @@ class HUD(Scene, UIElement):
             32,
             bold=True
         )
+        self.character_label.set_anchor(Anchor(offset=(10, 10)))
         self.status_panel.add_child(self.character_label)
         
         # 创建生命值标签和进度条
         self.health_label = Label(30, 70, "生命值: 100/100", 24)
         self.health_bar = ProgressBar(30, 100, 260, 20, (255, 0, 0))
+        self.health_label.set_anchor(Anchor(offset=(10, 50)))
+        self.health_bar.set_anchor(Anchor(offset=(10, 80)))
         self.status_panel.add_child(self.health_label)
         self.status_panel.add_child(self.health_bar)
         
         # 创建经验值标签和进度条
         self.exp_label = Label(30, 130, "经验值: 0/100", 24)
         self.exp_bar = ProgressBar(30, 160, 260, 20, (0, 255, 0))
+        self.exp_label.set_anchor(Anchor(offset=(10, 110)))
+        self.exp_bar.set_anchor(Anchor(offset=(10, 140)))
         self.status_panel.add_child(self.exp_label)
         self.status_panel.add_child(self.exp_bar)
         
@@ -45,12 +53,16 @@ class HUD(Scene, UIElement):
             200, 120,
             color=(50, 50, 50, 200)
         )
+        self.resource_panel.set_anchor(Anchor((1.0, 0.0), (-20, 20)))
         self.add_child(self.resource_panel)
         
         # 创建资源标签
         self.score_label = Label(screen_width - 210, 30, "得分: 0", 24)
         self.fragment_label = Label(screen_width - 210, 60, "碎片: 0", 24)
         self.star_label = Label(screen_width - 210, 90, "星星: 0", 24)
+        self.score_label.set_anchor(Anchor(offset=(10, 10)))
+        self.fragment_label.set_anchor(Anchor(offset=(10, 40)))
+        self.star_label.set_anchor(Anchor(offset=(10, 70)))
         
         self.resource_panel.add_child(self.score_label)
         self.resource_panel.add_child(self.fragment_label)
@@ -59,15 +71,32 @@ class HUD(Scene, UIElement):
         # 玩家引用
         self.player: Optional[Player] = None
         
+        # 有战斗事件发生时才刷新显示
+        self.needs_refresh = True
+        
         print("HUD初始化完成")
     
     def initialize(self):
         """初始化场景"""
         pass
     
+    def resize(self, width: int, height: int):
+        """屏幕大小变化时调整布局"""
+        self.set_size(width, height)
+    
+    def bind_events(self, events: EventQueue):
+        """订阅会改变HUD显示内容的战斗事件"""
+        for event_type in CombatEvent:
+            events.subscribe(event_type, self._on_combat_event)
+    
+    def _on_combat_event(self, source, target, value):
+        """标记HUD需要刷新"""
+        self.needs_refresh = True
+    
     def set_player(self, player: Player):
         """设置要监控的玩家"""
         self.player = player
+        self.needs_refresh = True
         # 更新角色标签
         character_names = {
             'Soldier': '士兵',
@@ -82,31 +111,32 @@ class HUD(Scene, UIElement):
     
     def update(self):
         """更新HUD显示的信息"""
-        super().update()
+        UIElement.update(self)
+        
+        if self.player and self.needs_refresh:
+            self.refresh()
+    
+    def refresh(self):
+        """根据玩家当前状态刷新所有标签和进度条"""
+        self.needs_refresh = False
+        
+        # 更新生命值
+        health_text = f"生命值: {int(self.player.health)}/{int(self.player.max_health)}"
+        self.health_label.set_text(health_text)
+        self.health_bar.set_progress(self.player.health / self.player.max_health)
+        
+        # 更新经验值
+        exp_needed = self.player.experience_to_next_level
+        exp_text = f"经验值: {self.player.experience}/{exp_needed}"
+        self.exp_label.set_text(exp_text)
+        self.exp_bar.set_progress(self.player.experience / exp_needed)
         
-        if self.player:
-            # 更新生命值
-            health_text = f"生命值: {int(self.player.health)}/{int(self.player.max_health)}"
-            self.health_label.set_text(health_text)
-            self.health_bar.set_progress(self.player.health / self.player.max_health)
-            
-            # 更新经验值
-            exp_needed = self.player.experience_to_next_level
-            exp_text = f"经验值: {self.player.experience}/{exp_needed}"
-            self.exp_label.set_text(exp_text)
-            self.exp_bar.set_progress(self.player.experience / exp_needed)
-            
-            # 更新资源
-            self.score_label.set_text(f"得分: {self.player.score}")
-            self.fragment_label.set_text(f"碎片: {self.player.fragments}")
-            self.star_label.set_text(f"星星: {self.player.stars}")
-            
-            print(f"HUD更新 - 生命值: {int(self.player.health)}/{int(self.player.max_health)} " +
-                  f"经验值: {self.player.experience}/{exp_needed} " +
-                  f"得分: {self.player.score} " +
-                  f"碎片: {self.player.fragments} " +
-                  f"星星: {self.player.stars}")
+        # 更新资源
+        self.score_label.set_text(f"得分: {self.player.score}")
+        self.fragment_label.set_text(f"碎片: {self.player.fragments}")
+        self.star_label.set_text(f"星星: {self.player.stars}")
     
     def render(self, screen: pygame.Surface):
         """渲染HUD"""
-        super().render(screen) 
\ No newline at end of file
+        update_layout(self)
+        UIElement.render(self, screen) 
\ No newline at end of file
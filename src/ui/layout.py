@@ -0,0 +1,132 @@
+from typing import List, Optional, Tuple
+from ui.ui_element import UIElement
+
+class Anchor:
+    """相对父元素定位
+    
+    anchor是父元素上的参考点（0-1比例），pivot是自身上的参考点（默认与anchor相同），
+    两点对齐后再加上offset。stretch不为None时，元素大小为父元素大小加上stretch。
+    """
+    def __init__(self, anchor: Tuple[float, float] = (0.0, 0.0),
+                 offset: Tuple[int, int] = (0, 0),
+                 pivot: Optional[Tuple[float, float]] = None,
+                 stretch: Optional[Tuple[Optional[int], Optional[int]]] = None):
+        self.anchor = anchor
+        self.offset = offset
+        self.pivot = pivot if pivot is not None else anchor
+        self.stretch = stretch
+    
+    def resize(self, element: UIElement, parent: UIElement):
+        """根据父元素大小调整元素大小（仅stretch不为None时）"""
+        if self.stretch is None:
+            return
+        stretch_w, stretch_h = self.stretch
+        element.set_size(
+            element.width if stretch_w is None else max(0, parent.width + stretch_w),
+            element.height if stretch_h is None else max(0, parent.height + stretch_h)
+        )
+    
+    def place(self, element: UIElement, parent: UIElement):
+        """根据父元素的位置和大小放置元素"""
+        x = parent.x + parent.width * self.anchor[0] + self.offset[0] - element.width * self.pivot[0]
+        y = parent.y + parent.height * self.anchor[1] + self.offset[1] - element.height * self.pivot[1]
+        element.set_position(int(round(x)), int(round(y)))
+
+def _visible_children(container: UIElement) -> List[UIElement]:
+    """参与排列的子元素（可见且没有单独定位）"""
+    return [child for child in container.children if child.visible and child.anchor is None]
+
+class Stack:
+    """把子元素沿水平或垂直方向依次排列
+    
+    align为垂直于排列方向的对齐比例；fit为True时容器大小收缩为内容大小。
+    """
+    def __init__(self, direction: str = 'vertical', spacing: int = 0,
+                 align: float = 0.5, padding: int = 0, fit: bool = True):
+        if direction not in ('vertical', 'horizontal'):
+            raise ValueError(f"未知的排列方向: {direction}")
+        self.direction = direction
+        self.spacing = spacing
+        self.align = align
+        self.padding = padding
+        self.fit = fit
+    
+    def arrange(self, container: UIElement):
+        """排列容器的子元素"""
+        children = _visible_children(container)
+        vertical = self.direction == 'vertical'
+        padding = self.padding
+        
+        if self.fit:
+            length = sum(c.height if vertical else c.width for c in children)
+            length += self.spacing * max(0, len(children) - 1)
+            cross = max((c.width if vertical else c.height for c in children), default=0)
+            if vertical:
+                container.set_size(cross + padding * 2, length + padding * 2)
+            else:
+                container.set_size(length + padding * 2, cross + padding * 2)
+        
+        cursor = (container.y if vertical else container.x) + padding
+        for child in children:
+            if vertical:
+                x = container.x + padding + (container.width - padding * 2 - child.width) * self.align
+                child.set_position(int(round(x)), cursor)
+                cursor += child.height + self.spacing
+            else:
+                y = container.y + padding + (container.height - padding * 2 - child.height) * self.align
+                child.set_position(cursor, int(round(y)))
+                cursor += child.width + self.spacing
+
+class Grid:
+    """把子元素按行排列成网格，单元格大小取子元素的最大尺寸
+    
+    align为网格整体在容器内的水平对齐比例。
+    """
+    def __init__(self, columns: int, spacing: Tuple[int, int] = (0, 0),
+                 padding: Tuple[int, int] = (0, 0), align: float = 0.5):
+        self.columns = max(1, columns)
+        self.spacing = spacing
+        self.padding = padding
+        self.align = align
+    
+    def arrange(self, container: UIElement):
+        """排列容器的子元素"""
+        children = _visible_children(container)
+        if not children:
+            return
+        cell_w = max(c.width for c in children)
+        cell_h = max(c.height for c in children)
+        columns = min(self.columns, len(children))
+        grid_w = cell_w * columns + self.spacing[0] * (columns - 1)
+        
+        start_x = container.x + self.padding[0] + (container.width - self.padding[0] * 2 - grid_w) * self.align
+        start_y = container.y + self.padding[1]
+        for i, child in enumerate(children):
+            row, col = divmod(i, self.columns)
+            child.set_position(int(round(start_x + col * (cell_w + self.spacing[0]))),
+                               start_y + row * (cell_h + self.spacing[1]))
+
+def update_layout(element: UIElement) -> int:
+    """对需要重新布局的子树执行布局，返回实际布局的元素数量
+    
+    先确定子元素的大小（拉伸或由Stack收缩为内容大小），再排列和定位子元素；
+    子元素被移动时其子树整体平移，不需要重新计算。
+    """
+    if not element.needs_layout:
+        return 0
+    count = 1
+    
+    # 先按父元素大小拉伸子元素，再布局子元素内部
+    for child in element.children:
+        if child.anchor is not None:
+            child.anchor.resize(child, element)
+    for child in element.children:
+        count += update_layout(child)
+    
+    if element.arrangement is not None:
+        element.arrangement.arrange(element)
+    for child in element.children:
+        if child.anchor is not None:
+            child.anchor.place(child, element)
+    element.needs_layout = False
+    return count
@@ -2,8 +2,9 @@ import pygame
 from typing import Dict, Callable
 from ui.ui_element import UIElement, Button, Label, Panel
 from ui.dialog import Dialog
+from ui.hit_index import PointerDispatcher
+from ui.layout import Anchor, Stack, update_layout
 from scene_manager import Scene
-from resource_manager import ResourceManager
 from save_manager import SaveManager
 
 class MainMenu(Scene):
@@ -20,6 +21,7 @@ class MainMenu(Scene):
             96,                       # 增大字号
             bold=True
         )
+        title.set_anchor(Anchor((0.5, 0.25), pivot=(0.5, 0.0)))
         self.ui_root.add_child(title)
         
         # 按钮设置
@@ -28,6 +30,12 @@ class MainMenu(Scene):
         button_spacing = 30
         start_y = screen_height // 2  # 从屏幕中间开始放置按钮
         
+        # 按钮纵向排列，整体水平居中
+        self.button_stack = UIElement(screen_width // 2 - button_width // 2, start_y, button_width, 0)
+        self.button_stack.set_arrangement(Stack('vertical', spacing=button_spacing))
+        self.button_stack.set_anchor(Anchor((0.5, 0.5), pivot=(0.5, 0.0)))
+        self.ui_root.add_child(self.button_stack)
+        
         # 创建按钮
         self.buttons = {}
         button_configs = [
@@ -53,7 +61,7 @@ class MainMenu(Scene):
                 create_button_callback(name)  # 为每个按钮创建独立的回调函数
             )
             self.buttons[name] = button
-            self.ui_root.add_child(button)
+            self.button_stack.add_child(button)
         
         # 创建确认对话框
         self.confirm_dialog = Dialog(
@@ -66,15 +74,16 @@ class MainMenu(Scene):
             self._on_new_game_confirmed,
             self._on_new_game_cancelled
         )
+        self.confirm_dialog.set_anchor(Anchor((0.5, 0.5)))
         self.ui_root.add_child(self.confirm_dialog)
         
+        # 指针事件分发（点击检测索引）
+        self.dispatcher = PointerDispatcher(self.ui_root)
+        
         # 存档管理器
         self.save_manager = SaveManager()
         self.has_save = False
         
-        # 资源管理器
-        self.resource_manager = ResourceManager()
-        
         print("主菜单初始化完成")
     
     def initialize(self):
@@ -82,6 +91,18 @@ class MainMenu(Scene):
         self.has_save = self.save_manager.save_exists()
         self._update_button_states()
     
+    def resize(self, width: int, height: int):
+        """屏幕大小变化时调整布局"""
+        self.ui_root.set_size(width, height)
+    
+    def suspend(self):
+        """挂起场景时清除按钮悬停状态"""
+        self.dispatcher.reset()
+    
+    def resume(self):
+        """恢复场景时刷新存档状态"""
+        self.initialize()
+    
     def _update_button_states(self):
         """更新按钮状态"""
         self.buttons['continue'].enabled = self.has_save
@@ -110,7 +131,7 @@ class MainMenu(Scene):
     
     def handle_event(self, event: pygame.event.Event):
         """处理事件"""
-        self.ui_root.handle_event(event)
+        self.dispatcher.handle_event(event)
     
     def update(self):
         """更新主菜单"""
@@ -122,4 +143,5 @@ class MainMenu(Scene):
         screen.fill((30, 30, 30))
         
         # 渲染UI元素
+        update_layout(self.ui_root)
         self.ui_root.render(screen) 
\ No newline at end of file
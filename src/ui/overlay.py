@@ -0,0 +1,48 @@
+import pygame
+from typing import Dict, Tuple
+
+class OverlayCompositor:
+    """覆盖层合成器
+    
+    全屏遮罩（场景切换淡入淡出、暂停/结束遮罩、对话框背景）按屏幕大小和颜色
+    预先分配并缓存，每帧只修改透明度后绘制，不再重复创建Surface。
+    """
+    def __init__(self):
+        self.layers: Dict[Tuple[Tuple[int, int], Tuple[int, int, int]], pygame.Surface] = {}
+        self.allocations = 0  # 已分配的遮罩数量（用于测试和统计）
+    
+    def get_layer(self, size: Tuple[int, int],
+                  color: Tuple[int, int, int] = (0, 0, 0)) -> pygame.Surface:
+        """获取指定大小和颜色的遮罩，不存在时创建"""
+        key = (tuple(size), tuple(color))
+        layer = self.layers.get(key)
+        if layer is None:
+            layer = pygame.Surface(key[0])
+            layer.fill(key[1])
+            layer.set_alpha(255)
+            self.layers[key] = layer
+            self.allocations += 1
+        return layer
+    
+    def draw(self, screen: pygame.Surface, alpha: int,
+             color: Tuple[int, int, int] = (0, 0, 0)):
+        """在屏幕上绘制全屏遮罩，alpha为0-255"""
+        alpha = max(0, min(255, int(alpha)))
+        if alpha == 0:
+            return
+        layer = self.get_layer(screen.get_size(), color)
+        if layer.get_alpha() != alpha:
+            layer.set_alpha(alpha)
+        screen.blit(layer, (0, 0))
+    
+    def fade(self, screen: pygame.Surface, progress: float,
+             color: Tuple[int, int, int] = (0, 0, 0)):
+        """绘制淡入遮罩，progress从0（全黑）到1（完全透明）"""
+        self.draw(screen, 255 * (1 - max(0.0, min(1.0, progress))), color)
+    
+    def clear(self):
+        """释放所有缓存的遮罩（例如切换分辨率后）"""
+        self.layers.clear()
+
+# 全局共享的合成器，各场景和对话框复用同一组遮罩
+compositor = OverlayCompositor()
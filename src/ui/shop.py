@@ -1,42 +1,39 @@
 import pygame
-from typing import Dict, List, Callable, Optional
+from typing import List, Callable, Optional
 from ui.ui_element import UIElement, Button, Label, Panel
+from ui.hit_index import PointerDispatcher
+from ui.layout import Anchor, Grid, Stack, update_layout
 from entities.player import Player
 from scene_manager import Scene
-
-class ShopItem:
-    """商店物品"""
-    def __init__(self, name: str, description: str, price: int, 
-                 currency: str, effect: Callable[[Player], None]):
-        self.name = name
-        self.description = description
-        self.price = price
-        self.currency = currency  # 'fragments' 或 'stars'
-        self.effect = effect
+from shop_catalog import ShopCatalog, ShopItem
 
 class ItemCard(Panel):
-    """物品卡片"""
+    """物品卡片，滚动时重新绑定到其他物品而不是重新创建"""
     def __init__(self, x: int, y: int, width: int, height: int, 
-                 item: ShopItem, on_purchase: Callable[[], None]):
+                 item: ShopItem, on_purchase: Callable[[ShopItem], None]):
         super().__init__(x, y, width, height)
+        self.item = item
+        self.on_purchase = on_purchase
         
         # 物品名称
-        name_label = Label(x + 10, y + 10, item.name, 24, bold=True)
-        self.add_child(name_label)
+        self.name_label = Label(x + 10, y + 10, item.name, 24, bold=True)
+        self.name_label.set_anchor(Anchor(offset=(10, 10)))
+        self.add_child(self.name_label)
         
         # 物品描述
-        desc_label = Label(x + 10, y + 40, item.description, 18)
-        self.add_child(desc_label)
+        self.desc_label = Label(x + 10, y + 40, item.description, 18)
+        self.desc_label.set_anchor(Anchor(offset=(10, 40)))
+        self.add_child(self.desc_label)
         
         # 价格
-        currency_symbol = "★" if item.currency == "stars" else "◆"
-        price_label = Label(
+        self.price_label = Label(
             x + 10, 
             y + height - 40,
-            f"价格: {item.price}{currency_symbol}",
+            self._price_text(item),
             20
         )
-        self.add_child(price_label)
+        self.price_label.set_anchor(Anchor((0.0, 1.0), (10, -40), pivot=(0.0, 0.0)))
+        self.add_child(self.price_label)
         
         # 购买按钮
         self.purchase_button = Button(
@@ -45,16 +42,37 @@ class ItemCard(Panel):
             80,
             30,
             "购买",
-            on_purchase
+            lambda: self.on_purchase(self.item)
         )
+        self.purchase_button.set_anchor(Anchor((1.0, 1.0), (-90, -40), pivot=(0.0, 0.0)))
         self.add_child(self.purchase_button)
+    
+    @staticmethod
+    def _price_text(item: ShopItem) -> str:
+        currency_symbol = "★" if item.currency == "stars" else "◆"
+        return f"价格: {item.price}{currency_symbol}"
+    
+    def bind(self, item: ShopItem):
+        """绑定到另一个物品（文本未变化的标签不会重新渲染）"""
+        if item is self.item:
+            return
+        self.item = item
+        self.name_label.set_text(item.name)
+        self.desc_label.set_text(item.description)
+        self.price_label.set_text(self._price_text(item))
 
 class Shop(Scene, UIElement):
-    def __init__(self, screen_width: int, screen_height: int):
+    # 物品卡片大小
+    CARD_WIDTH = 300
+    CARD_HEIGHT = 120
+    
+    def __init__(self, screen_width: int, screen_height: int,
+                 catalog: Optional[ShopCatalog] = None):
         UIElement.__init__(self, 0, 0, screen_width, screen_height)
         
         # 创建标题
         title_label = Label(screen_width // 2 - 50, 50, "商店", 48, bold=True)
+        title_label.set_anchor(Anchor((0.5, 0.0), (0, 50)))
         self.add_child(title_label)
         
         # 创建标签页按钮
@@ -62,6 +80,12 @@ class Shop(Scene, UIElement):
         tab_height = 40
         tab_y = 120
         
+        # 标签页按钮横向排列，整体水平居中
+        self.tab_bar = UIElement(screen_width // 2 - tab_width - 10, tab_y, tab_width * 2 + 20, tab_height)
+        self.tab_bar.set_arrangement(Stack('horizontal', spacing=20))
+        self.tab_bar.set_anchor(Anchor((0.5, 0.0), (0, tab_y)))
+        self.add_child(self.tab_bar)
+        
         self.temp_shop_button = Button(
             screen_width // 2 - tab_width - 10,
             tab_y,
@@ -70,7 +94,7 @@ class Shop(Scene, UIElement):
             "临时商店",
             lambda: self.switch_shop('temp')
         )
-        self.add_child(self.temp_shop_button)
+        self.tab_bar.add_child(self.temp_shop_button)
         
         self.perm_shop_button = Button(
             screen_width // 2 + 10,
@@ -80,7 +104,7 @@ class Shop(Scene, UIElement):
             "永久商店",
             lambda: self.switch_shop('perm')
         )
-        self.add_child(self.perm_shop_button)
+        self.tab_bar.add_child(self.perm_shop_button)
         
         # 创建商店面板
         panel_width = screen_width - 200
@@ -91,6 +115,8 @@ class Shop(Scene, UIElement):
             panel_width,
             panel_height
         )
+        self.shop_panel.set_anchor(Anchor((0.5, 0.0), (0, 180), stretch=(-200, -300)))
+        self.shop_panel.set_arrangement(Grid(2, spacing=(50, 30), padding=(0, 20)))
         self.add_child(self.shop_panel)
         
         # 返回按钮
@@ -102,141 +128,108 @@ class Shop(Scene, UIElement):
             "返回",
             lambda: None  # 将在外部设置
         )
+        self.back_button.set_anchor(Anchor((0.5, 1.0), (0, -80), pivot=(0.5, 0.0)))
         self.add_child(self.back_button)
         
-        # 商店物品
-        self.temp_items: List[ShopItem] = [
-            ShopItem(
-                "生命恢复",
-                "恢复50%最大生命值",
-                30,
-                "fragments",
-                lambda player: setattr(player, 'health', 
-                                     min(player.health + player.max_health * 0.5,
-                                         player.max_health))
-            ),
-            ShopItem(
-                "攻击力提升",
-                "临时提升30%攻击力，持续60秒",
-                40,
-                "fragments",
-                lambda player: setattr(player, 'damage_bonus', 
-                                     player.damage_bonus + 0.3)
-            ),
-            ShopItem(
-                "速度提升",
-                "临时提升20%移动速度，持续60秒",
-                35,
-                "fragments",
-                lambda player: setattr(player, 'speed_bonus', 
-                                     player.speed_bonus + 0.2)
-            )
-        ]
-        
-        self.perm_items: List[ShopItem] = [
-            ShopItem(
-                "最大生命值提升",
-                "永久提升10%最大生命值",
-                3,
-                "stars",
-                lambda player: setattr(player, 'max_health', 
-                                     player.max_health * 1.1)
-            ),
-            ShopItem(
-                "基础攻击力提升",
-                "永久提升10%基础攻击力",
-                4,
-                "stars",
-                lambda player: setattr(player, 'base_damage', 
-                                     player.base_damage * 1.1)
-            ),
-            ShopItem(
-                "基础速度提升",
-                "永久提升10%基础速度",
-                4,
-                "stars",
-                lambda player: setattr(player, 'base_speed', 
-                                     player.base_speed * 1.1)
-            )
-        ]
+        # 商店物品目录（从数据文件加载，按id索引）
+        self.catalog = catalog if catalog is not None else ShopCatalog.load()
+        self.temp_items: List[ShopItem] = self.catalog.items_for('temp')
+        self.perm_items: List[ShopItem] = self.catalog.items_for('perm')
         
         # 当前显示的商店类型
         self.current_shop = 'temp'
         self.current_items = self.temp_items
         
-        # 创建物品卡片
-        self.item_cards: Dict[str, List[ItemCard]] = {
-            'temp': [],
-            'perm': []
-        }
+        # 物品卡片只为可见窗口内的物品创建，滚动时复用
+        self.card_pool: List[ItemCard] = []
+        self.scroll_row = 0  # 可见窗口的第一行
+        self.visible_cards: List[ItemCard] = []
         
-        self._create_item_cards()
+        # 上次计算可购买状态时的货币数量，变化时才重新计算
+        self.affordability_wallet: Optional[tuple] = None
         
         # 玩家引用
         self.player: Optional[Player] = None
         
         # 回调函数
         self.on_back: Optional[Callable[[], None]] = None
+        
+        # 指针事件分发（点击检测索引）
+        self.dispatcher = PointerDispatcher(self)
+        
+        # 货币信息（只在数值变化时重新渲染文本）
+        self.fragment_label = Label(20, 20, "碎片: 0")
+        self.star_label = Label(20, 50, "星星: 0")
     
     def initialize(self):
-        """初始化场景"""
-        pass
+        """初始化场景（首次进入时才创建可见的物品卡片）"""
+        self.switch_shop(self.current_shop)
+    
+    def resize(self, width: int, height: int):
+        """屏幕大小变化时调整布局，并按新的可见行数重新绑定卡片"""
+        self.set_size(width, height)
+        update_layout(self)
+        self.scroll_row = min(self.scroll_row, self.max_scroll_row())
+        self._refresh_cards()
+    
+    def _visible_rows(self) -> int:
+        """商店面板能完整显示的卡片行数"""
+        grid = self.shop_panel.arrangement
+        row_height = self.CARD_HEIGHT + grid.spacing[1]
+        return max(1, (self.shop_panel.height - grid.padding[1] * 2 + grid.spacing[1]) // row_height)
     
-    def _create_item_cards(self):
-        """创建物品卡片"""
-        card_width = 300
-        card_height = 120
-        cards_per_row = 2
-        spacing_x = 50
-        spacing_y = 30
+    def max_scroll_row(self) -> int:
+        """当前商店最大的滚动行数"""
+        columns = self.shop_panel.arrangement.columns
+        total_rows = (len(self.current_items) + columns - 1) // columns
+        return max(0, total_rows - self._visible_rows())
+    
+    def _refresh_cards(self):
+        """把可见窗口内的物品绑定到卡片上，卡片不足时才创建"""
+        columns = self.shop_panel.arrangement.columns
+        start = self.scroll_row * columns
+        window = self.current_items[start:start + self._visible_rows() * columns]
+        
+        while len(self.card_pool) < len(window):
+            item = window[len(self.card_pool)]
+            self.card_pool.append(ItemCard(
+                self.shop_panel.x, self.shop_panel.y,
+                self.CARD_WIDTH, self.CARD_HEIGHT,
+                item, self.purchase_item
+            ))
         
-        start_x = self.shop_panel.x + (self.shop_panel.width - 
-                                     (card_width * cards_per_row + 
-                                      spacing_x * (cards_per_row - 1))) // 2
-        start_y = self.shop_panel.y + 20
+        for card, item in zip(self.card_pool, window):
+            card.bind(item)
         
-        # 创建临时商店卡片
-        for i, item in enumerate(self.temp_items):
-            row = i // cards_per_row
-            col = i % cards_per_row
-            card = ItemCard(
-                start_x + col * (card_width + spacing_x),
-                start_y + row * (card_height + spacing_y),
-                card_width,
-                card_height,
-                item,
-                lambda item=item: self.purchase_item(item)
-            )
-            self.item_cards['temp'].append(card)
+        # 只在卡片数量变化时重建面板的子元素
+        cards = self.card_pool[:len(window)]
+        if cards != self.visible_cards:
+            self.visible_cards = cards
+            self.shop_panel.clear_children()
+            for card in cards:
+                self.shop_panel.add_child(card)
         
-        # 创建永久商店卡片
-        for i, item in enumerate(self.perm_items):
-            row = i // cards_per_row
-            col = i % cards_per_row
-            card = ItemCard(
-                start_x + col * (card_width + spacing_x),
-                start_y + row * (card_height + spacing_y),
-                card_width,
-                card_height,
-                item,
-                lambda item=item: self.purchase_item(item)
-            )
-            self.item_cards['perm'].append(card)
+        self.affordability_wallet = None
+    
+    def scroll(self, rows: int):
+        """滚动物品列表"""
+        scroll_row = max(0, min(self.scroll_row + rows, self.max_scroll_row()))
+        if scroll_row != self.scroll_row:
+            self.scroll_row = scroll_row
+            self._refresh_cards()
     
     def switch_shop(self, shop_type: str):
         """切换商店类型"""
         self.current_shop = shop_type
-        self.current_items = (self.temp_items if shop_type == 'temp' 
-                            else self.perm_items)
+        self.current_items = self.catalog.items_for(shop_type)
         
         # 更新按钮状态
         self.temp_shop_button.pressed = shop_type == 'temp'
         self.perm_shop_button.pressed = shop_type == 'perm'
         
-        # 更新商店面板的子元素
-        self.shop_panel.children.clear()
-        for card in self.item_cards[shop_type]:
-            self.shop_panel.add_child(card)
+        # 回到列表顶部并重新绑定卡片
+        self.scroll_row = 0
+        self._refresh_cards()
     
     def set_player(self, player: Player):
         """设置玩家引用"""
@@ -257,6 +250,13 @@ class Shop(Scene, UIElement):
                 self.player.stars -= item.price
                 item.effect(self.player)
     
+    def handle_event(self, event: pygame.event.Event):
+        """处理事件"""
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll(-event.y)
+            return
+        self.dispatcher.handle_event(event)
+    
     def set_callbacks(self, on_back: Callable[[], None]):
         """设置回调函数"""
         self.on_back = on_back
@@ -264,19 +264,18 @@ class Shop(Scene, UIElement):
     
     def update(self):
         """更新商店界面"""
-        super().update()
+        UIElement.update(self)
         
         if not self.player:
             return
         
-        # 更新物品可购买状态
-        for card in self.item_cards[self.current_shop]:
-            item = next(item for item in self.current_items 
-                       if item.name == card.children[0].text)
-            if item.currency == 'fragments':
-                card.purchase_button.enabled = self.player.fragments >= item.price
-            else:
-                card.purchase_button.enabled = self.player.stars >= item.price
+        # 货币数量变化时才更新可见物品的可购买状态
+        wallet = (self.player.fragments, self.player.stars)
+        if wallet == self.affordability_wallet:
+            return
+        self.affordability_wallet = wallet
+        for card in self.visible_cards:
+            card.purchase_button.set_enabled(card.item.affordable(*wallet))
     
     def render(self, screen: pygame.Surface):
         """渲染商店界面"""
@@ -284,15 +283,13 @@ class Shop(Scene, UIElement):
         screen.fill((30, 30, 30))
         
         # 渲染UI元素
-        super().render(screen)
+        update_layout(self)
+        UIElement.render(self, screen)
         
         # 渲染货币信息
         if self.player:
-            fragment_text = f"碎片: {self.player.fragments}"
-            star_text = f"星星: {self.player.stars}"
-            
-            fragment_label = Label(20, 20, fragment_text)
-            star_label = Label(20, 50, star_text)
+            self.fragment_label.set_text(f"碎片: {self.player.fragments}")
+            self.star_label.set_text(f"星星: {self.player.stars}")
             
-            fragment_label.render(screen)
-            star_label.render(screen) 
\ No newline at end of file
+            self.fragment_label.render(screen)
+            self.star_label.render(screen) 
\ No newline at end of file
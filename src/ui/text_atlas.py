@@ -0,0 +1,222 @@
+import ast
+import json
+import os
+import struct
+import zlib
+import pygame
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ui.ui_element import UIElement, Button
+from shop_catalog import ShopCatalog
+from asset_pack import asset_exists, asset_size, open_asset
+
+# 文字图集文件：文件头 + 索引JSON + zlib压缩的RGBA像素，启动时一次读取
+ATLAS_FILE = os.path.join("assets", "data", "text_atlas.bin")
+MAGIC = b'GFTA'
+VERSION = 1
+HEADER = struct.Struct('<4sHIHH')  # magic, version, 索引长度, 图集宽, 图集高
+ATLAS_WIDTH = 1024
+PADDING = 1  # 相邻文字之间的间隔（像素）
+
+# 扫描静态文本的UI代码目录
+SOURCE_DIRS = [os.path.join("src", "ui"), os.path.join("src", "scenes")]
+
+WHITE = (255, 255, 255)
+DISABLED_TEXT = (150, 150, 150)  # Button.disabled_text_color
+
+# 文本条目：(文本, 字号, 粗体, 颜色)
+TextKey = Tuple[str, int, bool, Tuple[int, int, int]]
+
+# 无法从代码字面量中收集的静态文本（由列表或数据生成）
+STATIC_BUTTON_TEXTS: List[str] = ['新游戏', '继续游戏', '商店', '退出']
+STATIC_STRINGS: List[TextKey] = [
+    # 新游戏确认对话框
+    ('确认', 32, True, WHITE),
+    ('当前存在游戏存档，是否开始新游戏？\n这将覆盖现有存档。', 24, False, WHITE),
+    # 角色名称
+    ('士兵', 32, True, WHITE),
+    ('突击手', 32, True, WHITE),
+    ('炮兵', 32, True, WHITE)
+]
+
+def make_key(text: str, size: int, bold: bool, color: Tuple[int, ...]) -> str:
+    """生成图集索引中的键"""
+    return f"{size}|{int(bold)}|{color[0]},{color[1]},{color[2]}|{text}"
+
+def font_signature() -> Dict[str, Optional[int]]:
+    """字体文件签名（文件大小），字体变化后已烘焙的图集失效"""
+    return {path: asset_size(path) for path in UIElement.FONT_FILES.values()}
+
+def _literal(node: Optional[ast.AST], default=None):
+    """取字面量的值，不是字面量时返回default"""
+    if node is None:
+        return default
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return default
+
+def _call_args(call: ast.Call, names: List[str]) -> Dict[str, ast.AST]:
+    """按参数名整理调用的位置参数和关键字参数"""
+    args = dict(zip(names, call.args))
+    for keyword in call.keywords:
+        if keyword.arg is not None:
+            args[keyword.arg] = keyword.value
+    return args
+
+def collect_source_strings(paths: Iterable[str]) -> Set[TextKey]:
+    """从UI代码中收集以字符串字面量创建的Label和Button文本"""
+    entries: Set[TextKey] = set()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+                continue
+            if node.func.id == 'Label':
+                args = _call_args(node, ['x', 'y', 'text', 'font_size', 'color', 'bold'])
+                text = _literal(args.get('text'))
+                size = _literal(args.get('font_size'), 24)
+                color = _literal(args.get('color'), WHITE)
+                bold = _literal(args.get('bold'), False)
+                if isinstance(text, str) and isinstance(size, int) and isinstance(color, tuple):
+                    entries.add((text, size, bool(bold), color))
+            elif node.func.id == 'Button':
+                args = _call_args(node, ['x', 'y', 'width', 'height', 'text', 'callback'])
+                text = _literal(args.get('text'))
+                if isinstance(text, str):
+                    entries.update(_button_entries(text))
+    return entries
+
+def _button_entries(text: str) -> List[TextKey]:
+    """按钮文本有可用和禁用两种颜色"""
+    return [(text, Button.font_size, True, WHITE), (text, Button.font_size, True, DISABLED_TEXT)]
+
+def collect_static_strings() -> List[TextKey]:
+    """收集所有需要烘焙的静态文本"""
+    paths = []
+    for directory in SOURCE_DIRS:
+        for file in sorted(os.listdir(directory)):
+            if file.endswith(".py"):
+                paths.append(os.path.join(directory, file))
+    entries = collect_source_strings(paths)
+    entries.update(STATIC_STRINGS)
+    for text in STATIC_BUTTON_TEXTS:
+        entries.update(_button_entries(text))
+    
+    # 商店物品名称和描述
+    for item in ShopCatalog.load().items.values():
+        entries.add((item.name, 24, True, WHITE))
+        entries.add((item.description, 18, False, WHITE))
+    return sorted(entries, key=lambda entry: make_key(*entry))
+
+def bake(entries: Iterable[TextKey], path: str = ATLAS_FILE) -> int:
+    """把文本渲染并打包到图集文件，返回烘焙的条目数量"""
+    rendered = []
+    for text, size, bold, color in entries:
+        if not text:
+            continue
+        surface = UIElement.get_font(size, bold).render(text, True, color)
+        rendered.append((make_key(text, size, bold, color), surface))
+    
+    # 按高度从高到低逐行排列
+    rendered.sort(key=lambda item: item[1].get_height(), reverse=True)
+    placements: Dict[str, List[int]] = {}
+    x = y = row_height = 0
+    for key, surface in rendered:
+        width, height = surface.get_size()
+        if width > ATLAS_WIDTH:
+            print(f"文本过宽，跳过烘焙: {key}")
+            continue
+        if x + width > ATLAS_WIDTH:
+            x = 0
+            y += row_height + PADDING
+            row_height = 0
+        placements[key] = [x, y, width, height]
+        x += width + PADDING
+        row_height = max(row_height, height)
+    atlas_height = max(1, y + row_height)
+    
+    atlas = pygame.Surface((ATLAS_WIDTH, atlas_height), pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for key, surface in rendered:
+        if key in placements:
+            # 直接复制像素（包括Alpha），不与透明背景混合
+            atlas.blit(surface, placements[key][:2], special_flags=pygame.BLEND_RGBA_MAX)
+    
+    index = json.dumps({
+        'fonts': font_signature(),
+        'entries': placements
+    }, ensure_ascii=False).encode('utf-8')
+    pixels = zlib.compress(pygame.image.tostring(atlas, 'RGBA'))
+    
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    temp_file = path + ".tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(index), ATLAS_WIDTH, atlas_height))
+        f.write(index)
+        f.write(pixels)
+    os.replace(temp_file, path)
+    return len(placements)
+
+class TextAtlas:
+    """预烘焙的静态文字图集，按(文本, 字号, 粗体, 颜色)查找子画面"""
+    def __init__(self, surface: pygame.Surface, entries: Dict[str, List[int]]):
+        self.surface = surface
+        self.entries = entries
+        self.surfaces: Dict[str, pygame.Surface] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, text: str, size: int, bold: bool,
+            color: Tuple[int, ...]) -> Optional[pygame.Surface]:
+        """获取已烘焙的文本画面，未烘焙时返回None"""
+        key = make_key(text, size, bold, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            rect = self.entries.get(key)
+            if rect is None:
+                self.misses += 1
+                return None
+            surface = self.surface.subsurface(pygame.Rect(rect))
+            self.surfaces[key] = surface
+        self.hits += 1
+        return surface
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    @classmethod
+    def load(cls, path: str = ATLAS_FILE) -> Optional['TextAtlas']:
+        """加载图集文件，文件不存在、损坏或字体已变化时返回None"""
+        if not asset_exists(path):
+            print(f"未找到文字图集，使用实时渲染: {path}")
+            return None
+        try:
+            with open_asset(path) as f:
+                blob = f.read()
+            magic, version, index_len, width, height = HEADER.unpack_from(blob)
+            if magic != MAGIC or version != VERSION:
+                print(f"文字图集格式不匹配，使用实时渲染: {path}")
+                return None
+            offset = HEADER.size
+            index = json.loads(blob[offset:offset + index_len].decode('utf-8'))
+            if index['fonts'] != font_signature():
+                print("字体文件已变化，文字图集失效，请重新烘焙")
+                return None
+            pixels = zlib.decompress(blob[offset + index_len:])
+            surface = pygame.image.frombuffer(pixels, (width, height), 'RGBA')
+            surface = surface.convert_alpha() if pygame.display.get_surface() else surface.copy()
+            print(f"加载文字图集: {len(index['entries'])}条文本")
+            return cls(surface, index['entries'])
+        except (OSError, struct.error, ValueError, KeyError, zlib.error, pygame.error) as e:
+            print(f"加载文字图集失败: {e}")
+            return None
+
+def bake_main() -> bool:
+    """烘焙文字图集（由bake_assets.py调用）"""
+    entries = collect_static_strings()
+    count = bake(entries)
+    print(f"已烘焙文字图集: {count}/{len(entries)}条文本 -> {ATLAS_FILE}")
+    return count == len(entries)
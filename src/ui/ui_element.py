@@ -1,5 +1,6 @@
 import pygame
 from typing import Tuple, Optional, Callable, Dict
+from asset_pack import open_asset
 
 class UIElement:
     # 字体缓存
@@ -8,56 +9,187 @@ class UIElement:
         'bold': {}
     }
     
+    # 字体文件
+    FONT_FILES = {
+        'regular': "assets/fonts/SourceHanSans-Regular.ttc",
+        'bold': "assets/fonts/SourceHanSans-Bold.ttc"
+    }
+    
+    # 预烘焙的静态文字图集（见ui.text_atlas），由启动流程加载
+    text_atlas = None
+    
+    # 是否已向pygame登记退出时清空缓存（pygame.quit调用一次后登记即失效）
+    _quit_registered = False
+    
+    @staticmethod
+    def clear_font_cache():
+        """清空字体缓存和文字图集，pygame.quit时自动调用（退出后缓存的字体对象已失效，继续使用会崩溃）"""
+        for fonts in UIElement._fonts.values():
+            fonts.clear()
+        UIElement.text_atlas = None
+        UIElement._quit_registered = False
+    
     @staticmethod
     def get_font(size: int, bold: bool = False) -> pygame.font.Font:
         """获取指定大小的字体"""
         font_type = 'bold' if bold else 'regular'
         if size not in UIElement._fonts[font_type]:
-            font_path = "assets/fonts/SourceHanSans-Bold.ttc" if bold else "assets/fonts/SourceHanSans-Regular.ttc"
+            if not UIElement._quit_registered:
+                pygame.register_quit(UIElement.clear_font_cache)
+                UIElement._quit_registered = True
+            font_path = UIElement.FONT_FILES[font_type]
             try:
-                UIElement._fonts[font_type][size] = pygame.font.Font(font_path, size)
+                UIElement._fonts[font_type][size] = pygame.font.Font(open_asset(font_path), size)
             except Exception as e:
                 # 创建一个默认字体作为后备
                 UIElement._fonts[font_type][size] = pygame.font.SysFont(None, size)
         return UIElement._fonts[font_type][size]
     
+    @staticmethod
+    def render_text(text: str, size: int, bold: bool = False,
+                    color: Tuple[int, int, int] = (255, 255, 255)) -> pygame.Surface:
+        """渲染文本，静态文本直接取自文字图集，其余文本才打开字体实时渲染"""
+        atlas = UIElement.text_atlas
+        if atlas is not None:
+            surface = atlas.get(text, size, bold, color)
+            if surface is not None:
+                return surface
+        return UIElement.get_font(size, bold).render(text, True, color)
+    
+    # 布局版本号：任意元素的位置、层级或可见性变化时递增，点击检测索引据此判断是否需要重建
+    layout_version = 0
+    # 是否接收指针事件（会被加入点击检测索引）
+    interactive = False
+    # 是否为模态元素（可见时屏蔽其下层元素的指针事件）
+    modal = False
+    
+    @staticmethod
+    def invalidate_layout():
+        """标记布局已变化"""
+        UIElement.layout_version += 1
+    
     def __init__(self, x: int, y: int, width: int, height: int):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.rect = pygame.Rect(x, y, width, height)
-        self.visible = True
-        self.enabled = True
+        self.dirty = True  # 本帧外观是否发生了变化
         self.parent: Optional['UIElement'] = None
         self.children: list['UIElement'] = []
+        
+        # 布局（见ui.layout）：anchor决定自身在父元素中的位置，arrangement决定子元素的排列
+        self.anchor = None
+        self.arrangement = None
+        self.needs_layout = True  # 本元素或其子树需要重新布局
+        
+        self.visible = True
+        self.enabled = True
+    
+    @property
+    def visible(self) -> bool:
+        return self._visible
+    
+    @visible.setter
+    def visible(self, value: bool):
+        if getattr(self, '_visible', None) != value:
+            self._visible = value
+            self.dirty = True
+            UIElement.invalidate_layout()
+            # 可见性影响父元素中的排列
+            if self.parent is not None:
+                self.parent.request_layout()
+    
+    def mark_dirty(self):
+        """标记元素外观已变化"""
+        self.dirty = True
+    
+    def consume_changes(self) -> bool:
+        """返回本元素及其子树自上次调用以来是否有变化，并清除变化标记"""
+        changed = self.dirty
+        self.dirty = False
+        for child in self.children:
+            if child.consume_changes():
+                changed = True
+        return changed
     
     def set_position(self, x: int, y: int):
-        """设置元素位置"""
+        """设置元素位置，子元素随之平移"""
+        dx = x - self.x
+        dy = y - self.y
+        if dx == 0 and dy == 0:
+            return
         self.x = x
         self.y = y
         self.rect.x = x
         self.rect.y = y
-        self._update_children_position()
+        self.dirty = True
+        UIElement.invalidate_layout()
+        self._update_children_position(dx, dy)
     
-    def _update_children_position(self):
-        """更新子元素位置"""
+    def _update_children_position(self, dx: int, dy: int):
+        """平移子元素"""
         for child in self.children:
-            child.set_position(
-                self.x + child.x - child.parent.x,
-                self.y + child.y - child.parent.y
-            )
+            child.set_position(child.x + dx, child.y + dy)
+    
+    def set_size(self, width: int, height: int):
+        """设置元素大小"""
+        if width == self.width and height == self.height:
+            return
+        self.width = width
+        self.height = height
+        self.rect.width = width
+        self.rect.height = height
+        self.dirty = True
+        UIElement.invalidate_layout()
+        self.request_layout()
+        if self.parent is not None:
+            self.parent.request_layout()
+    
+    def set_anchor(self, anchor):
+        """设置相对父元素的定位方式（ui.layout.Anchor）"""
+        self.anchor = anchor
+        self.request_layout()
+        if self.parent is not None:
+            self.parent.request_layout()
+    
+    def set_arrangement(self, arrangement):
+        """设置子元素的排列方式（ui.layout.Stack/Grid）"""
+        self.arrangement = arrangement
+        self.request_layout()
+    
+    def request_layout(self):
+        """标记本元素需要重新布局，并沿父链向上传播"""
+        element = self
+        while element is not None and not element.needs_layout:
+            element.needs_layout = True
+            element = element.parent
     
     def add_child(self, child: 'UIElement'):
         """添加子元素"""
         child.parent = self
         self.children.append(child)
+        self.dirty = True
+        UIElement.invalidate_layout()
+        self.request_layout()
     
     def remove_child(self, child: 'UIElement'):
         """移除子元素"""
         if child in self.children:
             child.parent = None
             self.children.remove(child)
+            self.dirty = True
+            UIElement.invalidate_layout()
+            self.request_layout()
+    
+    def clear_children(self):
+        """移除所有子元素"""
+        for child in self.children:
+            child.parent = None
+        self.children.clear()
+        self.dirty = True
+        UIElement.invalidate_layout()
+        self.request_layout()
     
     def update(self):
         """更新UI元素"""
@@ -91,8 +223,16 @@ class UIElement:
     def contains_point(self, x: int, y: int) -> bool:
         """检查点是否在元素内"""
         return self.rect.collidepoint(x, y)
+    
+    def set_hovered(self, hovered: bool):
+        """设置指针悬停状态（由点击检测分发器调用）"""
+        pass
 
 class Button(UIElement):
+    """按钮，每种外观状态的画面只渲染一次并缓存"""
+    interactive = True
+    font_size = 24  # 按钮文本使用粗体
+    
     def __init__(self, x: int, y: int, width: int, height: int, 
                  text: str, callback: Callable[[], None]):
         super().__init__(x, y, width, height)
@@ -109,24 +249,65 @@ class Button(UIElement):
         self.text_color = (255, 255, 255)  # 白色文本
         self.disabled_text_color = (150, 150, 150)  # 禁用状态的文本颜色
         
-        # 创建文本
-        self.font = self.get_font(24, bold=True)  # 使用粗体
-        self._update_text_surface()
+        # 各外观状态的缓存画面（normal/hover/pressed/disabled）
+        self.state_surfaces: Dict[str, pygame.Surface] = {}
+        self.state = self.get_state()
+    
+    def get_state(self) -> str:
+        """获取当前外观状态"""
+        if not self.enabled:
+            return 'disabled'
+        if self.pressed:
+            return 'pressed'
+        if self.hovered:
+            return 'hover'
+        return 'normal'
+    
+    def _render_state(self, state: str) -> pygame.Surface:
+        """渲染指定外观状态的按钮画面"""
+        surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         
-        # 创建按钮surface
-        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        # 绘制按钮背景
+        color = {
+            'disabled': self.disabled_color,
+            'pressed': self.pressed_color,
+            'hover': self.hover_color
+        }.get(state, self.normal_color)
+        pygame.draw.rect(surface, color, pygame.Rect(0, 0, self.width, self.height))
+        
+        # 绘制边框
+        enabled = state != 'disabled'
+        border_color = (200, 200, 200) if enabled else (100, 100, 100)
+        pygame.draw.rect(surface, border_color, pygame.Rect(0, 0, self.width, self.height), 2)
+        
+        # 绘制文本
+        text_color = self.text_color if enabled else self.disabled_text_color
+        text_surface = self.render_text(self.text, self.font_size, True, text_color)
+        surface.blit(text_surface, text_surface.get_rect(center=(self.width // 2, self.height // 2)))
+        return surface
     
-    def _update_text_surface(self):
-        """更新文本表面"""
-        color = self.disabled_text_color if not self.enabled else self.text_color
-        self.text_surface = self.font.render(self.text, True, color)
-        self.text_rect = self.text_surface.get_rect(center=self.rect.center)
+    def set_text(self, text: str):
+        """更新按钮文本"""
+        if text == self.text:
+            return
+        self.text = text
+        self.state_surfaces.clear()
+        self.dirty = True
+    
+    def set_size(self, width: int, height: int):
+        """设置按钮大小（清空外观缓存）"""
+        if width == self.width and height == self.height:
+            return
+        super().set_size(width, height)
+        self.state_surfaces.clear()
     
     def set_enabled(self, enabled: bool):
         """设置按钮是否可用"""
-        if self.enabled != enabled:
-            self.enabled = enabled
-            self._update_text_surface()
+        self.enabled = enabled
+    
+    def set_hovered(self, hovered: bool):
+        """设置指针悬停状态"""
+        self.hovered = hovered
     
     def handle_event(self, event: pygame.event.Event) -> bool:
         """处理按钮事件"""
@@ -147,40 +328,21 @@ class Button(UIElement):
         return self.hovered
     
     def render(self, screen: pygame.Surface):
-        """渲染按钮"""
+        """渲染按钮（状态未变化时直接绘制缓存画面）"""
         if not self.visible:
             return
         
-        # 选择颜色
-        if not self.enabled:
-            color = self.disabled_color
-        elif self.pressed:
-            color = self.pressed_color
-        elif self.hovered:
-            color = self.hover_color
-        else:
-            color = self.normal_color
-        
-        # 清空surface
-        self.surface.fill((0, 0, 0, 0))
-        
-        # 绘制按钮背景
-        pygame.draw.rect(self.surface, color, 
-                        pygame.Rect(0, 0, self.width, self.height))
-        
-        # 绘制边框
-        border_color = (200, 200, 200) if self.enabled else (100, 100, 100)
-        pygame.draw.rect(self.surface, border_color, 
-                        pygame.Rect(0, 0, self.width, self.height), 2)
+        # 外观状态可能被直接修改属性改变，在渲染时统一检测
+        state = self.get_state()
+        if state != self.state:
+            self.state = state
+            self.dirty = True
         
-        # 更新文本位置
-        text_rect = self.text_surface.get_rect(center=(self.width // 2, self.height // 2))
-        
-        # 绘制文本
-        self.surface.blit(self.text_surface, text_rect)
-        
-        # 将按钮surface绘制到屏幕上
-        screen.blit(self.surface, self.rect)
+        surface = self.state_surfaces.get(state)
+        if surface is None:
+            surface = self._render_state(state)
+            self.state_surfaces[state] = surface
+        screen.blit(surface, self.rect)
         
         # 渲染子元素
         for child in self.children:
@@ -190,7 +352,6 @@ class Label(UIElement):
     def __init__(self, x: int, y: int, text: str, font_size: int = 24, 
                  color: Tuple[int, int, int] = (255, 255, 255),
                  bold: bool = False):
-        self.font = self.get_font(font_size, bold)
         self.text = text
         self.color = color
         self.font_size = font_size
@@ -199,18 +360,32 @@ class Label(UIElement):
         super().__init__(x, y, self.text_surface.get_width(), 
                         self.text_surface.get_height())
     
+    @property
+    def font(self) -> pygame.font.Font:
+        """标签使用的字体（只在需要时打开）"""
+        return self.get_font(self.font_size, self.bold)
+    
     def _update_text_surface(self):
         """更新文本表面"""
-        self.text_surface = self.font.render(self.text, True, self.color)
+        self.text_surface = self.render_text(self.text, self.font_size, self.bold, self.color)
     
     def set_text(self, text: str):
-        """更新文本内容"""
+        """更新文本内容，文本未变化时不重新渲染"""
+        if text == self.text:
+            return
         self.text = text
+        self.dirty = True
         self._update_text_surface()
-        self.width = self.text_surface.get_width()
-        self.height = self.text_surface.get_height()
-        self.rect.width = self.width
-        self.rect.height = self.height
+        width = self.text_surface.get_width()
+        height = self.text_surface.get_height()
+        if width != self.width or height != self.height:
+            self.width = width
+            self.height = height
+            self.rect.width = width
+            self.rect.height = height
+            # 尺寸变化只影响参与布局的元素
+            if self.parent is not None and (self.anchor is not None or self.parent.arrangement is not None):
+                self.parent.request_layout()
     
     def render(self, screen: pygame.Surface):
         """渲染文本"""
@@ -234,6 +409,25 @@ class Panel(UIElement):
         pygame.draw.rect(self.surface, self.color, 
                         pygame.Rect(0, 0, width, height))
     
+    def set_color(self, color: Tuple[int, int, int, int]):
+        """更新面板颜色（只在颜色变化时重新填充）"""
+        if color == self.color:
+            return
+        self.color = color
+        self.surface.fill((0, 0, 0, 0))
+        pygame.draw.rect(self.surface, self.color,
+                        pygame.Rect(0, 0, self.width, self.height))
+        self.dirty = True
+    
+    def set_size(self, width: int, height: int):
+        """设置面板大小（重新创建背景）"""
+        if width == self.width and height == self.height:
+            return
+        super().set_size(width, height)
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(self.surface, self.color,
+                        pygame.Rect(0, 0, width, height))
+    
     def render(self, screen: pygame.Surface):
         """渲染面板"""
         if not self.visible:
@@ -247,6 +441,7 @@ class Panel(UIElement):
             child.render(screen)
 
 class ProgressBar(UIElement):
+    """进度条，进度按像素量化，填充宽度变化时才重新绘制"""
     def __init__(self, x: int, y: int, width: int, height: int, 
                  fill_color: Tuple[int, int, int] = (0, 255, 0),
                  background_color: Tuple[int, int, int] = (50, 50, 50),
@@ -256,23 +451,33 @@ class ProgressBar(UIElement):
         self.background_color = background_color
         self.border_color = border_color
         self.progress = 1.0  # 0.0 到 1.0 之间的值
+        self.fill_width = width  # 量化后的填充宽度（像素）
         
         # 创建surface
         self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.rendered_width = -1  # surface中已绘制的填充宽度
         
         print(f"创建进度条 - 位置: ({x}, {y}) 大小: {width}x{height}")
     
     def set_progress(self, value: float):
         """设置进度值（0.0 到 1.0 之间）"""
         self.progress = max(0.0, min(1.0, value))
-        print(f"进度条更新: {self.progress:.2%}")
+        fill_width = int(self.width * self.progress)
+        if fill_width != self.fill_width:
+            self.fill_width = fill_width
+            self.dirty = True
     
-    def render(self, screen: pygame.Surface):
-        """渲染进度条"""
-        if not self.visible:
+    def set_size(self, width: int, height: int):
+        """设置进度条大小（重新创建画面，按新宽度量化进度）"""
+        if width == self.width and height == self.height:
             return
-        
-        # 清空surface
+        super().set_size(width, height)
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.fill_width = int(width * self.progress)
+        self.rendered_width = -1
+    
+    def _redraw(self):
+        """重新绘制进度条画面"""
         self.surface.fill((0, 0, 0, 0))
         
         # 绘制背景
@@ -280,18 +485,26 @@ class ProgressBar(UIElement):
                         pygame.Rect(0, 0, self.width, self.height))
         
         # 绘制进度
-        if self.progress > 0:
-            fill_width = int(self.width * self.progress)
+        if self.fill_width > 0:
             pygame.draw.rect(self.surface, self.fill_color,
-                           pygame.Rect(0, 0, fill_width, self.height))
+                           pygame.Rect(0, 0, self.fill_width, self.height))
         
         # 绘制边框
         pygame.draw.rect(self.surface, self.border_color,
                         pygame.Rect(0, 0, self.width, self.height), 2)
+        self.rendered_width = self.fill_width
+    
+    def render(self, screen: pygame.Surface):
+        """渲染进度条"""
+        if not self.visible:
+            return
+        
+        if self.rendered_width != self.fill_width:
+            self._redraw()
         
         # 将surface绘制到屏幕上
         screen.blit(self.surface, self.rect)
         
         # 渲染子元素
         for child in self.children:
-            child.render(screen) 
\ No newline at end of file
+            child.render(screen)
\ No newline at end of file
@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "src"))
+
+import pygame
+import asset_pack
+from asset_pack import (ALIGNMENT, AssetPack, AssetStream, asset_exists, asset_size, collect_assets, list_assets,
+                        open_asset, pack)
+from shop_catalog import ShopCatalog
+
+ASSET_DIR = os.path.join(ROOT_DIR, "assets")
+
+class TestAssetPack(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.temp_dir, "assets.pak")
+        cls.files = collect_assets(ASSET_DIR)
+        pack(cls.files, cls.path, ASSET_DIR)
+    
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+    
+    def setUp(self):
+        self.pack = AssetPack.load(self.path, ASSET_DIR)
+    
+    def tearDown(self):
+        asset_pack.set_default_pack(None)
+        self.pack.close()
+    
+    def test_index_and_data(self):
+        """测试资源包索引和数据与原始文件一致"""
+        self.assertIn('audio/sfx/hit.mp3', self.pack)
+        self.assertIn('data/shop_items.json', self.pack)
+        self.assertEqual(len(self.pack.index), len(self.files))
+        self.assertEqual(sorted(self.pack.names('audio/bgm/')), ['audio/bgm/battle_bgm.mp3', 'audio/bgm/menu_bgm.mp3'])
+        
+        for file in self.files:
+            name = asset_pack.asset_name(file, ASSET_DIR)
+            self.assertEqual((self.pack.data_start + self.pack.index[name][0]) % ALIGNMENT, 0)
+            with open(file, 'rb') as f:
+                self.assertEqual(bytes(self.pack.get(name)), f.read())
+    
+    def test_default_pack_loaders(self):
+        """测试资源读取优先使用资源包"""
+        asset_pack.set_default_pack(self.pack)
+        stream = open_asset(os.path.join("assets", "audio", "sfx", "hit.mp3"))
+        self.assertIsInstance(stream, AssetStream)
+        self.assertEqual(stream.read(4), bytes(self.pack.get('audio/sfx/hit.mp3')[:4]))
+        stream.seek(-4, os.SEEK_END)
+        self.assertEqual(len(stream.read()), 4)
+        
+        self.assertEqual(list_assets(os.path.join("assets", "audio", "sfx"), ".mp3")[0],
+                         os.path.join("assets", "audio", "sfx", "boss_appear.mp3"))
+        self.assertEqual(len(ShopCatalog.load()), 6)
+        
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error:
+            return
+        packed = pygame.mixer.Sound(open_asset(os.path.join("assets", "audio", "sfx", "hit.mp3")))
+        loose = pygame.mixer.Sound(os.path.join(ASSET_DIR, "audio", "sfx", "hit.mp3"))
+        self.assertEqual(packed.get_raw(), loose.get_raw())
+    
+    def test_stale_entries_fall_back_to_files(self):
+        """测试原始文件修改后资源包中的条目过期，改为读取原始文件，新增的文件也能列出"""
+        project = os.path.join(self.temp_dir, "project")
+        data_dir = os.path.join(project, "assets", "data")
+        os.makedirs(data_dir)
+        contents = {'a.json': b'{"a": 1}', 'b.json': b'{"b": 2}'}
+        for name, content in contents.items():
+            with open(os.path.join(data_dir, name), 'wb') as f:
+                f.write(content)
+        cwd = os.getcwd()
+        os.chdir(project)
+        try:
+            path = os.path.join("assets", "assets.pak")
+            pack(collect_assets("assets"), path, "assets")
+            stale_pack = AssetPack.load(path)
+            try:
+                asset_pack.set_default_pack(stale_pack)
+                a_path = os.path.join("assets", "data", "a.json")
+                b_path = os.path.join("assets", "data", "b.json")
+                with open_asset(a_path) as f:
+                    self.assertIsInstance(f, AssetStream)
+                
+                # 同样大小的新内容：只有修改时间不同
+                with open(a_path, 'wb') as f:
+                    f.write(b'{"a": 9}')
+                stat = os.stat(a_path)
+                os.utime(a_path, ns=(stat.st_atime_ns, stale_pack.index['data/a.json'][2] + 1_000_000_000))
+                # 大小不同
+                with open(b_path, 'wb') as f:
+                    f.write(b'{"b": 20}')
+                with open(os.path.join(data_dir, "c.json"), 'wb') as f:
+                    f.write(b'{}')
+                
+                self.assertFalse(stale_pack.fresh('data/a.json'))
+                self.assertFalse(stale_pack.fresh('data/b.json'))
+                with open_asset(a_path) as f:
+                    self.assertNotIsInstance(f, AssetStream)
+                    self.assertEqual(f.read(), b'{"a": 9}')
+                with open_asset(b_path) as f:
+                    self.assertEqual(f.read(), b'{"b": 20}')
+                self.assertEqual(asset_size(b_path), 9)
+                self.assertEqual(list_assets(os.path.join("assets", "data"), ".json"),
+                                 [os.path.join("assets", "data", name) for name in ('a.json', 'b.json', 'c.json')])
+                
+                # 只发布资源包时（原始文件不存在）使用资源包中的数据
+                os.remove(a_path)
+                self.assertTrue(stale_pack.fresh('data/a.json'))
+                self.assertTrue(asset_exists(a_path))
+                with open_asset(a_path) as f:
+                    self.assertEqual(f.read(), b'{"a": 1}')
+            finally:
+                asset_pack.set_default_pack(None)
+                stale_pack.close()
+        finally:
+            os.chdir(cwd)
+    
+    def test_corrupt_pack(self):
+        """测试损坏的资源包不会被使用"""
+        broken = os.path.join(self.temp_dir, "broken.pak")
+        with open(broken, 'wb') as f:
+            f.write(b'GFPK\x09\x00')
+        self.assertIsNone(AssetPack.load(broken))
+        self.assertIsNone(AssetPack.load(os.path.join(self.temp_dir, "missing.pak")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "src"))
+
+import pygame
+from audio_cache import AudioCache
+
+SFX_DIR = os.path.join(ROOT_DIR, "assets", "audio", "sfx")
+
+class TestAudioCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error as e:
+            raise unittest.SkipTest(f"无法初始化音频: {e}")
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = AudioCache(os.path.join(self.temp_dir, "cache"))
+        self.source = os.path.join(self.temp_dir, "hit.mp3")
+        shutil.copy(os.path.join(SFX_DIR, "hit.mp3"), self.source)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_warm_load_matches_decoded(self):
+        """测试缓存读取的PCM与解码结果一致"""
+        decoded = self.cache.load_sound(self.source)
+        cached = self.cache.load_sound(self.source)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+        self.assertEqual(cached.get_raw(), decoded.get_raw())
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 1)
+    
+    def test_source_change_invalidates(self):
+        """测试源文件变化后重新解码并删除旧缓存"""
+        self.cache.load_sound(self.source)
+        old_file = self.cache.cache_path(self.source)
+        
+        shutil.copy(os.path.join(SFX_DIR, "collect.mp3"), self.source)
+        sound = self.cache.load_sound(self.source)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(os.listdir(self.cache.cache_dir), [os.path.basename(self.cache.cache_path(self.source))])
+        self.assertFalse(os.path.exists(old_file))
+        self.assertEqual(sound.get_raw(), pygame.mixer.Sound(self.source).get_raw())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from audio_mixer import ChannelManager, SoundPolicy
+
+class StubChannel:
+    """模拟混音通道：播放后一直忙碌，直到测试调用finish或stop"""
+    def __init__(self):
+        self.sound = None
+        self.busy = False
+        self.plays = 0
+    
+    def play(self, sound):
+        self.sound = sound
+        self.busy = True
+        self.plays += 1
+    
+    def get_busy(self) -> bool:
+        return self.busy
+    
+    def stop(self):
+        self.busy = False
+    
+    def finish(self):
+        self.busy = False
+
+class TestAudioMixer(unittest.TestCase):
+    def create(self, channel_count: int, policies: dict) -> ChannelManager:
+        self.now = 0
+        self.channels = [StubChannel() for _ in range(channel_count)]
+        self.sounds = {name: f"sound:{name}" for name in policies}
+        return ChannelManager(policies=policies, channels=self.channels, clock=lambda: self.now)
+    
+    def play(self, manager: ChannelManager, at: int, *names: str):
+        """在指定时间请求并处理一帧的播放"""
+        self.now = at
+        for name in names:
+            manager.request(name)
+        manager.flush(self.sounds)
+    
+    def sounds_on_channels(self) -> list:
+        return [channel.sound if channel.busy else None for channel in self.channels]
+    
+    def test_reuse_oldest_same_voice(self):
+        """测试同名音效达到声部上限时复用最旧的声部，而不是占用空闲通道"""
+        manager = self.create(4, {'shot': SoundPolicy(max_voices=2, priority=1)})
+        self.play(manager, 0, 'shot')
+        self.play(manager, 10, 'shot')
+        self.play(manager, 20, 'shot')
+        self.assertEqual([channel.plays for channel in self.channels], [2, 1, 0, 0])
+        self.assertEqual(manager.voice_start_times[:2], [20, 10])
+        self.assertEqual(manager.active_voices('shot'), 2)
+        self.assertEqual(manager.stats['stolen'], 1)
+        
+        # 下一次复用的是现在最旧的通道1
+        self.play(manager, 30, 'shot')
+        self.assertEqual([channel.plays for channel in self.channels], [2, 2, 0, 0])
+    
+    def test_steal_lowest_priority_oldest(self):
+        """测试通道不足时抢占优先级最低、其次最旧的声部，不抢占更高优先级的声部"""
+        manager = self.create(3, {
+            'low': SoundPolicy(max_voices=3, priority=1),
+            'low2': SoundPolicy(max_voices=3, priority=1),
+            'mid': SoundPolicy(max_voices=3, priority=2),
+            'high': SoundPolicy(max_voices=3, priority=3)
+        })
+        self.play(manager, 0, 'low2')
+        self.play(manager, 10, 'mid')
+        self.play(manager, 20, 'low')
+        self.assertEqual(self.sounds_on_channels(), ['sound:low2', 'sound:mid', 'sound:low'])
+        
+        # 两个最低优先级的声部中抢占更旧的low2
+        self.play(manager, 30, 'high')
+        self.assertEqual(self.sounds_on_channels(), ['sound:high', 'sound:mid', 'sound:low'])
+        
+        # 同优先级可以抢占：mid抢占low
+        self.play(manager, 40, 'mid')
+        self.assertEqual(self.sounds_on_channels(), ['sound:high', 'sound:mid', 'sound:mid'])
+        self.assertEqual(manager.stats['stolen'], 2)
+        
+        # 所有声部优先级都更高时丢弃
+        self.play(manager, 50, 'low')
+        self.assertEqual(self.sounds_on_channels(), ['sound:high', 'sound:mid', 'sound:mid'])
+        self.assertEqual(manager.stats['dropped'], 1)
+        
+        # 声部结束后使用空闲通道
+        self.channels[0].finish()
+        self.play(manager, 60, 'low')
+        self.assertEqual(self.sounds_on_channels(), ['sound:low', 'sound:mid', 'sound:mid'])
+        self.assertEqual(manager.stats['stolen'], 2)
+    
+    def test_cooldown_boundary(self):
+        """测试冷却时间内的请求被节流，恰好到达冷却时间时可以播放"""
+        manager = self.create(4, {'hit': SoundPolicy(max_voices=4, priority=1, cooldown=50)})
+        self.play(manager, 100, 'hit')
+        self.play(manager, 149, 'hit')
+        self.assertEqual(manager.stats['throttled'], 1)
+        self.assertEqual(manager.stats['played'], 1)
+        self.play(manager, 150, 'hit')
+        self.assertEqual(manager.stats['played'], 2)
+        # 冷却从上一次实际播放开始计算
+        self.play(manager, 199, 'hit')
+        self.assertEqual(manager.stats['throttled'], 2)
+    
+    def test_merge_requests_in_frame(self):
+        """测试同一帧内的重复请求合并为一次播放，高优先级先分配通道"""
+        manager = self.create(1, {
+            'shot': SoundPolicy(max_voices=1, priority=1),
+            'boss': SoundPolicy(max_voices=1, priority=5)
+        })
+        self.play(manager, 0, 'shot', 'shot', 'boss', 'shot')
+        self.assertEqual(self.sounds_on_channels(), ['sound:boss'])
+        self.assertEqual(self.channels[0].plays, 1)
+        self.assertEqual(manager.pending, {})
+        self.assertEqual(manager.stats, {
+            'requested': 4,
+            'played': 1,
+            'merged': 2,
+            'throttled': 0,
+            'stolen': 0,
+            'dropped': 1
+        })
+        
+        # 没有请求的帧不做任何处理
+        manager.flush(self.sounds)
+        self.assertEqual(manager.stats['played'], 1)
+    
+    def test_stats_and_stop_all(self):
+        """测试统计计数累加，stop_all停止所有声部并丢弃未处理的请求"""
+        manager = self.create(2, {'a': SoundPolicy(max_voices=1, priority=1, cooldown=10)})
+        self.play(manager, 0, 'a', 'a')
+        self.play(manager, 5, 'a')
+        self.play(manager, 10, 'a')
+        manager.request('a')
+        manager.stop_all()
+        self.assertEqual(manager.active_voices(), 0)
+        self.assertEqual(manager.pending, {})
+        self.assertEqual(manager.stats, {
+            'requested': 5,
+            'played': 2,
+            'merged': 1,
+            'throttled': 1,
+            'stolen': 1,
+            'dropped': 0
+        })
+        
+        # 未加载的音效不播放也不计入播放次数
+        self.play(manager, 100, 'missing')
+        self.assertEqual(manager.stats['played'], 2)
+        self.assertEqual(manager.stats['requested'], 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+import sys
+import os
+import math
+
+# 使用无窗口的显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from entities.bullet_patterns import (BossBulletPool, SpiralPattern, RingPattern, RainPattern,
+                                      AimedFanPattern, compile_pattern)
+
+def bullets(pool: BossBulletPool) -> list:
+    """池中所有子弹的 (x, y, vx, vy, damage)"""
+    return [(pool.xs[i], pool.ys[i], pool.vxs[i], pool.vys[i], pool.damages[i]) for i in range(pool.count)]
+
+def angles(pool: BossBulletPool, start: int = 0) -> list:
+    """池中子弹速度方向（度，0~360）"""
+    return [round(math.degrees(math.atan2(pool.vys[i], pool.vxs[i])) % 360, 6) % 360
+            for i in range(start, pool.count)]
+
+class TestBulletPatterns(unittest.TestCase):
+    def test_spiral_table(self):
+        """测试螺旋弹幕每轮发射各旋臂，每轮旋转step，一个周期后回到起点"""
+        pattern = SpiralPattern(speed=2.0, arms=3, step=0.2)
+        self.assertEqual(pattern.steps, 31)
+        self.assertEqual(len(pattern.vx_table), 31 * 3)
+        pool = BossBulletPool()
+        self.assertEqual(pattern.emit(pool, (100, 50), None, 5), 3)
+        self.assertEqual(angles(pool), [0.0, 120.0, 240.0])
+        pattern.emit(pool, (100, 50), None, 5)
+        self.assertEqual(angles(pool, 3), [round(math.degrees(0.2) + a, 6) for a in (0, 120, 240)])
+        for x, y, vx, vy, damage in bullets(pool):
+            self.assertEqual((x, y, damage), (100, 50, 5))
+            self.assertAlmostEqual(math.hypot(vx, vy), 2.0)
+        
+        pattern.reset()
+        pool.clear()
+        for _ in range(pattern.steps + 1):
+            pattern.emit(pool, (0, 0), None, 1)
+        self.assertEqual(bullets(pool)[-3:], bullets(pool)[:3])
+    
+    def test_ring_table(self):
+        """测试环形弹幕一次发射一整圈，相邻两轮错开半个间隔"""
+        pattern = RingPattern(speed=3.0, count=8)
+        pool = BossBulletPool()
+        self.assertEqual(pattern.emit(pool, (0, 0), None, 1), 8)
+        self.assertEqual(angles(pool), [45.0 * i for i in range(8)])
+        pattern.emit(pool, (0, 0), None, 1)
+        self.assertEqual(angles(pool, 8), [45.0 * i + 22.5 for i in range(8)])
+        pattern.emit(pool, (0, 0), None, 1)
+        self.assertEqual(bullets(pool)[16:], bullets(pool)[:8])
+        
+        # 只在间隔帧发射
+        pattern = RingPattern(speed=3.0, interval=45, count=8)
+        self.assertEqual([pattern.update(pool, frame, (0, 0), None, 1) for frame in (0, 1, 44, 45)], [8, 0, 0, 8])
+    
+    def test_rain_width_follows_arena(self):
+        """测试弹雨的落点按场地宽度分道，一轮覆盖每条道一次，竖直下落"""
+        pattern = compile_pattern({'type': 'rain', 'lanes': 4, 'per_emit': 2}, 2.5, arena_width=800)
+        self.assertIsInstance(pattern, RainPattern)
+        self.assertEqual(sorted(pattern.x_table), [100.0, 300.0, 500.0, 700.0])
+        pool = BossBulletPool()
+        self.assertEqual(pattern.emit(pool, (400, 300), None, 3), 2)
+        self.assertEqual(pattern.emit(pool, (400, 300), None, 3), 2)
+        self.assertEqual(sorted(pool.xs[:4]), [100.0, 300.0, 500.0, 700.0])
+        for x, y, vx, vy, damage in bullets(pool):
+            self.assertEqual((y, vx, vy, damage), (0.0, 0.0, 2.5, 3))
+        
+        # 显式给出的场地宽度优先
+        pattern = compile_pattern({'type': 'rain', 'lanes': 2, 'arena_width': 100}, 2.5, arena_width=800)
+        self.assertEqual(sorted(pattern.x_table), [25.0, 75.0])
+    
+    def test_aimed_fan_points_at_target(self):
+        """测试瞄准扇形弹幕的中心子弹指向目标，两侧按spread偏转"""
+        pattern = AimedFanPattern(speed=5.0, count=3, spread=30.0)
+        pool = BossBulletPool()
+        self.assertEqual(pattern.emit(pool, (10, 10), (10, 110), 2), 3)
+        self.assertAlmostEqual(pool.vxs[1], 0.0)
+        self.assertAlmostEqual(pool.vys[1], 5.0)
+        self.assertEqual(angles(pool), [60.0, 90.0, 120.0])
+        
+        # 目标改变时重新瞄准
+        pattern.emit(pool, (0, 0), (-30, 0), 2)
+        self.assertAlmostEqual(pool.vxs[4], -5.0)
+        self.assertAlmostEqual(pool.vys[4], 0.0)
+        
+        # 没有目标或目标与发射点重合时不发射
+        self.assertEqual(pattern.emit(pool, (0, 0), None, 2), 0)
+        self.assertEqual(pattern.emit(pool, (5, 5), (5, 5), 2), 0)
+        self.assertEqual(pool.count, 6)
+    
+    def test_compile_pattern(self):
+        """测试编译时使用默认速度，未知类型被拒绝"""
+        pattern = compile_pattern({'type': 'ring', 'count': 4}, 6.0)
+        self.assertEqual(pattern.speed, 6.0)
+        self.assertAlmostEqual(pattern.vx_table[0], 6.0)
+        pattern = compile_pattern({'type': 'spiral', 'speed': 1.5, 'arms': 2}, 6.0)
+        self.assertEqual(pattern.speed, 1.5)
+        with self.assertRaises(ValueError):
+            compile_pattern({'type': 'laser'}, 6.0)
+    
+    def test_swap_remove_keeps_columns_aligned(self):
+        """测试越界回收用交换删除后，剩余子弹的各列数据仍然对应同一颗子弹"""
+        pool = BossBulletPool(capacity=16, bounds=(0, 0, 100, 100))
+        for i in range(8):
+            # 奇数号子弹向左飞出边界；每颗子弹的y、速度和伤害都由编号决定
+            vx = -50.0 if i % 2 else 1.0
+            pool.spawn(10.0 + i, float(i), vx, 0.5 * i, float(i))
+        pool.update()
+        self.assertEqual(pool.count, 4)
+        remaining = sorted(bullets(pool), key=lambda bullet: bullet[4])
+        self.assertEqual([bullet[4] for bullet in remaining], [0.0, 2.0, 4.0, 6.0])
+        for x, y, vx, vy, damage in remaining:
+            i = int(damage)
+            self.assertEqual((x, y, vx, vy), (11.0 + i, i + 0.5 * i, 1.0, 0.5 * i))
+    
+    def test_culling_at_bounds(self):
+        """测试子弹恰好在边界上时保留，越过边界时回收"""
+        pool = BossBulletPool(capacity=8, bounds=(-10, -10, 110, 110))
+        pool.spawn(100, 50, 10, 0, 1)    # 移动到x=110，恰好在边界上
+        pool.spawn(100, 50, 11, 0, 2)    # x=111，越界
+        pool.spawn(50, 0, 0, -10, 3)     # y=-10，恰好在边界上
+        pool.spawn(50, 0, 0, -10.5, 4)   # y=-10.5，越界
+        pool.update()
+        self.assertEqual(sorted(damage for *_, damage in bullets(pool)), [1, 3])
+        self.assertEqual(pool.frame, 1)
+        
+        # 修改边界后按新边界回收：y=-20越界，x=120在新边界内
+        pool.set_bounds(0, 0, 200, 200)
+        pool.update()
+        self.assertEqual(bullets(pool), [(120, 50, 10, 0, 1)])
+    
+    def test_collide_circle(self):
+        """测试圆形碰撞返回命中子弹的总伤害并移除命中的子弹"""
+        pool = BossBulletPool(capacity=8)
+        reach = 10 + pool.size
+        pool.spawn(100 + reach, 100, 0, 0, 3)        # 恰好接触
+        pool.spawn(100, 100 - reach + 1, 0, 0, 4)    # 重叠
+        pool.spawn(100 + reach + 1, 100, 0, 0, 100)  # 差1像素
+        pool.spawn(300, 300, 0, 0, 200)
+        self.assertEqual(pool.collide_circle(100, 100, 10), 7)
+        self.assertEqual(sorted(damage for *_, damage in bullets(pool)), [100, 200])
+        self.assertEqual(pool.collide_circle(100, 100, 10), 0)
+        self.assertEqual(pool.count, 2)
+    
+    def test_limit_and_dropped(self):
+        """测试达到上限时只发射能放下的部分并计入丢弃数量"""
+        pool = BossBulletPool(capacity=8)
+        pool.set_limit(5)
+        pattern = RingPattern(speed=1.0, count=4)
+        self.assertEqual(pattern.emit(pool, (0, 0), None, 1), 4)
+        self.assertEqual(pattern.emit(pool, (0, 0), None, 1), 1)
+        self.assertEqual(pool.count, 5)
+        self.assertEqual(pool.dropped, 3)
+        self.assertFalse(pool.spawn(0, 0, 0, 0, 1))
+        self.assertEqual(pool.dropped, 4)
+        pool.set_limit(100)
+        self.assertEqual(pool.limit, 8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from physics.broadphase import SpatialHashGrid, collect_swept_pairs
+from physics.narrowphase import (ShapeBatch, SweptCircleBatch, SHAPE_AABB, SHAPE_CIRCLE, NO_HIT,
+                                 circle_circle, circle_aabb, first_hits, sweep_pairs,
+                                 swept_circle_aabb, swept_circle_circle)
+
+class TestCollision(unittest.TestCase):
+    def test_static_tests(self):
+        """测试静态重叠检测"""
+        self.assertTrue(circle_circle(0, 0, 5, 9, 0, 5))
+        self.assertFalse(circle_circle(0, 0, 5, 11, 0, 5))
+        self.assertTrue(circle_aabb(12, 5, 3, 0, 0, 10, 10))
+        # 角附近：与矩形包围盒相交但与圆角不相交
+        self.assertFalse(circle_aabb(12.5, 12.5, 3, 0, 0, 10, 10))
+    
+    def test_swept_circle_does_not_tunnel(self):
+        """测试高速子弹在一帧内穿过目标时仍能检测到碰撞"""
+        # 狙击子弹每帧移动20像素，目标只有10像素宽
+        t = swept_circle_aabb(-10, 5, 10, 5, 2, 0, 0, 10, 10)
+        self.assertNotEqual(t, NO_HIT)
+        self.assertAlmostEqual(t, 0.4)
+        
+        t = swept_circle_circle(-30, 0, 30, 0, 1, 0, 0, 3)
+        self.assertAlmostEqual(t, (30 - 4) / 60)
+    
+    def test_swept_circle_misses(self):
+        """测试扫掠路径错过目标和角"""
+        self.assertEqual(swept_circle_aabb(-10, 20, 20, 20, 2, 0, 0, 10, 10), NO_HIT)
+        # 路径经过外扩矩形的角区域但没有碰到圆角
+        self.assertEqual(swept_circle_aabb(8, 16, 16, 8, 2, 0, 0, 10, 10), NO_HIT)
+        # 远离目标运动
+        self.assertEqual(swept_circle_circle(10, 0, 20, 0, 1, 0, 0, 3), NO_HIT)
+    
+    def test_batch_first_hit(self):
+        """测试批量扫掠时子弹只命中路径上最先碰到的目标"""
+        shapes = ShapeBatch()
+        shapes.add(50, 0, 5, 5, SHAPE_AABB)
+        shapes.add(30, 0, 5, 5, SHAPE_CIRCLE)
+        shapes.add(500, 500, 5, 5, SHAPE_AABB)
+        grid = SpatialHashGrid(cell_size=32)
+        for i in range(shapes.count):
+            grid.insert(i, *shapes.bounds(i))
+        
+        movers = SweptCircleBatch()
+        movers.add(0, 0, 80, 0, 2)
+        movers.add(0, 100, 80, 100, 2)
+        
+        pair_a, pair_b = collect_swept_pairs(grid, movers.x0s, movers.y0s,
+                                             movers.x1s, movers.y1s, movers.radii, movers.count)
+        self.assertNotIn(2, pair_b)
+        hits = first_hits(pair_a, pair_b, sweep_pairs(movers, shapes, pair_a, pair_b))
+        self.assertEqual(list(hits.keys()), [0])
+        self.assertEqual(hits[0][0], 1)
+
+if __name__ == '__main__':
+    unittest.main()
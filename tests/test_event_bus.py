@@ -0,0 +1,120 @@
+import unittest
+import sys
+import os
+import weakref
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from event_bus import CombatEvent, EventQueue
+
+class Entity:
+    pass
+
+class TestEventBus(unittest.TestCase):
+    def test_drain_order(self):
+        """测试按入队顺序分发，同一事件的多个订阅者按订阅顺序调用"""
+        events = EventQueue()
+        received = []
+        events.subscribe(CombatEvent.HIT, lambda source, target, value: received.append(('hit', value)))
+        events.subscribe(CombatEvent.KILL, lambda source, target, value: received.append(('kill', value)))
+        events.subscribe(CombatEvent.KILL, lambda source, target, value: received.append(('kill2', value)))
+        events.push(CombatEvent.HIT, value=1)
+        events.push(CombatEvent.KILL, value=2)
+        events.push(CombatEvent.HIT, value=3)
+        
+        self.assertEqual(events.drain(), 3)
+        self.assertEqual(received, [('hit', 1), ('kill', 2), ('kill2', 2), ('hit', 3)])
+        self.assertEqual(events.count, 0)
+        self.assertEqual(events.drain(), 0)
+    
+    def test_push_during_drain(self):
+        """测试处理函数推入的事件在同一次drain中处理"""
+        events = EventQueue()
+        received = []
+        
+        def on_hit(source, target, value):
+            received.append(('hit', value))
+            if value >= 10:
+                events.push(CombatEvent.KILL, source, target, 100)
+        
+        events.subscribe(CombatEvent.HIT, on_hit)
+        events.subscribe(CombatEvent.KILL, lambda source, target, value: received.append(('kill', value)))
+        events.push(CombatEvent.HIT, value=5)
+        events.push(CombatEvent.HIT, value=10)
+        
+        self.assertEqual(events.drain(), 3)
+        self.assertEqual(received, [('hit', 5), ('hit', 10), ('kill', 100)])
+        self.assertEqual(events.count, 0)
+    
+    def test_references_released(self):
+        """测试drain和clear之后不再持有实体的引用"""
+        events = EventQueue()
+        source, target = Entity(), Entity()
+        refs = [weakref.ref(source), weakref.ref(target)]
+        events.push(CombatEvent.KILL, source, target, 10)
+        del source, target
+        events.drain()
+        self.assertTrue(all(ref() is None for ref in refs))
+        
+        entity = Entity()
+        ref = weakref.ref(entity)
+        events.push(CombatEvent.HIT, entity, None, 1)
+        del entity
+        events.clear()
+        self.assertIsNone(ref())
+        self.assertEqual(events.drain(), 0)
+    
+    def test_totals_and_frame_counts(self):
+        """测试每帧计数在drain时重置，累计计数跨帧累加"""
+        events = EventQueue()
+        for _ in range(3):
+            events.push(CombatEvent.HIT)
+        events.push(CombatEvent.KILL)
+        events.drain()
+        self.assertEqual(events.frame_counts[CombatEvent.HIT], 3)
+        self.assertEqual(events.frame_counts[CombatEvent.KILL], 1)
+        
+        events.push(CombatEvent.PICKUP)
+        events.drain()
+        self.assertEqual(events.frame_counts[CombatEvent.HIT], 0)
+        self.assertEqual(events.frame_counts[CombatEvent.PICKUP], 1)
+        self.assertEqual(events.totals[CombatEvent.HIT], 3)
+        self.assertEqual(events.totals[CombatEvent.KILL], 1)
+        self.assertEqual(events.totals[CombatEvent.PICKUP], 1)
+        self.assertEqual(events.totals[CombatEvent.LEVEL_UP], 0)
+    
+    def test_overflow_drops_only_hits(self):
+        """测试队列满时只丢弃命中事件，击杀和拾取扩容后保留"""
+        events = EventQueue(capacity=4)
+        kills = []
+        pickups = []
+        events.subscribe(CombatEvent.KILL, lambda source, target, value: kills.append(value))
+        events.subscribe(CombatEvent.PICKUP, lambda source, target, value: pickups.append(value))
+        for _ in range(4):
+            events.push(CombatEvent.HIT, value=1)
+        events.push(CombatEvent.HIT, value=1)
+        self.assertEqual(events.dropped, 1)
+        self.assertEqual(events.capacity, 4)
+        
+        events.push(CombatEvent.KILL, value=50)
+        events.push(CombatEvent.PICKUP, value=2)
+        events.push(CombatEvent.HIT, value=1)
+        self.assertEqual(events.capacity, 8)
+        self.assertEqual(events.dropped, 1)
+        self.assertEqual(events.count, 7)
+        
+        # 处理函数在drain中推入事件导致扩容时仍然全部处理
+        def on_kill(source, target, value):
+            for i in range(10):
+                events.push(CombatEvent.PICKUP, value=i)
+        
+        events.subscribe(CombatEvent.KILL, on_kill)
+        self.assertEqual(events.drain(), 17)
+        self.assertEqual(kills, [50])
+        self.assertEqual(pickups, [2] + list(range(10)))
+        self.assertEqual(events.totals[CombatEvent.HIT], 5)
+        self.assertEqual(events.dropped, 1)
+
+if __name__ == '__main__':
+    unittest.main()
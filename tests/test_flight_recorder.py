@@ -0,0 +1,90 @@
+import unittest
+import json
+import shutil
+import sys
+import os
+import tempfile
+import time
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from flight_recorder import FlightRecorder
+
+class TestFlightRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def create(self, **kwargs) -> FlightRecorder:
+        options = dict(capacity=8, threshold_ms=50.0, after=2, cooldown=0.0, directory=self.directory)
+        options.update(kwargs)
+        return FlightRecorder(**options)
+    
+    def test_ring_buffer_window(self):
+        """测试只保留最近capacity帧，实体数量和事件归入所在的帧"""
+        recorder = self.create()
+        for i in range(12):
+            recorder.set_counts(enemies=i, bullets=i * 10)
+            if i == 10:
+                recorder.mark("spawn", "CircleEnemy")
+            self.assertIsNone(recorder.record("game", 16.0, 4.0, 1.0, 2.0))
+        window = recorder.window()
+        self.assertEqual([frame['frame'] for frame in window], list(range(4, 12)))
+        self.assertEqual(window[-1]['counts'], {'enemies': 11, 'bullets': 110})
+        self.assertEqual(window[-2]['events'][0][1:], ("spawn", "CircleEnemy"))
+        self.assertEqual(window[-1]['events'], [])
+        recorder.record("game", 16.0, 4.0, 1.0, 2.0)
+        self.assertEqual(recorder.window()[-1]['counts'], {})
+    
+    def test_hitch_dump(self):
+        """测试卡顿后再记录after帧写入文件，冷却时间内和预期的长帧不再写入"""
+        recorder = self.create()
+        for _ in range(3):
+            recorder.record("game", 16.0, 4.0, 1.0, 2.0)
+        self.assertIsNone(recorder.record("game", 80.0, 70.0, 60.0, 5.0, gc_ms=12.0, gc_collections=1))
+        self.assertIsNone(recorder.record("game", 16.0, 4.0, 1.0, 2.0))
+        path = recorder.record("game", 16.0, 4.0, 1.0, 2.0)
+        self.assertIsNotNone(path)
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['hitch']['frame'], 3)
+        self.assertEqual(data['hitch']['frame_ms'], 80.0)
+        self.assertTrue(data['hitch']['stack'] or data['hitch']['threads'])
+        hitch_frame = [frame for frame in data['frames'] if frame['frame'] == 3][0]
+        self.assertEqual(hitch_frame['gc_ms'], 12.0)
+        self.assertEqual(data['frames'][-1]['frame'], 5)
+        
+        recorder.expect_long_frame("preload")
+        recorder.record("game", 500.0, 490.0, 0.0, 0.0)
+        self.assertIsNone(recorder._pending)
+        recorder.cooldown = 60.0
+        recorder.record("game", 80.0, 70.0, 60.0, 5.0)
+        self.assertIsNone(recorder._pending)
+        self.assertEqual(len(recorder.dumps), 1)
+    
+    @unittest.skipUnless(hasattr(__import__('signal'), 'setitimer'), "平台不支持setitimer")
+    def test_stack_sampled_during_hitch(self):
+        """测试定时器在卡顿期间采样到主线程正在执行的函数"""
+        recorder = self.create(threshold_ms=20.0)
+        recorder.install()
+        try:
+            recorder.record("game", 16.0, 4.0, 1.0, 2.0)
+            start = time.perf_counter()
+            self.slow_function(0.06)
+            recorder.record("game", (time.perf_counter() - start) * 1000, 60.0, 60.0, 0.0)
+        finally:
+            recorder.uninstall()
+        stack = recorder._pending['stack']
+        self.assertIsNotNone(stack)
+        self.assertIn("slow_function", stack[-1])
+    
+    def slow_function(self, seconds: float):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+if __name__ == '__main__':
+    unittest.main()
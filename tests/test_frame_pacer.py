@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from frame_pacer import FramePacer, PacingMode
+
+class FakeClock:
+    """可控的时钟：sleep直接推进时间，每次读取时间额外推进tick"""
+    def __init__(self, tick: float = 0.00001):
+        self.now = 0.0
+        self.tick = tick
+        self.sleeps = []
+    
+    def clock(self) -> float:
+        self.now += self.tick
+        return self.now
+    
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestFramePacer(unittest.TestCase):
+    def create(self, mode: PacingMode = PacingMode.PRECISE, fps: int = 50):
+        self.fake = FakeClock()
+        return FramePacer(fps, mode, spin_ms=2.0, clock=self.fake.clock, sleep=self.fake.sleep)
+    
+    def work(self, seconds: float):
+        self.fake.now += seconds
+    
+    def test_precise_deadlines(self):
+        """测试精确等待对齐固定周期的截止时间，单帧超时不累积误差"""
+        pacer = self.create()
+        for _ in range(10):
+            self.work(0.005)
+            pacer.wait()
+        # 睡到截止时间前2ms，剩下的自旋
+        self.assertAlmostEqual(self.fake.sleeps[0], 0.013, delta=0.001)
+        stats = pacer.get_stats()
+        self.assertAlmostEqual(stats['mean_ms'], 20.0, delta=0.2)
+        self.assertLess(stats['jitter_ms'], 0.2)
+        self.assertAlmostEqual(pacer.work_ms, 5.0, delta=0.2)
+        
+        # 超时不到一帧：下一帧缩短，继续沿原来的周期推进
+        deadline = pacer.deadline
+        self.work(0.025)
+        pacer.wait()
+        self.assertAlmostEqual(pacer.deadline, deadline + 0.02, delta=1e-9)
+        self.assertEqual(pacer.missed, 0)
+        self.work(0.001)
+        pacer.wait()
+        self.assertAlmostEqual(pacer.frame_ms, 15.0, delta=0.2)
+        
+        # 落后超过一帧：重新对齐，不连续追帧
+        self.work(0.1)
+        pacer.wait()
+        self.assertEqual(pacer.missed, 1)
+        self.assertAlmostEqual(pacer.deadline - self.fake.now, 0.02, delta=0.001)
+    
+    def test_uncapped_and_vsync_fallback(self):
+        """测试不限帧率时不等待，垂直同步未生效时改用精确等待"""
+        pacer = self.create(PacingMode.UNCAPPED)
+        for _ in range(5):
+            self.work(0.002)
+            pacer.wait()
+        self.assertEqual(self.fake.sleeps, [])
+        self.assertAlmostEqual(pacer.get_stats()['mean_ms'], 2.0, delta=0.2)
+        
+        pacer = self.create(PacingMode.VSYNC)
+        for _ in range(pacer.vsync_check):
+            self.work(0.002)
+            pacer.wait()
+        self.assertEqual(pacer.mode, PacingMode.PRECISE)
+        self.work(0.002)
+        pacer.wait()
+        self.assertAlmostEqual(pacer.frame_ms, 20.0, delta=0.2)
+    
+    def test_idle_callback(self):
+        """测试等待之前调用空闲回调，回调消耗的时间从等待中扣除"""
+        pacer = self.create()
+        slacks = []
+        def idle(slack: float):
+            slacks.append(slack)
+            self.work(0.004)
+        pacer.idle = idle
+        self.work(0.005)
+        pacer.wait()
+        self.assertAlmostEqual(slacks[0], 0.013, delta=0.001)
+        self.assertAlmostEqual(self.fake.sleeps[0], 0.009, delta=0.001)
+        self.assertAlmostEqual(pacer.work_ms, 5.0, delta=0.2)
+        self.assertAlmostEqual(pacer.frame_ms, 20.0, delta=0.2)
+        
+        pacer.set_mode(PacingMode.UNCAPPED)
+        pacer.wait()
+        self.assertEqual(slacks[-1], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import gc
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from gc_controller import GCController
+
+class TestGCController(unittest.TestCase):
+    def create(self, **kwargs) -> GCController:
+        """使用可控的对象计数，记录回收的代而不真正回收"""
+        self.count = [0, 0, 0]
+        self.collected = []
+        controller = GCController(get_count=lambda: tuple(self.count),
+                                  collect=self.collected.append, **kwargs)
+        controller.enabled = True
+        controller.estimates = [0.2, 0.5, 5.0]
+        return controller
+    
+    def test_young_collection_in_slack(self):
+        """测试年轻代超过阈值且空闲时间够用时回收，不够时推迟，超过紧急阈值时立即回收"""
+        controller = self.create()
+        self.count = [500, 0, 0]
+        self.assertIsNone(controller.collect_in_slack(0.010))
+        self.count = [1500, 3, 0]
+        self.assertIsNone(controller.collect_in_slack(0.0001))
+        self.assertEqual(controller.collect_in_slack(0.010), 0)
+        self.count = [1500, 10, 0]
+        self.assertEqual(controller.collect_in_slack(0.010), 1)
+        self.count = [25000, 0, 0]
+        self.assertEqual(controller.collect_in_slack(0.0), 0)
+        self.assertEqual(self.collected, [0, 1, 0])
+    
+    def test_old_generation_deferral(self):
+        """测试老年代在空闲时间不够时推迟，最多推迟max_defer帧；请求完整回收时立即执行"""
+        controller = self.create(max_defer=3)
+        self.count = [0, 0, 10]
+        for _ in range(3):
+            self.assertIsNone(controller.collect_in_slack(0.001))
+        self.assertEqual(controller.deferred, 3)
+        self.assertEqual(controller.collect_in_slack(0.001), 2)
+        self.assertEqual(controller.deferred, 0)
+        self.assertEqual(controller.collect_in_slack(0.010), 2)
+        
+        self.count = [0, 0, 0]
+        controller.request_full()
+        self.assertEqual(controller.collect_in_slack(0.0), 2)
+        self.assertFalse(controller.full_requested)
+        self.assertEqual(self.collected, [2, 2, 2])
+        
+        controller.enabled = False
+        controller.request_full()
+        self.assertIsNone(controller.collect_in_slack(0.010))
+    
+    def test_start_stop_and_pause_stats(self):
+        """测试接管后关闭自动回收并记录停顿，非调度的回收单独计数，停止后恢复"""
+        was_enabled = gc.isenabled()
+        thresholds = gc.get_threshold()
+        controller = GCController(thresholds=(1, 10, 10))
+        controller.start()
+        try:
+            self.assertFalse(gc.isenabled())
+            self.assertEqual(gc.get_threshold(), (1, 10, 10))
+            gc.collect(0)
+            self.assertEqual(controller.unscheduled, 1)
+            # 阈值为1，循环引用的垃圾不会被引用计数释放，年轻代一定超过阈值
+            for _ in range(100):
+                garbage = []
+                garbage.append(garbage)
+            del garbage
+            self.assertIn(controller.collect_in_slack(1.0), (0, 1, 2))
+            stats = controller.get_stats()
+            self.assertEqual(sum(stats['collections']), 2)
+            self.assertEqual(stats['unscheduled'], 1)
+            self.assertGreaterEqual(stats['pause']['max'], 0.0)
+        finally:
+            controller.stop()
+        self.assertEqual(gc.isenabled(), was_enabled)
+        self.assertEqual(gc.get_threshold(), thresholds)
+        self.assertNotIn(controller._on_gc, gc.callbacks)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from ui.ui_element import Button, Panel
+from ui.dialog import Dialog
+from ui.hit_index import HitTestIndex, PointerDispatcher
+
+def motion(pos):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+
+def click(pos):
+    return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1),
+            pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1)]
+
+class TestHitTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1280, 720))
+    
+    def setUp(self):
+        self.clicked = []
+        self.root = Panel(0, 0, 1280, 720)
+        self.buttons = []
+        # 10x10的按钮网格，放在两层面板中
+        for row in range(10):
+            card = Panel(0, row * 60, 1280, 60)
+            self.root.add_child(card)
+            for col in range(10):
+                button = Button(col * 120, row * 60, 100, 50, f"{row},{col}",
+                                lambda r=row, c=col: self.clicked.append((r, c)))
+                card.add_child(button)
+                self.buttons.append(button)
+    
+    def test_hit_topmost(self):
+        """测试点击检测返回最上层的可用元素"""
+        index = HitTestIndex(self.root)
+        self.assertIs(index.hit(130, 70), self.buttons[11])
+        self.assertIsNone(index.hit(110, 10))
+        
+        # 上层重叠按钮优先，禁用后落到下层
+        top = Button(100, 50, 60, 40, "top", lambda: None)
+        self.root.add_child(top)
+        self.assertIs(index.hit(130, 70), top)
+        top.enabled = False
+        self.assertIs(index.hit(130, 70), self.buttons[11])
+    
+    def test_rebuild_only_on_layout_change(self):
+        """测试索引只在布局变化时重建"""
+        index = HitTestIndex(self.root)
+        for x in range(0, 1280, 7):
+            index.hit(x, 100)
+        self.assertEqual(index.rebuilds, 1)
+        
+        self.buttons[0].set_position(500, 650)
+        self.assertIs(index.hit(510, 660), self.buttons[0])
+        self.assertEqual(index.rebuilds, 2)
+    
+    def test_hover_touches_only_entered_and_left(self):
+        """测试鼠标移动只更新进入和离开的元素"""
+        dispatcher = PointerDispatcher(self.root)
+        calls = []
+        for button in self.buttons:
+            button.set_hovered = lambda hovered, b=button: calls.append((b.text, hovered))
+        
+        dispatcher.handle_event(motion((10, 10)))
+        dispatcher.handle_event(motion((20, 20)))
+        dispatcher.handle_event(motion((130, 10)))
+        self.assertEqual(calls, [("0,0", True), ("0,0", False), ("0,1", True)])
+    
+    def test_click_and_modal(self):
+        """测试点击分发以及模态对话框屏蔽下层按钮"""
+        dispatcher = PointerDispatcher(self.root)
+        for event in click((250, 130)):
+            dispatcher.handle_event(event)
+        self.assertEqual(self.clicked, [(2, 2)])
+        
+        dialog = Dialog(400, 200, 400, 200, "确认", "消息", lambda: None, lambda: None)
+        self.root.add_child(dialog)
+        dialog.show()
+        for event in click((250, 130)):
+            dispatcher.handle_event(event)
+        self.assertEqual(self.clicked, [(2, 2)])
+        
+        # 点击取消按钮后对话框隐藏，下层按钮恢复响应
+        cancel = dialog.cancel_button.rect.center
+        for event in click(cancel):
+            dispatcher.handle_event(event)
+        self.assertFalse(dialog.visible)
+        for event in click((250, 130)):
+            dispatcher.handle_event(event)
+        self.assertEqual(self.clicked, [(2, 2), (2, 2)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from input_manager import Action, InputManager
+
+class KeyState:
+    """模拟pygame.key.get_pressed的返回值"""
+    def __init__(self, *keys):
+        self.keys = set(keys)
+    
+    def __getitem__(self, key):
+        return key in self.keys
+
+class TestInputManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((320, 240))
+    
+    def setUp(self):
+        self.input = InputManager()
+        self.input.install()
+        pygame.event.clear()
+    
+    def tearDown(self):
+        pygame.event.set_allowed(None)
+    
+    def test_motion_coalescing(self):
+        """测试连续的鼠标移动事件被合并，其他事件保持顺序"""
+        for i in range(50):
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(i, i), rel=(1, 2), buttons=(0, 0, 0)))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0, unicode='', scancode=0))
+        
+        events = self.input.poll()
+        self.assertEqual([e.type for e in events], [pygame.MOUSEMOTION, pygame.KEYDOWN])
+        self.assertEqual(events[0].pos, (49, 49))
+        self.assertEqual(events[0].rel, (50, 100))
+        self.assertEqual(self.input.stats['coalesced'], 49)
+        
+        # 按下过的动作在下一次采样时触发
+        snapshot = self.input.build_snapshot(KeyState(), (0, 0), (False, False, False))
+        self.assertTrue(snapshot.was_pressed(Action.PAUSE))
+        self.assertFalse(snapshot.is_held(Action.PAUSE))
+    
+    def test_filtered_events(self):
+        """测试未允许的事件类型不会进入事件队列"""
+        pygame.event.post(pygame.event.Event(pygame.JOYBUTTONDOWN, joy=0, instance_id=0, button=0))
+        self.assertEqual(self.input.poll(), [])
+    
+    def test_snapshot(self):
+        """测试快照的动作映射、方向标准化和按下检测"""
+        snapshot = self.input.build_snapshot(KeyState(pygame.K_w, pygame.K_d), (10, 20), (True, False, False))
+        self.assertTrue(snapshot.is_held(Action.MOVE_UP))
+        self.assertTrue(snapshot.is_held(Action.FIRE))
+        self.assertTrue(snapshot.was_pressed(Action.FIRE))
+        self.assertAlmostEqual(snapshot.move[0], 2 ** -0.5)
+        self.assertAlmostEqual(snapshot.move[1], -(2 ** -0.5))
+        self.assertEqual(snapshot.mouse_pos, (10, 20))
+        with self.assertRaises(AttributeError):
+            snapshot.move = (0, 0)
+        
+        # 持续按住不会再次触发
+        snapshot = self.input.build_snapshot(KeyState(pygame.K_w), (10, 20), (True, False, False))
+        self.assertEqual(snapshot.tick, 2)
+        self.assertFalse(snapshot.was_pressed(Action.FIRE))
+        self.assertEqual(snapshot.move, (0.0, -1.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from ui.ui_element import UIElement, Button, Label, Panel
+from ui.layout import Anchor, Grid, Stack, update_layout
+from ui.main_menu import MainMenu
+
+class TestLayout(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1280, 720))
+    
+    def test_anchor_and_stretch(self):
+        """测试锚点定位和拉伸"""
+        root = UIElement(0, 0, 800, 600)
+        panel = Panel(0, 0, 10, 10)
+        panel.set_anchor(Anchor((0.5, 0.0), (0, 100), stretch=(-200, -300)))
+        button = Button(0, 0, 80, 30, "按钮", lambda: None)
+        button.set_anchor(Anchor((1.0, 1.0), (-10, -10)))
+        root.add_child(panel)
+        panel.add_child(button)
+        
+        update_layout(root)
+        self.assertEqual(panel.rect, pygame.Rect(100, 100, 600, 300))
+        self.assertEqual(button.rect.bottomright, (690, 390))
+        
+        # 调整根元素大小后，子树随之调整
+        root.set_size(1000, 800)
+        update_layout(root)
+        self.assertEqual(panel.rect, pygame.Rect(100, 100, 800, 500))
+        self.assertEqual(button.rect.bottomright, (890, 590))
+    
+    def test_stack_and_grid(self):
+        """测试纵向排列、收缩和网格排列"""
+        root = UIElement(0, 0, 800, 600)
+        stack = UIElement(0, 0, 0, 0)
+        stack.set_arrangement(Stack('vertical', spacing=10))
+        stack.set_anchor(Anchor((0.5, 0.5)))
+        root.add_child(stack)
+        buttons = [Button(0, 0, 200, 50, str(i), lambda: None) for i in range(3)]
+        for button in buttons:
+            stack.add_child(button)
+        
+        update_layout(root)
+        self.assertEqual(stack.rect, pygame.Rect(300, 215, 200, 170))
+        self.assertEqual([b.rect.y for b in buttons], [215, 275, 335])
+        
+        # 隐藏元素后重新排列
+        buttons[1].visible = False
+        update_layout(root)
+        self.assertEqual((buttons[0].rect.y, buttons[2].rect.y), (245, 305))
+        
+        grid = UIElement(0, 0, 700, 400)
+        grid.set_arrangement(Grid(2, spacing=(50, 30), padding=(0, 20)))
+        cards = [Panel(0, 0, 300, 120) for _ in range(3)]
+        for card in cards:
+            grid.add_child(card)
+        update_layout(grid)
+        self.assertEqual([c.rect.topleft for c in cards], [(25, 20), (375, 20), (25, 170)])
+    
+    def test_only_dirty_subtrees(self):
+        """测试只有变化的子树重新布局"""
+        root = UIElement(0, 0, 800, 600)
+        left = UIElement(0, 0, 400, 600)
+        right = UIElement(0, 0, 400, 600)
+        right.set_anchor(Anchor((1.0, 0.0)))
+        for panel in (left, right):
+            root.add_child(panel)
+            for i in range(10):
+                label = Label(0, 0, f"标签{i}")
+                label.set_anchor(Anchor(offset=(10, i * 30)))
+                panel.add_child(label)
+        
+        self.assertEqual(update_layout(root), 23)
+        self.assertEqual(update_layout(root), 0)
+        
+        # 修改文本只会重新布局该标签的父元素及其祖先
+        right.children[3].set_text("更长的标签文本")
+        self.assertEqual(update_layout(root), 2)
+        self.assertEqual(right.children[3].rect.topleft, (410, 90))
+    
+    def test_main_menu_resize(self):
+        """测试主菜单在不同屏幕大小下无需重建即可重新布局"""
+        menu = MainMenu(1280, 720)
+        screen = pygame.Surface((1280, 720))
+        menu.render(screen)
+        new_game = menu.buttons['new_game']
+        self.assertEqual(new_game.rect.centerx, 640)
+        self.assertEqual(new_game.rect.y, 360)
+        
+        menu.resize(800, 600)
+        menu.render(screen)
+        self.assertIs(menu.buttons['new_game'], new_game)
+        self.assertEqual(new_game.rect.centerx, 400)
+        self.assertEqual(new_game.rect.y, 300)
+        self.assertEqual(menu.confirm_dialog.rect.center, (400, 300))
+        self.assertEqual(menu.confirm_dialog.cancel_button.rect.y, menu.confirm_dialog.rect.bottom - 60)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from memory_telemetry import BudgetedSampler, MemoryTelemetry, read_rss
+from perf_stats import format_memory
+from entities.artillery import Bullet as ArtilleryShell
+from entities.bullet import Bullet
+from entities.bullet_patterns import BossBulletPool
+
+class Tracked:
+    pass
+
+class TrackedChild(Tracked):
+    pass
+
+class TestMemoryTelemetry(unittest.TestCase):
+    def create(self) -> MemoryTelemetry:
+        self.now = 0.0
+        return MemoryTelemetry(clock=lambda: self.now)
+    
+    def test_rss_and_allocation_deltas(self):
+        """测试RSS按间隔采样，分配块变化每帧记录"""
+        rss = read_rss()
+        self.assertIsNotNone(rss)
+        self.assertGreater(rss, 0)
+        
+        # 分配块计数由测试提供，不受其他测试遗留的垃圾被回收影响
+        self.now = 0.0
+        blocks = [5000]
+        telemetry = MemoryTelemetry(clock=lambda: self.now, get_blocks=lambda: blocks[0])
+        telemetry.update()
+        self.assertGreater(telemetry.rss_bytes, 0)
+        self.assertEqual(telemetry.rss_sampler.runs, 1)
+        self.assertEqual(telemetry.block_deltas.last, 0)
+        blocks[0] += 1000
+        telemetry.update()
+        self.assertEqual(telemetry.rss_sampler.runs, 1)
+        self.assertEqual(telemetry.block_deltas.last, 1000)
+        self.now = 1.0
+        blocks[0] -= 300
+        telemetry.update()
+        self.assertEqual(telemetry.rss_sampler.runs, 2)
+        self.assertEqual(telemetry.block_deltas.last, -300)
+        self.assertEqual(telemetry.snapshot()['blocks'], 5700)
+    
+    def test_census_counts_subclasses_and_surfaces(self):
+        """测试对象统计包括子类，以及不被垃圾回收跟踪的Surface"""
+        telemetry = self.create()
+        telemetry.watch("tracked", Tracked)
+        telemetry.watch("surfaces", pygame.Surface)
+        before = telemetry.census()
+        objects = [Tracked(), TrackedChild(), TrackedChild()]
+        surfaces = [pygame.Surface((4, 4)) for _ in range(5)]
+        # 同一个表面被多处引用只计一次
+        holders = [{'image': surfaces[0]}, {'image': surfaces[0]}]
+        counts = telemetry.census()
+        self.assertEqual(counts['tracked'] - before['tracked'], 3)
+        self.assertEqual(counts['surfaces'] - before['surfaces'], 5)
+        del objects, surfaces, holders
+        
+        # 容器类型按size计数：子弹池中的子弹计入子弹数量
+        telemetry.watch("bullets", BossBulletPool, size=lambda pool: pool.count)
+        telemetry.watch("bullets", Bullet)
+        telemetry.watch("bullets", ArtilleryShell)
+        before = telemetry.census()['bullets']
+        pool = BossBulletPool(capacity=64)
+        for i in range(10):
+            pool.spawn(100, 100, 1, 0, 5)
+        bullets = [Bullet(0, 0, 1, 0, 5, 1), ArtilleryShell(0, 0, 1, 0, 5, 1)]
+        self.assertEqual(telemetry.census()['bullets'] - before, 12)
+        del pool, bullets
+        
+        # 未开启时不统计，快照中也不显示
+        self.assertEqual(self.create().snapshot()['counts'], {})
+    
+    def test_sampler_budget(self):
+        """测试采样耗时超出预算时拉长间隔"""
+        sampler = BudgetedSampler(5.0, 0.002)
+        sampler.record(0.0, 0.001)
+        self.assertEqual(sampler.interval, 5.0)
+        self.assertFalse(sampler.due(5.0))
+        self.assertTrue(sampler.due(5.001))
+        sampler.record(10.0, 10.05)
+        self.assertAlmostEqual(sampler.interval, 25.0)
+        self.assertAlmostEqual(sampler.total_cost, 0.051)
+    
+    def test_tracing_top_allocations(self):
+        """测试开启tracemalloc后记录分配排行和每帧追踪内存"""
+        telemetry = self.create()
+        telemetry.start_tracing()
+        try:
+            telemetry.update()
+            keep = [bytearray(1024) for _ in range(200)]
+            self.now = 1.0
+            telemetry.update()
+            self.assertGreater(telemetry.traced_deltas.last, 200 * 1024)
+            top = telemetry.sample_top()
+            self.assertTrue(any(entry['size'] >= 200 * 1024 for entry in top))
+            lines = format_memory(telemetry.snapshot())
+            self.assertTrue(any(line.startswith("追踪内存") for line in lines))
+            del keep
+        finally:
+            telemetry.stop_tracing()
+        self.assertFalse(telemetry.tracing)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from scene_manager import Scene, SceneManager
+from scenes.game_scene import GameScene
+from entities.player import Player
+from ui.shop import Shop
+from ui.ui_element import Label
+from ui.overlay import OverlayCompositor
+
+class AllocationCounter:
+    """统计Surface创建、Label创建和文本重新渲染的次数"""
+    def __init__(self):
+        self.surfaces = 0
+        self.labels = 0
+        self.text_renders = 0
+    
+    def __enter__(self):
+        counter = self
+        self._surface = pygame.Surface
+        self._label_init = Label.__init__
+        self._label_update = Label._update_text_surface
+        
+        class CountingSurface(self._surface):
+            def __init__(self, *args, **kwargs):
+                counter.surfaces += 1
+                super().__init__(*args, **kwargs)
+        
+        def label_init(label, *args, **kwargs):
+            counter.labels += 1
+            counter._label_init(label, *args, **kwargs)
+        
+        def label_update(label):
+            counter.text_renders += 1
+            counter._label_update(label)
+        
+        pygame.Surface = CountingSurface
+        Label.__init__ = label_init
+        Label._update_text_surface = label_update
+        return self
+    
+    def __exit__(self, *exc):
+        pygame.Surface = self._surface
+        Label.__init__ = self._label_init
+        Label._update_text_surface = self._label_update
+        return False
+    
+    def total(self) -> int:
+        return self.surfaces + self.labels + self.text_renders
+
+class TestOverlay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.screen = pygame.display.set_mode((1280, 720))
+    
+    def _render_frames(self, render, frames: int = 30) -> AllocationCounter:
+        """预热一帧后统计连续多帧渲染的分配次数"""
+        render(self.screen)
+        with AllocationCounter() as counter:
+            for _ in range(frames):
+                render(self.screen)
+        return counter
+    
+    def test_compositor_reuses_layers(self):
+        """测试遮罩按屏幕大小和颜色缓存，修改透明度不重新分配"""
+        compositor = OverlayCompositor()
+        for alpha in range(0, 256, 16):
+            compositor.draw(self.screen, alpha)
+        compositor.fade(self.screen, 0.5, (255, 255, 255))
+        self.assertEqual(compositor.allocations, 2)
+        compositor.draw(pygame.Surface((320, 240)), 128)
+        self.assertEqual(compositor.allocations, 3)
+    
+    def test_transition_does_not_allocate(self):
+        """测试场景切换动画期间不分配Surface"""
+        manager = SceneManager()
+        manager.register_scene('empty', Scene())
+        manager.switch_scene('empty')
+        manager.transition_time = 60 * 1000
+        counter = self._render_frames(manager.render)
+        self.assertTrue(manager.is_transitioning)
+        self.assertEqual(counter.surfaces, 0)
+    
+    def test_pause_and_game_over_do_not_allocate(self):
+        """测试暂停和游戏结束界面每帧不创建遮罩和Label"""
+        scene = GameScene(1280, 720)
+        scene.set_player_class(Player)
+        scene.initialize()
+        
+        scene.paused = True
+        self.assertEqual(self._render_frames(scene.render).total(), 0)
+        
+        scene.paused = False
+        scene.game_over = True
+        self.assertEqual(self._render_frames(scene.render).total(), 0)
+        
+        # 数值变化时只重新渲染变化的文本
+        scene.player.score += 10
+        with AllocationCounter() as counter:
+            scene.render(self.screen)
+            scene.render(self.screen)
+        self.assertEqual((counter.surfaces, counter.labels, counter.text_renders), (0, 0, 1))
+    
+    def test_shop_does_not_allocate(self):
+        """测试商店每帧不创建货币Label"""
+        shop = Shop(1280, 720)
+        shop.set_player(Player(640, 360))
+        shop.switch_shop('temp')
+        counter = self._render_frames(shop.render)
+        self.assertEqual(counter.labels + counter.text_renders, 0)
+
+if __name__ == '__main__':
+    unittest.main()
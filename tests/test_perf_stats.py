@@ -0,0 +1,84 @@
+import unittest
+import random
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from perf_stats import MetricStats, P2Quantile, PerfLogEmitter, PerfStats, RingBuffer
+
+class TestPerfStats(unittest.TestCase):
+    def test_ring_buffer(self):
+        """测试环形缓冲区覆盖最旧的数值，平均值随之更新"""
+        ring = RingBuffer(4)
+        self.assertEqual(ring.mean, 0.0)
+        for value in range(1, 7):
+            ring.append(float(value))
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(ring.values(), [3.0, 4.0, 5.0, 6.0])
+        self.assertEqual(ring.last, 6.0)
+        self.assertAlmostEqual(ring.mean, 4.5)
+    
+    def test_p2_quantile(self):
+        """测试P²估计与精确百分位接近"""
+        rng = random.Random(1)
+        # 模拟帧耗时：大部分16ms左右，少量长帧
+        samples = [rng.gauss(16.0, 1.0) + (rng.random() < 0.03) * rng.uniform(10, 40)
+                   for _ in range(5000)]
+        ordered = sorted(samples)
+        for p in (0.5, 0.95, 0.99):
+            estimator = P2Quantile(p)
+            for value in samples:
+                estimator.add(value)
+            exact = ordered[int(p * (len(ordered) - 1))]
+            self.assertAlmostEqual(estimator.value, exact, delta=max(0.5, exact * 0.1))
+        self.assertEqual(estimator.maximum, ordered[-1])
+        
+        small = P2Quantile(0.5)
+        for value in (3.0, 1.0, 2.0):
+            small.add(value)
+        self.assertEqual(small.value, 2.0)
+    
+    def test_windowed_percentiles(self):
+        """测试百分位反映最近的窗口，新窗口样本不足时沿用上一个窗口"""
+        stats = MetricStats(window=100, min_samples=10)
+        for _ in range(100):
+            stats.add(30.0)
+        for _ in range(5):
+            stats.add(10.0)
+        self.assertEqual(stats.snapshot()['p50'], 30.0)
+        for _ in range(95):
+            stats.add(10.0)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['p50'], 10.0)
+        self.assertEqual(snapshot['max'], 10.0)
+        self.assertEqual(snapshot['mean'], 10.0)
+        self.assertEqual(set(snapshot), {'last', 'mean', 'max', 'p50', 'p95', 'p99'})
+    
+    def test_scenes_fps_and_log(self):
+        """测试按场景统计、每秒FPS记录和定期日志"""
+        perf = PerfStats(window=60, scene_window=30)
+        for _ in range(60):
+            perf.record_frame(20.0, 8.0, 3.0, 5.0, 'game')
+        for _ in range(30):
+            perf.record_frame(10.0, 2.0, 1.0, 1.0, 'main_menu')
+        snapshot = perf.snapshot()
+        self.assertAlmostEqual(snapshot['scenes']['game']['frame']['mean'], 20.0)
+        self.assertAlmostEqual(snapshot['scenes']['main_menu']['render']['p50'], 1.0)
+        self.assertAlmostEqual(snapshot['fps'], 1000.0 / ((30 * 20.0 + 30 * 10.0) / 60))
+        self.assertEqual(list(perf.fps_history.values()), [50.0])
+        self.assertNotIn('scenes', perf.snapshot(include_scenes=False))
+        
+        now = [0.0]
+        emitted = []
+        emitter = PerfLogEmitter(perf.snapshot, interval=5.0, clock=lambda: now[0])
+        emitter.emit = emitted.append
+        now[0] = 4.0
+        self.assertFalse(emitter.update())
+        now[0] = 5.0
+        self.assertTrue(emitter.update())
+        self.assertEqual(emitted[0]['frames'], 90)
+
+if __name__ == '__main__':
+    unittest.main()
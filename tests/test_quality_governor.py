@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from quality_governor import QualityGovernor, quality
+from entities.sprite_atlas import SpriteAtlas, SpriteBatch, fill_sprite
+from entities.bullet_patterns import BossBulletPool
+
+class TestQualityGovernor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+    
+    def setUp(self):
+        # 预算20ms：超过18ms降档，低于12ms升档
+        self.governor = QualityGovernor(target_fps=50, window=10, upgrade_delay=20)
+    
+    def feed(self, work_ms: float, frames: int) -> int:
+        """连续记录若干帧，返回档位变化次数"""
+        return sum(self.governor.record_frame(work_ms) for _ in range(frames))
+    
+    def test_downgrade_and_hitches(self):
+        """测试持续超预算逐档降级，偶发卡顿不触发降级"""
+        for _ in range(5):
+            self.feed(10.0, 4)
+            self.feed(100.0, 1)
+        self.assertEqual(self.governor.level, 0)
+        self.feed(10.0, 10)
+        
+        # 窗口中一半以上的帧超预算时降档
+        self.assertEqual(self.feed(25.0, 4), 0)
+        self.assertEqual(self.feed(25.0, 1), 1)
+        self.assertEqual(self.governor.tier.name, "medium")
+        # 降档后重新积累一个窗口才会再次判断
+        self.assertEqual(self.feed(25.0, 9), 0)
+        self.assertEqual(self.feed(25.0, 1), 1)
+        self.feed(25.0, 100)
+        self.assertEqual(self.governor.level, len(self.governor.tiers) - 1)
+    
+    def test_hysteresis(self):
+        """测试阈值之间的帧耗时保持当前档位，升档需要持续一段时间"""
+        self.governor.set_level(2)
+        self.assertEqual(self.feed(15.0, 200), 0)
+        
+        self.assertEqual(self.feed(5.0, 24), 0)
+        self.assertEqual(self.feed(5.0, 1), 1)
+        self.assertEqual(self.governor.level, 1)
+        
+        # 升档后马上撑不住：降回原档位，下一次升档等待加倍
+        self.feed(25.0, 10)
+        self.assertEqual(self.governor.level, 2)
+        self.assertEqual(self.governor.upgrade_delay, 40)
+        self.assertEqual(self.feed(5.0, 48), 0)
+        self.assertEqual(self.feed(5.0, 1), 1)
+    
+    def test_lock(self):
+        """测试锁定档位后不再自动调整"""
+        self.governor.set_level(3, lock=True)
+        self.assertEqual(self.feed(1.0, 500), 0)
+        self.governor.unlock()
+        self.feed(1.0, 500)
+        self.assertEqual(self.governor.level, 0)
+    
+    def test_bullet_detail_and_limit(self):
+        """测试低画质使用简化子弹精灵，子弹池不超过档位上限"""
+        atlas = SpriteAtlas(page_size=64)
+        atlas.register("shot", (12, 12), fill_sprite((255, 0, 0)), rotations=4)
+        atlas.register_simple("shot", (3, 3), fill_sprite((255, 0, 0)))
+        batch = SpriteBatch(atlas)
+        batch.add_many('enemy_bullets', "shot", [10.0], [10.0], 1, 45.0)
+        batch.detail = False
+        batch.add_many('enemy_bullets', "shot", [10.0], [10.0], 1, 45.0)
+        detailed, simple = batch.layers['enemy_bullets']
+        self.assertNotEqual(detailed[2].size, (3, 3))
+        self.assertEqual(simple[2].size, (3, 3))
+        
+        pool = BossBulletPool(capacity=64)
+        pool.set_limit(quality.tiers[-1].bullet_limit)
+        self.assertEqual(pool.limit, 64)
+        pool.set_limit(10)
+        table = [1.0] * 20
+        self.assertEqual(pool.emit_table(0, 0, table, table, 0, 20, 1), 10)
+        self.assertFalse(pool.spawn(0, 0, 1, 1, 1))
+        self.assertEqual(pool.count, 10)
+        self.assertEqual(pool.dropped, 11)
+
+if __name__ == '__main__':
+    unittest.main()
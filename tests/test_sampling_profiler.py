@@ -0,0 +1,176 @@
+import unittest
+import shutil
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import sampling_profiler
+from sampling_profiler import SamplingProfiler
+from frame_pacer import FramePacer
+
+# 以下函数把线程停在自身的栈帧中：锁的release/acquire是C函数，不产生Python栈帧，
+# 所以线程停住时栈顶一定是这些函数本身
+def hot_function(entered, hold):
+    entered.release()
+    hold.acquire()
+
+def cold_function(entered, hold):
+    entered.release()
+    hold.acquire()
+
+def idle_wait(entered, hold):
+    entered.release()
+    hold.acquire()
+
+def worker(steps):
+    for function, entered, hold in steps:
+        function(entered, hold)
+
+class ParkedThread:
+    """按计划依次停在各个函数中的线程，由测试控制何时进入下一个函数"""
+    def __init__(self, functions):
+        self.steps = []
+        for function in functions:
+            entered = threading.Lock()
+            hold = threading.Lock()
+            entered.acquire()
+            hold.acquire()
+            self.steps.append((function, entered, hold))
+        self.thread = threading.Thread(target=worker, args=(self.steps,))
+        self.index = 0
+        self.parked = False
+    
+    @property
+    def ident(self) -> int:
+        return self.thread.ident
+    
+    def start(self):
+        self.thread.start()
+    
+    def park(self):
+        """等待线程停在下一个函数中"""
+        self.steps[self.index][1].acquire()
+        self.parked = True
+    
+    def release(self):
+        """让线程离开当前函数"""
+        self.steps[self.index][2].release()
+        self.index += 1
+        self.parked = False
+    
+    def finish(self):
+        while self.index < len(self.steps):
+            if not self.parked:
+                self.park()
+            self.release()
+        self.thread.join()
+
+class TestSamplingProfiler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def sample_parked(self, profiler: SamplingProfiler, plan) -> ParkedThread:
+        """按计划[(函数, 采样次数)]让线程依次停在各函数中，并直接调用sample采样"""
+        parked = ParkedThread([function for function, _ in plan])
+        parked.start()
+        profiler.set_target(parked.ident)
+        try:
+            for _, samples in plan:
+                parked.park()
+                for _ in range(samples):
+                    self.assertTrue(profiler.sample())
+                parked.release()
+        finally:
+            parked.finish()
+        return parked
+    
+    def test_hot_functions_and_folded_stacks(self):
+        """测试热点函数按自身采样数排序，折叠栈的采样数与总数一致"""
+        profiler = SamplingProfiler(directory=self.directory)
+        self.sample_parked(profiler, [(hot_function, 9), (cold_function, 3)])
+        self.assertEqual(profiler.samples, 12)
+        self.assertEqual(profiler.idle_samples, 0)
+        
+        hot = profiler.compute_hot()
+        self.assertEqual([entry['function'] for entry in hot[:2]],
+                         ["test_sampling_profiler.py:hot_function", "test_sampling_profiler.py:cold_function"])
+        self.assertEqual([entry['self'] for entry in hot], [9, 3])
+        self.assertAlmostEqual(hot[0]['self_percent'], 75.0)
+        self.assertAlmostEqual(hot[0]['total_percent'], 75.0)
+        self.assertEqual(hot[0]['line'], hot_function.__code__.co_firstlineno)
+        # 外层函数没有自身采样，但累计占比为100%
+        worker_code = worker.__code__
+        self.assertEqual(profiler.total_counts[worker_code], 12)
+        self.assertNotIn(worker_code, profiler.self_counts)
+        
+        lines = profiler.folded()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith(";test_sampling_profiler.py:worker;"
+                                          "test_sampling_profiler.py:hot_function 9"))
+        self.assertTrue(lines[1].endswith(";test_sampling_profiler.py:cold_function 3"))
+        for line in lines:
+            self.assertTrue(line.split(";")[0].startswith("threading.py:"))
+        
+        path = profiler.write_folded()
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), lines)
+        
+        # 深度限制：只保留最内层的max_depth层
+        shallow = SamplingProfiler(max_depth=2, directory=self.directory)
+        self.sample_parked(shallow, [(hot_function, 1)])
+        self.assertEqual(shallow.folded(), ["test_sampling_profiler.py:worker;test_sampling_profiler.py:hot_function 1"])
+    
+    def test_idle_wait_excluded(self):
+        """测试空闲等待中的采样只保留在折叠栈中，不计入热点函数和累计占比"""
+        profiler = SamplingProfiler(directory=self.directory)
+        self.assertTrue(profiler._is_idle(FramePacer.wait.__code__))
+        
+        idle_functions = sampling_profiler.IDLE_FUNCTIONS
+        sampling_profiler.IDLE_FUNCTIONS = idle_functions | {("test_sampling_profiler.py", "idle_wait")}
+        try:
+            self.sample_parked(profiler, [(idle_wait, 8), (hot_function, 2)])
+        finally:
+            sampling_profiler.IDLE_FUNCTIONS = idle_functions
+        self.assertEqual(profiler.samples, 10)
+        self.assertEqual(profiler.idle_samples, 8)
+        
+        hot = profiler.compute_hot()
+        self.assertEqual([entry['function'] for entry in hot], ["test_sampling_profiler.py:hot_function"])
+        self.assertAlmostEqual(hot[0]['self_percent'], 100.0)
+        self.assertEqual(profiler.total_counts[worker.__code__], 2)
+        self.assertTrue(any(line.endswith("test_sampling_profiler.py:idle_wait 8") for line in profiler.folded()))
+    
+    def test_background_thread(self):
+        """测试后台采样线程采样目标线程，停止后不再运行"""
+        profiler = SamplingProfiler(hz=500.0, refresh=0.01, directory=self.directory)
+        parked = ParkedThread([hot_function])
+        parked.start()
+        try:
+            parked.park()
+            profiler.start(parked.ident)
+            self.assertTrue(profiler.running)
+            # 只等待采样发生，不对采样频率做断言
+            deadline = time.perf_counter() + 5.0
+            while profiler.samples == 0 and time.perf_counter() < deadline:
+                time.sleep(0.01)
+            self.assertIsNone(profiler.stop(save=False))
+        finally:
+            parked.finish()
+        self.assertFalse(profiler.running)
+        self.assertGreater(profiler.samples, 0)
+        self.assertEqual(profiler.hot[0]['function'], "test_sampling_profiler.py:hot_function")
+        self.assertEqual(sum(int(line.rsplit(" ", 1)[1]) for line in profiler.folded()), profiler.samples)
+        
+        # 目标线程结束后采样返回False
+        self.assertFalse(profiler.sample())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import save_format
+from save_format import SaveFormatError, SCHEMA_VERSION
+from save_manager import SaveManager
+
+class TestSaveFormat(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            'score': 12345,
+            'fragments': -3,
+            'stars': 2 ** 40,
+            'play_time': 3600.5,
+            'runs': [{'score': 100, 'kills': 7, 'boss': True, 'weapon': None}],
+            'unlocked_upgrades': ['攻击力', 'speed'],
+            'replays': [b'\x00\x01\xff']
+        }
+    
+    def test_roundtrip(self):
+        """测试编码后再解码得到相同的数据"""
+        for compress in (True, False):
+            blob = save_format.dumps(self.data, compress=compress)
+            version, data = save_format.loads(blob)
+            self.assertEqual(version, SCHEMA_VERSION)
+            self.assertEqual(data, self.data)
+    
+    def test_corruption_detected(self):
+        """测试损坏或截断的存档会被拒绝"""
+        blob = bytearray(save_format.dumps(self.data))
+        blob[-1] ^= 0xFF
+        with self.assertRaises(SaveFormatError):
+            save_format.loads(bytes(blob))
+        with self.assertRaises(SaveFormatError):
+            save_format.loads(b'GFSV')
+        with self.assertRaises(SaveFormatError):
+            save_format.loads(b'{"score": 1}' * 4)
+    
+    def test_migration(self):
+        """测试旧版本存档迁移和过新版本的拒绝"""
+        data = save_format.migrate({'score': 10}, 1)
+        self.assertEqual(data['score'], 10)
+        self.assertEqual(data['runs'], [])
+        self.assertEqual(data['unlocked_upgrades'], [])
+        with self.assertRaises(SaveFormatError):
+            save_format.migrate({}, SCHEMA_VERSION + 1)
+        for root in ([1, 2], "score", None):
+            with self.assertRaises(SaveFormatError):
+                save_format.migrate(root, 1)
+    
+    def test_save_manager_legacy_and_merge(self):
+        """测试SaveManager加载旧版JSON存档，并在保存时保留未提供的字段"""
+        temp_dir = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            os.chdir(temp_dir)
+            manager = SaveManager()
+            with open(manager.legacy_save_file, 'w', encoding='utf-8') as f:
+                json.dump({'score': 5, 'fragments': 1, 'stars': 0, 'play_time': 0}, f)
+            
+            data = manager.load_game()
+            self.assertEqual(data['score'], 5)
+            self.assertEqual(data['runs'], [])
+            
+            data['runs'].append({'score': 5})
+            self.assertTrue(manager.save_game({'score': 9}))
+            
+            loaded = SaveManager().load_game()
+            self.assertEqual(loaded['score'], 9)
+            self.assertEqual(loaded['runs'], [{'score': 5}])
+            self.assertTrue(manager.export_json())
+            with open(manager.export_file, 'r', encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['version'], SCHEMA_VERSION)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(temp_dir)
+    
+    def test_save_manager_keeps_unreadable_saves(self):
+        """测试无法读取的存档（版本过新、旧版根节点不是字典）不会被保存覆盖"""
+        temp_dir = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            os.chdir(temp_dir)
+            manager = SaveManager()
+            newer = save_format.dumps(self.data, version=SCHEMA_VERSION + 1)
+            with open(manager.save_file, 'wb') as f:
+                f.write(newer)
+            
+            self.assertIsNone(manager.load_game())
+            self.assertTrue(manager.save_game({'score': 1}))
+            backups = [name for name in os.listdir(manager.save_dir) if name.endswith('.bak')]
+            self.assertEqual(len(backups), 1)
+            with open(os.path.join(manager.save_dir, backups[0]), 'rb') as f:
+                self.assertEqual(f.read(), newer)
+            self.assertEqual(SaveManager().load_game()['score'], 1)
+            
+            # 旧版JSON的根节点不是字典：加载失败但之后的保存仍然成功
+            os.remove(manager.save_file)
+            with open(manager.legacy_save_file, 'w', encoding='utf-8') as f:
+                json.dump([1, 2, 3], f)
+            manager = SaveManager()
+            self.assertIsNone(manager.load_game())
+            self.assertTrue(manager.save_game({'score': 2}))
+            self.assertTrue(manager.save_game({'stars': 3}))
+            loaded = SaveManager().load_game()
+            self.assertEqual((loaded['score'], loaded['stars']), (2, 3))
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from scene_manager import Scene, SceneManager, SceneState
+from scenes.game_scene import GameScene
+from entities.soldier import Soldier
+
+class RecordingScene(Scene):
+    """记录生命周期调用的场景"""
+    def __init__(self):
+        self.calls = []
+    
+    def prepare(self):
+        self.calls.append('prepare')
+    
+    def initialize(self):
+        self.calls.append('initialize')
+    
+    def suspend(self):
+        self.calls.append('suspend')
+    
+    def resume(self):
+        self.calls.append('resume')
+    
+    def cleanup(self):
+        self.calls.append('cleanup')
+
+class TestSceneManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+    
+    def test_suspend_and_resume(self):
+        """测试压栈的场景被挂起保留，返回时恢复而不重新初始化"""
+        manager = SceneManager()
+        menu = RecordingScene()
+        shop = RecordingScene()
+        manager.register_scene('menu', menu)
+        manager.register_scene('shop', shop)
+        
+        manager.switch_scene('menu')
+        manager.switch_scene('shop')
+        self.assertEqual(menu.state, SceneState.SUSPENDED)
+        self.assertEqual(manager.scene_stack, ['menu'])
+        
+        # 切回栈中的场景：恢复并出栈，不重复入栈
+        manager.switch_scene('menu')
+        self.assertEqual(menu.calls, ['initialize', 'suspend', 'resume'])
+        self.assertEqual(manager.scene_stack, ['shop'])
+        
+        manager.switch_scene('shop')
+        self.assertEqual(shop.calls, ['initialize', 'suspend', 'resume'])
+        
+        # 出栈时当前场景被清理
+        manager.pop_scene()
+        self.assertEqual(shop.calls[-1], 'cleanup')
+        self.assertEqual(shop.state, SceneState.CREATED)
+        self.assertEqual(menu.state, SceneState.ACTIVE)
+        
+        # 强制重新初始化
+        manager.switch_scene('menu', reinitialize=True)
+        self.assertEqual(menu.calls[-2:], ['cleanup', 'initialize'])
+    
+    def test_preload(self):
+        """测试后台预初始化后切换场景使用预先创建的玩家"""
+        manager = SceneManager()
+        game = GameScene(1280, 720)
+        game.set_player_class(Soldier)
+        manager.register_scene('game', game)
+        
+        self.assertTrue(manager.preload_scene('game'))
+        manager.wait_for_preload('game')
+        self.assertEqual(game.state, SceneState.PREPARED)
+        prepared = game.prepared_player
+        self.assertIsInstance(prepared, Soldier)
+        
+        manager.switch_scene('game')
+        self.assertIs(game.player, prepared)
+        self.assertIsNone(game.prepared_player)
+        self.assertEqual(game.state, SceneState.ACTIVE)
+    
+    def test_scene_factory(self):
+        """测试工厂注册的场景在第一次使用时才创建，且只创建一次"""
+        manager = SceneManager()
+        created = []
+        
+        def factory():
+            created.append(RecordingScene())
+            return created[-1]
+        
+        manager.register_scene_factory('shop', factory)
+        self.assertTrue(manager.has_scene('shop'))
+        self.assertEqual(created, [])
+        
+        self.assertTrue(manager.preload_scene('shop'))
+        manager.wait_for_preload('shop')
+        manager.switch_scene('shop')
+        manager.switch_scene('shop', reinitialize=True)
+        self.assertEqual(len(created), 1)
+        self.assertIs(manager.get_scene('shop'), created[0])
+        self.assertEqual(created[0].calls, ['prepare', 'initialize', 'cleanup', 'initialize'])
+        self.assertEqual(manager.scene_factories, {})
+
+if __name__ == '__main__':
+    unittest.main()
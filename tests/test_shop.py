@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from entities.player import Player
+from shop_catalog import CATALOG_FILE, ShopCatalog, ShopItem, compile_effect
+from ui.shop import Shop
+
+def make_catalog(count: int) -> ShopCatalog:
+    """创建包含count个临时商店物品的目录"""
+    return ShopCatalog.from_data({'items': [
+        {
+            'id': f"item_{i}",
+            'name': f"物品{i}",
+            'price': i,
+            'currency': 'fragments',
+            'effect': {'type': 'bonus', 'attribute': 'damage_bonus', 'amount': 0.1}
+        }
+        for i in range(count)
+    ]})
+
+class TestShop(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.screen = pygame.display.set_mode((1280, 720))
+    
+    def test_catalog_file(self):
+        """测试数据文件中的物品按id索引并按商店分组"""
+        catalog = ShopCatalog.load(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), CATALOG_FILE))
+        self.assertEqual(len(catalog.items_for('temp')), 3)
+        self.assertEqual(len(catalog.items_for('perm')), 3)
+        self.assertEqual(catalog.get('heal').currency, 'fragments')
+        
+        player = Player(640, 360)
+        player.health = 10
+        catalog.get('heal').effect(player)
+        self.assertEqual(player.health, min(10 + player.max_health * 0.5, player.max_health))
+        
+        with self.assertRaises(ValueError):
+            compile_effect({'type': 'teleport'})
+        with self.assertRaises(ValueError):
+            catalog.add(ShopItem("生命恢复", "", 1, 'fragments', lambda player: None, item_id='heal'))
+    
+    def test_cards_created_for_visible_window(self):
+        """测试只为可见窗口创建卡片，滚动时复用"""
+        shop = Shop(1280, 720, make_catalog(300))
+        self.assertEqual(shop.card_pool, [])
+        shop.initialize()
+        
+        # 面板高度420，每行120+30，可显示2行共4张卡片
+        self.assertEqual(len(shop.card_pool), 4)
+        self.assertEqual(shop.visible_cards[0].item.item_id, 'item_0')
+        
+        pool = list(shop.card_pool)
+        shop.scroll(3)
+        self.assertEqual(shop.card_pool, pool)
+        self.assertEqual([card.item.item_id for card in shop.visible_cards],
+                         ['item_6', 'item_7', 'item_8', 'item_9'])
+        
+        # 不能滚动到最后一行之后
+        shop.scroll(1000)
+        self.assertEqual(shop.scroll_row, shop.max_scroll_row())
+        self.assertEqual(shop.visible_cards[-1].item.item_id, 'item_299')
+        
+        # 点击卡片按钮购买的是当前绑定的物品
+        player = Player(640, 360)
+        player.fragments = 1000
+        shop.set_player(player)
+        shop.visible_cards[0].purchase_button.callback()
+        self.assertEqual(player.fragments, 1000 - shop.visible_cards[0].item.price)
+    
+    def test_affordability_on_currency_change(self):
+        """测试只在货币变化时重新计算可购买状态"""
+        shop = Shop(1280, 720, make_catalog(300))
+        shop.initialize()
+        player = Player(640, 360)
+        player.fragments = 1
+        shop.set_player(player)
+        
+        checks = []
+        affordable = ShopItem.affordable
+        ShopItem.affordable = lambda item, fragments, stars: checks.append(item) or affordable(item, fragments, stars)
+        try:
+            shop.update()
+            self.assertEqual(len(checks), 4)
+            self.assertEqual([card.purchase_button.enabled for card in shop.visible_cards],
+                             [True, True, False, False])
+            
+            for _ in range(10):
+                shop.update()
+            self.assertEqual(len(checks), 4)
+            
+            player.fragments = 3
+            shop.update()
+            self.assertEqual(len(checks), 8)
+            self.assertTrue(shop.visible_cards[3].purchase_button.enabled)
+        finally:
+            ShopItem.affordable = affordable
+
+if __name__ == '__main__':
+    unittest.main()
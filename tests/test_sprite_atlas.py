@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+import threading
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from entities.sprite_atlas import SpriteAtlas, SpriteBatch, circle_size, circle_sprite, fill_sprite
+from entities.soldier import Soldier
+from entities.bullet import PlayerBullet
+
+class TestSpriteAtlas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+    
+    def setUp(self):
+        self.atlas = SpriteAtlas(page_size=64)
+        self.atlas.register("dot", circle_size(3), circle_sprite((255, 0, 0), 3))
+        self.atlas.register("bar", (20, 4), fill_sprite((0, 255, 0)), rotations=4)
+    
+    def test_lazy_build_and_packing(self):
+        """测试第一次查询时统一生成所有精灵，帧不重叠且放不下时换页"""
+        self.assertEqual(self.atlas.frames, {})
+        self.atlas.frame("dot")
+        self.assertEqual(set(self.atlas.frames), {"dot", "bar"})
+        
+        self.atlas.register("big", (40, 40), fill_sprite((0, 0, 255)), rotations=2)
+        self.assertEqual(self.atlas.build(), 2)
+        self.assertGreater(len(self.atlas.pages), 1)
+        
+        frames = [frame for frames in self.atlas.frames.values() for frame in frames]
+        for i, (page, area) in enumerate(frames):
+            self.assertTrue(page.get_rect().contains(area))
+            for other_page, other in frames[i + 1:]:
+                if other_page is page:
+                    self.assertFalse(area.colliderect(other))
+    
+    def test_rotation_lookup(self):
+        """测试按角度选择最接近的预旋转帧"""
+        self.atlas.build()
+        bar = self.atlas.frames["bar"]
+        self.assertIs(self.atlas.frame("bar", 0), bar[0])
+        self.assertIs(self.atlas.frame("bar", 95), bar[1])
+        self.assertIs(self.atlas.frame("bar", -90), bar[3])
+        self.assertIs(self.atlas.frame("bar", 350), bar[0])
+        # 旋转90度的横条变为竖条
+        self.assertGreater(bar[1][1].height, bar[1][1].width)
+    
+    def test_batch_flush(self):
+        """测试批量绘制按图层输出精灵并清空"""
+        screen = pygame.Surface((100, 100))
+        batch = SpriteBatch(self.atlas)
+        batch.add('a', "dot", 10, 10)
+        batch.add_many('b', "dot", [50, 80], [50, 80], 2)
+        self.assertEqual(batch.flush(screen, ('a', 'b')), 3)
+        self.assertEqual(screen.get_at((10, 10))[:3], (255, 0, 0))
+        self.assertEqual(screen.get_at((80, 80))[:3], (255, 0, 0))
+        self.assertEqual(screen.get_at((30, 30))[:3], (0, 0, 0))
+        self.assertEqual(batch.flush(screen, ('a', 'b')), 0)
+    
+    def test_background_build_converted_on_main_thread(self):
+        """测试后台线程生成的图集页不访问显示设备，由主线程转换后帧引用新页"""
+        atlas = SpriteAtlas(page_size=64)
+        atlas.register("dot", circle_size(3), circle_sprite((255, 0, 0), 3))
+        atlas.register("bar", (20, 4), fill_sprite((0, 255, 0)), rotations=4)
+        screen = pygame.display.set_mode((100, 100))
+        thread = threading.Thread(target=atlas.build)
+        thread.start()
+        thread.join()
+        self.assertEqual(atlas.unconverted, list(range(len(atlas.pages))))
+        page, area = atlas.frame("dot")
+        color = page.get_at(area.center)
+        
+        self.assertEqual(atlas.convert_pages(), len(atlas.pages))
+        self.assertEqual(atlas.unconverted, [])
+        self.assertEqual(atlas.convert_pages(), 0)
+        converted, converted_area = atlas.frame("dot")
+        self.assertIsNot(converted, page)
+        self.assertIn(converted, atlas.pages)
+        self.assertEqual(converted_area, area)
+        self.assertEqual(converted.get_at(area.center), color)
+        self.assertTrue(all(frame_page in atlas.pages for frames in atlas.frames.values()
+                            for frame_page, _ in frames))
+        screen.blit(converted, (0, 0), area)
+        
+        # 主线程中生成的新页直接转换
+        atlas.register("big", (40, 40), fill_sprite((0, 0, 255)))
+        atlas.build()
+        self.assertEqual(atlas.unconverted, [])
+    
+    def test_entity_render(self):
+        """测试实体通过全局图集渲染自身和子弹"""
+        screen = pygame.Surface((200, 200))
+        soldier = Soldier(100, 100)
+        soldier.bullets.append(PlayerBullet(20, 20, 1, 0, 1, 1, "soldier"))
+        soldier.render(screen)
+        self.assertEqual(screen.get_at((100, 100))[:3], (0, 255, 0))
+        self.assertEqual(screen.get_at((20, 20))[:3], (255, 255, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import shutil
+import sys
+import os
+import tempfile
+import time
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from stall_watchdog import StallWatchdog
+
+class TestStallWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.directory, "stalls.log")
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def read_log(self) -> str:
+        with open(self.log_path, encoding='utf-8') as f:
+            return f.read()
+    
+    def test_stall_detection_and_recovery(self):
+        """测试心跳停止超过阈值时计数并写入调用栈，持续卡住时按间隔重复，恢复后记录时长"""
+        now = [0.0]
+        watchdog = StallWatchdog(threshold=1.0, repeat=5.0, log_path=self.log_path, clock=lambda: now[0])
+        watchdog.heartbeat()
+        now[0] = 0.5
+        self.assertFalse(watchdog.check())
+        now[0] = 1.5
+        self.assertTrue(watchdog.check())
+        self.assertEqual(watchdog.stalls, 1)
+        now[0] = 3.0
+        self.assertTrue(watchdog.check())
+        now[0] = 7.0
+        self.assertTrue(watchdog.check())
+        
+        now[0] = 8.0
+        watchdog.heartbeat()
+        self.assertFalse(watchdog.check())
+        stats = watchdog.get_stats()
+        self.assertEqual(stats['stalls'], 1)
+        self.assertAlmostEqual(stats['longest_stall_s'], 8.0)
+        self.assertFalse(stats['stalled'])
+        watchdog.stop()
+        
+        log = self.read_log()
+        # 卡住时写入两次调用栈（1.5秒和6.5秒之后），调用栈包含当前的测试函数
+        self.assertEqual(log.count("主线程调用栈"), 2)
+        self.assertIn("test_stall_detection_and_recovery", log)
+        self.assertIn("卡住了 8.00秒", log)
+    
+    def test_background_thread(self):
+        """测试后台线程在主线程忙碌时写入主线程的调用栈"""
+        watchdog = StallWatchdog(threshold=0.05, poll=0.01, log_path=self.log_path)
+        watchdog.start()
+        try:
+            watchdog.heartbeat()
+            self.busy_main_thread(0.3)
+            watchdog.heartbeat()
+            time.sleep(0.05)
+        finally:
+            watchdog.stop()
+        self.assertEqual(watchdog.stalls, 1)
+        self.assertFalse(watchdog.stalled)
+        self.assertIn("busy_main_thread", self.read_log())
+    
+    def busy_main_thread(self, seconds: float):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from startup_trace import StartupTracer
+
+class TestStartupTrace(unittest.TestCase):
+    def setUp(self):
+        self.tracer = StartupTracer()
+    
+    def tearDown(self):
+        self.tracer.uninstall()
+    
+    def test_disabled_records_nothing(self):
+        """测试未开启时不记录"""
+        with self.tracer.span("scene:menu"):
+            pass
+        self.tracer.mark("first_frame")
+        self.assertEqual(self.tracer.records, [])
+        self.assertEqual(self.tracer.marks, {})
+        self.assertFalse(self.tracer.first_frame())
+    
+    def test_nested_spans_self_time(self):
+        """测试嵌套记录的自身耗时不包含子记录"""
+        self.tracer.install()
+        with self.tracer.span("outer"):
+            with self.tracer.span("inner"):
+                time.sleep(0.02)
+        inner, outer = self.tracer.records
+        self.assertEqual((inner['name'], inner['depth']), ("inner", 1))
+        self.assertEqual((outer['name'], outer['depth']), ("outer", 0))
+        self.assertGreaterEqual(outer['total_ms'], inner['total_ms'])
+        self.assertLess(outer['self_ms'], inner['total_ms'])
+        self.assertEqual(self.tracer.summary()['constructed'], ["inner", "outer"])
+    
+    def test_import_tracing(self):
+        """测试导入钩子记录新导入的模块，首帧后移除钩子"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(temp_dir, "traced_module.py"), 'w') as f:
+                f.write("import time\ntime.sleep(0.01)\nVALUE = 42\n")
+            sys.path.insert(0, temp_dir)
+            self.tracer.install(exit_after_report=True)
+            import traced_module
+            self.assertEqual(traced_module.VALUE, 42)
+            
+            record = next(r for r in self.tracer.records if r['name'] == "traced_module")
+            self.assertEqual(record['category'], 'import')
+            self.assertGreaterEqual(record['total_ms'], 10)
+            
+            self.assertTrue(self.tracer.first_frame())
+            self.assertIn('first_frame', self.tracer.marks)
+            self.assertNotIn(self.tracer._finder, sys.meta_path)
+        finally:
+            sys.path.remove(temp_dir)
+            sys.modules.pop("traced_module", None)
+            shutil.rmtree(temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
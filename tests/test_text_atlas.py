@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from ui.ui_element import UIElement, Button, Label
+from ui import text_atlas
+from ui.text_atlas import TextAtlas, bake, collect_source_strings
+
+class TestTextAtlas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.screen = pygame.display.set_mode((640, 480))
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "text_atlas.bin")
+    
+    def tearDown(self):
+        UIElement.text_atlas = None
+        shutil.rmtree(self.temp_dir)
+    
+    def test_collect_source_strings(self):
+        """测试从代码中收集Label和Button的字面量文本"""
+        source = os.path.join(self.temp_dir, "screen.py")
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write("title = Label(0, 0, '标题', 48, bold=True)\n"
+                    "tip = Label(0, 0, text='提示', color=(255, 0, 0))\n"
+                    "score = Label(0, 0, f'得分: {score}')\n"
+                    "ok = Button(0, 0, 100, 40, '确认', None)\n")
+        entries = collect_source_strings([source])
+        self.assertIn(('标题', 48, True, (255, 255, 255)), entries)
+        self.assertIn(('提示', 24, False, (255, 0, 0)), entries)
+        self.assertIn(('确认', 24, True, (255, 255, 255)), entries)
+        self.assertIn(('确认', 24, True, (150, 150, 150)), entries)
+        self.assertEqual(len(entries), 4)
+    
+    def test_bake_and_load(self):
+        """测试烘焙的文本与实时渲染的像素一致"""
+        entries = [('Shop', 48, True, (255, 255, 255)), ('Back', 24, False, (255, 0, 0))]
+        self.assertEqual(bake(entries, self.path), 2)
+        
+        atlas = TextAtlas.load(self.path)
+        self.assertIsNotNone(atlas)
+        for text, size, bold, color in entries:
+            baked = atlas.get(text, size, bold, color)
+            live = UIElement.get_font(size, bold).render(text, True, color)
+            self.assertEqual(baked.get_size(), live.get_size())
+            self.assertEqual(baked.get_at((baked.get_width() // 2, baked.get_height() // 2)),
+                             live.get_at((live.get_width() // 2, live.get_height() // 2)))
+        self.assertIsNone(atlas.get('Shop', 24, True, (255, 255, 255)))
+        self.assertEqual((atlas.hits, atlas.misses), (2, 1))
+    
+    def test_widgets_use_atlas(self):
+        """测试静态文本不再打开字体，动态文本回退到实时渲染"""
+        bake([('Shop', 48, True, (255, 255, 255)), ('OK', 24, True, (255, 255, 255))], self.path)
+        UIElement.text_atlas = TextAtlas.load(self.path)
+        
+        opened = []
+        get_font = UIElement.get_font
+        UIElement.get_font = staticmethod(lambda size, bold=False: opened.append(size) or get_font(size, bold))
+        try:
+            label = Label(0, 0, 'Shop', 48, bold=True)
+            Button(0, 0, 100, 40, 'OK', lambda: None).render(self.screen)
+            self.assertEqual(opened, [])
+            label.set_text('Score: 10')
+            self.assertEqual(opened, [48])
+        finally:
+            UIElement.get_font = staticmethod(get_font)
+    
+    def test_invalid_atlas_falls_back(self):
+        """测试字体变化或文件损坏时不使用图集"""
+        bake([('Shop', 48, True, (255, 255, 255))], self.path)
+        signature = text_atlas.font_signature
+        text_atlas.font_signature = lambda: {'changed.ttc': 1}
+        try:
+            self.assertIsNone(TextAtlas.load(self.path))
+        finally:
+            text_atlas.font_signature = signature
+        
+        with open(self.path, 'wb') as f:
+            f.write(b'broken')
+        self.assertIsNone(TextAtlas.load(self.path))
+        self.assertIsNone(TextAtlas.load(os.path.join(self.temp_dir, "missing.bin")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+
+# 使用无窗口的显示和音频驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加src目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+from ui.ui_element import UIElement, Button, Label, Panel, ProgressBar
+
+class TestWidgets(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.screen = pygame.display.set_mode((640, 480))
+    
+    def test_button_caches_states(self):
+        """测试按钮每种外观状态只渲染一次"""
+        button = Button(10, 10, 100, 40, "按钮", lambda: None)
+        renders = []
+        render_state = button._render_state
+        button._render_state = lambda state: renders.append(state) or render_state(state)
+        
+        for _ in range(10):
+            button.render(self.screen)
+        button.hovered = True
+        for _ in range(10):
+            button.render(self.screen)
+        button.hovered = False
+        button.enabled = False
+        button.render(self.screen)
+        button.enabled = True
+        button.render(self.screen)
+        self.assertEqual(renders, ['normal', 'hover', 'disabled'])
+        
+        # 修改文本后重新渲染
+        button.set_text("新文本")
+        button.render(self.screen)
+        self.assertEqual(renders[-1], 'normal')
+    
+    def test_progress_bar_quantized(self):
+        """测试进度条只在填充像素宽度变化时重绘"""
+        bar = ProgressBar(10, 60, 100, 10)
+        redraws = []
+        redraw = bar._redraw
+        bar._redraw = lambda: redraws.append(bar.fill_width) or redraw()
+        
+        bar.render(self.screen)
+        bar.set_progress(0.501)
+        bar.render(self.screen)
+        bar.set_progress(0.505)
+        bar.render(self.screen)
+        bar.set_progress(0.42)
+        bar.render(self.screen)
+        self.assertEqual(redraws, [100, 50, 42])
+        
+        # 调整大小后重新创建画面并按新宽度量化
+        bar.set_size(200, 12)
+        self.assertEqual(bar.surface.get_size(), (200, 12))
+        self.assertEqual(bar.fill_width, 84)
+        bar.render(self.screen)
+        self.assertEqual(redraws[-1], 84)
+        bar.render(self.screen)
+        self.assertEqual(len(redraws), 4)
+    
+    def test_tree_reports_changes(self):
+        """测试UI树报告本帧是否有变化"""
+        root = Panel(0, 0, 640, 480)
+        label = Label(10, 10, "文本")
+        button = Button(10, 50, 100, 40, "按钮", lambda: None)
+        bar = ProgressBar(10, 100, 100, 10)
+        for child in (label, button, bar):
+            root.add_child(child)
+        
+        root.render(self.screen)
+        self.assertTrue(root.consume_changes())
+        root.render(self.screen)
+        self.assertFalse(root.consume_changes())
+        
+        label.set_text("文本")
+        bar.set_progress(1.0)
+        root.render(self.screen)
+        self.assertFalse(root.consume_changes())
+        
+        button.pressed = True
+        root.render(self.screen)
+        self.assertTrue(root.consume_changes())
+        
+        bar.set_progress(0.3)
+        self.assertTrue(root.consume_changes())
+        label.visible = False
+        self.assertTrue(root.consume_changes())
+    
+    def test_font_cache_cleared_on_quit(self):
+        """测试pygame退出时清空字体缓存，重新初始化后仍能渲染文字"""
+        UIElement.get_font(24)
+        pygame.quit()
+        self.assertFalse(any(UIElement._fonts.values()))
+        self.assertIsNone(UIElement.text_atlas)
+        
+        pygame.init()
+        self.__class__.screen = pygame.display.set_mode((640, 480))
+        Label(10, 10, "退出后重新渲染").render(self.screen)
+        
+        # 每次退出都会清空（登记在退出后失效，需要重新登记）
+        pygame.quit()
+        self.assertFalse(any(UIElement._fonts.values()))
+        pygame.init()
+        self.__class__.screen = pygame.display.set_mode((640, 480))
+
+if __name__ == '__main__':
+    unittest.main()